@@ -0,0 +1,40 @@
+"""
+Alembic 환경 설정
+
+테이블 대부분은 db/init.sql 덤프로 만들어지고 ORM 모델이 없는 테이블도 있어서
+autogenerate는 사용하지 않습니다 (target_metadata = None). 마이그레이션은 직접 작성합니다.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import settings
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+DATABASE_URL = settings.DATABASE_URL + "?charset=utf8mb4"
+target_metadata = None
+
+
+def run_migrations_offline() -> None:
+    """SQL만 출력 (alembic upgrade head --sql)"""
+    context.configure(url=DATABASE_URL, target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
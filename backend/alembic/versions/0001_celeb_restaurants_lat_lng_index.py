@@ -0,0 +1,48 @@
+"""celeb_restaurants (Latitude, Longitude) 인덱스 - /restaurants/nearby 바운딩 박스 사전 필터용
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "idx_celeb_restaurants_lat_lng"
+TABLE_NAME = "celeb_restaurants"
+
+
+def _has_table() -> bool:
+    if op.get_context().as_sql:
+        return True  # --sql 모드는 DB를 조회할 수 없으므로 테이블이 있다고 보고 DDL 출력
+    return sa.inspect(op.get_bind()).has_table(TABLE_NAME)
+
+
+def _has_index() -> bool:
+    if op.get_context().as_sql:
+        return False  # --sql 모드는 DB를 조회할 수 없음
+    inspector = sa.inspect(op.get_bind())
+    return any(index["name"] == INDEX_NAME for index in inspector.get_indexes(TABLE_NAME))
+
+
+def upgrade() -> None:
+    # 레스토랑 데이터를 따로 적재하는 DB가 있어 새 DB에는 테이블이 없을 수 있음
+    # → 이 경우 건너뛰고 뒤 리비전(0002, 0003)은 계속 진행 (테이블 생성 시 인덱스는 db/init.sql / 모델 선언에 포함)
+    if not _has_table():
+        print(f"⚠️ {TABLE_NAME} 테이블 없음 → {INDEX_NAME} 생성 건너뜀")
+        return
+
+    # 모델 선언 후 수동으로 이미 만든 DB도 있으므로 없을 때만 생성
+    if not _has_index():
+        op.create_index(INDEX_NAME, TABLE_NAME, ["Latitude", "Longitude"])
+
+
+def downgrade() -> None:
+    if not _has_table():
+        return
+    if op.get_context().as_sql or _has_index():
+        op.drop_index(INDEX_NAME, table_name=TABLE_NAME)
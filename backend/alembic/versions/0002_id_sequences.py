@@ -0,0 +1,43 @@
+"""id_sequences 테이블 - convers_id 블록 예약용 시퀀스 (write-behind 대화 저장)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "id_sequences"
+
+
+def _has_table() -> bool:
+    if op.get_context().as_sql:
+        return False  # --sql 모드는 DB를 조회할 수 없음
+    return sa.inspect(op.get_bind()).has_table(TABLE_NAME)
+
+
+def upgrade() -> None:
+    if not _has_table():
+        op.create_table(
+            TABLE_NAME,
+            sa.Column("name", sa.String(64), primary_key=True),
+            sa.Column("next_id", sa.BigInteger, nullable=False),
+            mysql_engine="InnoDB",
+            mysql_charset="utf8mb4",
+            mysql_collate="utf8mb4_unicode_ci",
+        )
+
+    # 기존 대화 다음 번호부터 시작 (이미 행이 있으면 그대로 - 앱 시작 시 MAX 이상으로만 올림)
+    op.execute(
+        "INSERT IGNORE INTO id_sequences (name, next_id) "
+        "SELECT 'conversations', COALESCE(MAX(convers_id), 0) + 1 FROM conversations"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table(TABLE_NAME)
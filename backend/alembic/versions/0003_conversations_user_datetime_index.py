@@ -0,0 +1,34 @@
+"""conversations (user_id, datetime, convers_id) 인덱스 - /chat/history keyset 페이지네이션용
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "idx_conversations_user_datetime_id"
+TABLE_NAME = "conversations"
+
+
+def _has_index() -> bool:
+    if op.get_context().as_sql:
+        return False  # --sql 모드는 DB를 조회할 수 없음
+    inspector = sa.inspect(op.get_bind())
+    return any(index["name"] == INDEX_NAME for index in inspector.get_indexes(TABLE_NAME))
+
+
+def upgrade() -> None:
+    # db/init.sql로 새로 만든 DB에는 이미 있으므로 없을 때만 생성
+    if not _has_index():
+        op.create_index(INDEX_NAME, TABLE_NAME, ["user_id", "datetime", "convers_id"])
+
+
+def downgrade() -> None:
+    if op.get_context().as_sql or _has_index():
+        op.drop_index(INDEX_NAME, table_name=TABLE_NAME)
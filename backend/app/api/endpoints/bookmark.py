@@ -1,18 +1,22 @@
 # backend/app/api/endpoints/bookmark.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database.connection import get_db
+from app.database.connection import get_async_db, get_db
 from app.models.bookmark import Bookmark
 from app.schemas.bookmarkschema import BookmarkCreate, BookmarkListResponse
+from app.services.llm_rerank_cache import llm_rerank_cache
+from app.services.taste_profile import TasteProfileService
 
 router = APIRouter(prefix="/bookmark", tags=["bookmark"])
 
 
 # 1️⃣ 북마크 생성
 @router.post("", response_model=BookmarkListResponse)
-def add_bookmark(data: BookmarkCreate, db: Session = Depends(get_db)):
+def add_bookmark(data: BookmarkCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """
     북마크 생성
     - KMediaPage에서 보내는 데이터를 그대로 저장
@@ -41,6 +45,13 @@ def add_bookmark(data: BookmarkCreate, db: Session = Depends(get_db)):
 
         print(f"✅ 북마크 생성 성공: bookmark_id={new_bookmark.bookmark_id}")
 
+        # 👤 취향 벡터 증분 갱신 (응답 후 백그라운드)
+        background_tasks.add_task(
+            TasteProfileService.apply_bookmark_change,
+            new_bookmark.user_id, new_bookmark.place_type, new_bookmark.reference_id, True
+        )
+        background_tasks.add_task(llm_rerank_cache.invalidate_user, new_bookmark.user_id)
+
         # to_dict()를 사용하여 응답 생성
         bookmark_dict = new_bookmark.to_dict()
         
@@ -69,7 +80,7 @@ def add_bookmark(data: BookmarkCreate, db: Session = Depends(get_db)):
 
 # 2️⃣ 북마크 목록 조회
 @router.get("/{user_id}", response_model=list[BookmarkListResponse])
-def list_bookmarks(user_id: int, db: Session = Depends(get_db)):
+async def list_bookmarks(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     사용자의 모든 북마크 조회
     - reference_id를 그대로 반환 (추천 시스템에서 사용)
@@ -77,7 +88,8 @@ def list_bookmarks(user_id: int, db: Session = Depends(get_db)):
     try:
         print(f"📥 북마크 조회 요청: user_id={user_id}")
         
-        bookmarks = db.query(Bookmark).filter(Bookmark.user_id == user_id).all()
+        result = await db.execute(select(Bookmark).where(Bookmark.user_id == user_id))
+        bookmarks = result.scalars().all()
         
         print(f"✅ 북마크 조회 성공: {len(bookmarks)}개")
 
@@ -113,7 +125,7 @@ def list_bookmarks(user_id: int, db: Session = Depends(get_db)):
 
 # 3️⃣ 북마크 삭제
 @router.delete("/{bookmark_id}/{user_id}")
-def delete_bookmarks(bookmark_id: int, user_id: int, db: Session = Depends(get_db)):
+def delete_bookmarks(bookmark_id: int, user_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """
     북마크 삭제
     - bookmark_id와 user_id를 모두 확인
@@ -121,13 +133,20 @@ def delete_bookmarks(bookmark_id: int, user_id: int, db: Session = Depends(get_d
     try:
         print(f"📥 북마크 삭제 요청: bookmark_id={bookmark_id}, user_id={user_id}")
         
-        Bookmark.delete_bookmark(
+        deleted = Bookmark.delete_bookmark(
             db=db,
             bookmark_id=bookmark_id,
             user_id=user_id,
         )
         
         print(f"✅ 북마크 삭제 성공")
+
+        # 👤 취향 벡터 증분 갱신 (응답 후 백그라운드)
+        background_tasks.add_task(
+            TasteProfileService.apply_bookmark_change,
+            user_id, deleted["place_type"], deleted["reference_id"], False
+        )
+        background_tasks.add_task(llm_rerank_cache.invalidate_user, user_id)
         return {"detail": "Bookmark deleted successfully"}
     except ValueError as e:
         print(f"❌ 북마크 삭제 실패 (Not Found): {e}")
@@ -139,7 +158,7 @@ def delete_bookmarks(bookmark_id: int, user_id: int, db: Session = Depends(get_d
 
 # 4️⃣ 추천을 위한 reference_id 목록 조회
 @router.get("/{user_id}/reference-ids")
-def get_reference_ids(user_id: int, place_type: int = None, db: Session = Depends(get_db)):
+async def get_reference_ids(user_id: int, place_type: int = None, db: AsyncSession = Depends(get_async_db)):
     """
     추천 시스템을 위한 reference_id 목록 반환
     
@@ -151,13 +170,12 @@ def get_reference_ids(user_id: int, place_type: int = None, db: Session = Depend
         { "reference_ids": [123, 456, 789] }
     """
     try:
-        query = db.query(Bookmark.reference_id).filter(Bookmark.user_id == user_id)
+        query = select(Bookmark.reference_id).where(Bookmark.user_id == user_id)
         
         if place_type is not None:
-            query = query.filter(Bookmark.place_type == place_type)
+            query = query.where(Bookmark.place_type == place_type)
         
-        bookmarks = query.all()
-        reference_ids = [bm.reference_id for bm in bookmarks]
+        reference_ids = (await db.execute(query)).scalars().all()
         
         print(f"✅ reference_id 조회 성공: {len(reference_ids)}개")
         return {"reference_ids": reference_ids}
@@ -6,13 +6,16 @@
 🍽️ Restaurant 전용 라우팅 추가!
 🎬 K-Contents 전용 라우팅 추가!
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from app.database.connection import get_db
+from app.core.config import settings
+from app.database.connection import get_db, get_async_db
 from app.services.chat_service import ChatService
+from app.services.conversation_history import ConversationHistoryService
 from app.services.chat_rest import ChatRestService  # 🍽️
 from app.schemas import ChatMessage
 from app.core.deps import get_current_user
@@ -45,7 +48,7 @@ async def send_message(
     }
     """
     try:
-        result = ChatService.send_message(
+        result = await ChatService.send_message(
             db=db,
             user_id=current_user['user_id'],
             message=request.message,
@@ -196,7 +199,7 @@ async def send_kcontent_message(
     }
     """
     try:
-        result = ChatService.send_message(
+        result = await ChatService.send_message(
             db=db,
             user_id=current_user['user_id'],
             message=request.message,
@@ -254,24 +257,47 @@ async def send_kcontent_message_streaming(
 @router.get("/history")
 async def get_conversation_history(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    limit: int = 50
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(50, ge=1, le=settings.CONVERSATION_HISTORY_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (더 오래된 대화)"),
+    fields: str = Query("full", pattern="^(full|preview)$", description="full = 전체 텍스트, preview = 앞부분만"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="ndjson = 전체 히스토리 스트리밍"),
 ):
     """
-    사용자의 대화 히스토리 조회
+    사용자의 대화 히스토리 조회 (keyset 페이지네이션)
     모든 서비스의 대화 히스토리를 한 번에 가져옴
+    
+    - json: limit개 (페이지 안에서는 오래된 순) + next_cursor
+    - ndjson: cursor 이후 전체를 최신순으로 한 줄에 1개씩 스트리밍 (limit 무시)
     """
     try:
-        history = ChatService.get_conversation_history(
+        if format == "ndjson":
+            return StreamingResponse(
+                ConversationHistoryService.stream_ndjson(
+                    db=db,
+                    user_id=current_user['user_id'],
+                    cursor=cursor,
+                    fields=fields
+                ),
+                media_type="application/x-ndjson",
+                headers={"X-Accel-Buffering": "no"}
+            )
+        
+        history, next_cursor = await ConversationHistoryService.get_page(
             db=db,
             user_id=current_user['user_id'],
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            fields=fields
         )
         
         return {
             "conversations": history,
-            "total": len(history)
+            "total": len(history),
+            "next_cursor": next_cursor
         }
     
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"히스토리 조회 오류: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"히스토리 조회 오류: {str(e)}")
@@ -15,18 +15,34 @@ from app.schemas import (
     ConcertsResponse # 사용하지 않지만 일단 유지합니다.
 )
 
-# 위치 기반 검색을 위한 수학 함수 (하버사인 공식의 일부)를 위한 import
-from sqlalchemy.sql import func
-import math
+# 위치 기반 검색용 좌표 배열 인덱스
+from app.core.config import settings
+from app.utils.geo_index import ArrayGeoIndex, get_geo_index
 
-# 지구 반경 (킬로미터)
-EARTH_RADIUS_KM = 6371
+CONCERT_GEO_INDEX = "concert"
 
 router = APIRouter(
     prefix="/concerts", # URL 접두사를 /api/concerts로 변경
     tags=["concerts"] # 태그를 concerts로 변경
 )
 
+def _concert_geo_index(db: Session):
+    """콘서트 좌표 인덱스 (id/좌표/시작일만 조회 - ORM 객체 생성 없음)"""
+    def loader():
+        rows = db.query(
+            Concert.concert_id, Concert.latitude, Concert.longitude, Concert.start_date
+        ).filter(
+            Concert.latitude.isnot(None),
+            Concert.longitude.isnot(None)
+        ).all()
+        return ArrayGeoIndex.from_rows(
+            (row.concert_id, row.latitude, row.longitude, row.start_date.toordinal())
+            for row in rows
+        )
+
+    return get_geo_index(CONCERT_GEO_INDEX, loader, settings.GEO_INDEX_TTL_SECONDS)
+
+
 @router.get("/", response_model=List[ConcertResponse])
 async def get_all_concerts(
     # filter_type 필드가 모델에서 제거되었으므로, 인자도 제거합니다.
@@ -178,51 +194,29 @@ async def search_concerts_by_location(
 ):
     """
     주어진 중심 좌표(위도, 경도)와 반경(km) 내에 위치하는 콘서트 목록을 조회합니다.
-    (하버사인 공식을 사용하여 거리를 계산합니다. DB 함수가 아닌 Python math를 사용하므로 대량 데이터에는 비효율적일 수 있습니다.)
+    (🚀 NumPy 좌표 배열 인덱스: 위도 범위 사전 필터 + 벡터화 하버사인,
+     반경 안에 든 콘서트만 DB에서 조회합니다.)
     """
     try:
         if radius_km <= 0:
             raise HTTPException(status_code=400, detail="반경은 0보다 커야 합니다.")
 
-        # 1. 모든 콘서트 데이터와 위도/경도를 가져옵니다.
-        # 실제 운영 환경에서는 DB의 공간 확장 기능을 사용하는 것이 성능상 유리합니다.
-        all_concerts = db.query(Concert).all()
+        # 1. 좌표 인덱스 (GEO_INDEX_TTL_SECONDS마다 재생성)
+        index = _concert_geo_index(db)
+        if index is None:
+            raise HTTPException(status_code=500, detail="콘서트 위치 인덱스를 만들 수 없습니다.")
 
-        # 2. 중심 좌표와 콘서트 위치 간의 거리를 계산하고 필터링합니다.
-        nearby_concerts = []
-        
-        # 중심 좌표를 라디안으로 변환
-        center_lat_rad = math.radians(lat)
-        center_lon_rad = math.radians(lon)
-
-        for concert in all_concerts:
-            # latitude 또는 longitude가 없는 데이터는 건너뜁니다.
-            if concert.latitude is None or concert.longitude is None:
-                continue
-
-            # 콘서트 위치를 라디안으로 변환
-            concert_lat_rad = math.radians(concert.latitude)
-            concert_lon_rad = math.radians(concert.longitude)
-            
-            # 위도 및 경도 차이 계산
-            dlat = concert_lat_rad - center_lat_rad
-            dlon = concert_lon_rad - center_lon_rad
-            
-            # 하버사인 공식 (Haversine Formula)을 적용하여 거리를 계산합니다.
-            a = math.sin(dlat / 2)**2 + math.cos(center_lat_rad) * math.cos(concert_lat_rad) * math.sin(dlon / 2)**2
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-            
-            # 킬로미터 단위의 최종 거리
-            distance_km = EARTH_RADIUS_KM * c
-
-            # 검색 반경 내에 있는 경우 목록에 추가
-            if distance_km <= radius_km:
-                nearby_concerts.append(concert)
-                
-        # 시작 날짜 순으로 정렬하여 반환
-        nearby_concerts.sort(key=lambda x: x.start_date, reverse=False)
-
-        return nearby_concerts
+        # 2. 반경 내 concert_id (시작 날짜 순)
+        concert_ids, _ = index.query(lat, lon, radius_km * 1000)
+        if len(concert_ids) == 0:
+            return []
+
+        # 3. 해당 콘서트만 조회 후 인덱스 순서대로 정렬
+        concert_ids = concert_ids.tolist()
+        concerts = db.query(Concert).filter(Concert.concert_id.in_(concert_ids)).all()
+        concerts_by_id = {concert.concert_id: concert for concert in concerts}
+
+        return [concerts_by_id[concert_id] for concert_id in concert_ids if concert_id in concerts_by_id]
 
     except HTTPException:
         raise
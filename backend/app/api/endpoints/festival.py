@@ -2,11 +2,11 @@
 축제 API 엔드포인트 (ORM 버전)
 """
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, and_, select
 from typing import List, Optional
 from datetime import date, datetime
-from app.database.connection import get_db  # ← backend. 제거
+from app.database.connection import get_async_db  # ← backend. 제거
 from app.models.festival import Festival     # ← backend. 제거
 from app.schemas import (                    # ← backend. 제거
     FestivalResponse,
@@ -22,13 +22,14 @@ router = APIRouter(
 @router.get("/{festival_id}", response_model=FestivalResponse)
 async def get_festival_by_id(
     festival_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """특정 축제 상세 정보 (ORM 버전)"""
     try:
-        festival = db.query(Festival).filter(
-            Festival.fastival_id == festival_id
-        ).first()
+        result = await db.execute(
+            select(Festival).where(Festival.festival_id == festival_id)
+        )
+        festival = result.scalar_one_or_none()
         
         if not festival:
             raise HTTPException(status_code=404, detail="축제를 찾을 수 없습니다")
@@ -43,7 +44,7 @@ async def get_festival_by_id(
 @router.get("/search/query", response_model=List[FestivalResponse])
 async def search_festivals(
     q: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """축제 검색 (ORM 버전)"""
     try:
@@ -51,12 +52,15 @@ async def search_festivals(
             raise HTTPException(status_code=400, detail="검색어는 2글자 이상이어야 합니다")
         
         # 제목 또는 설명에서 검색
-        festivals = db.query(Festival).filter(
-            or_(
-                Festival.title.contains(q),
-                Festival.description.contains(q)
-            )
-        ).order_by(Festival.start_date.desc()).limit(100).all()
+        result = await db.execute(
+            select(Festival).where(
+                or_(
+                    Festival.title.contains(q),
+                    Festival.description.contains(q)
+                )
+            ).order_by(Festival.start_date.desc()).limit(100)
+        )
+        festivals = result.scalars().all()
         
         return festivals
     
@@ -3,11 +3,14 @@ Map Search & Geocoding API
 Google Geocoding API를 사용한 장소 좌표 검색
 """
 from fastapi import APIRouter, Query, HTTPException
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 import httpx
 import os
 from dotenv import load_dotenv
 
+from app.core.http_client import google_geocoding_http
+from app.services.geocode_cache import geocode_cache
+
 load_dotenv()
 
 router = APIRouter(
@@ -16,11 +19,15 @@ router = APIRouter(
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GEOCODING_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+GEOCODING_LANGUAGE = "ko"
 
 
 async def get_coordinates_from_google(query: str) -> Dict[str, float]:
     """
-    Google Geocoding API로 좌표를 조회하는 함수
+    Google Geocoding API로 좌표를 조회하는 함수 (🚀 캐시 우선)
+    
+    같은 검색어는 geocode_cache에서 바로 반환하고,
+    동시에 들어온 같은 검색어는 Google 호출 1번의 결과를 함께 사용합니다.
     
     Args:
         query: 검색할 장소 이름 또는 주소
@@ -28,51 +35,70 @@ async def get_coordinates_from_google(query: str) -> Dict[str, float]:
     Returns:
         Dict[str, float]: {"latitude": float, "longitude": float} 또는 None
     """
+    try:
+        return await geocode_cache.get_or_fetch(
+            query,
+            GEOCODING_LANGUAGE,
+            lambda: _fetch_coordinates_from_google(query)
+        )
+    except Exception as e:
+        print(f"❌ Geocode cache Exception: {type(e).__name__} - {e}")
+        return None
+
+
+async def _fetch_coordinates_from_google(query: str) -> Tuple[str, Optional[Dict[str, float]]]:
+    """
+    Google Geocoding API 호출
+    
+    Returns:
+        (status, 좌표 또는 None) - status는 Google 응답 상태 ("OK", "ZERO_RESULTS" 등)
+                                  또는 요청 실패 시 "ERROR" (캐시하지 않음)
+    """
     params = {
         "address": query,
         "key": GOOGLE_API_KEY,
-        "language": "ko"
+        "language": GEOCODING_LANGUAGE
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(GEOCODING_URL, params=params, timeout=10)
-            data = response.json()
-
-            print(f"🔍 Google API Status: {data.get('status')}")
-            
-            # 상태 체크
-            if data.get("status") != "OK":
-                print(f"❌ Google API Error: {data.get('status')} - {data.get('error_message', 'No message')}")
-                return None
-
-            # results 존재 확인
-            results = data.get("results", [])
-            if not results:
-                print(f"❌ No results for: {query}")
-                return None
-
-            # 안전한 접근
-            location = results[0].get("geometry", {}).get("location", {})
-            
-            if not location or "lat" not in location or "lng" not in location:
-                print(f"❌ Invalid location data: {query}")
-                return None
-
-            print(f"✅ Found coords: lat={location['lat']}, lng={location['lng']}")
-            return {
-                "latitude": location["lat"],
-                "longitude": location["lng"]
-            }
+        # 🚀 공유 클라이언트 (keep-alive 연결 재사용)
+        response = await google_geocoding_http.get(GEOCODING_URL, params=params)
+        data = response.json()
+
+        print(f"🔍 Google API Status: {data.get('status')}")
+        
+        # 상태 체크
+        if data.get("status") != "OK":
+            print(f"❌ Google API Error: {data.get('status')} - {data.get('error_message', 'No message')}")
+            return data.get("status") or "ERROR", None
+
+        # results 존재 확인
+        results = data.get("results", [])
+        if not results:
+            print(f"❌ No results for: {query}")
+            return "ZERO_RESULTS", None
+
+        # 안전한 접근
+        location = results[0].get("geometry", {}).get("location", {})
+        
+        if not location or "lat" not in location or "lng" not in location:
+            print(f"❌ Invalid location data: {query}")
+            return "ERROR", None
+
+        print(f"✅ Found coords: lat={location['lat']}, lng={location['lng']}")
+        return "OK", {
+            "latitude": location["lat"],
+            "longitude": location["lng"]
+        }
     
     except httpx.TimeoutException:
         print(f"❌ Google API Timeout for: {query}")
-        return None
+        return "ERROR", None
     except Exception as e:
         print(f"❌ Google API Exception: {type(e).__name__} - {e}")
         import traceback
         traceback.print_exc()
-        return None
+        return "ERROR", None
 
 
 @router.get("/location", response_model=Dict[str, Any])
@@ -122,4 +148,10 @@ async def search_location_endpoint(
         "latitude": coords["latitude"],
         "longitude": coords["longitude"],
         "message": f"'{query}' 좌표 조회 성공"
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/location/cache-stats")
+async def get_geocode_cache_stats():
+    """지오코딩 캐시 통계 (히트율 / 네거티브 히트 / 합쳐진 요청 수)"""
+    return geocode_cache.stats()
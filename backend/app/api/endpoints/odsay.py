@@ -2,13 +2,24 @@
 ODsay API 대중교통 경로 검색
 ODsay API를 사용한 출발지-도착지 간 대중교통 경로 검색 및 폴리라인 생성
 """
-import requests
+import asyncio
+import httpx
 import os
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional, Tuple, Union
 import traceback
 
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.core.http_client import odsay_http
+from app.database.connection import get_db
+from app.models.destination import Destination
+from app.models.schedule import Schedule
+from app.services.route_cache import route_cache
+from app.utils.polyline import encode_polyline
+
 # 환경 변수에서 ODSAY_API_KEY를 불러옵니다.
 ODSAY_API_KEY = os.getenv("ODSAY_API_KEY") 
 ODSAY_URL = "https://api.odsay.com/v1/api/searchPubTransPathT?lang=1"
@@ -47,6 +58,39 @@ class RouteResponse(BaseModel):
     subPath: List[Dict[str, Any]] = Field(..., description="경로 단계별 상세 정보")
     fullData: Dict[str, Any] = Field(..., description="ODSAY API 원본 응답 데이터 전체")
 
+class EncodedSegmentPath(BaseModel):
+    """구간별 폴리라인 (Google encoded polyline 문자열)"""
+    trafficType: int                     # 1: 지하철, 2: 버스, 3: 도보
+    polyline: str
+
+class SlimRouteResponse(BaseModel):
+    """경로 검색 응답 - slim 모드 (fullData 제외 + 좌표는 encoded polyline)"""
+    segmentedPath: List[EncodedSegmentPath] = Field(..., description="구간별 교통수단 타입과 encoded polyline")
+    totalTime: int = Field(..., description="총 소요 시간 (분)")
+    fare: int = Field(..., description="요금 (원)")
+    subPath: List[Dict[str, Any]] = Field(..., description="경로 단계별 상세 정보")
+
+class ItineraryLeg(BaseModel):
+    """일정의 한 구간 (목적지 → 다음 목적지)"""
+    fromDestinationId: int
+    toDestinationId: int
+    fromName: str
+    toName: str
+    totalTime: int = Field(0, description="구간 소요 시간 (분)")
+    fare: int = Field(0, description="구간 요금 (원)")
+    segmentedPath: List[EncodedSegmentPath] = Field(default_factory=list, description="구간별 encoded polyline")
+    error: Optional[str] = Field(None, description="경로 검색 실패 사유 (실패한 구간만)")
+
+class ItineraryResponse(BaseModel):
+    """일정 전체 경로 응답"""
+    schedule_id: int
+    polyline: str = Field(..., description="전체 경로 encoded polyline (성공한 구간만 이어 붙임)")
+    totalTime: int = Field(..., description="총 소요 시간 (분, 성공한 구간 합계)")
+    totalFare: int = Field(..., description="총 요금 (원, 성공한 구간 합계)")
+    legs: List[ItineraryLeg]
+    failedLegs: int = Field(0, description="경로 검색에 실패한 구간 수")
+    skippedDestinations: List[int] = Field(default_factory=list, description="좌표가 없어 제외된 destination_id")
+
 # ----------------------------------------------------
 # 도보/대중교통 영문 변환 로직
 # ----------------------------------------------------
@@ -76,16 +120,175 @@ def convert_to_english(sub_path: Dict[str, Any]) -> None:
     else:
         sub_path['sectionTimeText'] = f"{time_min} min"
 
+# ----------------------------------------------------
+# ODsay 호출 / 경로 가공
+# ----------------------------------------------------
+
+async def fetch_route_data(start_lat: float, start_lng: float, end_lat: float, end_lng: float) -> Dict[str, Any]:
+    """
+    ODsay API 호출 → 검증된 원본 응답 (route_cache 저장 대상)
+    
+    Raises:
+        HTTPException 404: 경로를 찾을 수 없음 (ODsay error / path 없음)
+        HTTPException 503: 외부 API 연결 실패
+    """
+    params = {
+        'apiKey': ODSAY_API_KEY, 
+        'SX': start_lng,
+        'SY': start_lat,
+        'EX': end_lng,
+        'EY': end_lat,
+        'CID': 1000,
+        'output': 'json'
+    }
+
+    try:
+        print(f"🚀 ODsay API 호출: start=({start_lat},{start_lng}), end=({end_lat},{end_lng})")
+        
+        # 🚀 공유 비동기 클라이언트 (이벤트 루프를 막지 않음 + keep-alive)
+        response = await odsay_http.get(ODSAY_URL, params=params)
+        response.raise_for_status()
+        data: Dict[str, Any] = response.json()
+        
+        print(f"📦 ODsay API 응답 status: {response.status_code}")
+
+    except httpx.HTTPStatusError as e:
+        print(f"❌ HTTP 에러: {e.response.status_code}")
+        raise HTTPException(
+            status_code=e.response.status_code, 
+            detail=f"외부 API 통신 오류: HTTP {e.response.status_code}"
+        )
+    
+    except httpx.RequestError as e:
+        print(f"❌ 요청 에러: {e}")
+        raise HTTPException(
+            status_code=503, 
+            detail="외부 경로 API와의 연결에 실패했습니다. (Timeout 등)"
+        )
+
+    # error 체크 (dict 또는 list일 수 있음)
+    if data.get('error'):
+        error = data['error']
+        
+        # error의 타입에 따라 다르게 처리
+        if isinstance(error, dict):
+            error_msg = error.get('message', 'Unknown error')
+        elif isinstance(error, list) and len(error) > 0:
+            error_msg = str(error[0])
+        else:
+            error_msg = str(error)
+        
+        print(f"❌ ODsay API Error: {error_msg}")
+        raise HTTPException(
+            status_code=404, 
+            detail=f"ODsay 경로 검색 실패: {error_msg}"
+        )
+
+    # result 및 path 존재 확인
+    if not data.get('result') or not data['result'].get('path'):
+        print("❌ ODsay: 경로 없음")
+        raise HTTPException(
+            status_code=404, 
+            detail="출발지/도착지 사이의 유효한 경로를 찾을 수 없습니다."
+        )
+
+    return data
+
+
+async def get_route_data(start_lat: float, start_lng: float, end_lat: float, end_lng: float) -> Dict[str, Any]:
+    """🚀 경로 캐시 우선 (약 50m 격자 양자화 + single-flight), 미스면 ODsay 호출"""
+    return await route_cache.get_or_fetch(
+        start_lat, start_lng, end_lat, end_lng,
+        lambda: fetch_route_data(start_lat, start_lng, end_lat, end_lng)
+    )
+
+
+def build_segments(
+    sub_paths: List[Dict[str, Any]],
+    start_lat: float,
+    start_lng: float
+) -> List[Tuple[int, List[Tuple[float, float]]]]:
+    """
+    subPath → 구간별 (trafficType, [(lat, lng), ...])
+    
+    각 구간은 이전 구간의 마지막 좌표에서 시작합니다. (첫 구간은 출발지)
+    """
+    segments: List[Tuple[int, List[Tuple[float, float]]]] = []
+    current_segment_coords: List[Tuple[float, float]] = [(start_lat, start_lng)]
+
+    for idx, sub_path in enumerate(sub_paths):
+        traffic_type = sub_path.get('trafficType', 3)
+        segment_coords = []
+
+        # 이전 구간의 마지막 좌표를 현재 구간의 시작점으로
+        if current_segment_coords:
+            segment_coords.append(current_segment_coords[-1])
+
+        # 안전한 stations 접근
+        pass_stop_list = sub_path.get('passStopList')
+        if pass_stop_list:
+            stations = pass_stop_list.get('stations')
+            
+            # stations가 리스트인 경우 (정상)
+            if stations and isinstance(stations, list):
+                for station in stations:
+                    if isinstance(station, dict):
+                        lat = station.get('y')
+                        lng = station.get('x')
+                        if lat is not None and lng is not None:
+                            segment_coords.append((float(lat), float(lng)))
+                    else:
+                        print(f"⚠️ 구간 {idx}: station이 dict가 아님 - {type(station)}")
+            
+            # stations가 딕셔너리인 경우 (예외)
+            elif stations and isinstance(stations, dict):
+                print(f"⚠️ 구간 {idx}: stations가 dict임 (list 기대) - keys: {list(stations.keys())}")
+                # 필요시 딕셔너리 처리 로직 추가
+            
+            # stations가 다른 타입인 경우
+            elif stations:
+                print(f"⚠️ 구간 {idx}: stations 타입 불명 - {type(stations)}")
+
+        # 안전한 endX/endY 접근
+        end_x = sub_path.get('endX')
+        end_y = sub_path.get('endY')
+        if end_x is not None and end_y is not None:
+            segment_coords.append((float(end_y), float(end_x)))
+
+        # 유효한 세그먼트만 추가 (좌표가 2개 이상)
+        if len(segment_coords) > 1:
+            segments.append((traffic_type, segment_coords))
+            print(f"  ✓ 구간 {idx}: {len(segment_coords)}개 좌표")
+
+        current_segment_coords = segment_coords
+
+    return segments
+
+
+def summarize_route(data: Dict[str, Any]) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """첫 번째 경로 → (총 소요 시간, 요금, 영문 변환된 subPath)"""
+    path_result = data['result']['path'][0]
+
+    total_time = path_result.get('info', {}).get('totalTime', 0)
+    fare = path_result.get('info', {}).get('payment', 0)
+    sub_paths = path_result.get('subPath', [])
+
+    for sub_path in sub_paths:
+        convert_to_english(sub_path)
+
+    return total_time, fare, sub_paths
+
 # ----------------------------------------------------
 # 경로 검색 엔드포인트
 # ----------------------------------------------------
 
-@router.post("/search/route", response_model=RouteResponse)
-async def search_route(request: RouteRequest):
+@router.post("/search/route", response_model=Union[RouteResponse, SlimRouteResponse])
+async def search_route(request: RouteRequest, slim: bool = False):
     """
     POST /api/search/route
     
     ODsay API를 호출하고 구간별 폴리라인, 상세 경로 정보를 반환합니다.
+    (🚀 출발/도착 좌표 약 50m 격자 기준 경로 캐시 사용)
     
     Args:
         request: RouteRequest {
@@ -94,6 +297,7 @@ async def search_route(request: RouteRequest):
             endLat: 도착지 위도,
             endLng: 도착지 경도
         }
+        slim (query): True면 fullData를 빼고 segmentedPath를 encoded polyline으로 반환
         
     Returns:
         RouteResponse {
@@ -103,6 +307,10 @@ async def search_route(request: RouteRequest):
             subPath: 경로 상세 정보,
             fullData: ODsay API 원본 응답
         }
+        slim=True면 SlimRouteResponse {
+            segmentedPath: [{trafficType, polyline}],
+            totalTime, fare, subPath
+        }
         
     Raises:
         HTTPException 500: ODSAY_API_KEY가 설정되지 않음
@@ -117,145 +325,182 @@ async def search_route(request: RouteRequest):
             detail="서버 환경 설정 오류: ODSAY_API_KEY가 설정되지 않았습니다."
         )
 
-    params = {
-        'apiKey': ODSAY_API_KEY, 
-        'SX': request.startLng,
-        'SY': request.startLat,
-        'EX': request.endLng,
-        'EY': request.endLat,
-        'CID': 1000,
-        'output': 'json'
-    }
-
     try:
-        print(f"🚀 ODsay API 호출: start=({request.startLat},{request.startLng}), end=({request.endLat},{request.endLng})")
-        
-        response = requests.get(ODSAY_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data: Dict[str, Any] = response.json()
-        
-        print(f"📦 ODsay API 응답 status: {response.status_code}")
-
-        # error 체크 (dict 또는 list일 수 있음)
-        if data.get('error'):
-            error = data['error']
-            
-            # error의 타입에 따라 다르게 처리
-            if isinstance(error, dict):
-                error_msg = error.get('message', 'Unknown error')
-            elif isinstance(error, list) and len(error) > 0:
-                error_msg = str(error[0])
-            else:
-                error_msg = str(error)
-            
-            print(f"❌ ODsay API Error: {error_msg}")
-            raise HTTPException(
-                status_code=404, 
-                detail=f"ODsay 경로 검색 실패: {error_msg}"
-            )
-
-        # result 및 path 존재 확인
-        if not data.get('result') or not data['result'].get('path'):
-            print("❌ ODsay: 경로 없음")
-            raise HTTPException(
-                status_code=404, 
-                detail="출발지/도착지 사이의 유효한 경로를 찾을 수 없습니다."
-            )
+        data = await get_route_data(request.startLat, request.startLng, request.endLat, request.endLng)
 
-        # 첫 번째 경로 선택
-        path_result = data['result']['path'][0]
-
-        # 1. 핵심 정보 추출
-        total_time = path_result.get('info', {}).get('totalTime', 0)
-        fare = path_result.get('info', {}).get('payment', 0)
-        sub_paths = path_result.get('subPath', [])
+        # 1. 핵심 정보 추출 + subPath 항목 영문 변환
+        total_time, fare, sub_paths = summarize_route(data)
         
         print(f"✅ 경로 찾음: {len(sub_paths)}개 구간, {total_time}분, {fare}원")
 
-        # 2. subPath 항목 영문 변환
-        for sub_path in sub_paths:
-            convert_to_english(sub_path)
-
-        # 3. 폴리라인 좌표 추출 및 세그먼트 생성
-        segmented_paths: List[SegmentPath] = []
-        current_segment_coords: List[PathNode] = [
-            PathNode(lat=request.startLat, lng=request.startLng)
-        ]
-
-        for idx, sub_path in enumerate(sub_paths):
-            traffic_type = sub_path.get('trafficType', 3)
-            segment_coords = []
-
-            # 이전 구간의 마지막 좌표를 현재 구간의 시작점으로
-            if current_segment_coords:
-                segment_coords.append(current_segment_coords[-1])
-
-            # 안전한 stations 접근
-            pass_stop_list = sub_path.get('passStopList')
-            if pass_stop_list:
-                stations = pass_stop_list.get('stations')
-                
-                # stations가 리스트인 경우 (정상)
-                if stations and isinstance(stations, list):
-                    for station in stations:
-                        if isinstance(station, dict):
-                            lat = station.get('y')
-                            lng = station.get('x')
-                            if lat is not None and lng is not None:
-                                segment_coords.append(PathNode(lat=lat, lng=lng))
-                        else:
-                            print(f"⚠️ 구간 {idx}: station이 dict가 아님 - {type(station)}")
-                
-                # stations가 딕셔너리인 경우 (예외)
-                elif stations and isinstance(stations, dict):
-                    print(f"⚠️ 구간 {idx}: stations가 dict임 (list 기대) - keys: {list(stations.keys())}")
-                    # 필요시 딕셔너리 처리 로직 추가
-                
-                # stations가 다른 타입인 경우
-                elif stations:
-                    print(f"⚠️ 구간 {idx}: stations 타입 불명 - {type(stations)}")
-
-            # 안전한 endX/endY 접근
-            end_x = sub_path.get('endX')
-            end_y = sub_path.get('endY')
-            if end_x is not None and end_y is not None:
-                segment_coords.append(PathNode(lat=end_y, lng=end_x))
-
-            # 유효한 세그먼트만 추가 (좌표가 2개 이상)
-            if len(segment_coords) > 1:
-                segmented_paths.append(SegmentPath(
-                    trafficType=traffic_type,
-                    coordinates=segment_coords
-                ))
-                print(f"  ✓ 구간 {idx}: {len(segment_coords)}개 좌표")
+        # 2. 폴리라인 좌표 추출 및 세그먼트 생성
+        segments = build_segments(sub_paths, request.startLat, request.startLng)
 
-            current_segment_coords = segment_coords
+        # 3. 최종 응답 반환
+        if slim:
+            return SlimRouteResponse(
+                segmentedPath=[
+                    EncodedSegmentPath(trafficType=traffic_type, polyline=encode_polyline(coords))
+                    for traffic_type, coords in segments
+                ],
+                totalTime=total_time,
+                fare=fare,
+                subPath=sub_paths
+            )
 
-        # 4. 최종 응답 반환
         return RouteResponse(
-            segmentedPath=segmented_paths,
+            segmentedPath=[
+                SegmentPath(
+                    trafficType=traffic_type,
+                    coordinates=[PathNode(lat=lat, lng=lng) for lat, lng in coords]
+                )
+                for traffic_type, coords in segments
+            ],
             totalTime=total_time,
             fare=fare,
             subPath=sub_paths,
             fullData=data
         )
-
-    except requests.exceptions.HTTPError as e:
-        print(f"❌ HTTP 에러: {e.response.status_code}")
+    
+    except HTTPException:
+        # 이미 발생한 HTTPException은 그대로 재발생
+        raise
+    
+    except Exception as e:
+        print(f"❌ 서버 내부 오류: {type(e).__name__} - {e}")
+        traceback.print_exc()
         raise HTTPException(
-            status_code=e.response.status_code, 
-            detail=f"외부 API 통신 오류: HTTP {e.response.status_code}"
+            status_code=500, 
+            detail=f"경로 데이터 처리 중 알 수 없는 서버 오류가 발생했습니다."
         )
+
+
+# ----------------------------------------------------
+# 일정 전체 경로 (여러 목적지) 엔드포인트
+# ----------------------------------------------------
+
+async def _route_leg(
+    origin: Destination,
+    destination: Destination,
+    semaphore: asyncio.Semaphore
+) -> Tuple[ItineraryLeg, List[Tuple[float, float]]]:
+    """
+    구간 1개 경로 (경로 캐시 사용)
     
-    except requests.exceptions.RequestException as e:
-        print(f"❌ 요청 에러: {e}")
+    Returns:
+        (구간 결과, 구간 전체 좌표) - 실패해도 예외 대신 error 필드 + 빈 좌표로 반환
+    """
+    leg = ItineraryLeg(
+        fromDestinationId=origin.destination_id,
+        toDestinationId=destination.destination_id,
+        fromName=origin.name,
+        toName=destination.name,
+    )
+    start_lat, start_lng = float(origin.latitude), float(origin.longitude)
+
+    try:
+        async with semaphore:
+            data = await get_route_data(start_lat, start_lng, float(destination.latitude), float(destination.longitude))
+        total_time, fare, sub_paths = summarize_route(data)
+        segments = build_segments(sub_paths, start_lat, start_lng)
+    except HTTPException as e:
+        leg.error = str(e.detail)
+        return leg, []
+    except Exception as e:
+        # 캐시/응답 형식 오류도 이 구간만 실패로 처리 (gather 전체가 실패하지 않도록)
+        print(f"❌ 구간 경로 처리 오류 ({origin.destination_id} → {destination.destination_id}): {type(e).__name__} - {e}")
+        leg.error = "경로 데이터 처리 중 오류가 발생했습니다."
+        return leg, []
+
+    leg.totalTime = total_time
+    leg.fare = fare
+    leg.segmentedPath = [
+        EncodedSegmentPath(trafficType=traffic_type, polyline=encode_polyline(coords))
+        for traffic_type, coords in segments
+    ]
+    return leg, [point for _, coords in segments for point in coords]
+
+
+@router.get("/search/itinerary/{schedule_id}", response_model=ItineraryResponse)
+async def search_itinerary(
+    schedule_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /api/search/itinerary/{schedule_id}
+    
+    일정의 목적지들(visit_order 순)을 잇는 전체 대중교통 경로를 한 번에 반환합니다.
+    클라이언트가 /api/search/route를 N-1번 순서대로 호출하는 대신
+    모든 구간을 동시에(최대 ITINERARY_MAX_CONCURRENT_LEGS개) 경로 캐시를 통해 조회합니다.
+    
+    Returns:
+        ItineraryResponse {
+            polyline: 전체 경로 encoded polyline,
+            totalTime: 총 소요 시간 (분),
+            totalFare: 총 요금 (원),
+            legs: 구간별 결과 (실패한 구간은 error),
+            skippedDestinations: 좌표가 없는 목적지
+        }
+        
+    Raises:
+        HTTPException 500: ODSAY_API_KEY가 설정되지 않음
+        HTTPException 404: 일정을 찾을 수 없음
+    """
+    
+    if not ODSAY_API_KEY:
+        print("❌ ODSAY_API_KEY not set")
         raise HTTPException(
-            status_code=503, 
-            detail="외부 경로 API와의 연결에 실패했습니다. (Timeout 등)"
+            status_code=500, 
+            detail="서버 환경 설정 오류: ODSAY_API_KEY가 설정되지 않았습니다."
+        )
+
+    schedule = db.query(Schedule).filter(
+        Schedule.schedule_id == schedule_id,
+        Schedule.user_id == current_user['user_id']
+    ).first()
+
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+
+    try:
+        destinations = db.query(Destination).filter(
+            Destination.schedule_id == schedule_id
+        ).order_by(Destination.visit_order, Destination.destination_id).all()
+
+        # 좌표가 있는 목적지만 경로에 포함
+        stops = [d for d in destinations if d.latitude is not None and d.longitude is not None]
+        skipped = [d.destination_id for d in destinations if d.latitude is None or d.longitude is None]
+
+        # 🚀 모든 구간 동시 조회 (동시 실행 수 제한)
+        semaphore = asyncio.Semaphore(settings.ITINERARY_MAX_CONCURRENT_LEGS)
+        results = await asyncio.gather(*[
+            _route_leg(origin, destination, semaphore)
+            for origin, destination in zip(stops, stops[1:])
+        ])
+        legs = [leg for leg, _ in results]
+
+        # 전체 폴리라인 (구간 경계의 중복 좌표 제거)
+        path: List[Tuple[float, float]] = []
+        for _, coords in results:
+            for point in coords:
+                if not path or path[-1] != point:
+                    path.append(point)
+
+        ok_legs = [leg for leg in legs if leg.error is None]
+        print(f"✅ 일정 경로: schedule_id={schedule_id}, 구간 {len(legs)}개 (실패 {len(legs) - len(ok_legs)}개)")
+
+        return ItineraryResponse(
+            schedule_id=schedule_id,
+            polyline=encode_polyline(path),
+            totalTime=sum(leg.totalTime for leg in ok_legs),
+            totalFare=sum(leg.fare for leg in ok_legs),
+            legs=legs,
+            failedLegs=len(legs) - len(ok_legs),
+            skippedDestinations=skipped
         )
     
     except HTTPException:
-        # 이미 발생한 HTTPException은 그대로 재발생
         raise
     
     except Exception as e:
@@ -263,5 +508,11 @@ async def search_route(request: RouteRequest):
         traceback.print_exc()
         raise HTTPException(
             status_code=500, 
-            detail=f"경로 데이터 처리 중 알 수 없는 서버 오류가 발생했습니다."
-        )
\ No newline at end of file
+            detail="일정 경로 처리 중 알 수 없는 서버 오류가 발생했습니다."
+        )
+
+
+@router.get("/search/route/cache-stats")
+async def get_route_cache_stats():
+    """경로 캐시 통계 (히트율 / 합쳐진 요청 수 / ODsay 호출 수)"""
+    return route_cache.stats()
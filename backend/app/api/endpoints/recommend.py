@@ -3,6 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.database.connection import get_db
 from app.models.bookmark import Bookmark
 from app.core.qdrant_client import get_qdrant_client
@@ -13,142 +14,134 @@ from app.schemas.recommend_schema import (
 )
 from app.schemas.bookmarkschema import PlaceType
 
-# ✅ 원본 테이블 모델 import
-from app.models.kcontent import KContent
-from app.models.restaurant import Restaurant
-# from app.models.attraction import Attraction  # 필요시 주석 해제
-from app.models.festival import Festival
+# ✅ 원본 테이블 일괄 조회 / 추천 엔진
+from app.services.place_hydration import hydrate_places
+from app.services.recommend_engine import BookmarkRecommender, PLACE_TYPE_COLLECTION_MAP
+from app.services.taste_profile import TasteProfileService
 
 router = APIRouter(prefix="/recommand", tags=["recommand"])
 
-PLACE_TYPE_COLLECTION_MAP = {
-    PlaceType.RESTAURANT: "seoul-restaurant",
-    PlaceType.FESTIVAL: "seoul-festival",
-    # PlaceType.ATTRACTION: "seoul-attraction",
-    PlaceType.KCONTENT: "seoul-kcontents",
-}
 
 
 ############################################################
 # 🔧 Helper Function: 원본 테이블에서 데이터 가져오기
 ############################################################
-def fetch_original_data(db: Session, place_type: int, reference_id: int):
+def format_original_data(place_type: int, item):
     """
-    place_type과 reference_id로 원본 테이블에서 완전한 데이터 조회
+    원본 테이블 ORM 객체 → 응답용 dict
     
     Returns:
         dict: 원본 데이터 (name, address, image_url, latitude, longitude 등)
     """
-    try:
-        if place_type == PlaceType.KCONTENT:
-            # ✅ K-콘텐츠 테이블 (정확한 컬럼명 사용)
-            item = db.query(KContent).filter(KContent.content_id == reference_id).first()
-            if item:
-                # ✅ 실제 컬럼명 확인
-                # drama_name_en, location_name_en, address_en, category_en, keyword_en, trip_tip_en
-                
-                # 이미지 URL 처리
-                image_url = None
-                if hasattr(item, 'thumbnail') and item.thumbnail:
-                    image_url = item.thumbnail
-                elif hasattr(item, 'image_url') and item.image_url:
-                    image_url = item.image_url
-                elif hasattr(item, 'image_url_list') and item.image_url_list:
-                    # image_url_list가 리스트나 JSON 형태인 경우
-                    if isinstance(item.image_url_list, list) and len(item.image_url_list) > 0:
-                        image_url = item.image_url_list[0]
-                    elif isinstance(item.image_url_list, str):
-                        # JSON 문자열인 경우 파싱 시도
-                        import json
-                        try:
-                            url_list = json.loads(item.image_url_list)
-                            if url_list and len(url_list) > 0:
-                                image_url = url_list[0]
-                        except:
-                            pass
-                
-                return {
-                    "name": item.location_name_en or item.location_name or item.drama_name_en or "Unknown",
-                    "address": item.address_en or item.address or "",
-                    "image_url": image_url,
-                    "latitude": float(item.latitude) if item.latitude else None,
-                    "longitude": float(item.longitude) if item.longitude else None,
-                    "category": item.category_en or item.category or "",
-                    "extra": {
-                        "content_id": item.content_id,
-                        "drama_name_en": item.drama_name_en,
-                        "location_name_en": item.location_name_en,
-                        "address_en": item.address_en,
-                        "category_en": item.category_en,
-                        "keyword_en": item.keyword_en,
-                        "trip_tip_en": item.trip_tip_en,
-                        "latitude": float(item.latitude) if item.latitude else None,
-                        "longitude": float(item.longitude) if item.longitude else None,
-                    }
-                }
-        
-        elif place_type == PlaceType.RESTAURANT:
-            # ✅ 음식점 테이블
-            item = db.query(Restaurant).filter(Restaurant.restaurant_id == reference_id).first()
-            if item:
-                return {
-                    "name": item.restaurant_name or item.name or "Unknown",
-                    "address": item.address or "",
-                    "image_url": item.image_url,
-                    "latitude": float(item.latitude) if item.latitude else None,
-                    "longitude": float(item.longitude) if item.longitude else None,
-                    "category": getattr(item, 'category', None) or "",
-                    "extra": {
-                        "restaurant_id": item.restaurant_id,
-                        "restaurant_name": item.restaurant_name,
-                        "cuisine_type": getattr(item, 'cuisine_type', None),
-                        "address": item.address,
-                    }
-                }
+    if place_type == PlaceType.KCONTENT:
+        # ✅ K-콘텐츠 테이블 (정확한 컬럼명 사용)
+        # drama_name_en, location_name_en, address_en, category_en, keyword_en, trip_tip_en
         
-        # elif place_type == PlaceType.ATTRACTION:
-        #     # ✅ 명소 테이블 (필요시 활성화)
-        #     item = db.query(Attraction).filter(Attraction.attraction_id == reference_id).first()
-        #     if item:
-        #         return {
-        #             "name": item.name or item.title or "Unknown",
-        #             "address": item.address or "",
-        #             "image_url": item.image_url,
-        #             "latitude": float(item.latitude) if item.latitude else None,
-        #             "longitude": float(item.longitude) if item.longitude else None,
-        #             "category": getattr(item, 'category', None) or "",
-        #             "extra": {
-        #                 "attraction_id": item.attraction_id,
-        #                 "name": item.name,
-        #             }
-        #         }
+        # 이미지 URL 처리
+        image_url = None
+        if hasattr(item, 'thumbnail') and item.thumbnail:
+            image_url = item.thumbnail
+        elif hasattr(item, 'image_url') and item.image_url:
+            image_url = item.image_url
+        elif hasattr(item, 'image_url_list') and item.image_url_list:
+            # image_url_list가 리스트나 JSON 형태인 경우
+            if isinstance(item.image_url_list, list) and len(item.image_url_list) > 0:
+                image_url = item.image_url_list[0]
+            elif isinstance(item.image_url_list, str):
+                # JSON 문자열인 경우 파싱 시도
+                import json
+                try:
+                    url_list = json.loads(item.image_url_list)
+                    if url_list and len(url_list) > 0:
+                        image_url = url_list[0]
+                except:
+                    pass
         
-        elif place_type == PlaceType.FESTIVAL:
-            # ✅ 축제 테이블
-            item = db.query(Festival).filter(Festival.festival_id == reference_id).first()
-            if item:
-                return {
-                    "name": item.festival_name or getattr(item, 'title', None) or "Unknown",
-                    "address": getattr(item, 'address', None) or "",
-                    "image_url": getattr(item, 'image_url', None),
-                    "latitude": float(item.latitude) if hasattr(item, 'latitude') and item.latitude else None,
-                    "longitude": float(item.longitude) if hasattr(item, 'longitude') and item.longitude else None,
-                    "category": "festival",
-                    "extra": {
-                        "festival_id": item.festival_id,
-                        "festival_name": item.festival_name,
-                        "start_date": str(item.start_date) if hasattr(item, 'start_date') and item.start_date else None,
-                        "end_date": str(item.end_date) if hasattr(item, 'end_date') and item.end_date else None,
-                    }
-                }
-        
-        return None
+        return {
+            "name": item.location_name_en or item.location_name or item.drama_name_en or "Unknown",
+            "address": item.address_en or item.address or "",
+            "image_url": image_url,
+            "latitude": float(item.latitude) if item.latitude else None,
+            "longitude": float(item.longitude) if item.longitude else None,
+            "category": item.category_en or item.category or "",
+            "extra": {
+                "content_id": item.content_id,
+                "drama_name_en": item.drama_name_en,
+                "location_name_en": item.location_name_en,
+                "address_en": item.address_en,
+                "category_en": item.category_en,
+                "keyword_en": item.keyword_en,
+                "trip_tip_en": item.trip_tip_en,
+                "latitude": float(item.latitude) if item.latitude else None,
+                "longitude": float(item.longitude) if item.longitude else None,
+            }
+        }
+    
+    elif place_type == PlaceType.RESTAURANT:
+        # ✅ 음식점 테이블
+        return {
+            "name": item.restaurant_name or item.name or "Unknown",
+            "address": item.address or "",
+            "image_url": item.image_url,
+            "latitude": float(item.latitude) if item.latitude else None,
+            "longitude": float(item.longitude) if item.longitude else None,
+            "category": getattr(item, 'category', None) or "",
+            "extra": {
+                "restaurant_id": item.restaurant_id,
+                "restaurant_name": item.restaurant_name,
+                "cuisine_type": getattr(item, 'cuisine_type', None),
+                "address": item.address,
+            }
+        }
     
-    except Exception as e:
-        print(f"❌ 원본 데이터 조회 실패 (place_type={place_type}, reference_id={reference_id}): {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+    # elif place_type == PlaceType.ATTRACTION:
+    #     # ✅ 명소 테이블 (필요시 활성화 - place_hydration.PLACE_MODELS에도 추가)
+    #     return {
+    #         "name": item.name or item.title or "Unknown",
+    #         "address": item.address or "",
+    #         "image_url": item.image_url,
+    #         "latitude": float(item.latitude) if item.latitude else None,
+    #         "longitude": float(item.longitude) if item.longitude else None,
+    #         "category": getattr(item, 'category', None) or "",
+    #         "extra": {
+    #             "attraction_id": item.attraction_id,
+    #             "name": item.name,
+    #         }
+    #     }
+    
+    elif place_type == PlaceType.FESTIVAL:
+        # ✅ 축제 테이블
+        return {
+            "name": item.festival_name or getattr(item, 'title', None) or "Unknown",
+            "address": getattr(item, 'address', None) or "",
+            "image_url": getattr(item, 'image_url', None),
+            "latitude": float(item.latitude) if hasattr(item, 'latitude') and item.latitude else None,
+            "longitude": float(item.longitude) if hasattr(item, 'longitude') and item.longitude else None,
+            "category": "festival",
+            "extra": {
+                "festival_id": item.festival_id,
+                "festival_name": item.festival_name,
+                "start_date": str(item.start_date) if hasattr(item, 'start_date') and item.start_date else None,
+                "end_date": str(item.end_date) if hasattr(item, 'end_date') and item.end_date else None,
+            }
+        }
+    
+    return None
+
+
+def fetch_original_data_bulk(db: Session, keys):
+    """
+    🚀 (place_type, reference_id) 목록을 테이블당 IN 쿼리 1번으로 조회
+    
+    Returns:
+        dict: {(place_type, reference_id): 원본 데이터}
+    """
+    return hydrate_places(db, keys, format_original_data)
+
+
+def fetch_original_data(db: Session, place_type: int, reference_id: int):
+    """place_type과 reference_id로 원본 테이블에서 완전한 데이터 조회 (단건)"""
+    return fetch_original_data_bulk(db, [(place_type, reference_id)]).get((place_type, reference_id))
 
 
 ############################################################
@@ -181,75 +174,65 @@ def recommend_from_bookmarks(
 
     client = get_qdrant_client()
     recommended_items: list[RecommendedItem] = []
-    seen_ids = set()  # 중복 제거용
 
-    for b in bookmarks:
-        collection_name = PLACE_TYPE_COLLECTION_MAP.get(b.place_type)
-        if not collection_name:
-            continue
-
-        # 2) Qdrant에서 유사 콘텐츠 추천
+    # 2) Qdrant에서 유사 콘텐츠 추천
+    #    - 취향 벡터가 있으면 centroid로 벡터 검색 1번
+    #    - 없거나 실패하면 북마크별 추천 (컬렉션당 recommend_batch 1회, 최근성 가중치 + 중복 제거)
+    hits = None
+    if settings.TASTE_PROFILE_ENABLED:
         try:
-            results = client.recommend(
-                collection_name=collection_name,
-                positive=[b.reference_id],
-                limit=req.top_k_per_bookmark,
+            hits = TasteProfileService.recommend(
+                db, client, req.user_id, bookmarks,
+                limit=req.top_k_per_bookmark * len(bookmarks),
             )
         except Exception as e:
-            print(f"Qdrant recommend 실패 (bookmark_id={b.bookmark_id}): {e}")
-            continue
+            print(f"⚠️ 취향 벡터 추천 실패, 북마크별 추천으로 fallback: {e}")
+    if hits is None:
+        hits = BookmarkRecommender.recommend(client, bookmarks, PLACE_TYPE_COLLECTION_MAP, req.top_k_per_bookmark)
+
+    # 3) 원본 테이블에서 데이터 일괄 조회 (place_type별 IN 쿼리 1번)
+    original_map = fetch_original_data_bulk(db, [(hit.place_type, hit.reference_id) for hit in hits])
 
-        # 3) 각 추천 결과에 대해 원본 테이블에서 데이터 가져오기
-        for r in results:
-            payload = r.payload or {}
-            rec_reference_id = payload.get("content_id") or payload.get("id") or r.id
-            
-            # 중복 체크
-            unique_key = f"{b.place_type}_{rec_reference_id}"
-            if unique_key in seen_ids:
-                continue
-            seen_ids.add(unique_key)
-            
-            # ✅ 원본 테이블에서 완전한 데이터 조회
-            original_data = fetch_original_data(db, b.place_type, rec_reference_id)
-            
-            if original_data:
-                # ✅ 원본 데이터 사용 (모든 필드 포함)
-                item = RecommendedItem(
-                    place_type=b.place_type,
-                    reference_id=rec_reference_id,
-                    name=original_data["name"],
-                    address=original_data.get("address"),
-                    image_url=original_data.get("image_url"),
-                    latitude=original_data.get("latitude"),
-                    longitude=original_data.get("longitude"),
-                    score=r.score,
-                    extra=original_data.get("extra", {}),  # ✅ 모든 영어 필드 포함!
-                )
-                print(f"✅ 원본 데이터 사용: {original_data['name']} (extra 필드 개수: {len(original_data.get('extra', {}))})")
-            else:
-                # 원본 데이터 없으면 Qdrant payload 사용
-                item = RecommendedItem(
-                    place_type=b.place_type,
-                    reference_id=rec_reference_id,
-                    name=payload.get("location_name_en") or payload.get("location_name") or payload.get("name") or "Unknown",
-                    address=payload.get("address_en") or payload.get("address"),
-                    image_url=payload.get("image_url") or payload.get("thumbnail") or payload.get("image"),
-                    latitude=payload.get("latitude"),
-                    longitude=payload.get("longitude"),
-                    score=r.score,
-                    extra=payload,
-                )
-                print(f"⚠️ Qdrant payload 사용: {item.name}")
-            
-            recommended_items.append(item)
+    for hit in hits:
+        place_type, rec_reference_id = hit.place_type, hit.reference_id
+        payload = hit.payload
+        original_data = original_map.get((place_type, rec_reference_id))
+        
+        if original_data:
+            # ✅ 원본 데이터 사용 (모든 필드 포함)
+            item = RecommendedItem(
+                place_type=place_type,
+                reference_id=rec_reference_id,
+                name=original_data["name"],
+                address=original_data.get("address"),
+                image_url=original_data.get("image_url"),
+                latitude=original_data.get("latitude"),
+                longitude=original_data.get("longitude"),
+                score=hit.score,
+                extra=original_data.get("extra", {}),  # ✅ 모든 영어 필드 포함!
+            )
+            print(f"✅ 원본 데이터 사용: {original_data['name']} (extra 필드 개수: {len(original_data.get('extra', {}))})")
+        else:
+            # 원본 데이터 없으면 Qdrant payload 사용
+            item = RecommendedItem(
+                place_type=place_type,
+                reference_id=rec_reference_id,
+                name=payload.get("location_name_en") or payload.get("location_name") or payload.get("name") or "Unknown",
+                address=payload.get("address_en") or payload.get("address"),
+                image_url=payload.get("image_url") or payload.get("thumbnail") or payload.get("image"),
+                latitude=payload.get("latitude"),
+                longitude=payload.get("longitude"),
+                score=hit.score,
+                extra=payload,
+            )
+            print(f"⚠️ Qdrant payload 사용: {item.name}")
+        
+        recommended_items.append(item)
 
     if not recommended_items:
         raise HTTPException(status_code=404, detail="추천 결과를 찾지 못했습니다.")
 
-    # 점수순 정렬
-    recommended_items.sort(key=lambda x: x.score, reverse=True)
-
+    # 점수순 정렬은 TasteProfileService / BookmarkRecommender에서 처리
     print(f"✅ 총 추천 개수: {len(recommended_items)}")
     return BookmarkBasedRecommendResponse(
         user_id=req.user_id,
@@ -287,67 +270,47 @@ def recommend_from_bookmarks_atleast(
 
     client = get_qdrant_client()
     recommended_items: list[RecommendedItem] = []
-    seen_ids = set()
 
-    for b in bookmarks:
-        collection_name = PLACE_TYPE_COLLECTION_MAP.get(b.place_type)
-        if not collection_name:
-            continue
+    hits = BookmarkRecommender.recommend(client, bookmarks, PLACE_TYPE_COLLECTION_MAP, req.top_k_per_bookmark)
 
-        try:
-            results = client.recommend(
-                collection_name=collection_name,
-                positive=[b.reference_id],
-                limit=req.top_k_per_bookmark,
-            )
-        except Exception as e:
-            print(f"Qdrant recommend 실패 (bookmark_id={b.bookmark_id}): {e}")
-            continue
+    # ✅ 원본 테이블에서 데이터 일괄 조회
+    original_map = fetch_original_data_bulk(db, [(hit.place_type, hit.reference_id) for hit in hits])
 
-        for r in results:
-            payload = r.payload or {}
-            rec_reference_id = payload.get("content_id") or payload.get("id") or r.id
-            
-            unique_key = f"{b.place_type}_{rec_reference_id}"
-            if unique_key in seen_ids:
-                continue
-            seen_ids.add(unique_key)
-            
-            # ✅ 원본 테이블에서 데이터 조회
-            original_data = fetch_original_data(db, b.place_type, rec_reference_id)
-            
-            if original_data:
-                item = RecommendedItem(
-                    place_type=b.place_type,
-                    reference_id=rec_reference_id,
-                    name=original_data["name"],
-                    address=original_data.get("address"),
-                    image_url=original_data.get("image_url"),
-                    latitude=original_data.get("latitude"),
-                    longitude=original_data.get("longitude"),
-                    score=r.score,
-                    extra=original_data.get("extra", {}),
-                )
-            else:
-                item = RecommendedItem(
-                    place_type=b.place_type,
-                    reference_id=rec_reference_id,
-                    name=payload.get("location_name_en") or payload.get("name") or "Unknown",
-                    address=payload.get("address_en") or payload.get("address"),
-                    image_url=payload.get("image_url") or payload.get("thumbnail"),
-                    latitude=payload.get("latitude"),
-                    longitude=payload.get("longitude"),
-                    score=r.score,
-                    extra=payload,
-                )
-            
-            recommended_items.append(item)
+    for hit in hits:
+        place_type, rec_reference_id = hit.place_type, hit.reference_id
+        payload = hit.payload
+        original_data = original_map.get((place_type, rec_reference_id))
+        
+        if original_data:
+            item = RecommendedItem(
+                place_type=place_type,
+                reference_id=rec_reference_id,
+                name=original_data["name"],
+                address=original_data.get("address"),
+                image_url=original_data.get("image_url"),
+                latitude=original_data.get("latitude"),
+                longitude=original_data.get("longitude"),
+                score=hit.score,
+                extra=original_data.get("extra", {}),
+            )
+        else:
+            item = RecommendedItem(
+                place_type=place_type,
+                reference_id=rec_reference_id,
+                name=payload.get("location_name_en") or payload.get("name") or "Unknown",
+                address=payload.get("address_en") or payload.get("address"),
+                image_url=payload.get("image_url") or payload.get("thumbnail"),
+                latitude=payload.get("latitude"),
+                longitude=payload.get("longitude"),
+                score=hit.score,
+                extra=payload,
+            )
+        
+        recommended_items.append(item)
 
     if not recommended_items:
         raise HTTPException(status_code=404, detail="추천 결과를 찾지 못했습니다.")
 
-    recommended_items.sort(key=lambda x: x.score, reverse=True)
-
     return BookmarkBasedRecommendResponse(
         user_id=req.user_id,
         total_count=len(recommended_items),
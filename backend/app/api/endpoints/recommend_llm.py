@@ -5,24 +5,29 @@ LLM 강화 추천 엔드포인트
 기존 recommend.py의 벡터 추천에 LLM 분석을 추가
 """
 
+import asyncio
+import time
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.database.connection import get_db
 from app.models.bookmark import Bookmark
 from app.core.qdrant_client import get_qdrant_client
-from app.services.llm_recommend_service import LLMRecommendService, generate_simple_reason
+from app.services.llm_recommend_service import CANDIDATE_LIMIT, LLMRecommendService, generate_simple_reason
+from app.services.llm_rerank_cache import llm_rerank_cache
 from app.schemas.recommend_schema import (
     BookmarkBasedRecommendRequest,
     RecommendedItem,
 )
 from app.schemas.bookmarkschema import PlaceType
+from app.utils.sse import sse_event
 
-# ✅ 원본 테이블
-from app.models.kcontent import KContent
-from app.models.restaurant import Restaurant
-from app.models.festival import Festival
+# ✅ 원본 테이블 일괄 조회
+from app.services.place_hydration import hydrate_places
+from app.services.recommend_engine import PLACE_TYPE_COLLECTION_MAP, BookmarkRecommender
 
 from pydantic import BaseModel
 
@@ -67,110 +72,87 @@ class LLMRecommendResponse(BaseModel):
 # Helper: 원본 데이터 조회
 # ============================================================
 
-def fetch_original_data(db: Session, place_type: int, reference_id: int):
-    """원본 테이블에서 데이터 조회 (recommend.py와 동일)"""
-    try:
-        if place_type == PlaceType.KCONTENT:
-            item = db.query(KContent).filter(KContent.content_id == reference_id).first()
-            if not item:
-                return None
-            
-            image_url = None
-            if hasattr(item, 'thumbnail') and item.thumbnail:
-                image_url = item.thumbnail
-            elif hasattr(item, 'image_url') and item.image_url:
-                image_url = item.image_url
-            
-            return {
-                "name": item.location_name_en or item.location_name or item.drama_name_en or "Unknown",
-                "address": item.address_en or item.address or "",
-                "image_url": image_url,
-                "latitude": float(item.latitude) if item.latitude else None,
-                "longitude": float(item.longitude) if item.longitude else None,
-                "category": item.category_en or item.category or "",
-                "extra": {
-                    "content_id": item.content_id,
-                    "drama_name_en": item.drama_name_en,
-                    "location_name_en": item.location_name_en,
-                    "address_en": item.address_en,
-                    "category_en": item.category_en,
-                    "keyword_en": item.keyword_en,
-                    "trip_tip_en": item.trip_tip_en,
-                }
-            }
+def format_original_data(place_type: int, item):
+    """원본 테이블 ORM 객체 → dict (recommend.py와 동일)"""
+    if place_type == PlaceType.KCONTENT:
+        image_url = None
+        if hasattr(item, 'thumbnail') and item.thumbnail:
+            image_url = item.thumbnail
+        elif hasattr(item, 'image_url') and item.image_url:
+            image_url = item.image_url
         
-        elif place_type == PlaceType.RESTAURANT:
-            item = db.query(Restaurant).filter(Restaurant.restaurant_id == reference_id).first()
-            if not item:
-                return None
-            
-            return {
-                "name": item.restaurant_name or "Unknown",
-                "address": item.address or "",
-                "image_url": item.image_url,
-                "latitude": float(item.latitude) if item.latitude else None,
-                "longitude": float(item.longitude) if item.longitude else None,
-                "category": getattr(item, 'category', None) or "",
-                "extra": {
-                    "restaurant_id": item.restaurant_id,
-                    "restaurant_name": item.restaurant_name,
-                }
+        return {
+            "name": item.location_name_en or item.location_name or item.drama_name_en or "Unknown",
+            "address": item.address_en or item.address or "",
+            "image_url": image_url,
+            "latitude": float(item.latitude) if item.latitude else None,
+            "longitude": float(item.longitude) if item.longitude else None,
+            "category": item.category_en or item.category or "",
+            "extra": {
+                "content_id": item.content_id,
+                "drama_name_en": item.drama_name_en,
+                "location_name_en": item.location_name_en,
+                "address_en": item.address_en,
+                "category_en": item.category_en,
+                "keyword_en": item.keyword_en,
+                "trip_tip_en": item.trip_tip_en,
             }
-        
-        elif place_type == PlaceType.FESTIVAL:
-            item = db.query(Festival).filter(Festival.festival_id == reference_id).first()
-            if not item:
-                return None
-            
-            return {
-                "name": item.festival_name or "Unknown",
-                "address": getattr(item, 'address', None) or "",
-                "image_url": getattr(item, 'image_url', None),
-                "latitude": float(item.latitude) if hasattr(item, 'latitude') and item.latitude else None,
-                "longitude": float(item.longitude) if hasattr(item, 'longitude') and item.longitude else None,
-                "category": "festival",
-                "extra": {
-                    "festival_id": item.festival_id,
-                    "festival_name": item.festival_name,
-                }
+        }
+    
+    elif place_type == PlaceType.RESTAURANT:
+        return {
+            "name": item.restaurant_name or "Unknown",
+            "address": item.address or "",
+            "image_url": item.image_url,
+            "latitude": float(item.latitude) if item.latitude else None,
+            "longitude": float(item.longitude) if item.longitude else None,
+            "category": getattr(item, 'category', None) or "",
+            "extra": {
+                "restaurant_id": item.restaurant_id,
+                "restaurant_name": item.restaurant_name,
             }
-        
-        return None
+        }
     
-    except Exception as e:
-        print(f"❌ 원본 데이터 조회 실패: {e}")
-        return None
+    elif place_type == PlaceType.FESTIVAL:
+        return {
+            "name": item.festival_name or "Unknown",
+            "address": getattr(item, 'address', None) or "",
+            "image_url": getattr(item, 'image_url', None),
+            "latitude": float(item.latitude) if hasattr(item, 'latitude') and item.latitude else None,
+            "longitude": float(item.longitude) if hasattr(item, 'longitude') and item.longitude else None,
+            "category": "festival",
+            "extra": {
+                "festival_id": item.festival_id,
+                "festival_name": item.festival_name,
+            }
+        }
+    
+    return None
+
+
+def fetch_original_data_bulk(db: Session, keys):
+    """🚀 원본 데이터 일괄 조회 → {(place_type, reference_id): dict}"""
+    return hydrate_places(db, keys, format_original_data)
 
 
-PLACE_TYPE_COLLECTION_MAP = {
-    PlaceType.RESTAURANT: "seoul-restaurant",
-    PlaceType.FESTIVAL: "seoul-festival",
-    PlaceType.KCONTENT: "seoul-kcontent",
-}
+def fetch_original_data(db: Session, place_type: int, reference_id: int):
+    """원본 테이블에서 데이터 조회 (단건)"""
+    return fetch_original_data_bulk(db, [(place_type, reference_id)]).get((place_type, reference_id))
 
 
 # ============================================================
-# 1️⃣ LLM 강화 추천 (벡터 + LLM)
+# Helper: 북마크 + 벡터 추천 후보
 # ============================================================
 
-@router.post("/enhanced", response_model=LLMRecommendResponse)
-def get_llm_enhanced_recommendations(
-    req: BookmarkBasedRecommendRequest,
-    use_llm: bool = True,  # LLM 사용 여부 (비용 절약 옵션)
-    db: Session = Depends(get_db),
-):
+def _collect_candidates(req: BookmarkBasedRecommendRequest, db: Session):
     """
-    LLM 강화 추천
+    북마크 상세 + Qdrant 벡터 추천 후보 (원본 데이터 병합) 조회
     
-    1. Qdrant로 벡터 기반 유사 콘텐츠 추천 (기존 방식)
-    2. LLM으로 사용자 취향 분석 및 재정렬
-    3. 각 추천에 개인화된 이유 추가
+    /enhanced, /enhanced/stream 공용
     
-    Query Parameters:
-        use_llm (bool): LLM 사용 여부 (기본값: True)
-                        False면 간단한 규칙 기반 이유만 생성
+    Returns:
+        (bookmark_details, qdrant_recommendations) - 후보는 벡터 점수 내림차순
     """
-    
     # 1️⃣ 사용자 북마크 가져오기
     query = db.query(Bookmark).filter(Bookmark.user_id == req.user_id)
     if req.place_type is not None:
@@ -181,10 +163,11 @@ def get_llm_enhanced_recommendations(
     if not bookmarks:
         raise HTTPException(status_code=404, detail="해당 사용자의 북마크가 없습니다.")
     
-    # 북마크 상세 정보 조회 (LLM에 전달용)
+    # 북마크 상세 정보 조회 (LLM에 전달용) - 일괄 조회
+    bookmark_map = fetch_original_data_bulk(db, [(bm.place_type, bm.reference_id) for bm in bookmarks])
     bookmark_details = []
     for bm in bookmarks:
-        details = fetch_original_data(db, bm.place_type, bm.reference_id)
+        details = bookmark_map.get((bm.place_type, bm.reference_id))
         if details:
             bookmark_details.append({
                 "bookmark_id": bm.bookmark_id,
@@ -193,95 +176,105 @@ def get_llm_enhanced_recommendations(
                 **details
             })
     
-    # 2️⃣ Qdrant로 벡터 기반 추천
+    # 2️⃣ Qdrant로 벡터 기반 추천 (컬렉션당 recommend_batch 1회)
     client = get_qdrant_client()
     qdrant_recommendations = []
-    seen_ids = set()
+    candidate_hits = BookmarkRecommender.recommend(client, bookmarks, PLACE_TYPE_COLLECTION_MAP, req.top_k_per_bookmark)
     
-    for bm in bookmarks:
-        collection_name = PLACE_TYPE_COLLECTION_MAP.get(bm.place_type)
-        if not collection_name:
-            continue
-            
-          
-        try:
-          
-            # 2. 실제 포인트 몇 개 가져와서 ID 형식 확인
-            points = client.scroll(collection_name=collection_name, limit=3)
-            print(f"🔍 실제 포인트 ID들: {[p.id for p in points[0]]}")
-            print(f"🔍 북마크 reference_id: {bm.reference_id} (타입: {type(bm.reference_id)})")
-            
-            # 3. 기존 recommend 코드
-            results = client.recommend(
-                collection_name=collection_name,
-                positive=[bm.reference_id],
-                limit=req.top_k_per_bookmark,
-            )
-        except Exception as e:
-            print(f"Qdrant 추천 실패: {e}")
-            continue
-        
-        try:
-            results = client.recommend(
-                collection_name=collection_name,
-                positive=[bm.reference_id],
-                limit=req.top_k_per_bookmark,
-            )
-        except Exception as e:
-            print(f"Qdrant 추천 실패: {e}")
-            continue
+    # 원본 데이터 일괄 조회 (place_type별 IN 쿼리 1번)
+    original_map = fetch_original_data_bulk(db, [(hit.place_type, hit.reference_id) for hit in candidate_hits])
+    
+    for hit in candidate_hits:
+        place_type, rec_reference_id = hit.place_type, hit.reference_id
+        payload = hit.payload
+        original_data = original_map.get((place_type, rec_reference_id))
         
-        for r in results:
-            payload = r.payload or {}
-            rec_reference_id = payload.get("content_id") or payload.get("id") or r.id
-            
-            unique_key = f"{bm.place_type}_{rec_reference_id}"
-            if unique_key in seen_ids:
-                continue
-            seen_ids.add(unique_key)
-            
-            # 원본 데이터 조회
-            original_data = fetch_original_data(db, bm.place_type, rec_reference_id)
-            
-            if original_data:
-                qdrant_recommendations.append({
-                    "place_type": bm.place_type,
-                    "reference_id": rec_reference_id,
-                    "name": original_data["name"],
-                    "address": original_data.get("address"),
-                    "image_url": original_data.get("image_url"),
-                    "latitude": original_data.get("latitude"),
-                    "longitude": original_data.get("longitude"),
-                    "category": original_data.get("category"),
-                    "score": r.score,
-                    "extra": original_data.get("extra", {}),
-                })
-            else:
-                # ✅ recommend.py와 동일한 fallback 추가
-                qdrant_recommendations.append({
-                    "place_type": bm.place_type,
-                    "reference_id": rec_reference_id,
-                    "name": (
-                        payload.get("location_name_en")
-                        or payload.get("location_name")
-                        or payload.get("name")
-                        or "Unknown"
-                    ),
-                    "address": payload.get("address_en") or payload.get("address"),
-                    "image_url": (
-                        payload.get("image_url")
-                        or payload.get("thumbnail")
-                        or payload.get("image")
-                    ),
-                    "latitude": payload.get("latitude"),
-                    "longitude": payload.get("longitude"),
-                    "category": payload.get("category_en") or payload.get("category"),
-                    "score": r.score,
-                    "extra": payload,
-                })
+        if original_data:
+            qdrant_recommendations.append({
+                "place_type": place_type,
+                "reference_id": rec_reference_id,
+                "name": original_data["name"],
+                "address": original_data.get("address"),
+                "image_url": original_data.get("image_url"),
+                "latitude": original_data.get("latitude"),
+                "longitude": original_data.get("longitude"),
+                "category": original_data.get("category"),
+                "score": hit.score,
+                "extra": original_data.get("extra", {}),
+            })
+        else:
+            # ✅ recommend.py와 동일한 fallback 추가
+            qdrant_recommendations.append({
+                "place_type": place_type,
+                "reference_id": rec_reference_id,
+                "name": (
+                    payload.get("location_name_en")
+                    or payload.get("location_name")
+                    or payload.get("name")
+                    or "Unknown"
+                ),
+                "address": payload.get("address_en") or payload.get("address"),
+                "image_url": (
+                    payload.get("image_url")
+                    or payload.get("thumbnail")
+                    or payload.get("image")
+                ),
+                "latitude": payload.get("latitude"),
+                "longitude": payload.get("longitude"),
+                "category": payload.get("category_en") or payload.get("category"),
+                "score": hit.score,
+                "extra": payload,
+            })
     if not qdrant_recommendations:
         raise HTTPException(status_code=404, detail="추천 결과를 찾지 못했습니다.")
     
+    return bookmark_details, qdrant_recommendations
+
+
+def _to_llm_item(item: dict) -> LLMRecommendedItem:
+    """병합된 추천 dict → 응답 아이템 (LLM 필드가 없으면 벡터 점수만)"""
+    return LLMRecommendedItem(
+        place_type=item["place_type"],
+        reference_id=item["reference_id"],
+        name=item["name"],
+        address=item.get("address"),
+        image_url=item.get("image_url"),
+        latitude=item.get("latitude"),
+        longitude=item.get("longitude"),
+        category=item.get("category"),
+        vector_score=item.get("original_score", item.get("score", 0)) or 0,
+        llm_rank=item.get("llm_rank"),
+        llm_match_score=item.get("llm_match_score"),
+        llm_reason=item.get("llm_reason"),
+        extra=item.get("extra"),
+    )
+
+
+# ============================================================
+# 1️⃣ LLM 강화 추천 (벡터 + LLM)
+# ============================================================
+
+@router.post("/enhanced", response_model=LLMRecommendResponse)
+def get_llm_enhanced_recommendations(
+    req: BookmarkBasedRecommendRequest,
+    use_llm: bool = True,  # LLM 사용 여부 (비용 절약 옵션)
+    db: Session = Depends(get_db),
+):
+    """
+    LLM 강화 추천
+    
+    1. Qdrant로 벡터 기반 유사 콘텐츠 추천 (기존 방식)
+    2. LLM으로 사용자 취향 분석 및 재정렬
+    3. 각 추천에 개인화된 이유 추가
+    
+    Query Parameters:
+        use_llm (bool): LLM 사용 여부 (기본값: True)
+                        False면 간단한 규칙 기반 이유만 생성
+    """
+    
+    # 1️⃣ 2️⃣ 북마크 + 벡터 추천 후보
+    bookmark_details, qdrant_recommendations = _collect_candidates(req, db)
+    
     # 3️⃣ LLM으로 강화 (선택적)
     if use_llm:
         try:
@@ -289,28 +282,12 @@ def get_llm_enhanced_recommendations(
             enhanced_result = llm_service.enhance_recommendations(
                 user_bookmarks=bookmark_details,
                 recommended_items=qdrant_recommendations,
-                top_n=10
+                top_n=10,
+                user_id=req.user_id
             )
             
             # 응답 변환
-            recommendations = [
-                LLMRecommendedItem(
-                    place_type=item["place_type"],
-                    reference_id=item["reference_id"],
-                    name=item["name"],
-                    address=item.get("address"),
-                    image_url=item.get("image_url"),
-                    latitude=item.get("latitude"),
-                    longitude=item.get("longitude"),
-                    category=item.get("category"),
-                    vector_score=item.get("original_score", 0),
-                    llm_rank=item.get("llm_rank"),
-                    llm_match_score=item.get("llm_match_score"),
-                    llm_reason=item.get("llm_reason"),
-                    extra=item.get("extra"),
-                )
-                for item in enhanced_result["recommendations"]
-            ]
+            recommendations = [_to_llm_item(item) for item in enhanced_result["recommendations"]]
             
             return LLMRecommendResponse(
                 user_id=req.user_id,
@@ -350,4 +327,73 @@ def get_llm_enhanced_recommendations(
             total_count=len(recommendations),
             user_taste_summary="Based on your bookmarked places",
             recommendations=recommendations
-        )
\ No newline at end of file
+        )
+
+
+# ============================================================
+# 2️⃣ LLM 강화 추천 - 스트리밍 (SSE)
+# ============================================================
+
+@router.post("/enhanced/stream")
+async def stream_llm_enhanced_recommendations(
+    req: BookmarkBasedRecommendRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    🌊 LLM 강화 추천 - Streaming 방식
+    
+    벡터 추천 후보를 먼저 보내고 (Qdrant 1회 왕복),
+    LLM 재정렬 결과는 JSON이 생성되는 대로 항목별로 보냅니다.
+    
+    응답 형식 (Server-Sent Events):
+    data: {"type": "candidates", "recommendations": [...]}  # 벡터 점수 순 (LLM 필드 없음)
+    data: {"type": "summary", "user_taste_summary": "..."}
+    data: {"type": "rerank", "item": {..., "llm_rank": 1, "llm_reason": "..."}}
+    data: {"type": "done", "total_count": 10, "cached": false}
+    data: {"type": "error", "message": "..."}  # LLM 실패 시 (candidates는 그대로 사용)
+    """
+    # 동기 DB/Qdrant 조회는 스레드에서 (404는 스트림 시작 전에 응답)
+    bookmark_details, qdrant_recommendations = await asyncio.to_thread(_collect_candidates, req, db)
+    
+    async def event_generator():
+        started = time.perf_counter()
+        candidates = [_to_llm_item(item).model_dump() for item in qdrant_recommendations[:CANDIDATE_LIMIT]]
+        yield sse_event({"type": "candidates", "recommendations": candidates})
+        print(f"⏱️ [recommend-llm/stream] 후보 전송: {round((time.perf_counter() - started) * 1000, 1)}ms ({len(candidates)}개)")
+        
+        try:
+            llm_service = LLMRecommendService()
+            async for event in llm_service.astream_recommendations(
+                user_bookmarks=bookmark_details,
+                recommended_items=qdrant_recommendations,
+                top_n=10,
+                user_id=req.user_id
+            ):
+                if event["type"] == "rerank":
+                    event = {"type": "rerank", "item": _to_llm_item(event["item"]).model_dump()}
+                yield sse_event(event)
+            print(f"⏱️ [recommend-llm/stream] LLM 재정렬 완료: {round((time.perf_counter() - started) * 1000, 1)}ms")
+        
+        except Exception as e:
+            print(f"⚠️ LLM 스트리밍 재정렬 실패: {e}")
+            yield sse_event({"type": "error", "message": str(e)})
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
+# ============================================================
+# 3️⃣ LLM 재정렬 캐시 통계
+# ============================================================
+
+@router.get("/cache-stats")
+def get_llm_rerank_cache_stats():
+    """LLM 재정렬 캐시 히트율 (hits / stale_hits / misses / refreshes)"""
+    return llm_rerank_cache.stats()
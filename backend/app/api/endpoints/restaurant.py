@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text
 from typing import List, Optional
 
-from app.database.connection import get_db
+from app.core.config import settings
+from app.database.connection import get_db, get_async_db
 from app.models.restaurant import Restaurant
+from app.utils.geo_index import GridIndex, bounding_box, get_geo_index, haversine_m
 
 router = APIRouter(
     prefix="/restaurants",
@@ -13,8 +16,8 @@ router = APIRouter(
 
 
 @router.get("/map", summary="음식점 지도 데이터 조회")
-def get_restaurants_for_map(
-    db: Session = Depends(get_db),
+async def get_restaurants_for_map(
+    db: AsyncSession = Depends(get_async_db),
     keyword: Optional[str] = Query(None, description="음식점 이름 또는 지하철 검색"),
     limit: int = Query(100, description="최대 조회 개수 (기본 100개)")
 ):
@@ -24,17 +27,17 @@ def get_restaurants_for_map(
     - 좌표, 이미지, 이름 제공
     - keyword가 있으면 필터링
     """
-    query = db.query(Restaurant)
+    query = select(Restaurant)
 
     if keyword:
         search = f"%{keyword}%"
-        query = query.filter(
+        query = query.where(
             (Restaurant.restaurant_name.ilike(search)) |
             (Restaurant.near_subway.ilike(search)) |
             (Restaurant.place.ilike(search))
         )
 
-    results = query.limit(limit).all()
+    results = (await db.execute(query.limit(limit))).scalars().all()
 
     if not results:
         raise HTTPException(status_code=404, detail="검색된 음식점이 없습니다")
@@ -53,6 +56,76 @@ def get_restaurants_for_map(
     ]
 
 
+# 주변 음식점 조회용 컬럼 (SQL 경로 / 그리드 인덱스 공통)
+_NEARBY_SELECT = """
+    SELECT 
+        restaurant_id,
+        restaurant_name_en AS name,
+        place_en AS place,
+        image_path,
+        Latitude AS latitude,
+        Longitude AS longitude,
+        near_subway_en AS near_subway,
+        type_en AS type,
+        description_clean_en AS description_clean
+    FROM celeb_restaurants
+    WHERE 
+        Latitude IS NOT NULL 
+        AND Longitude IS NOT NULL
+"""
+
+_GRID_INDEX_NAME = "celeb_restaurants"
+
+
+def _nearby_item(row, distance_meters: float) -> dict:
+    return {
+        "restaurant_id": row.restaurant_id,
+        "name": row.name,
+        "place": row.place,
+        "image": row.image_path,
+        "latitude": float(row.latitude) if row.latitude else None,
+        "longitude": float(row.longitude) if row.longitude else None,
+        "near_subway": row.near_subway,
+        "type": row.type,
+        "description": row.description_clean,
+        "distance_meters": round(distance_meters, 1)  # 소수점 1자리
+    }
+
+
+def _nearby_from_sql(db: Session, lat: float, lng: float, radius: int) -> List[tuple]:
+    """바운딩 박스(인덱스 컬럼 BETWEEN)로 후보만 읽고 정확한 거리는 Python에서 계산"""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+    query = text(_NEARBY_SELECT + """
+        AND Latitude BETWEEN :min_lat AND :max_lat
+        AND Longitude BETWEEN :min_lng AND :max_lng
+    """)
+
+    rows = db.execute(query, {
+        "min_lat": min_lat,
+        "max_lat": max_lat,
+        "min_lng": min_lng,
+        "max_lng": max_lng,
+    }).fetchall()
+
+    found = []
+    for row in rows:
+        distance = haversine_m(lat, lng, float(row.latitude), float(row.longitude))
+        if distance <= radius:
+            found.append((distance, row))
+
+    found.sort(key=lambda pair: pair[0])
+    return found
+
+
+def _restaurant_grid_index(db: Session):
+    """프로세스 내 그리드 인덱스 (GEO_INDEX_TTL_SECONDS마다 재생성)"""
+    def loader():
+        rows = db.execute(text(_NEARBY_SELECT)).fetchall()
+        return GridIndex.from_rows(rows, lambda row: (row.latitude, row.longitude))
+
+    return get_geo_index(_GRID_INDEX_NAME, loader, settings.GEO_INDEX_TTL_SECONDS)
+
+
 @router.get("/nearby", summary="주변 음식점 조회 (500m 반경)")
 def get_nearby_restaurants(
     lat: float = Query(..., description="K-Content 목적지 위도"),
@@ -61,7 +134,7 @@ def get_nearby_restaurants(
     db: Session = Depends(get_db)
 ):
     """
-    ✅ K-Content 목적지 주변 음식점 조회 (Haversine 공식 사용)
+    ✅ K-Content 목적지 주변 음식점 조회 (바운딩 박스 사전 필터 + Haversine)
     
     **사용 예시:**
     - `/restaurants/nearby?lat=37.5665&lng=126.9780&radius=500`
@@ -74,58 +147,32 @@ def get_nearby_restaurants(
     **반환 데이터:**
     - 거리순으로 정렬된 음식점 목록
     - 각 음식점의 좌표, 이름, 거리 포함
+    
+    **검색 방식 (NEARBY_SEARCH_BACKEND):**
+    - `sql`: Latitude/Longitude 인덱스로 반경을 감싸는 사각형만 조회 후 정확한 거리 계산
+    - `grid`: 프로세스 내 그리드 인덱스 (SQL 조회 실패 시에도 폴백으로 사용)
     """
     try:
-        # ✅ Haversine 공식: 두 지점 간 거리 계산 (단위: km)
-        # 6371 = 지구 반지름 (km)
-        query = text("""
-            SELECT 
-                restaurant_id,
-                restaurant_name_en AS name,
-                place_en AS place,
-                image_path,
-                Latitude AS latitude,
-                Longitude AS longitude,
-                near_subway_en AS near_subway,
-                type_en AS type,
-                description_clean_en AS description_clean,
-                (6371 * 1000 * acos(
-                    cos(radians(:lat)) * cos(radians(Latitude)) *
-                    cos(radians(Longitude) - radians(:lng)) +
-                    sin(radians(:lat)) * sin(radians(Latitude))
-                )) AS distance_meters
-            FROM celeb_restaurants
-            WHERE 
-                Latitude IS NOT NULL 
-                AND Longitude IS NOT NULL
-            HAVING distance_meters <= :radius
-            ORDER BY distance_meters ASC
-        """)
-
-        params = {
-            "lat": lat,
-            "lng": lng,
-            "radius": radius  # 미터 단위로 직접 비교
-        }
-
-        result = db.execute(query, params)
-        rows = result.fetchall()
+        found = None
+
+        if settings.NEARBY_SEARCH_BACKEND == "grid":
+            index = _restaurant_grid_index(db)
+            if index is not None:
+                found = index.query(lat, lng, radius)
+
+        if found is None:
+            try:
+                found = _nearby_from_sql(db, lat, lng, radius)
+            except Exception as e:
+                # 🗺️ DB 조회 실패 시 마지막으로 만든 그리드 인덱스로 응답
+                print(f"⚠️ 바운딩 박스 쿼리 실패, 그리드 인덱스로 폴백: {str(e)}")
+                index = _restaurant_grid_index(db)
+                if index is None:
+                    raise
+                found = index.query(lat, lng, radius)
 
         # ✅ 결과를 딕셔너리로 변환
-        restaurants = []
-        for row in rows:
-            restaurants.append({
-                "restaurant_id": row.restaurant_id,
-                "name": row.name,
-                "place": row.place,
-                "image": row.image_path,
-                "latitude": float(row.latitude) if row.latitude else None,
-                "longitude": float(row.longitude) if row.longitude else None,
-                "near_subway": row.near_subway,
-                "type": row.type,
-                "description": row.description_clean,
-                "distance_meters": round(row.distance_meters, 1)  # 소수점 1자리
-            })
+        restaurants = [_nearby_item(row, distance) for distance, row in found]
 
         return {
             "success": True,
@@ -144,10 +191,10 @@ def get_nearby_restaurants(
 
 
 @router.get("/search", summary="음식점 검색 (키워드)")
-def search_restaurants(
+async def search_restaurants(
     keyword: str = Query(..., min_length=1, description="검색 키워드"),
     limit: int = Query(20, description="최대 조회 개수", ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ✅ 음식점 이름, 장소, 지하철역으로 검색
@@ -157,11 +204,13 @@ def search_restaurants(
     """
     search = f"%{keyword}%"
     
-    results = db.query(Restaurant).filter(
-        (Restaurant.restaurant_name.ilike(search)) |
-        (Restaurant.place.ilike(search)) |
-        (Restaurant.near_subway.ilike(search))
-    ).limit(limit).all()
+    results = (await db.execute(
+        select(Restaurant).where(
+            (Restaurant.restaurant_name.ilike(search)) |
+            (Restaurant.place.ilike(search)) |
+            (Restaurant.near_subway.ilike(search))
+        ).limit(limit)
+    )).scalars().all()
 
     if not results:
         return {
@@ -179,16 +228,16 @@ def search_restaurants(
 
 
 @router.get("/{restaurant_id}", summary="음식점 상세 정보")
-def get_restaurant_detail(
+async def get_restaurant_detail(
     restaurant_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ✅ 특정 음식점의 상세 정보 조회
     """
-    restaurant = db.query(Restaurant).filter(
-        Restaurant.restaurant_id == restaurant_id
-    ).first()
+    restaurant = (await db.execute(
+        select(Restaurant).where(Restaurant.restaurant_id == restaurant_id)
+    )).scalar_one_or_none()
 
     if not restaurant:
         raise HTTPException(
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 from urllib.parse import quote_plus
 
 class Settings(BaseSettings):
@@ -9,18 +9,96 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "ktravel"
     DATABASE_USER: str = "ktravel_user"
     DATABASE_PASSWORD: str = "ktravel_password"
+    DATABASE_ASYNC_DRIVER: str = "aiomysql"  # 비동기 엔진 드라이버 (mysql+{드라이버})
+    
+    # DB 엔진 프로필 ("development" | "production"), 아래 값은 설정 시 프로필보다 우선
+    DB_PROFILE: str = "development"
+    DB_ECHO: Optional[bool] = None
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_RECYCLE: Optional[int] = None  # 초
+    DB_POOL_TIMEOUT: Optional[int] = None  # 커넥션 대기 최대 시간 (초)
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None  # SELECT 최대 실행 시간 (0이면 제한 없음)
     
     # Redis (세션 저장소)
     REDIS_URL: str = "redis://redis:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 50  # 비동기 Redis 커넥션 풀 크기
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30  # 이 시간 이상 쉰 연결은 사용 전에 PING
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 5.0
     
     # 세션 설정
     SECRET_KEY: str = "your-secret-key-change-this"
     SESSION_EXPIRE_HOURS: int = 24
+    SESSION_REFRESH_THRESHOLD_SECONDS: int = 3600  # 남은 시간이 이만큼 줄었을 때만 만료 시간 갱신
+    SESSION_LOCAL_CACHE_SECONDS: float = 5  # 프로세스 내 세션 캐시 TTL (0이면 사용 안 함)
+    SESSION_LOCAL_CACHE_SIZE: int = 10000
     
     # OpenAI
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o-mini"
     
+    # 임베딩 캐시 (LRU + Redis)
+    EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    EMBEDDING_CACHE_SIZE: int = 2048  # 프로세스 내 LRU 최대 항목 수
+    EMBEDDING_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # Redis 보관 기간 (0이면 Redis 미사용)
+    
+    # 하이브리드 검색 (BM25 + 벡터)
+    LEXICAL_INDEX_TTL_SECONDS: int = 3600  # lexical 인덱스 재생성 주기
+    LEXICAL_EXACT_COVERAGE: float = 0.8  # 이 이상 n-gram이 겹치면 이름 일치로 인정
+    
+    # SSE 스트리밍 (토큰 묶음 전송)
+    SSE_FLUSH_INTERVAL_MS: int = 40  # 이 시간 동안 모인 토큰을 한 프레임으로 전송
+    SSE_FLUSH_MAX_BYTES: int = 256  # 버퍼가 이 크기를 넘으면 즉시 전송
+    SSE_PACING_MS: int = 0  # 프레임 사이 인위적 지연 (0 = 사용 안 함)
+    
+    # 위치 검색 (주변 음식점)
+    NEARBY_SEARCH_BACKEND: str = "sql"  # "sql" = 바운딩 박스 쿼리, "grid" = 프로세스 내 그리드 인덱스
+    GEO_INDEX_TTL_SECONDS: int = 600  # 그리드 인덱스 재생성 주기
+    
+    # 북마크 추천
+    RECOMMEND_RECENCY_DECAY: float = 0.9  # 최신 북마크 순위별 가중치 감쇠 (1.0 = 가중치 없음)
+    TASTE_PROFILE_ENABLED: bool = True  # /from-bookmarks를 취향 벡터 검색 1번으로 처리
+    TASTE_PROFILE_TTL_SECONDS: int = 30 * 24 * 3600  # 취향 벡터 Redis 보관 기간 (만료 시 DB로 재생성)
+    
+    # LLM 재정렬 캐시 (/recommend-llm)
+    LLM_RERANK_CACHE_TTL_SECONDS: int = 24 * 3600  # Redis 보관 기간 (0이면 캐시 미사용)
+    LLM_RERANK_FRESH_SECONDS: int = 3600  # 이후에는 캐시를 반환하면서 백그라운드 갱신
+    LLM_RERANK_PROMPT_TOKEN_BUDGET: int = 1200  # 재정렬 프롬프트 최대 토큰 (대략치)
+    
+    # 외부 API HTTP 클라이언트 (커넥션 풀)
+    HTTP2_ENABLED: bool = True  # h2 패키지가 설치된 경우에만 적용
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    HTTP_POOL_TIMEOUT_SECONDS: float = 5.0  # 커넥션이 모두 사용 중일 때 최대 대기 시간
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    GOOGLE_GEOCODING_MAX_CONNECTIONS: int = 20  # upstream별 동시 요청 수 제한
+    GOOGLE_GEOCODING_TIMEOUT_SECONDS: float = 10.0
+    ODSAY_MAX_CONNECTIONS: int = 10
+    ODSAY_TIMEOUT_SECONDS: float = 10.0
+    
+    # 지오코딩 캐시 (LRU + Redis)
+    GEOCODE_CACHE_SIZE: int = 4096  # 프로세스 내 LRU 최대 항목 수
+    GEOCODE_CACHE_TTL_SECONDS: int = 30 * 24 * 3600  # Redis 보관 기간 (0이면 Redis 미사용)
+    GEOCODE_NEGATIVE_TTL_SECONDS: int = 3600  # ZERO_RESULTS 보관 기간
+    GEOCODE_CACHE_SEED_ON_STARTUP: bool = True  # DB 장소 좌표로 캐시 사전 적재
+    
+    # 대중교통 경로 캐시 (ODsay)
+    ROUTE_CACHE_TTL_SECONDS: int = 24 * 3600  # Redis 보관 기간 (0이면 캐시 미사용)
+    ROUTE_CACHE_QUANTIZE_M: float = 50  # 출발/도착 좌표 격자 크기 (이 안의 요청은 같은 경로 재사용)
+    ITINERARY_MAX_CONCURRENT_LEGS: int = 4  # 일정 전체 경로 조회 시 동시에 요청하는 구간 수
+    
+    # 대화 저장 (write-behind)
+    CONVERSATION_WRITE_BEHIND: bool = True  # False면 응답 전에 바로 INSERT
+    CONVERSATION_LOG_QUEUE_SIZE: int = 1000  # 큐가 가득 차면 호출한 쪽에서 바로 INSERT
+    CONVERSATION_LOG_BATCH_SIZE: int = 50  # 한 번에 INSERT하는 최대 대화 수
+    CONVERSATION_LOG_FLUSH_INTERVAL_MS: int = 50  # 배치를 모으는 최대 시간
+    CONVERSATION_ID_BLOCK_SIZE: int = 100  # id_sequences에서 한 번에 예약하는 convers_id 수
+    CONVERSATION_WAIT_WRITTEN_SECONDS: float = 5.0  # 대화를 참조하는 저장 전 write-behind 완료 대기 시간
+    
+    # 대화 히스토리 (/chat/history)
+    CONVERSATION_HISTORY_MAX_LIMIT: int = 200  # 페이지당 최대 대화 수
+    CONVERSATION_HISTORY_STREAM_BATCH: int = 200  # NDJSON 스트리밍 시 한 번에 읽는 대화 수
+    CONVERSATION_PREVIEW_CHARS: int = 120  # fields=preview일 때 질문/응답 앞부분 글자 수
+    
     # Kakao API
     KAKAO_REST_API_KEY: str = ""
     
@@ -36,6 +114,11 @@ class Settings(BaseSettings):
         encoded_password = quote_plus(self.DATABASE_PASSWORD)
         return f"mysql+pymysql://{self.DATABASE_USER}:{encoded_password}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
     
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        encoded_password = quote_plus(self.DATABASE_PASSWORD)
+        return f"mysql+{self.DATABASE_ASYNC_DRIVER}://{self.DATABASE_USER}:{encoded_password}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
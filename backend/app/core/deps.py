@@ -1,19 +1,21 @@
 from fastapi import Header, HTTPException, status, Depends
-from sqlalchemy.orm import Session
-from app.core.session import session_manager
-from app.database.connection import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from app.core.session import USER_PROFILE_FIELDS, async_session_manager, build_user_profile, local_session_cache
+from app.database.connection import get_async_db
 from app.models.users import User
 
 async def get_current_user(
     authorization: str = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> dict:
     """
     현재 로그인한 사용자 정보 가져오기 (세션 방식 + Authorization Header)
     
     Args:
         authorization: Authorization 헤더에서 가져온 "Bearer session_id"
-        db: ORM Session
+        db: 비동기 ORM Session
     
     Returns:
         사용자 정보 딕셔너리
@@ -38,40 +40,55 @@ async def get_current_user(
             detail="잘못된 인증 형식입니다. 'Bearer session_id' 형태여야 합니다"
         )
     
-    # 세션 데이터 가져오기
-    session_data = session_manager.get_session(session_id)
+    # 🚀 이 프로세스에서 최근(SESSION_LOCAL_CACHE_SECONDS 이내) 확인한 세션이면 Redis/DB 조회 없음
+    session_data = local_session_cache.get(session_id)
     
-    if not session_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="세션이 만료되었습니다. 다시 로그인해주세요"
-        )
-    
-    # 세션 갱신
-    session_manager.refresh_session(session_id)
+    if session_data is None:
+        # 세션 데이터 가져오기 (비동기 Redis GET+TTL 파이프라인, 갱신은 throttle)
+        session_data = await async_session_manager.resolve_session(session_id, use_local_cache=False)
+        
+        if not session_data:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="세션이 만료되었습니다. 다시 로그인해주세요"
+            )
+        
+        # 캐시 미스일 때만 사용자 존재 확인 (삭제된 사용자의 세션 거부)
+        user_id = session_data.get("user_id")
+        result = await db.execute(select(User).where(User.user_id == user_id))
+        user = result.scalar_one_or_none()
+        
+        if not user:
+            await async_session_manager.delete_session(session_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="사용자를 찾을 수 없습니다"
+            )
+        
+        # 예전 세션(프로필 없음)은 조회한 사용자 정보로 세션 프로필 채움
+        profile = session_data.get("user_data") or {}
+        if not all(field in profile for field in USER_PROFILE_FIELDS):
+            profile = build_user_profile(user)
+            session_data = {**session_data, "user_data": profile}
+            await async_session_manager.update_user_data(session_id, profile)
+        
+        local_session_cache.set(session_id, session_data)
     
-    # ORM으로 사용자 정보 가져오기
     user_id = session_data.get("user_id")
+    profile = session_data["user_data"]
     
-    user = db.query(User).filter(User.user_id == user_id).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="사용자를 찾을 수 없습니다"
-        )
-    
-    # User 객체를 딕셔너리로 변환 (UserResponse 스키마 호환)
+    # 세션 프로필을 딕셔너리로 변환 (UserResponse 스키마 호환)
+    created_at = profile.get('created_at')
     return {
-        'user_id': user.user_id,
-        'username': user.username,
-        'email': user.email,
-        'name': user.name,
-        'address': user.address,
-        'phone': user.phone,
-        'gender': user.gender,
-        'permit': user.permit,
-        'created_at': user.created_at
+        'user_id': user_id,
+        'username': profile['username'],
+        'email': profile['email'],
+        'name': profile['name'],
+        'address': profile['address'],
+        'phone': profile['phone'],
+        'gender': profile['gender'],
+        'permit': profile['permit'],
+        'created_at': datetime.fromisoformat(created_at) if created_at else None
     }
 
 # 선택적: 관리자 권한 체크
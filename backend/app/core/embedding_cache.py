@@ -0,0 +1,190 @@
+# app/core/embedding_cache.py
+"""
+쿼리 임베딩 캐시 (LRU + Redis 2단 구조)
+
+같은 질문("namsan tower", 드라마 제목 등)이 채팅마다 다시 임베딩되는 것을 막습니다.
+- 1단: 프로세스 내 LRU (OrderedDict)
+- 2단: Redis (float32 바이트로 압축 저장, TTL 적용)
+- 키: 모델명 + 정규화된 텍스트
+"""
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from langchain_openai import OpenAIEmbeddings
+
+from app.core.config import settings
+from app.core.session import redis_binary_client
+
+
+def _pack_vector(vector: List[float]) -> bytes:
+    """벡터를 float32 리틀엔디언 바이트로 변환"""
+    return struct.pack(f"<{len(vector)}f", *vector)
+
+
+def _unpack_vector(data: bytes) -> List[float]:
+    """float32 바이트를 벡터로 복원"""
+    return list(struct.unpack(f"<{len(data) // 4}f", data))
+
+
+class EmbeddingCache:
+    """모델명 + 정규화 텍스트 기준 임베딩 캐시"""
+
+    KEY_PREFIX = "emb"
+
+    def __init__(self, max_size: int, ttl_seconds: int, redis=None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis if ttl_seconds > 0 else None
+
+        self._lru: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 📊 카운터
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """소문자 + 공백 정리"""
+        return " ".join(text.lower().split())
+
+    def _key(self, model_name: str, normalized_text: str) -> str:
+        digest = hashlib.sha1(normalized_text.encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{model_name}:{digest}"
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """LRU에 저장 (최대 크기 초과 시 가장 오래된 항목 제거)"""
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+    def get_many(self, model_name: str, normalized_texts: List[str]) -> List[Optional[List[float]]]:
+        """여러 텍스트의 캐시된 임베딩 조회 (없으면 None)"""
+        keys = [self._key(model_name, t) for t in normalized_texts]
+        found: List[Optional[List[float]]] = [None] * len(keys)
+
+        # 1단: LRU
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    found[i] = vector
+                    self.memory_hits += 1
+
+        # 2단: Redis (MGET 1회)
+        missing = [i for i, v in enumerate(found) if v is None]
+        if missing and self.redis is not None:
+            try:
+                raw_values = self.redis.mget([keys[i] for i in missing])
+            except Exception as e:
+                print(f"⚠️ 임베딩 캐시 Redis 조회 실패: {e}")
+                raw_values = [None] * len(missing)
+
+            redis_hits = 0
+            for i, raw in zip(missing, raw_values):
+                if raw:
+                    vector = _unpack_vector(raw)
+                    found[i] = vector
+                    redis_hits += 1
+                    self._remember(keys[i], vector)
+
+            with self._lock:
+                self.redis_hits += redis_hits
+
+        # 📊 카운터는 여러 스레드가 동시에 갱신하므로 락 안에서 증가
+        with self._lock:
+            self.misses += sum(1 for v in found if v is None)
+        return found
+
+    def set_many(self, model_name: str, normalized_texts: List[str], vectors: List[List[float]]) -> None:
+        """임베딩 저장 (LRU + Redis 파이프라인)"""
+        keys = [self._key(model_name, t) for t in normalized_texts]
+        for key, vector in zip(keys, vectors):
+            self._remember(key, vector)
+
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, vector in zip(keys, vectors):
+                pipe.setex(key, self.ttl_seconds, _pack_vector(vector))
+            pipe.execute()
+        except Exception as e:
+            print(f"⚠️ 임베딩 캐시 Redis 저장 실패: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """히트/미스 통계"""
+        with self._lock:
+            memory_hits, redis_hits, misses = self.memory_hits, self.redis_hits, self.misses
+            size = len(self._lru)
+        lookups = memory_hits + redis_hits + misses
+        hits = memory_hits + redis_hits
+        return {
+            "memory_hits": memory_hits,
+            "redis_hits": redis_hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": size,
+            "max_size": self.max_size,
+        }
+
+
+class CachedEmbeddings:
+    """
+    임베딩 모델 래퍼 - embed_query / embed_documents 호출 전에 캐시 확인
+
+    캐시에 없는 텍스트만 모아서 embed_documents 1회로 계산합니다.
+    """
+
+    def __init__(self, embeddings, model_name: str, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        normalized = [EmbeddingCache.normalize(t) for t in texts]
+        vectors = self.cache.get_many(self.model_name, normalized)
+
+        # 캐시 미스 텍스트만 (중복 제거 후) 한 번에 임베딩
+        pending = list(dict.fromkeys(n for n, v in zip(normalized, vectors) if v is None))
+        if pending:
+            computed = self.embeddings.embed_documents(pending)
+            self.cache.set_many(self.model_name, pending, computed)
+            by_text = dict(zip(pending, computed))
+            vectors = [v if v is not None else by_text[n] for n, v in zip(normalized, vectors)]
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+# 공유 캐시 인스턴스 (모든 채팅 서비스가 함께 사용)
+embedding_cache = EmbeddingCache(
+    max_size=settings.EMBEDDING_CACHE_SIZE,
+    ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+    redis=redis_binary_client,
+)
+
+_cached_models: Dict[str, CachedEmbeddings] = {}
+_models_lock = threading.Lock()
+
+
+def get_cached_embeddings(model_name: str = None) -> CachedEmbeddings:
+    """모델별 캐시 임베딩 싱글톤"""
+    model_name = model_name or settings.EMBEDDING_MODEL
+    with _models_lock:
+        if model_name not in _cached_models:
+            _cached_models[model_name] = CachedEmbeddings(
+                OpenAIEmbeddings(model=model_name),
+                model_name=model_name,
+                cache=embedding_cache,
+            )
+        return _cached_models[model_name]
@@ -0,0 +1,99 @@
+# app/core/http_client.py
+"""
+외부 API용 공유 비동기 HTTP 클라이언트 (커넥션 풀)
+
+요청마다 httpx.AsyncClient를 새로 만들면 매번 TCP + TLS 핸드셰이크를 다시 합니다.
+외부 API(upstream)별로 AsyncClient 하나를 재사용해서 keep-alive 연결을 유지합니다.
+
+- upstream별 커넥션 수 제한 = 동시 요청 수 제한 (초과 요청은 pool 타임아웃까지 대기)
+- upstream별 타임아웃 (connect / read / pool)
+- h2 패키지가 설치되어 있으면 HTTP/2 사용
+- 앱 종료 시 close_http_clients()로 연결 정리 (main.py shutdown 이벤트)
+
+사용법:
+    from app.core.http_client import google_geocoding_http
+
+    response = await google_geocoding_http.get(GEOCODING_URL, params=params)
+"""
+import importlib.util
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+# HTTP/2는 h2 패키지가 있을 때만 (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class UpstreamHTTPClient:
+    """외부 API 하나에 대한 공유 AsyncClient (처음 사용할 때 생성)"""
+
+    def __init__(
+        self,
+        name: str,
+        max_connections: int,
+        timeout: float,
+        connect_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
+    ):
+        self.name = name
+        self.max_connections = max_connections
+        self.timeout = httpx.Timeout(
+            timeout,
+            connect=connect_timeout if connect_timeout is not None else settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+            pool=pool_timeout if pool_timeout is not None else settings.HTTP_POOL_TIMEOUT_SECONDS,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE and settings.HTTP2_ENABLED,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            )
+            print(f"🌐 HTTP 클라이언트 생성: {self.name} (max_connections={self.max_connections}, "
+                  f"http2={HTTP2_AVAILABLE and settings.HTTP2_ENABLED})")
+        return self._client
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.client.get(url, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+# 🚀 upstream별 공유 클라이언트
+google_geocoding_http = UpstreamHTTPClient(
+    "google-geocoding",
+    max_connections=settings.GOOGLE_GEOCODING_MAX_CONNECTIONS,
+    timeout=settings.GOOGLE_GEOCODING_TIMEOUT_SECONDS,
+)
+
+odsay_http = UpstreamHTTPClient(
+    "odsay",
+    max_connections=settings.ODSAY_MAX_CONNECTIONS,
+    timeout=settings.ODSAY_TIMEOUT_SECONDS,
+)
+
+HTTP_CLIENTS: Dict[str, UpstreamHTTPClient] = {
+    client.name: client
+    for client in (google_geocoding_http, odsay_http)
+}
+
+
+async def close_http_clients() -> None:
+    """모든 공유 클라이언트 연결 종료 (앱 shutdown 시)"""
+    for client in HTTP_CLIENTS.values():
+        try:
+            await client.aclose()
+        except Exception as e:
+            print(f"⚠️ HTTP 클라이언트 종료 실패 ({client.name}): {e}")
@@ -1,12 +1,106 @@
 import redis
+import redis.asyncio as aioredis
 import json
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
+from typing import Optional
 from app.core.config import settings
 
 # Redis 클라이언트
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
 
+# 바이너리 값 저장용 Redis 클라이언트 (임베딩 캐시 등 - decode 하지 않음)
+redis_binary_client = redis.from_url(settings.REDIS_URL, decode_responses=False)
+
+# 🚀 비동기 Redis 클라이언트 (async def 핸들러용 - 이벤트 루프를 막지 않음)
+# 커넥션 풀 크기 고정 (다 쓰이면 에러 대신 대기) + 유휴 연결 health check
+# (main.py startup/shutdown에서 연결 확인/정리)
+async_redis_pool = aioredis.BlockingConnectionPool.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+)
+async_redis_client = aioredis.Redis(connection_pool=async_redis_pool)
+
+# 세션 blob에 저장하는 사용자 프로필 필드 (get_current_user가 users 조회 없이 사용)
+USER_PROFILE_FIELDS = ('username', 'email', 'name', 'address', 'phone', 'gender', 'permit', 'created_at')
+
+
+def build_user_profile(user) -> dict:
+    """User ORM 객체 → 세션 저장용 프로필 (JSON 직렬화 가능)"""
+    return {
+        'username': user.username,
+        'email': user.email,
+        'name': user.name,
+        'address': user.address,
+        'phone': user.phone,
+        'gender': user.gender,
+        'permit': user.permit,
+        'created_at': user.created_at.isoformat() if user.created_at else None,
+    }
+
+
+class LocalSessionCache:
+    """
+    프로세스 내 세션 캐시 (짧은 TTL)
+
+    같은 세션으로 연속 요청이 들어올 때 Redis 조회를 생략합니다.
+    로그아웃은 이 프로세스의 캐시에서 즉시 제거되고,
+    다른 워커에서는 최대 SESSION_LOCAL_CACHE_SECONDS 동안 남아 있을 수 있습니다.
+    (get_current_user는 사용자 존재를 확인한 세션만 저장 → 삭제된 사용자도 같은 시간 안에 거부됨)
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 📊 카운터
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session_id: str) -> Optional[dict]:
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._items.get(session_id)
+            if entry is not None and entry[1] > time.monotonic():
+                self._items.move_to_end(session_id)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._items[session_id]
+            self.misses += 1
+            return None
+
+    def set(self, session_id: str, session_data: dict) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._items[session_id] = (session_data, time.monotonic() + self.ttl_seconds)
+            self._items.move_to_end(session_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._items.pop(session_id, None)
+
+
+local_session_cache = LocalSessionCache(
+    ttl_seconds=settings.SESSION_LOCAL_CACHE_SECONDS,
+    max_size=settings.SESSION_LOCAL_CACHE_SIZE,
+)
+
+
 class SessionManager:
     """세션 관리 클래스"""
     
@@ -69,6 +163,7 @@ class SessionManager:
         """
         session_key = f"session:{session_id}"
         redis_client.delete(session_key)
+        local_session_cache.delete(session_id)
     
     @staticmethod
     def refresh_session(session_id: str):
@@ -81,6 +176,170 @@ class SessionManager:
         session_key = f"session:{session_id}"
         expire_seconds = settings.SESSION_EXPIRE_HOURS * 3600
         redis_client.expire(session_key, expire_seconds)
+    
+    @staticmethod
+    def resolve_session(session_id: str) -> Optional[dict]:
+        """
+        🚀 인증용 세션 조회 (get_current_user 전용)
+        
+        1. 프로세스 내 캐시 (SESSION_LOCAL_CACHE_SECONDS) → Redis 왕복 없음
+        2. Redis GET + TTL을 파이프라인 1번으로 조회
+        3. 남은 시간이 SESSION_REFRESH_THRESHOLD_SECONDS 이상 줄었을 때만 EXPIRE (매 요청 갱신 X)
+        
+        Returns:
+            세션 데이터 딕셔너리 또는 None
+        """
+        cached = local_session_cache.get(session_id)
+        if cached is not None:
+            return cached
+        
+        session_key = f"session:{session_id}"
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(session_key)
+        pipe.ttl(session_key)
+        raw, ttl = pipe.execute()
+        
+        if not raw:
+            return None
+        
+        # 세션 갱신 (throttle)
+        expire_seconds = settings.SESSION_EXPIRE_HOURS * 3600
+        if ttl is not None and 0 <= ttl < expire_seconds - settings.SESSION_REFRESH_THRESHOLD_SECONDS:
+            redis_client.expire(session_key, expire_seconds)
+        
+        session_data = json.loads(raw)
+        local_session_cache.set(session_id, session_data)
+        return session_data
+    
+    @staticmethod
+    def update_user_data(session_id: str, user_data: dict):
+        """
+        세션의 user_data 교체 (만료 시간 유지)
+        
+        예전 세션(프로필 없이 생성됨)에 프로필을 채워 넣을 때 사용
+        """
+        session_key = f"session:{session_id}"
+        raw = redis_client.get(session_key)
+        if not raw:
+            return
+        
+        session_data = json.loads(raw)
+        session_data["user_data"] = user_data
+        redis_client.set(session_key, json.dumps(session_data), keepttl=True)
+        local_session_cache.set(session_id, session_data)
+
+class AsyncSessionManager:
+    """
+    비동기 세션 관리 클래스 (SessionManager와 같은 메서드, await로 호출)
+    
+    async def 핸들러/의존성(get_current_user)에서 사용합니다.
+    프로세스 내 세션 캐시(local_session_cache)는 SessionManager와 공유합니다.
+    """
+    
+    @staticmethod
+    async def create_session(user_id: int, user_data: dict) -> str:
+        """세션 생성 및 세션 ID 반환"""
+        session_id = secrets.token_urlsafe(32)
+        session_key = f"session:{session_id}"
+        
+        session_data = {
+            "user_id": user_id,
+            "user_data": user_data,
+            "created_at": datetime.now().isoformat()
+        }
+        
+        expire_seconds = settings.SESSION_EXPIRE_HOURS * 3600
+        await async_redis_client.setex(session_key, expire_seconds, json.dumps(session_data))
+        
+        return session_id
+    
+    @staticmethod
+    async def get_session(session_id: str) -> Optional[dict]:
+        """세션 ID로 세션 데이터 가져오기"""
+        session_data = await async_redis_client.get(f"session:{session_id}")
+        
+        if session_data:
+            return json.loads(session_data)
+        return None
+    
+    @staticmethod
+    async def delete_session(session_id: str):
+        """세션 삭제 (로그아웃)"""
+        await async_redis_client.delete(f"session:{session_id}")
+        local_session_cache.delete(session_id)
+    
+    @staticmethod
+    async def refresh_session(session_id: str):
+        """세션 만료 시간 갱신"""
+        expire_seconds = settings.SESSION_EXPIRE_HOURS * 3600
+        await async_redis_client.expire(f"session:{session_id}", expire_seconds)
+    
+    @staticmethod
+    async def resolve_session(session_id: str, use_local_cache: bool = True) -> Optional[dict]:
+        """
+        🚀 인증용 세션 조회 (SessionManager.resolve_session의 비동기 버전)
+        
+        use_local_cache=False면 프로세스 캐시를 읽지도 채우지도 않습니다.
+        (get_current_user가 사용자 존재를 확인한 뒤 직접 캐시에 저장)
+        """
+        if use_local_cache:
+            cached = local_session_cache.get(session_id)
+            if cached is not None:
+                return cached
+        
+        session_key = f"session:{session_id}"
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(session_key)
+            pipe.ttl(session_key)
+            raw, ttl = await pipe.execute()
+        
+        if not raw:
+            return None
+        
+        # 세션 갱신 (throttle)
+        expire_seconds = settings.SESSION_EXPIRE_HOURS * 3600
+        if ttl is not None and 0 <= ttl < expire_seconds - settings.SESSION_REFRESH_THRESHOLD_SECONDS:
+            await async_redis_client.expire(session_key, expire_seconds)
+        
+        session_data = json.loads(raw)
+        if use_local_cache:
+            local_session_cache.set(session_id, session_data)
+        return session_data
+    
+    @staticmethod
+    async def update_user_data(session_id: str, user_data: dict):
+        """세션의 user_data 교체 (만료 시간 유지)"""
+        session_key = f"session:{session_id}"
+        raw = await async_redis_client.get(session_key)
+        if not raw:
+            return
+        
+        session_data = json.loads(raw)
+        session_data["user_data"] = user_data
+        await async_redis_client.set(session_key, json.dumps(session_data), keepttl=True)
+        local_session_cache.set(session_id, session_data)
+
+
+async def check_async_redis() -> bool:
+    """비동기 Redis 연결 확인 (앱 startup 시)"""
+    try:
+        await async_redis_client.ping()
+        print(f"✅ 비동기 Redis 연결 확인 (max_connections={settings.REDIS_MAX_CONNECTIONS})")
+        return True
+    except Exception as e:
+        print(f"⚠️ 비동기 Redis 연결 실패: {e}")
+        return False
+
+
+async def close_async_redis() -> None:
+    """비동기 Redis 커넥션 풀 정리 (앱 shutdown 시)"""
+    try:
+        await async_redis_client.aclose()
+        await async_redis_pool.disconnect()
+    except Exception as e:
+        print(f"⚠️ 비동기 Redis 종료 실패: {e}")
+
 
 # 세션 매니저 인스턴스
 session_manager = SessionManager()
+async_session_manager = AsyncSessionManager()
@@ -1,20 +1,78 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
 from fastapi import Depends
+from typing import AsyncIterator, Optional
 
 # SQLAlchemy 엔진 생성 - settings.DATABASE_URL 사용 (이미 인코딩됨)
 DATABASE_URL = settings.DATABASE_URL + "?charset=utf8mb4"
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL + "?charset=utf8mb4"
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=10,
-    max_overflow=20,
-    echo=True  # 개발 시에만 사용, 프로덕션에서는 False
-)
+# ⚙️ 엔진 프로필 (DB_PROFILE 환경변수로 선택, DB_* 설정으로 개별 항목 덮어쓰기)
+# - development: 기존 설정 그대로 (SQL 로그 출력)
+# - production: SQL 로그 끔 + 긴 recycle + SELECT 타임아웃
+ENGINE_PROFILES = {
+    "development": {
+        "echo": True,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_recycle": 300,
+        "pool_timeout": 30,
+        "statement_timeout_ms": 0,
+    },
+    "production": {
+        "echo": False,
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_recycle": 1800,
+        "pool_timeout": 10,
+        "statement_timeout_ms": 10000,
+    },
+}
+
+
+def get_engine_profile(name: Optional[str] = None) -> dict:
+    """프로필 + settings 개별 덮어쓰기 (None이 아닌 값만)"""
+    name = name or settings.DB_PROFILE
+    if name not in ENGINE_PROFILES:
+        raise ValueError(f"알 수 없는 DB_PROFILE: {name} (사용 가능: {', '.join(ENGINE_PROFILES)})")
+
+    profile = dict(ENGINE_PROFILES[name])
+    overrides = {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+    }
+    profile.update({key: value for key, value in overrides.items() if value is not None})
+    return profile
+
+
+def engine_options(profile: dict) -> dict:
+    """프로필 → create_engine / create_async_engine 인자"""
+    options = {
+        "pool_pre_ping": True,
+        "echo": profile["echo"],
+        "pool_size": profile["pool_size"],
+        "max_overflow": profile["max_overflow"],
+        "pool_recycle": profile["pool_recycle"],
+        "pool_timeout": profile["pool_timeout"],
+    }
+    # MySQL SELECT 실행 시간 제한 (pymysql / aiomysql 모두 init_command 지원)
+    if profile["statement_timeout_ms"]:
+        options["connect_args"] = {
+            "init_command": f"SET SESSION max_execution_time={int(profile['statement_timeout_ms'])}"
+        }
+    return options
+
+
+engine_profile = get_engine_profile()
+
+engine = create_engine(DATABASE_URL, **engine_options(engine_profile))
 
 # 세션 로컬 클래스
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -31,11 +89,39 @@ def get_db() -> Session:
     finally:
         db.close()
 
+
+# 🚀 비동기 엔진 (aiomysql) - async def 핸들러에서 이벤트 루프를 막지 않음
+# 처음 사용할 때 생성 (동기 엔드포인트만 쓰는 환경에서는 aiomysql 불필요)
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(engine_profile))
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """비동기 ORM 세션 의존성 (async def 엔드포인트에서 Depends로 사용)"""
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """비동기 엔진 커넥션 풀 정리 (앱 shutdown 시)"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
 # 테이블 생성 함수 (나중에 사용)
 def create_tables():
     """모든 테이블을 데이터베이스에 생성"""
     Base.metadata.create_all(bind=engine)
-    
+
 def get_db_dependency():
     """FastAPI Depends 래퍼 함수"""
-    return Depends(get_db)
\ No newline at end of file
+    return Depends(get_db)
@@ -71,18 +71,59 @@ def health_check():
 # -------------------------------
 # Startup 이벤트
 # -------------------------------
-@app.on_event("startup")
-async def startup_event():
+def _seed_geocode_cache():
+    from app.database.connection import SessionLocal
+    from app.services.geocode_cache import seed_geocode_cache_from_db
+    db = SessionLocal()
     try:
-        from qdrant_client import QdrantClient
-        client = QdrantClient(url="http://localhost:6333")
-        print("✅ Qdrant 연결 성공")
+        seed_geocode_cache_from_db(db)
     except Exception as e:
-        print(f"❌ Qdrant 연결 실패: {e}")
+        print(f"⚠️ 지오코딩 캐시 사전 적재 실패: {e}")
+    finally:
+        db.close()
+
+@app.on_event("startup")
+async def startup_event():
+    # 🔎 검색 서비스 warm-up (Qdrant 연결 + lexical 인덱스) - 백그라운드 스레드에서 실행
+    import asyncio
+    from app.services.retrieval import RetrievalService
+    asyncio.get_running_loop().run_in_executor(None, RetrievalService.warm_up)
+    
+    # 🔌 비동기 Redis 커넥션 풀 연결 확인
+    from app.core.session import check_async_redis
+    await check_async_redis()
+    
+    # 📝 대화 저장 워커 시작 + convers_id 시퀀스 준비 (백그라운드 스레드)
+    from app.utils.conversation_store import conversation_logger
+    conversation_logger.start()
+    asyncio.get_running_loop().run_in_executor(None, conversation_logger.seed_ids)
+    
+    # 📍 지오코딩 캐시 사전 적재 (DB 장소 좌표) - 백그라운드 스레드에서 실행
+    if settings.GEOCODE_CACHE_SEED_ON_STARTUP:
+        asyncio.get_running_loop().run_in_executor(None, _seed_geocode_cache)
     
     # ⭐️ CORS 설정 확인 로그 추가
     print("=" * 50)
     print("🌐 CORS 설정 확인:")
     print(f"  - localhost:3000 허용됨")
     print(f"  - Credentials: True")
-    print("=" * 50)
\ No newline at end of file
+    print("=" * 50)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # 📝 큐에 남은 대화 저장 후 워커 종료
+    import asyncio
+    from app.utils.conversation_store import conversation_logger
+    await asyncio.to_thread(conversation_logger.stop)
+    
+    # 🌐 외부 API 공유 HTTP 클라이언트 연결 정리
+    from app.core.http_client import close_http_clients
+    await close_http_clients()
+    
+    # 🔌 비동기 Redis 커넥션 풀 정리
+    from app.core.session import close_async_redis
+    await close_async_redis()
+    
+    # 🗄️ 비동기 DB 엔진 커넥션 풀 정리
+    from app.database.connection import dispose_async_engine
+    await dispose_async_engine()
@@ -86,9 +86,10 @@ class Bookmark(Base):
         return new_bm
 
     @classmethod
-    def delete_bookmark(cls, db: Session, bookmark_id: int, user_id: int) -> None:
+    def delete_bookmark(cls, db: Session, bookmark_id: int, user_id: int) -> dict:
         """
         북마크 삭제 (user_id 체크)
+        - 삭제된 북마크 정보를 반환 (취향 벡터 갱신 등에 사용)
         """
         q = db.query(cls).filter(
             cls.bookmark_id == bookmark_id,
@@ -98,8 +99,10 @@ class Bookmark(Base):
         if not obj:
             raise ValueError("Bookmark not found or not owned by this user")
 
+        deleted = obj.to_dict()
         db.delete(obj)
         db.commit()
+        return deleted
 
     def to_dict(self):
         """
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database.connection import Base
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        # 🚀 /chat/history keyset 페이지네이션 (user_id = ? ORDER BY datetime, convers_id)
+        Index("idx_conversations_user_datetime_id", "user_id", "datetime", "convers_id"),
+    )
     
     # 실제 테이블 구조에 맞춘 필드들
     convers_id = Column(Integer, primary_key=True, index=True)
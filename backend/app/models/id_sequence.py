@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, String
+from app.database.connection import Base
+
+class IdSequence(Base):
+    """
+    ID 시퀀스 테이블 (MySQL에는 SEQUENCE가 없으므로 행 1개 = 시퀀스 1개)
+    
+    next_id: 아직 아무도 예약하지 않은 다음 ID
+    conversation_store가 SELECT ... FOR UPDATE로 블록 단위 예약 (워커 간 충돌 없음)
+    """
+    __tablename__ = "id_sequences"
+    
+    name = Column(String(64), primary_key=True)
+    next_id = Column(BigInteger, nullable=False)
+    
+    def __repr__(self):
+        return f"<IdSequence(name={self.name}, next_id={self.next_id})>"
@@ -1,11 +1,15 @@
 # models/restaurant.py
-from sqlalchemy import Column, Integer, String, DECIMAL, Text
+from sqlalchemy import Column, Integer, String, DECIMAL, Text, Index
 from sqlalchemy.orm import relationship
 from app.database.connection import Base
 
 
 class Restaurant(Base):
     __tablename__ = "celeb_restaurants"
+    __table_args__ = (
+        # 🚀 /restaurants/nearby 바운딩 박스(BETWEEN) 사전 필터용
+        Index("idx_celeb_restaurants_lat_lng", "Latitude", "Longitude"),
+    )
 
     restaurant_id = Column(Integer, primary_key=True, index=True)
 
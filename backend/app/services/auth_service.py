@@ -2,7 +2,7 @@
 인증 서비스 (ORM 버전 - username 전용)
 """
 from app.core.security import verify_password, get_password_hash
-from app.core.session import session_manager
+from app.core.session import build_user_profile, session_manager
 from app.models.users import User
 from sqlalchemy.orm import Session
 
@@ -54,14 +54,10 @@ class AuthService:
         if not verify_password(password, user.password):
             raise Exception("아이디 또는 비밀번호가 올바르지 않습니다")
         
-        # 세션 생성
+        # 세션 생성 (프로필 전체 저장 → get_current_user에서 users 조회 생략)
         session_id = session_manager.create_session(
             user_id=user.user_id,
-            user_data={
-                'username': user.username,
-                'email': user.email,
-                'name': user.name
-            }
+            user_data=build_user_profile(user)
         )
         
         return session_id, user
@@ -5,19 +5,18 @@
 - Festival/Attraction/Restaurant 검색 안함
 - prompt3.py 사용 (열정적인 K-Drama 팬 가이드 톤)
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 import json
-import os
-import random
-import re
 import asyncio
-from langchain_openai import OpenAIEmbeddings
-from qdrant_client import QdrantClient
+import time
 from concurrent.futures import ThreadPoolExecutor
 
-from app.models.conversation import Conversation  
-from app.utils.openai_client import chat_with_gpt, chat_with_gpt_stream
+from app.utils.openai_client import chat_with_gpt, achat_with_gpt_stream
+from app.utils.conversation_store import conversation_logger, save_conversation
+from app.utils.sse import SSEChunkWriter
+from app.services.retrieval import RetrievalService, SearchHit
+from app.utils.intent import KCONTENT_INTENTS
 from app.utils.prompt3 import (
     KCONTENT_QUICK_PROMPT,
     KCONTENT_COMPARISON_PROMPT,
@@ -28,49 +27,6 @@ from app.utils.prompt3 import (
 
 class ChatKContentsService:
     
-    # 🎯 Qdrant 설정 (KContents만)
-    #QDRANT_URL = "http://172.17.0.1:6333"
-    QDRANT_URL = os.getenv("QDRANT_URL", "http://172.17.0.1:6333")
-    QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
-    
-    
-    KCONTENT_COLLECTION = "seoul-kcontents"
-    
-    # 🚀 임베딩 모델 캐싱 (재사용)
-    _embedding_model = None
-    
-    # 🚀 Qdrant 클라이언트 캐싱 (재사용)
-    _qdrant_client = None
-    
-    @staticmethod
-    def _get_embedding_model():
-        """임베딩 모델 싱글톤 패턴으로 재사용"""
-        if ChatKContentsService._embedding_model is None:
-            ChatKContentsService._embedding_model = OpenAIEmbeddings(model="text-embedding-ada-002")
-        return ChatKContentsService._embedding_model
-        
-    @staticmethod
-    def _get_qdrant_client():
-        """Qdrant 클라이언트 싱글톤 패턴으로 재사용 - 클라우드/로컬 자동 선택"""
-        if ChatKContentsService._qdrant_client is None:
-            # API 키 있으면 클라우드 모드
-            if ChatKContentsService.QDRANT_API_KEY:
-                ChatKContentsService._qdrant_client = QdrantClient(
-                    url=ChatKContentsService.QDRANT_URL,
-                    api_key=ChatKContentsService.QDRANT_API_KEY,
-                    timeout=60,
-                    prefer_grpc=False
-                )
-                print(f"✅ Qdrant Cloud 연결 (KContents): {ChatKContentsService.QDRANT_URL}")
-            else:
-                ChatKContentsService._qdrant_client = QdrantClient(
-                    url=ChatKContentsService.QDRANT_URL,
-                    timeout=60,
-                    prefer_grpc=False
-                )
-                print(f"✅ Qdrant Local 연결 (KContents): {ChatKContentsService.QDRANT_URL}")
-        return ChatKContentsService._qdrant_client
-    
     # ===== 🔧 검색어 개선 기능 =====
     
     @staticmethod
@@ -138,18 +94,7 @@ class ChatKContentsService:
         return list(set(variants))  # 중복 제거
     
     @staticmethod
-    def _calculate_keyword_overlap(query: str, title: str) -> float:
-        """키워드 겹치는 정도 계산"""
-        query_words = set(query.lower().split())
-        title_words = set(title.lower().split())
-        
-        overlap = len(query_words & title_words)
-        total = len(query_words | title_words)
-        
-        return overlap / total if total > 0 else 0
-    
-    @staticmethod
-    def _improved_search(query: str) -> Dict[str, Any]:
+    def _improved_search(query: str) -> Optional[SearchHit]:
         """🔧 현실적으로 개선된 K-Content 검색"""
         
         try:
@@ -165,54 +110,8 @@ class ChatKContentsService:
             search_variants = ChatKContentsService._expand_search_terms(normalized_query)
             print(f"🔧 검색 변형들: {search_variants}")
             
-            # 4. 모든 변형으로 검색
-            best_result = None
-            best_score = 0
-            
-            qdrant_client = ChatKContentsService._get_qdrant_client()
-            embedding_model = ChatKContentsService._get_embedding_model()
-            
-            for variant in search_variants:
-                try:
-                    query_embedding = embedding_model.embed_query(variant)
-                    
-                    search_results = qdrant_client.search(
-                        collection_name=ChatKContentsService.KCONTENT_COLLECTION,
-                        query_vector=query_embedding,
-                        limit=5,
-                        score_threshold=0.3,  # 낮은 임계값으로 더 많은 결과
-                        with_payload=True,
-                        with_vectors=False
-                    )
-                    
-                    for result in search_results:
-                        # Vector 유사도 + 키워드 매칭 점수
-                        vector_score = result.score
-                        
-                        # 🎯 metadata에서 drama_name으로 제목 추출
-                        metadata = result.payload.get("metadata", {})
-                        drama_name = metadata.get("drama_name", "")
-                        location_name = metadata.get("location_name", "")
-                        combined_title = f"{drama_name} {location_name}"
-                        
-                        keyword_score = ChatKContentsService._calculate_keyword_overlap(cleaned_query, combined_title)
-                        combined_score = vector_score * 0.8 + keyword_score * 0.2
-                        
-                        if combined_score > best_score:
-                            best_score = combined_score
-                            best_result = result
-                            print(f"✅ 더 좋은 결과: '{variant}' → 점수: {combined_score:.3f}")
-                
-                except Exception as e:
-                    print(f"⚠️ 변형 '{variant}' 검색 실패: {e}")
-                    continue
-            
-            # 5. 결과 반환 (임계값 0.4로 낮춤)
-            if best_result and best_score > 0.4:
-                return best_result
-            else:
-                print(f"❌ 유효한 결과 없음 (최고 점수: {best_score:.3f})")
-                return None
+            # 4. 통합 검색 서비스 (벡터 + BM25 하이브리드)
+            return RetrievalService.search_best(normalized_query, search_variants, "kcontent")
                 
         except Exception as e:
             print(f"❌ K-Content 검색 오류: {e}")
@@ -235,7 +134,7 @@ class ChatKContentsService:
                 return None
             
             # 🎯 payload.metadata에서 데이터 추출
-            kcontent_metadata = result.payload.get("metadata", {})
+            kcontent_metadata = result.metadata
             
             formatted_data = {
                 "content_id": kcontent_metadata.get("content_id", ""),
@@ -305,20 +204,13 @@ class ChatKContentsService:
                     temperature=0.7
                 )
                 
-                conversation = Conversation(
-                    user_id=user_id,
-                    question=message,
-                    response=ai_response
-                )
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = conversation_logger.log(user_id, message, ai_response)
                 
                 print(f"⏱️ 총 소요 시간: {time.time() - total_start:.3f}초\n")
                 
                 return {
                     "response": ai_response,
-                    "convers_id": conversation.convers_id,
+                    "convers_id": convers_id,
                     "kcontents": [],
                     "has_kcontents": False,
                     "map_markers": []
@@ -336,20 +228,13 @@ class ChatKContentsService:
                     temperature=0.7
                 )
                 
-                conversation = Conversation(
-                    user_id=user_id,
-                    question=message,
-                    response=ai_response
-                )
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = conversation_logger.log(user_id, message, ai_response)
                 
                 print(f"⏱️ 총 소요 시간: {time.time() - total_start:.3f}초\n")
                 
                 return {
                     "response": ai_response,
-                    "convers_id": conversation.convers_id,
+                    "convers_id": convers_id,
                     "kcontents": [],
                     "has_kcontents": False,
                     "map_markers": []
@@ -364,20 +249,13 @@ class ChatKContentsService:
                 
                 ai_response = ChatKContentsService._generate_random_response(random_kcontents)
                 
-                conversation = Conversation(
-                    user_id=user_id,
-                    question=message,
-                    response=ai_response
-                )
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = conversation_logger.log(user_id, message, ai_response)
                 
                 print(f"⏱️ 총 소요 시간: {time.time() - total_start:.3f}초\n")
                 
                 return {
                     "response": ai_response,
-                    "convers_id": conversation.convers_id,
+                    "convers_id": convers_id,
                     "results": random_kcontents,
                     "kcontents": random_kcontents,
                     "has_kcontents": len(random_kcontents) > 0,
@@ -405,14 +283,7 @@ class ChatKContentsService:
                 
                 # 4. DB 저장
                 step_start = time.time()
-                conversation = Conversation(
-                    user_id=user_id,
-                    question=message,
-                    response=ai_response
-                )
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = conversation_logger.log(user_id, message, ai_response)
                 print(f"⏱️ 4. DB 저장: {time.time() - step_start:.3f}초")
                 
                 print(f"⏱️ 총 소요 시간: {time.time() - total_start:.3f}초\n")
@@ -425,7 +296,7 @@ class ChatKContentsService:
                 # 5. 응답 구성
                 return {
                     "response": ai_response,
-                    "convers_id": conversation.convers_id,
+                    "convers_id": convers_id,
                     "results": best_result,
                     "kcontents": best_result,
                     "has_kcontents": len(best_result) > 0,
@@ -441,6 +312,8 @@ class ChatKContentsService:
         🌊 K-Content 스트리밍 메시지 처리 - 제너레이터 반환
         """
         try:
+            request_started = time.perf_counter()  # ⏱️ TTFT 측정 기준
+            
             # 🚀 1. 질문 타입 분석
             analysis = ChatKContentsService._analyze_message_fast(message)
             question_type = analysis.get('type', 'kcontent_search')
@@ -458,19 +331,15 @@ class ChatKContentsService:
                 prompt = KCONTENT_COMPARISON_PROMPT.format(message=message)
                 
                 # 스트리밍 응답
-                full_response = ""
-                for chunk in chat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=300, temperature=0.7):
-                    full_response += chunk
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                    await asyncio.sleep(0.02)
+                sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatKContentsService:{question_type}")
+                async for frame in sse_writer.stream(achat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=300, temperature=0.7)):
+                    yield frame
+                full_response = sse_writer.full_response
                 
                 # 대화 저장
-                conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, full_response)
                 
-                yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': conversation.convers_id, 'kcontents': [], 'has_kcontents': False}, ensure_ascii=False)}\n\n"
+                yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': convers_id, 'kcontents': [], 'has_kcontents': False}, ensure_ascii=False)}\n\n"
                 return
             
             # 💡 일반 조언/팁 질문 처리
@@ -480,40 +349,33 @@ class ChatKContentsService:
                 prompt = KCONTENT_ADVICE_PROMPT.format(message=message)
                 
                 # 스트리밍 응답
-                full_response = ""
-                for chunk in chat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=350, temperature=0.7):
-                    full_response += chunk
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                    await asyncio.sleep(0.02)
+                sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatKContentsService:{question_type}")
+                async for frame in sse_writer.stream(achat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=350, temperature=0.7)):
+                    yield frame
+                full_response = sse_writer.full_response
                 
                 # 대화 저장
-                conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, full_response)
                 
-                yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': conversation.convers_id, 'kcontents': [], 'has_kcontents': False}, ensure_ascii=False)}\n\n"
+                yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': convers_id, 'kcontents': [], 'has_kcontents': False}, ensure_ascii=False)}\n\n"
                 return
             
             # 🎯 랜덤 추천 처리
             elif is_random or question_type == "random_recommendation":
                 yield f"data: {json.dumps({'type': 'random', 'message': '🎲 Finding amazing K-Drama locations...'}, ensure_ascii=False)}\n\n"
                 
-                random_kcontents = ChatKContentsService._get_random_kcontents(count=10)
+                random_kcontents = await asyncio.to_thread(ChatKContentsService._get_random_kcontents, count=10)
                 ai_response = ChatKContentsService._generate_random_response(random_kcontents)
                 
                 # 대화 저장
-                conversation = Conversation(user_id=user_id, question=message, response=ai_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, ai_response)
                 
                 # 🗺️ 랜덤 추천 마커 디버깅
                 print(f"🗺️ 랜덤 마커 생성 시작: kcontents 개수={len(random_kcontents)}")
                 map_markers = ChatKContentsService._create_map_markers(random_kcontents)
                 print(f"🗺️ 랜덤 생성된 마커: {len(map_markers)}개")
                 
-                yield f"data: {json.dumps({'type': 'done', 'full_response': ai_response, 'results': random_kcontents, 'kcontents': random_kcontents, 'convers_id': conversation.convers_id, 'has_kcontents': True, 'map_markers': map_markers}, ensure_ascii=False)}\n\n"
+                yield f"data: {json.dumps({'type': 'done', 'full_response': ai_response, 'results': random_kcontents, 'kcontents': random_kcontents, 'convers_id': convers_id, 'has_kcontents': True, 'map_markers': map_markers}, ensure_ascii=False)}\n\n"
                 return
             
             # 🚀 특정 K-Content 검색 (기본 동작)
@@ -521,7 +383,7 @@ class ChatKContentsService:
                 yield f"data: {json.dumps({'type': 'searching', 'message': '🔍 Searching for K-Drama location...'}, ensure_ascii=False)}\n\n"
                 
                 # K-Content 검색
-                kcontent = ChatKContentsService._search_best_kcontent(keyword)
+                kcontent = await asyncio.to_thread(ChatKContentsService._search_best_kcontent, keyword)
                 
                 if not kcontent:
                     yield f"data: {json.dumps({'type': 'error', 'message': 'Sorry, I could not find that K-Drama location. 😅'}, ensure_ascii=False)}\n\n"
@@ -545,17 +407,13 @@ class ChatKContentsService:
                 )
                 
                 # 스트리밍 응답
-                full_response = ""
-                for chunk in chat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=250, temperature=0.6):
-                    full_response += chunk
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                    await asyncio.sleep(0.02)
+                sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatKContentsService:{question_type}")
+                async for frame in sse_writer.stream(achat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=250, temperature=0.6)):
+                    yield frame
+                full_response = sse_writer.full_response
                 
                 # 대화 저장
-                conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, full_response)
                 
                 # 🗺️ 지도 마커 생성 - 디버깅 로그 추가!
                 print(f"🗺️ 마커 생성 시작: kcontent 데이터 확인")
@@ -574,7 +432,7 @@ class ChatKContentsService:
                 completion_data = {
                     'type': 'done',
                     'full_response': full_response,
-                    'convers_id': conversation.convers_id,
+                    'convers_id': convers_id,
                     'result': kcontent,
                     'results': [kcontent],
                     'kcontents': [kcontent],
@@ -596,86 +454,11 @@ class ChatKContentsService:
     @staticmethod
     def _analyze_message_fast(message: str) -> Dict[str, Any]:
         """
-        🚀 초고속 키워드 분석 - K-Content 질문 타입 자동 분류
+        🚀 초고속 키워드 분석 - K-Content 질문 타입 자동 분류 (사전 컴파일된 의도 분류기)
         """
         try:
-            message_lower = message.lower().strip()
-            
             print(f"\n🔍 K-Content 질문 분석 시작: '{message}'")
-            
-            # === 수량 추출 ===
-            import re
-            number_patterns = [
-                r'(\d+)곳', r'(\d+)개', r'(\d+)가지',
-                r'(\d+)\s*places?', r'(\d+)\s*spots?', r'(\d+)\s*locations?'
-            ]
-            
-            extracted_count = None
-            for pattern in number_patterns:
-                match = re.search(pattern, message_lower)
-                if match:
-                    extracted_count = int(match.group(1))
-                    print(f"   ✅ 수량 발견: {extracted_count}개")
-                    break
-            
-            # === 비교 질문 감지 ===
-            comparison_patterns = [
-                ' vs ', 'vs.', ' versus ', 'which one', 'which is better', 'compare'
-            ]
-            for pattern in comparison_patterns:
-                if pattern in message_lower:
-                    return {
-                        "type": "comparison",
-                        "keyword": message,
-                        "count": extracted_count
-                    }
-            
-            # === 일반 조언/팁 질문 감지 ===
-            advice_patterns = [
-                'tip', 'tips', 'advice', '팁', '조언',
-                'how to', '어떻게', '방법',
-                'what should i know', '알아야', '준비',
-                'etiquette', '에티켓', 'visit', '방문'
-            ]
-            
-            has_advice_keyword = any(kw in message_lower for kw in advice_patterns)
-            
-            # K-Drama 관련 키워드가 없으면 조언 질문
-            drama_keywords = [
-                'drama', 'filming', 'location', 'scene',
-                '드라마', '촬영지', '장면', '장소'
-            ]
-            has_drama = any(kw in message_lower for kw in drama_keywords)
-            
-            if has_advice_keyword and not has_drama:
-                return {
-                    "type": "general_advice",
-                    "keyword": message,
-                    "count": extracted_count
-                }
-            
-            # === 추천 질문 감지 ===
-            recommendation_patterns = [
-                'recommend', 'suggestion', 'suggest', '추천',
-                'best', 'top', 'popular', '인기'
-            ]
-            
-            has_recommendation = any(kw in message_lower for kw in recommendation_patterns)
-            
-            if has_recommendation or extracted_count:
-                return {
-                    "type": "recommendation",
-                    "keyword": message,
-                    "count": extracted_count or 10
-                }
-            
-            # === 특정 K-Content 검색 (기본) ===
-            keyword = ChatKContentsService._extract_keyword_simple(message)
-            return {
-                "type": "kcontent_search",
-                "keyword": keyword,
-                "count": extracted_count
-            }
+            return KCONTENT_INTENTS.classify(message, ChatKContentsService._extract_keyword_simple)
             
         except Exception as e:
             print(f"❌ 키워드 추출 오류: {e}")
@@ -710,33 +493,16 @@ class ChatKContentsService:
         try:
             print(f"🎲 랜덤 K-Content {count}개 추천 시작...")
             
-            qdrant_client = ChatKContentsService._get_qdrant_client()
-            
-            fetch_count = min(count * 5, 100)
+            selected_hits = RetrievalService.random_hits("kcontent", count)
             
-            scroll_result = qdrant_client.scroll(
-                collection_name=ChatKContentsService.KCONTENT_COLLECTION,
-                limit=fetch_count,
-                offset=random.randint(0, 50),
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            points = scroll_result[0]
-            
-            if not points:
+            if not selected_hits:
                 print(f"❌ K-Content를 가져올 수 없습니다")
                 return []
             
-            print(f"📊 가져온 K-Content: {len(points)}개")
-            
-            random.shuffle(points)
-            selected_points = points[:count]
-            
             kcontents = []
-            for point in selected_points:
+            for hit in selected_hits:
                 # 🎯 payload.metadata에서 데이터 추출
-                kcontent_metadata = point.payload.get("metadata", {})
+                kcontent_metadata = hit.metadata
                 
                 formatted_data = {
                     "content_id": kcontent_metadata.get("content_id"),
@@ -846,20 +612,3 @@ class ChatKContentsService:
         response_messages = [{"role": "user", "content": prompt}]
         
         return chat_with_gpt(response_messages, max_tokens=250, temperature=0.6)
-    
-    @staticmethod
-    def get_conversation_history(db: Session, user_id: int, limit: int = 50) -> List[Dict]:
-        """대화 히스토리 조회"""
-        conversations = db.query(Conversation).filter(
-            Conversation.user_id == user_id
-        ).order_by(Conversation.datetime.desc()).limit(limit).all()
-        
-        return [
-            {
-                "conversation_id": conv.convers_id,
-                "message": conv.question,
-                "response": conv.response,
-                "created_at": conv.datetime.isoformat()
-            }
-            for conv in reversed(conversations)
-        ]
\ No newline at end of file
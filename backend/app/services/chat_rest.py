@@ -5,19 +5,18 @@
 - 3-way 병렬 검색
 - prompt2.py 사용 (영어, 전문가/친절 톤)
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 import json
-import os
-import random
-import re
 import asyncio
-from langchain_openai import OpenAIEmbeddings
-from qdrant_client import QdrantClient
+import time
 from concurrent.futures import ThreadPoolExecutor
 
-from app.models.conversation import Conversation  
-from app.utils.openai_client import chat_with_gpt, chat_with_gpt_stream
+from app.utils.openai_client import chat_with_gpt, achat_with_gpt_stream
+from app.utils.conversation_store import conversation_logger, save_conversation
+from app.utils.sse import SSEChunkWriter
+from app.services.retrieval import RetrievalService, SearchHit
+from app.utils.intent import REST_INTENTS, RESTAURANT_KEYWORDS
 from app.utils.prompt2 import (
     # Restaurant prompts (전문가 톤)
     RESTAURANT_QUICK_PROMPT,
@@ -38,52 +37,6 @@ from app.utils.prompt2 import (
 
 class ChatRestService:
     
-    # 🎯 Qdrant 설정 (3개 컬렉션 모두 사용)
-    #QDRANT_URL = "http://172.17.0.1:6333"
-    QDRANT_URL = os.getenv("QDRANT_URL", "http://172.17.0.1:6333")
-    QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
-    
-    FESTIVAL_COLLECTION = "seoul-festival"
-    ATTRACTION_COLLECTION = "seoul-attraction"
-    RESTAURANT_COLLECTION = "seoul-restaurant"
-    
-    # 🚀 임베딩 모델 캐싱 (재사용)
-    _embedding_model = None
-    
-    # 🚀 Qdrant 클라이언트 캐싱 (재사용)
-    _qdrant_client = None
-    
-    @staticmethod
-    def _get_embedding_model():
-        """임베딩 모델 싱글톤 패턴으로 재사용"""
-        if ChatRestService._embedding_model is None:
-            ChatRestService._embedding_model = OpenAIEmbeddings(model="text-embedding-ada-002")
-        return ChatRestService._embedding_model
-        
-    @staticmethod
-    def _get_qdrant_client():
-        """Qdrant 클라이언트 싱글톤 패턴으로 재사용 - 클라우드/로컬 자동 선택"""
-        if ChatRestService._qdrant_client is None:
-            # API 키 있으면 클라우드 모드
-            if ChatRestService.QDRANT_API_KEY:
-                ChatRestService._qdrant_client = QdrantClient(
-                    url=ChatRestService.QDRANT_URL,
-                    api_key=ChatRestService.QDRANT_API_KEY,
-                    timeout=60,
-                    prefer_grpc=False
-                )
-                print(f"✅ Qdrant Cloud 연결 (Restaurant): {ChatRestService.QDRANT_URL}")
-            else:
-                ChatRestService._qdrant_client = QdrantClient(
-                    url=ChatRestService.QDRANT_URL,
-                    timeout=60,
-                    prefer_grpc=False
-                )
-                print(f"✅ Qdrant Local 연결 (Restaurant): {ChatRestService.QDRANT_URL}")
-        return ChatRestService._qdrant_client        
-    
-    
-    
     # ===== 🔧 검색어 개선 기능 =====
     
     @staticmethod
@@ -183,18 +136,7 @@ class ChatRestService:
         return list(set(variants))  # 중복 제거
     
     @staticmethod
-    def _calculate_keyword_overlap(query: str, title: str) -> float:
-        """키워드 겹치는 정도 계산"""
-        query_words = set(query.lower().split())
-        title_words = set(title.lower().split())
-        
-        overlap = len(query_words & title_words)
-        total = len(query_words | title_words)
-        
-        return overlap / total if total > 0 else 0
-    
-    @staticmethod
-    def _improved_search(query: str, search_type: str = "attraction") -> Dict[str, Any]:
+    def _improved_search(query: str, search_type: str = "attraction") -> Optional[SearchHit]:
         """🔧 현실적으로 개선된 검색 (통합 버전)"""
         
         try:
@@ -210,67 +152,8 @@ class ChatRestService:
             search_variants = ChatRestService._expand_search_terms(normalized_query)
             print(f"🔧 검색 변형들: {search_variants}")
             
-            # 4. 모든 변형으로 검색
-            best_result = None
-            best_score = 0
-            
-            qdrant_client = ChatRestService._get_qdrant_client()
-            embedding_model = ChatRestService._get_embedding_model()
-            
-            # 🎯 컬렉션 선택
-            if search_type == "restaurant":
-                collection_name = ChatRestService.RESTAURANT_COLLECTION
-            elif search_type == "festival":
-                collection_name = ChatRestService.FESTIVAL_COLLECTION
-            else:
-                collection_name = ChatRestService.ATTRACTION_COLLECTION
-            
-            for variant in search_variants:
-                try:
-                    query_embedding = embedding_model.embed_query(variant)
-                    
-                    search_results = qdrant_client.search(
-                        collection_name=collection_name,
-                        query_vector=query_embedding,
-                        limit=5,
-                        score_threshold=0.3,  # 낮은 임계값으로 더 많은 결과
-                        with_payload=True,
-                        with_vectors=False
-                    )
-                    
-                    for result in search_results:
-                        # Vector 유사도 + 키워드 매칭 점수
-                        vector_score = result.score
-                        
-                        # 타입별로 제목 추출
-                        if search_type == "restaurant":
-                            metadata = result.payload.get("metadata", {})
-                            title = metadata.get("name", "")
-                        elif search_type == "festival":
-                            metadata = result.payload.get("metadata", {})
-                            title = metadata.get("title", "")
-                        else:  # attraction
-                            metadata = result.payload.get("metadata", {})
-                            title = metadata.get("title", "")
-                            
-                        keyword_score = ChatRestService._calculate_keyword_overlap(cleaned_query, title)
-                        combined_score = vector_score * 0.8 + keyword_score * 0.2
-                        
-                        if combined_score > best_score:
-                            best_score = combined_score
-                            best_result = result
-                            print(f"✅ 더 좋은 결과: '{variant}' → 점수: {combined_score:.3f}")
-                
-                except Exception as e:
-                    print(f"⚠️ 변형 '{variant}' 검색 실패: {e}")
-                    continue
-            
-            # 5. 결과 반환 (임계값 0.5)
-            if best_result and best_score > 0.5:
-                return best_result
-            else:
-                print(f"❌ 유효한 결과 없음 (최고 점수: {best_score:.3f})")
-                return None
+            # 4. 통합 검색 서비스 (벡터 + BM25 하이브리드)
+            return RetrievalService.search_best(normalized_query, search_variants, search_type)
                 
         except Exception as e:
             print(f"❌ 개선된 검색 오류: {e}")
@@ -293,8 +176,8 @@ class ChatRestService:
                 return None
             
             # metadata에서 데이터 추출
-            metadata = result.payload.get("metadata", {})
-            page_content = result.payload.get("page_content", "")
+            metadata = result.metadata
+            page_content = result.page_content
             
             formatted_data = {
                 "id": str(metadata.get("restaurant_id", "")),
@@ -330,7 +213,7 @@ class ChatRestService:
                 print(f"🔍 축제 검색 결과 없음: '{keyword}'")
                 return None
             
-            festival_data = result.payload.get("metadata", {})
+            festival_data = result.metadata
             
             formatted_data = {
                 "festival_id": festival_data.get("festival_id", festival_data.get("row")),
@@ -368,7 +251,7 @@ class ChatRestService:
                 print(f"🔍 관광명소 검색 결과 없음: '{keyword}'")
                 return None
             
-            attraction_data = result.payload.get("metadata", {})
+            attraction_data = result.metadata
             
             formatted_data = {
                 "attr_id": attraction_data.get("attr_id", ""),
@@ -442,20 +325,13 @@ class ChatRestService:
                     temperature=0.7
                 )
                 
-                conversation = Conversation(
-                    user_id=user_id,
-                    question=message,
-                    response=ai_response
-                )
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = conversation_logger.log(user_id, message, ai_response)
                 
                 print(f"⏱️ 총 소요 시간: {time.time() - total_start:.3f}초\n")
                 
                 return {
                     "response": ai_response,
-                    "convers_id": conversation.convers_id,
+                    "convers_id": convers_id,
                     "restaurants": [],
                     "festivals": [],
                     "attractions": [],
@@ -481,20 +357,13 @@ class ChatRestService:
                     temperature=0.7
                 )
                 
-                conversation = Conversation(
-                    user_id=user_id,
-                    question=message,
-                    response=ai_response
-                )
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = conversation_logger.log(user_id, message, ai_response)
                 
                 print(f"⏱️ 총 소요 시간: {time.time() - total_start:.3f}초\n")
                 
                 return {
                     "response": ai_response,
-                    "convers_id": conversation.convers_id,
+                    "convers_id": convers_id,
                     "restaurants": [],
                     "festivals": [],
                     "attractions": [],
@@ -513,20 +382,13 @@ class ChatRestService:
                 
                 ai_response = ChatRestService._generate_random_response(random_attractions)
                 
-                conversation = Conversation(
-                    user_id=user_id,
-                    question=message,
-                    response=ai_response
-                )
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = conversation_logger.log(user_id, message, ai_response)
                 
                 print(f"⏱️ 총 소요 시간: {time.time() - total_start:.3f}초\n")
                 
                 return {
                     "response": ai_response,
-                    "convers_id": conversation.convers_id,
+                    "convers_id": convers_id,
                     "results": random_attractions,
                     "festivals": [],
                     "attractions": random_attractions,
@@ -579,14 +441,7 @@ class ChatRestService:
                 
                 # 4. DB 저장
                 step_start = time.time()
-                conversation = Conversation(
-                    user_id=user_id,
-                    question=message,
-                    response=ai_response
-                )
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = conversation_logger.log(user_id, message, ai_response)
                 print(f"⏱️ 4. DB 저장: {time.time() - step_start:.3f}초")
                 
                 print(f"⏱️ 총 소요 시간: {time.time() - total_start:.3f}초\n")
@@ -599,7 +454,7 @@ class ChatRestService:
                 # 5. 응답 구성
                 return {
                     "response": ai_response,
-                    "convers_id": conversation.convers_id,
+                    "convers_id": convers_id,
                     "results": best_result,
                     "festivals": [r for r in best_result if r.get('type') == 'festival'],
                     "attractions": [r for r in best_result if r.get('type') == 'attraction'],
@@ -619,6 +474,8 @@ class ChatRestService:
         🌊 통합 스트리밍 메시지 처리 - 제너레이터 반환
         """
         try:
+            request_started = time.perf_counter()  # ⏱️ TTFT 측정 기준
+            
             # 🚀 1. 질문 타입 분석
             analysis = ChatRestService._analyze_message_fast(message)
             question_type = analysis.get('type', 'place_search')
@@ -643,19 +500,15 @@ class ChatRestService:
                     prompt = GENERAL_COMPARISON_PROMPT.format(message=message)
                 
                 # 스트리밍 응답
-                full_response = ""
-                for chunk in chat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=300, temperature=0.7):
-                    full_response += chunk
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                    await asyncio.sleep(0.02)
+                sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatRestService:{question_type}")
+                async for frame in sse_writer.stream(achat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=300, temperature=0.7)):
+                    yield frame
+                full_response = sse_writer.full_response
                 
                 # 대화 저장
-                conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, full_response)
                 
-                yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': conversation.convers_id, 'restaurants': [], 'festivals': [], 'attractions': [], 'has_restaurants': False, 'has_festivals': False, 'has_attractions': False}, ensure_ascii=False)}\n\n"
+                yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': convers_id, 'restaurants': [], 'festivals': [], 'attractions': [], 'has_restaurants': False, 'has_festivals': False, 'has_attractions': False}, ensure_ascii=False)}\n\n"
                 return
             
             # 💡 일반 조언/팁 질문 처리
@@ -669,50 +522,40 @@ class ChatRestService:
                     prompt = GENERAL_ADVICE_PROMPT.format(message=message)
                 
                 # 스트리밍 응답
-                full_response = ""
-                for chunk in chat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=350, temperature=0.7):
-                    full_response += chunk
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                    await asyncio.sleep(0.02)
+                sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatRestService:{question_type}")
+                async for frame in sse_writer.stream(achat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=350, temperature=0.7)):
+                    yield frame
+                full_response = sse_writer.full_response
                 
                 # 대화 저장
-                conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, full_response)
                 
-                yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': conversation.convers_id, 'restaurants': [], 'festivals': [], 'attractions': [], 'has_restaurants': False, 'has_festivals': False, 'has_attractions': False}, ensure_ascii=False)}\n\n"
+                yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': convers_id, 'restaurants': [], 'festivals': [], 'attractions': [], 'has_restaurants': False, 'has_festivals': False, 'has_attractions': False}, ensure_ascii=False)}\n\n"
                 return
             
             # 🎯 랜덤 추천 처리
             elif is_random or question_type == "random_recommendation":
                 yield f"data: {json.dumps({'type': 'random', 'message': '🎲 Finding great places...'}, ensure_ascii=False)}\n\n"
                 
-                random_attractions = ChatRestService._get_random_attractions(count=10)
+                random_attractions = await asyncio.to_thread(ChatRestService._get_random_attractions, count=10)
                 ai_response = ChatRestService._generate_random_response(random_attractions)
                 
                 # 대화 저장
-                conversation = Conversation(user_id=user_id, question=message, response=ai_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, ai_response)
                 
-                yield f"data: {json.dumps({'type': 'done', 'full_response': ai_response, 'results': random_attractions, 'attractions': random_attractions, 'convers_id': conversation.convers_id, 'has_festivals': False, 'has_attractions': True, 'has_restaurants': False}, ensure_ascii=False)}\n\n"
+                yield f"data: {json.dumps({'type': 'done', 'full_response': ai_response, 'results': random_attractions, 'attractions': random_attractions, 'convers_id': convers_id, 'has_festivals': False, 'has_attractions': True, 'has_restaurants': False}, ensure_ascii=False)}\n\n"
                 return
             
             # 🚀 특정 장소 검색 (기본 동작 - 3-way 병렬 검색)
             else:
                 yield f"data: {json.dumps({'type': 'searching', 'message': '🔍 Searching for information...'}, ensure_ascii=False)}\n\n"
                 
-                # 3-way 병렬 검색
-                with ThreadPoolExecutor(max_workers=3) as executor:
-                    festival_future = executor.submit(ChatRestService._search_best_festival, keyword)
-                    attraction_future = executor.submit(ChatRestService._search_best_attraction, keyword)
-                    restaurant_future = executor.submit(ChatRestService._search_best_restaurant, keyword)
-                    
-                    festival = festival_future.result()
-                    attraction = attraction_future.result()
-                    restaurant = restaurant_future.result()
+                # 3-way 병렬 검색 (스레드 풀 - 이벤트 루프 비차단)
+                festival, attraction, restaurant = await asyncio.gather(
+                    asyncio.to_thread(ChatRestService._search_best_festival, keyword),
+                    asyncio.to_thread(ChatRestService._search_best_attraction, keyword),
+                    asyncio.to_thread(ChatRestService._search_best_restaurant, keyword),
+                )
                 
                 # 결과 수집
                 results = []
@@ -768,17 +611,13 @@ class ChatRestService:
                     )
                 
                 # 스트리밍 응답
-                full_response = ""
-                for chunk in chat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=250, temperature=0.6):
-                    full_response += chunk
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                    await asyncio.sleep(0.02)
+                sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatRestService:{question_type}")
+                async for frame in sse_writer.stream(achat_with_gpt_stream([{"role": "user", "content": prompt}], max_tokens=250, temperature=0.6)):
+                    yield frame
+                full_response = sse_writer.full_response
                 
                 # 대화 저장
-                conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, full_response)
                 
                 # 지도 마커 생성
                 map_markers = ChatRestService._create_map_markers([result])
@@ -787,7 +626,7 @@ class ChatRestService:
                 completion_data = {
                     'type': 'done',
                     'full_response': full_response,
-                    'convers_id': conversation.convers_id,
+                    'convers_id': convers_id,
                     'result': result,
                     'results': [result],
                     'festivals': [r for r in [result] if r.get('type') == 'festival'],
@@ -812,98 +651,16 @@ class ChatRestService:
     @staticmethod
     def _is_restaurant_query(message: str) -> bool:
         """메시지가 레스토랑 관련 질문인지 판단"""
-        restaurant_keywords = [
-            'restaurant', 'food', 'eat', 'dining', 'meal', 'cuisine', 'dish',
-            '레스토랑', '음식', '먹', '식당', '맛집', '요리', '음식점'
-        ]
-        
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in restaurant_keywords)
+        return RESTAURANT_KEYWORDS.search(message.lower())
     
     @staticmethod
     def _analyze_message_fast(message: str) -> Dict[str, Any]:
         """
-        🚀 초고속 키워드 분석 - 질문 타입 자동 분류
+        🚀 초고속 키워드 분석 - 질문 타입 자동 분류 (사전 컴파일된 의도 분류기)
         """
         try:
-            message_lower = message.lower().strip()
-            
             print(f"\n🔍 질문 분석 시작: '{message}'")
-            
-            # === 수량 추출 ===
-            import re
-            number_patterns = [
-                r'(\d+)곳', r'(\d+)개', r'(\d+)가지',
-                r'(\d+)\s*places?', r'(\d+)\s*spots?'
-            ]
-            
-            extracted_count = None
-            for pattern in number_patterns:
-                match = re.search(pattern, message_lower)
-                if match:
-                    extracted_count = int(match.group(1))
-                    print(f"   ✅ 수량 발견: {extracted_count}개")
-                    break
-            
-            # === 비교 질문 감지 ===
-            comparison_patterns = [
-                ' vs ', 'vs.', ' versus ', 'which one', 'which is better', 'compare'
-            ]
-            for pattern in comparison_patterns:
-                if pattern in message_lower:
-                    return {
-                        "type": "comparison",
-                        "keyword": message,
-                        "count": extracted_count
-                    }
-            
-            # === 일반 조언/팁 질문 감지 ===
-            advice_patterns = [
-                'tip', 'tips', 'advice', '팁', '조언',
-                'how to', '어떻게', '방법',
-                'what should i know', '알아야', '준비',
-                'culture', '문화', 'etiquette', '에티켓'
-            ]
-            
-            has_advice_keyword = any(kw in message_lower for kw in advice_patterns)
-            
-            place_keywords = [
-                'palace', 'temple', 'tower', 'museum', 'park',
-                '궁', '사찰', '타워', '박물관', '공원',
-                'restaurant', 'food', '레스토랑', '음식', '맛집'
-            ]
-            has_place = any(place in message_lower for place in place_keywords)
-            
-            if has_advice_keyword and not has_place:
-                return {
-                    "type": "general_advice",
-                    "keyword": message,
-                    "count": extracted_count
-                }
-            
-            # === 추천 질문 감지 ===
-            recommendation_patterns = [
-                'recommend', 'suggestion', 'suggest', '추천',
-                'places to visit', 'where to go', '가볼',
-                'best places', 'top places', '명소'
-            ]
-            
-            has_recommendation = any(kw in message_lower for kw in recommendation_patterns)
-            
-            if has_recommendation or extracted_count:
-                return {
-                    "type": "recommendation",
-                    "keyword": message,
-                    "count": extracted_count or 10
-                }
-            
-            # === 특정 장소 검색 (기본) ===
-            keyword = ChatRestService._extract_keyword_simple(message)
-            return {
-                "type": "place_search",
-                "keyword": keyword,
-                "count": extracted_count
-            }
+            return REST_INTENTS.classify(message, ChatRestService._extract_keyword_simple)
             
         except Exception as e:
             print(f"❌ 키워드 추출 오류: {e}")
@@ -938,32 +695,15 @@ class ChatRestService:
         try:
             print(f"🎲 랜덤 관광명소 {count}개 추천 시작...")
             
-            qdrant_client = ChatRestService._get_qdrant_client()
-            
-            fetch_count = min(count * 5, 100)
+            selected_hits = RetrievalService.random_hits("attraction", count)
             
-            scroll_result = qdrant_client.scroll(
-                collection_name=ChatRestService.ATTRACTION_COLLECTION,
-                limit=fetch_count,
-                offset=random.randint(0, 50),
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            points = scroll_result[0]
-            
-            if not points:
+            if not selected_hits:
                 print(f"❌ 관광명소를 가져올 수 없습니다")
                 return []
             
-            print(f"📊 가져온 관광명소: {len(points)}개")
-            
-            random.shuffle(points)
-            selected_points = points[:count]
-            
             attractions = []
-            for point in selected_points:
-                attraction_data = point.payload.get("metadata", {})
+            for hit in selected_hits:
+                attraction_data = hit.metadata
                 
                 formatted_data = {
                     "attr_id": attraction_data.get("attr_id"),
@@ -1094,20 +834,3 @@ class ChatRestService:
         response_messages = [{"role": "user", "content": prompt}]
         
         return chat_with_gpt(response_messages, max_tokens=250, temperature=0.6)
-    
-    @staticmethod
-    def get_conversation_history(db: Session, user_id: int, limit: int = 50) -> List[Dict]:
-        """대화 히스토리 조회"""
-        conversations = db.query(Conversation).filter(
-            Conversation.user_id == user_id
-        ).order_by(Conversation.datetime.desc()).limit(limit).all()
-        
-        return [
-            {
-                "conversation_id": conv.convers_id,
-                "message": conv.question,
-                "response": conv.response,
-                "created_at": conv.datetime.isoformat()
-            }
-            for conv in reversed(conversations)
-        ]
\ No newline at end of file
@@ -1,21 +1,18 @@
 # app/services/chat_service.py - 다중 검색 패턴 확장 버전 + 포맷팅 강제
 from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
-import json
-import os
-import random
-import re
 import asyncio
+import time
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings
-from qdrant_client import QdrantClient
-from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv()
 
-from app.models.conversation import Conversation  
 from app.models.festival import Festival
-from app.utils.openai_client import chat_with_gpt, chat_with_gpt_stream
+from app.utils.openai_client import chat_with_gpt, achat_with_gpt_stream
+from app.utils.conversation_store import save_conversation
+from app.utils.sse import SSEChunkWriter, sse_event
+from app.services.retrieval import RetrievalService, SearchHit
+from app.utils.intent import LUMI_INTENTS, LUMI_KCONTENT_INTENTS, RESTAURANT_KEYWORDS
 from app.utils.prompts import (
     KPOP_FESTIVAL_QUICK_PROMPT,
     KPOP_ATTRACTION_QUICK_PROMPT,
@@ -31,19 +28,6 @@ from app.utils.prompts import (
 
 class ChatService:
     
-    # 🎯 설정값들
-    QDRANT_URL = os.getenv("QDRANT_URL", "http://172.17.0.1:6333")
-    QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
-    
-    COLLECTION_NAME = "seoul-festival"
-    ATTRACTION_COLLECTION = "seoul-attraction"
-    RESTAURANT_COLLECTION = "seoul-restaurant"
-    KCONTENT_COLLECTION = "seoul-kcontents"  # 🎬 K-Content 추가
-    
-    # 🚀 캐싱된 인스턴스들
-    _embedding_model = None
-    _qdrant_client = None
-    
     # 🎨 포맷팅 강제 System Message - 추가!
     FORMATTING_SYSTEM_MESSAGE = {
         "role": "system",
@@ -73,34 +57,6 @@ Example format:
 ALWAYS structure your response this way for maximum readability!"""
     }
     
-    @staticmethod
-    def _get_embedding_model():
-        """임베딩 모델 싱글톤"""
-        if ChatService._embedding_model is None:
-            ChatService._embedding_model = OpenAIEmbeddings(model="text-embedding-ada-002")
-        return ChatService._embedding_model
-    
-    @staticmethod
-    def _get_qdrant_client():
-        """Qdrant 클라이언트 싱글톤"""
-        if ChatService._qdrant_client is None:
-            if ChatService.QDRANT_API_KEY:
-                ChatService._qdrant_client = QdrantClient(
-                    url=ChatService.QDRANT_URL,
-                    api_key=ChatService.QDRANT_API_KEY,
-                    timeout=60,
-                    prefer_grpc=False
-                )
-                print(f"✅ Qdrant Cloud 연결: {ChatService.QDRANT_URL}")
-            else:
-                ChatService._qdrant_client = QdrantClient(
-                    url=ChatService.QDRANT_URL,
-                    timeout=60,
-                    prefer_grpc=False
-                )
-                print(f"✅ Qdrant Local 연결: {ChatService.QDRANT_URL}")
-        return ChatService._qdrant_client
-    
     # ===== 통합된 검색어 처리 함수들 =====
     
     @staticmethod
@@ -191,18 +147,7 @@ ALWAYS structure your response this way for maximum readability!"""
         return list(set(variants))
     
     @staticmethod
-    def _calculate_keyword_overlap(query: str, title: str) -> float:
-        """키워드 겹치는 정도 계산"""
-        query_words = set(query.lower().split())
-        title_words = set(title.lower().split())
-        
-        overlap = len(query_words & title_words)
-        total = len(query_words | title_words)
-        
-        return overlap / total if total > 0 else 0
-    
-    @staticmethod
-    def _improved_search(query: str, search_type: str = "attraction") -> Optional[Dict]:
+    def _improved_search(query: str, search_type: str = "attraction") -> Optional[SearchHit]:
         """개선된 통합 검색 로직 (K-Content 포함)"""
         try:
             print(f"🔍 개선된 검색 시작: '{query}' (타입: {search_type})")
@@ -214,68 +159,8 @@ ALWAYS structure your response this way for maximum readability!"""
             search_variants = ChatService._expand_search_terms(cleaned_query, search_type)
             print(f"🔧 검색 변형들: {search_variants}")
             
-            # 3. 모든 변형으로 검색
-            best_result = None
-            best_score = 0
-            
-            qdrant_client = ChatService._get_qdrant_client()
-            embedding_model = ChatService._get_embedding_model()
-            
-            # 컬렉션 선택
-            collections = {
-                "restaurant": ChatService.RESTAURANT_COLLECTION,
-                "attraction": ChatService.ATTRACTION_COLLECTION,
-                "festival": ChatService.COLLECTION_NAME,
-                "kcontent": ChatService.KCONTENT_COLLECTION  # 🎬 K-Content 추가
-            }
-            collection_name = collections.get(search_type, ChatService.COLLECTION_NAME)
-            
-            for variant in search_variants:
-                try:
-                    query_embedding = embedding_model.embed_query(variant)
-                    
-                    search_results = qdrant_client.search(
-                        collection_name=collection_name,
-                        query_vector=query_embedding,
-                        limit=5,
-                        score_threshold=0.3,
-                        with_payload=True,
-                        with_vectors=False
-                    )
-                    
-                    for result in search_results:
-                        vector_score = result.score
-                        
-                        # 타입별 제목 추출 (K-Content 필드명 매핑)
-                        if search_type == "restaurant":
-                            title = result.payload.get("metadata", {}).get("name", "")
-                        elif search_type == "kcontent":
-                            metadata = result.payload.get("metadata", {})
-                            drama_name = metadata.get("drama_name_ko", "")  # 🔄 변경
-                            location_name = metadata.get("location_name_en", "")  # 🔄 변경
-                            title = f"{drama_name} {location_name}"
-                        else:
-                            title = result.payload.get("metadata", {}).get("title", "")
-                            
-                        keyword_score = ChatService._calculate_keyword_overlap(cleaned_query, title)
-                        combined_score = vector_score * 0.8 + keyword_score * 0.2
-                        
-                        if combined_score > best_score:
-                            best_score = combined_score
-                            best_result = result
-                            print(f"✅ 더 좋은 결과: '{variant}' → 점수: {combined_score:.3f}")
-                
-                except Exception as e:
-                    print(f"⚠️ 변형 '{variant}' 검색 실패: {e}")
-                    continue
-            
-            # 결과 반환 (K-Content는 임계값 0.4, 나머지는 0.5)
-            threshold = 0.4 if search_type == "kcontent" else 0.5
-            if best_result and best_score > threshold:
-                return best_result
-            else:
-                print(f"❌ 유효한 결과 없음 (최고 점수: {best_score:.3f})")
-                return None
+            # 3. 통합 검색 서비스 (벡터 + BM25 하이브리드)
+            return RetrievalService.search_best(cleaned_query, search_variants, search_type)
                 
         except Exception as e:
             print(f"❌ 개선된 검색 오류: {e}")
@@ -300,62 +185,47 @@ ALWAYS structure your response this way for maximum readability!"""
             all_results = []
             seen_content_ids = set()  # 중복 제거용
             
-            qdrant_client = ChatService._get_qdrant_client()
-            embedding_model = ChatService._get_embedding_model()
+            # 🔀 벡터 + lexical(BM25) 결합 - 드라마 이름이 정확히 일치하는 장소도 포함
+            hits = RetrievalService.search(
+                cleaned_query,
+                search_variants,
+                "kcontent",
+                limit=30,  # 더 많이 가져와서 선별
+                lexical_limit=limit * 3
+            )
             
-            for variant in search_variants:
-                try:
-                    query_embedding = embedding_model.embed_query(variant)
-                    
-                    search_results = qdrant_client.search(
-                        collection_name=ChatService.KCONTENT_COLLECTION,
-                        query_vector=query_embedding,
-                        limit=30,  # 더 많이 가져와서 선별
-                        score_threshold=0.3,
-                        with_payload=True,
-                        with_vectors=False
-                    )
-                    
-                    for result in search_results:
-                        metadata = result.payload.get("metadata", {})
-                        content_id = metadata.get("content_id", "")
-                        
-                        # 중복 제거
-                        if content_id in seen_content_ids:
-                            continue
-                        seen_content_ids.add(content_id)
-                        
-                        # 드라마명 매칭 체크
-                        drama_name_ko = metadata.get("drama_name_ko", "")
-                        drama_name_en = metadata.get("drama_name_en", "")
-                        location_name = metadata.get("location_name_en", "")
-                        title = f"{drama_name_ko} {location_name}"
-                        
-                        vector_score = result.score
-                        keyword_score = ChatService._calculate_keyword_overlap(cleaned_query, title)
-                        combined_score = vector_score * 0.8 + keyword_score * 0.2
-                        
-                        # 임계값 통과한 결과만 포함
-                        if combined_score > 0.35:  # 다중 검색은 조금 낮은 임계값
-                            # 🎨 카드 형태 데이터 생성
-                            card_data = {
-                                "content_id": content_id,
-                                "location_name": location_name,
-                                "category": metadata.get("category_en", ""),
-                                "thumbnail": metadata.get("thumbnail", ""),
-                                "drama_name": drama_name_ko,
-                                "drama_name_en": drama_name_en,
-                                "latitude": float(metadata.get("latitude", 0)),
-                                "longitude": float(metadata.get("longitude", 0)),
-                                "similarity_score": combined_score,
-                                "type": "kcontent"
-                            }
-                            all_results.append(card_data)
-                            print(f"✅ 추가: {location_name} ({drama_name_ko}) - 점수: {combined_score:.3f}")
+            for hit in hits:
+                metadata = hit.metadata
+                content_id = metadata.get("content_id", "")
                 
-                except Exception as e:
-                    print(f"⚠️ 변형 '{variant}' 검색 실패: {e}")
+                # 중복 제거
+                if content_id in seen_content_ids:
                     continue
+                seen_content_ids.add(content_id)
+                
+                # 드라마명 매칭 체크
+                drama_name_ko = metadata.get("drama_name_ko", "")
+                drama_name_en = metadata.get("drama_name_en", "")
+                location_name = metadata.get("location_name_en", "")
+                combined_score = hit.score
+                
+                # 임계값 통과한 결과만 포함
+                if combined_score > 0.35:  # 다중 검색은 조금 낮은 임계값
+                    # 🎨 카드 형태 데이터 생성
+                    card_data = {
+                        "content_id": content_id,
+                        "location_name": location_name,
+                        "category": metadata.get("category_en", ""),
+                        "thumbnail": metadata.get("thumbnail", ""),
+                        "drama_name": drama_name_ko,
+                        "drama_name_en": drama_name_en,
+                        "latitude": float(metadata.get("latitude", 0)),
+                        "longitude": float(metadata.get("longitude", 0)),
+                        "similarity_score": combined_score,
+                        "type": "kcontent"
+                    }
+                    all_results.append(card_data)
+                    print(f"✅ 추가: {location_name} ({drama_name_ko}) - 점수: {combined_score:.3f}")
             
             # 점수순 정렬 후 상위 limit개 반환
             all_results.sort(key=lambda x: x['similarity_score'], reverse=True)
@@ -378,8 +248,8 @@ ALWAYS structure your response this way for maximum readability!"""
         if not result:
             return None
             
-        metadata = result.payload.get("metadata", {})
-        page_content = result.payload.get("page_content", "")
+        metadata = result.metadata
+        page_content = result.page_content
         
         if search_type == "restaurant":
             return {
@@ -478,79 +348,15 @@ ALWAYS structure your response this way for maximum readability!"""
     
     @staticmethod
     def _analyze_message_fast(message: str, is_kcontent_mode: bool = False) -> Dict[str, Any]:
-        """메시지 분석 (🔧 더 넓은 다중 검색 패턴)"""
-        message_lower = message.lower().strip()
+        """메시지 분석 (🚀 사전 컴파일된 의도 분류기 사용)"""
         print(f"\n🔍 질문 분석 시작: '{message}' (K-Content모드: {is_kcontent_mode})")
         
-        # 수량 추출
-        number_patterns = [r'(\d+)곳', r'(\d+)개', r'(\d+)가지', r'(\d+)\s*places?', r'(\d+)\s*spots?', r'(\d+)\s*locations?']
-        extracted_count = None
-        for pattern in number_patterns:
-            match = re.search(pattern, message_lower)
-            if match:
-                extracted_count = int(match.group(1))
-                print(f"   ✅ 수량 발견: {extracted_count}개")
-                break
-        
-        # 🆕 더 넓은 다중 검색 패턴 감지
-        multiple_patterns = [
-            'places that appeared', 'locations that appeared', 'places from',
-            'all places', 'all locations', 'filming locations',
-            'places in', 'locations in', 'where', 'appeared',
-            'show me', 'tell me where', 'what are the places',
-            'places of', 'locations of', 'spots from', 'spots in',
-            '모든 장소', '전체 촬영지', '나온 장소', '등장한 장소', '촬영 장소들',
-            'drama', 'divorce insurance', 'places'  # 🔧 더 추가
-        ]
-        
-        has_multiple_intent = any(pattern in message_lower for pattern in multiple_patterns)
-        
-        # 🔧 드라마 관련 키워드 체크
-        drama_keywords = ['drama', 'divorce insurance', "mom's friend's son", 'appeared', 'filming', 'locations', 'places']
-        has_drama = any(kw in message_lower for kw in drama_keywords)
-        
-        # 🎯 K-Content 모드이거나 드라마 관련이면 다중 검색 허용
-        if has_multiple_intent and (is_kcontent_mode or has_drama):
-            keyword = ChatService._extract_keyword_simple(message)
-            print(f"🎬 다중 검색 트리거! 키워드: '{keyword}'")
-            return {"type": "multiple_kcontent_search", "keyword": keyword, "count": extracted_count or 20}
-        
-        # 비교 질문 감지
-        comparison_patterns = [' vs ', 'vs.', ' versus ', 'which one', 'which is better', 'compare']
-        if any(p in message_lower for p in comparison_patterns):
-            return {"type": "comparison", "keyword": message, "count": extracted_count}
-        
-        # 조언/팁 질문 감지
-        advice_patterns = ['tip', 'tips', 'advice', '팁', '조언', 'how to', '어떻게', '방법', 'what should i know', '알아야', '준비', 'etiquette', '에티켓']
-        
-        if is_kcontent_mode:
-            # K-Content 모드: 드라마 관련 키워드 체크
-            drama_keywords = ['drama', 'filming', 'location', 'scene', '드라마', '촬영지', '장면', '장소']
-            has_drama = any(kw in message_lower for kw in drama_keywords)
-            has_advice = any(kw in message_lower for kw in advice_patterns)
-            
-            if has_advice and not has_drama:
-                return {"type": "general_advice", "keyword": message, "count": extracted_count}
-        else:
-            # 일반 모드: 장소 관련 키워드 체크
-            place_keywords = ['palace', 'temple', 'tower', 'museum', 'park', '궁', '사찰', '타워', '박물관', '공원', 'gangnam', 'hongdae', 'myeongdong', 'itaewon', 'culture', '문화', 'transportation', '교통', 'weather', '날씨']
-            has_advice = any(kw in message_lower for kw in advice_patterns)
-            has_place = any(place in message_lower for place in place_keywords)
-            
-            if has_advice and not has_place:
-                return {"type": "general_advice", "keyword": message, "count": extracted_count}
-        
-        # 추천 질문 감지
-        recommendation_patterns = ['recommend', 'suggestion', 'suggest', '추천', 'places to visit', 'where to go', '가볼', 'best places', 'top places', '명소', 'best', 'top', 'popular', '인기']
-        has_recommendation = any(kw in message_lower for kw in recommendation_patterns)
-        
-        if has_recommendation or extracted_count:
-            return {"type": "recommendation", "keyword": message, "count": extracted_count or 10}
+        engine = LUMI_KCONTENT_INTENTS if is_kcontent_mode else LUMI_INTENTS
+        analysis = engine.classify(message, ChatService._extract_keyword_simple)
         
-        # 기본 검색
-        keyword = ChatService._extract_keyword_simple(message)
-        search_type = "kcontent_search" if is_kcontent_mode else "place_search"
-        return {"type": search_type, "keyword": keyword, "count": extracted_count}
+        if analysis["type"] == "multiple_kcontent_search":
+            print(f"🎬 다중 검색 트리거! 키워드: '{analysis['keyword']}'")
+        return analysis
     
     @staticmethod
     def _extract_keyword_simple(message: str) -> str:
@@ -568,8 +374,7 @@ ALWAYS structure your response this way for maximum readability!"""
     @staticmethod
     def _is_restaurant_query(message: str) -> bool:
         """레스토랑 관련 질문 판단"""
-        restaurant_keywords = ['restaurant', 'food', 'eat', 'dining', 'meal', 'cuisine', 'dish', '레스토랑', '음식', '먹', '식당', '맛집', '요리', '음식점']
-        return any(keyword in message.lower() for keyword in restaurant_keywords)
+        return RESTAURANT_KEYWORDS.search(message.lower())
     
     # ===== 지도 마커 =====
     
@@ -643,27 +448,13 @@ ALWAYS structure your response this way for maximum readability!"""
         try:
             print(f"🎲 랜덤 관광명소 {count}개 추천 시작...")
             
-            qdrant_client = ChatService._get_qdrant_client()
-            fetch_count = min(count * 5, 100)
-            
-            scroll_result = qdrant_client.scroll(
-                collection_name=ChatService.ATTRACTION_COLLECTION,
-                limit=fetch_count,
-                offset=random.randint(0, 50),
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            points = scroll_result[0]
-            if not points:
+            selected_hits = RetrievalService.random_hits("attraction", count)
+            if not selected_hits:
                 return []
             
-            random.shuffle(points)
-            selected_points = points[:count]
-            
             attractions = []
-            for point in selected_points:
-                attraction_data = point.payload.get("metadata", {})
+            for hit in selected_hits:
+                attraction_data = hit.metadata
                 formatted_data = {
                     "attr_id": attraction_data.get("attr_id"),
                     "title": attraction_data.get("title"),
@@ -685,27 +476,13 @@ ALWAYS structure your response this way for maximum readability!"""
         try:
             print(f"🎲 랜덤 K-Content {count}개 추천 시작...")
             
-            qdrant_client = ChatService._get_qdrant_client()
-            fetch_count = min(count * 5, 100)
-            
-            scroll_result = qdrant_client.scroll(
-                collection_name=ChatService.KCONTENT_COLLECTION,
-                limit=fetch_count,
-                offset=random.randint(0, 50),
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            points = scroll_result[0]
-            if not points:
+            selected_hits = RetrievalService.random_hits("kcontent", count)
+            if not selected_hits:
                 return []
             
-            random.shuffle(points)
-            selected_points = points[:count]
-            
             kcontents = []
-            for point in selected_points:
-                kcontent_metadata = point.payload.get("metadata", {})
+            for hit in selected_hits:
+                kcontent_metadata = hit.metadata
                 formatted_data = {
                     "content_id": kcontent_metadata.get("content_id"),
                     "drama_name": kcontent_metadata.get("drama_name_ko"),  # 🔄 변경
@@ -735,12 +512,19 @@ ALWAYS structure your response this way for maximum readability!"""
             return f"🎬 OMG! Here are {len(items)} amazing K-Drama filming locations in Seoul! Each spot is iconic and perfect for K-Drama fans! Ask me about any specific location for more details! 💕✨"
         return f"Yo! Hunters! 🔥💫 엄선한 {len(items)}개의 전설적인 장소들이야! 각 장소마다 특별한 빛의 에너지가 있으니까 직접 체크해봐! 궁금한 곳 있으면 말해줘! Let's explore! 🌙✨"
     
-    # ===== 메인 API 함수 (스트리밍 전용) =====
+    # ===== 메시지 처리 코어 (스트리밍/일반 공용) =====
     
     @staticmethod
-    async def send_message_streaming(db: Session, user_id: int, message: str, is_kcontent_mode: bool = False):
-        """스트리밍 메시지 처리 (다중 검색 기능 + 포맷팅 강제)"""
+    async def _message_events(db: Session, user_id: int, message: str, is_kcontent_mode: bool = False):
+        """
+        메시지 처리 코어 (다중 검색 기능 + 포맷팅 강제)
+        
+        스트리밍/일반 모드가 공유하는 로직으로, 이벤트 dict를 yield합니다.
+        마지막 이벤트는 'done', 'multiple_locations', 'error' 중 하나입니다.
+        """
         try:
+            request_started = time.perf_counter()  # ⏱️ TTFT 측정 기준
+            
             # 분석
             analysis = ChatService._analyze_message_fast(message, is_kcontent_mode)
             question_type = analysis.get('type', 'place_search')
@@ -753,23 +537,20 @@ ALWAYS structure your response this way for maximum readability!"""
             if is_kcontent_mode:
                 # 🆕 다중 검색 처리
                 if question_type == "multiple_kcontent_search":
-                    yield f"data: {json.dumps({'type': 'searching', 'message': '🔍 Finding all filming locations from this drama...'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'searching', 'message': '🔍 Finding all filming locations from this drama...'}
                     
                     count = analysis.get('count', 20)
-                    multiple_kcontents = ChatService._search_multiple_kcontent(keyword, count)
+                    multiple_kcontents = await asyncio.to_thread(ChatService._search_multiple_kcontent, keyword, count)
                     
                     if not multiple_kcontents:
-                        yield f"data: {json.dumps({'type': 'error', 'message': 'Sorry, I could not find locations for this drama. 😅'}, ensure_ascii=False)}\n\n"
+                        yield {'type': 'error', 'message': 'Sorry, I could not find locations for this drama. 😅'}
                         return
                     
                     # AI 응답 생성
                     ai_response = f"🎬 Amazing! I found {len(multiple_kcontents)} filming locations from this drama! Each place has its own special story. Tap any location card below for detailed information! 💕✨"
                     
                     # 대화 저장
-                    conversation = Conversation(user_id=user_id, question=message, response=ai_response)
-                    db.add(conversation)
-                    db.commit()
-                    db.refresh(conversation)
+                    convers_id = await save_conversation(user_id, message, ai_response)
                     
                     # 🎨 카드 형태 데이터 준비
                     location_cards = []
@@ -802,7 +583,7 @@ ALWAYS structure your response this way for maximum readability!"""
                     completion_data = {
                         'type': 'multiple_locations',
                         'full_response': ai_response,
-                        'convers_id': conversation.convers_id,
+                        'convers_id': convers_id,
                         'location_cards': location_cards,
                         'total_count': len(multiple_kcontents),
                         'drama_name': multiple_kcontents[0].get('drama_name') if multiple_kcontents else '',
@@ -810,12 +591,12 @@ ALWAYS structure your response this way for maximum readability!"""
                         'map_markers': map_markers
                     }
                     
-                    yield f"data: {json.dumps(completion_data, ensure_ascii=False)}\n\n"
+                    yield completion_data
                     return
                 
                 # 비교 질문
                 elif question_type == "comparison":
-                    yield f"data: {json.dumps({'type': 'generating', 'message': '🤔 Comparing K-Drama locations...'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'generating', 'message': '🤔 Comparing K-Drama locations...'}
                     
                     prompt = KCONTENT_COMPARISON_PROMPT.format(message=message)
                     
@@ -825,23 +606,19 @@ ALWAYS structure your response this way for maximum readability!"""
                         {"role": "user", "content": prompt}
                     ]
                     
-                    full_response = ""
-                    for chunk in chat_with_gpt_stream(messages, max_tokens=300, temperature=0.7):
-                        full_response += chunk
-                        yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                        await asyncio.sleep(0.02)
+                    sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatService:{question_type}")
+                    async for event in sse_writer.events(achat_with_gpt_stream(messages, max_tokens=300, temperature=0.7)):
+                        yield event
+                    full_response = sse_writer.full_response
                     
-                    conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                    db.add(conversation)
-                    db.commit()
-                    db.refresh(conversation)
+                    convers_id = await save_conversation(user_id, message, full_response)
                     
-                    yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': conversation.convers_id, 'kcontents': [], 'has_kcontents': False}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'done', 'full_response': full_response, 'convers_id': convers_id, 'kcontents': [], 'has_kcontents': False}
                     return
                 
                 # 조언 질문
                 elif question_type == "general_advice":
-                    yield f"data: {json.dumps({'type': 'generating', 'message': '💡 Preparing K-Drama tips...'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'generating', 'message': '💡 Preparing K-Drama tips...'}
                     
                     prompt = KCONTENT_ADVICE_PROMPT.format(message=message)
                     
@@ -851,53 +628,46 @@ ALWAYS structure your response this way for maximum readability!"""
                         {"role": "user", "content": prompt}
                     ]
                     
-                    full_response = ""
-                    for chunk in chat_with_gpt_stream(messages, max_tokens=350, temperature=0.7):
-                        full_response += chunk
-                        yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                        await asyncio.sleep(0.02)
+                    sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatService:{question_type}")
+                    async for event in sse_writer.events(achat_with_gpt_stream(messages, max_tokens=350, temperature=0.7)):
+                        yield event
+                    full_response = sse_writer.full_response
                     
-                    conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                    db.add(conversation)
-                    db.commit()
-                    db.refresh(conversation)
+                    convers_id = await save_conversation(user_id, message, full_response)
                     
-                    yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': conversation.convers_id, 'kcontents': [], 'has_kcontents': False}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'done', 'full_response': full_response, 'convers_id': convers_id, 'kcontents': [], 'has_kcontents': False}
                     return
                 
                 # 랜덤 추천
                 elif question_type == "recommendation":
-                    yield f"data: {json.dumps({'type': 'random', 'message': '🎲 Finding amazing K-Drama locations...'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'random', 'message': '🎲 Finding amazing K-Drama locations...'}
                     
                     count = analysis.get('count', 10)
-                    random_kcontents = ChatService._get_random_kcontents(count)
+                    random_kcontents = await asyncio.to_thread(ChatService._get_random_kcontents, count)
                     ai_response = ChatService._generate_random_response(random_kcontents, True)
                     
-                    conversation = Conversation(user_id=user_id, question=message, response=ai_response)
-                    db.add(conversation)
-                    db.commit()
-                    db.refresh(conversation)
+                    convers_id = await save_conversation(user_id, message, ai_response)
                     
                     map_markers = ChatService._create_markers(random_kcontents)
                     
-                    yield f"data: {json.dumps({'type': 'done', 'full_response': ai_response, 'results': random_kcontents, 'kcontents': random_kcontents, 'convers_id': conversation.convers_id, 'has_kcontents': True, 'map_markers': map_markers}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'done', 'full_response': ai_response, 'results': random_kcontents, 'kcontents': random_kcontents, 'convers_id': convers_id, 'has_kcontents': True, 'map_markers': map_markers}
                     return
                 
                 # K-Content 검색
                 else:
-                    yield f"data: {json.dumps({'type': 'searching', 'message': '🔍 Searching for K-Drama location...'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'searching', 'message': '🔍 Searching for K-Drama location...'}
                     
-                    kcontent = ChatService._search_best_kcontent(keyword)
+                    kcontent = await asyncio.to_thread(ChatService._search_best_kcontent, keyword)
                     
                     if not kcontent:
-                        yield f"data: {json.dumps({'type': 'error', 'message': 'Sorry, I could not find that K-Drama location. 😅'}, ensure_ascii=False)}\n\n"
+                        yield {'type': 'error', 'message': 'Sorry, I could not find that K-Drama location. 😅'}
                         return
                     
                     kcontent['type'] = 'kcontent'
                     title = f"{kcontent['drama_name']} - {kcontent['location_name']}"
                     
-                    yield f"data: {json.dumps({'type': 'found', 'title': title, 'result': kcontent}, ensure_ascii=False)}\n\n"
-                    yield f"data: {json.dumps({'type': 'generating', 'message': '🎬 Preparing K-Drama info...'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'found', 'title': title, 'result': kcontent}
+                    yield {'type': 'generating', 'message': '🎬 Preparing K-Drama info...'}
                     
                     prompt = KCONTENT_QUICK_PROMPT.format(
                         drama_name=kcontent.get('drama_name', ''),
@@ -914,23 +684,19 @@ ALWAYS structure your response this way for maximum readability!"""
                         {"role": "user", "content": prompt}
                     ]
                     
-                    full_response = ""
-                    for chunk in chat_with_gpt_stream(messages, max_tokens=250, temperature=0.6):
-                        full_response += chunk
-                        yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                        await asyncio.sleep(0.02)
+                    sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatService:{question_type}")
+                    async for event in sse_writer.events(achat_with_gpt_stream(messages, max_tokens=250, temperature=0.6)):
+                        yield event
+                    full_response = sse_writer.full_response
                     
-                    conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                    db.add(conversation)
-                    db.commit()
-                    db.refresh(conversation)
+                    convers_id = await save_conversation(user_id, message, full_response)
                     
                     map_markers = ChatService._create_markers([kcontent])
                     
                     completion_data = {
                         'type': 'done',
                         'full_response': full_response,
-                        'convers_id': conversation.convers_id,
+                        'convers_id': convers_id,
                         'result': kcontent,
                         'results': [kcontent],
                         'kcontents': [kcontent],
@@ -938,26 +704,23 @@ ALWAYS structure your response this way for maximum readability!"""
                         'map_markers': map_markers
                     }
                     
-                    yield f"data: {json.dumps(completion_data, ensure_ascii=False)}\n\n"
+                    yield completion_data
                     return
             
             # 🎤 일반 모드에서도 다중 검색 허용
             elif question_type == "multiple_kcontent_search":
-                yield f"data: {json.dumps({'type': 'searching', 'message': '🔍 Finding all filming locations from this drama...'}, ensure_ascii=False)}\n\n"
+                yield {'type': 'searching', 'message': '🔍 Finding all filming locations from this drama...'}
                 
                 count = analysis.get('count', 20)
-                multiple_kcontents = ChatService._search_multiple_kcontent(keyword, count)
+                multiple_kcontents = await asyncio.to_thread(ChatService._search_multiple_kcontent, keyword, count)
                 
                 if not multiple_kcontents:
-                    yield f"data: {json.dumps({'type': 'error', 'message': 'Sorry, I could not find locations for this drama. 😅'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'error', 'message': 'Sorry, I could not find locations for this drama. 😅'}
                     return
                 
                 ai_response = f"🎬 Amazing! I found {len(multiple_kcontents)} filming locations from this drama! Each place has its own special story. Tap any location card below for detailed information! 💕✨"
                 
-                conversation = Conversation(user_id=user_id, question=message, response=ai_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, ai_response)
                 
                 location_cards = []
                 for location in multiple_kcontents:
@@ -987,7 +750,7 @@ ALWAYS structure your response this way for maximum readability!"""
                 completion_data = {
                     'type': 'multiple_locations',
                     'full_response': ai_response,
-                    'convers_id': conversation.convers_id,
+                    'convers_id': convers_id,
                     'location_cards': location_cards,
                     'total_count': len(multiple_kcontents),
                     'drama_name': multiple_kcontents[0].get('drama_name') if multiple_kcontents else '',
@@ -995,14 +758,14 @@ ALWAYS structure your response this way for maximum readability!"""
                     'map_markers': map_markers
                 }
                 
-                yield f"data: {json.dumps(completion_data, ensure_ascii=False)}\n\n"
+                yield completion_data
                 return
             
             # 🎤 일반 모드 처리 (기존 로직 + 포맷팅 강제)
             # 레스토랑 관련 처리
             if is_restaurant_query:
                 if question_type == "comparison":
-                    yield f"data: {json.dumps({'type': 'generating', 'message': '🤔 레스토랑 비교 분석 중...'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'generating', 'message': '🤔 레스토랑 비교 분석 중...'}
                     
                     prompt = RESTAURANT_COMPARISON_PROMPT.format(message=message)
                     
@@ -1012,22 +775,18 @@ ALWAYS structure your response this way for maximum readability!"""
                         {"role": "user", "content": prompt}
                     ]
                     
-                    full_response = ""
-                    for chunk in chat_with_gpt_stream(messages, max_tokens=300, temperature=0.7):
-                        full_response += chunk
-                        yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                        await asyncio.sleep(0.02)
+                    sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatService:{question_type}")
+                    async for event in sse_writer.events(achat_with_gpt_stream(messages, max_tokens=300, temperature=0.7)):
+                        yield event
+                    full_response = sse_writer.full_response
                     
-                    conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                    db.add(conversation)
-                    db.commit()
-                    db.refresh(conversation)
+                    convers_id = await save_conversation(user_id, message, full_response)
                     
-                    yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': conversation.convers_id, 'results': [], 'festivals': [], 'attractions': [], 'restaurants': [], 'has_festivals': False, 'has_attractions': False, 'has_restaurants': False}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'done', 'full_response': full_response, 'convers_id': convers_id, 'results': [], 'festivals': [], 'attractions': [], 'restaurants': [], 'has_festivals': False, 'has_attractions': False, 'has_restaurants': False}
                     return
                 
                 elif question_type == "general_advice":
-                    yield f"data: {json.dumps({'type': 'generating', 'message': '💡 음식 문화 팁 준비 중...'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'generating', 'message': '💡 음식 문화 팁 준비 중...'}
                     
                     prompt = RESTAURANT_ADVICE_PROMPT.format(message=message)
                     
@@ -1037,32 +796,28 @@ ALWAYS structure your response this way for maximum readability!"""
                         {"role": "user", "content": prompt}
                     ]
                     
-                    full_response = ""
-                    for chunk in chat_with_gpt_stream(messages, max_tokens=350, temperature=0.7):
-                        full_response += chunk
-                        yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                        await asyncio.sleep(0.02)
+                    sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatService:{question_type}")
+                    async for event in sse_writer.events(achat_with_gpt_stream(messages, max_tokens=350, temperature=0.7)):
+                        yield event
+                    full_response = sse_writer.full_response
                     
-                    conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                    db.add(conversation)
-                    db.commit()
-                    db.refresh(conversation)
+                    convers_id = await save_conversation(user_id, message, full_response)
                     
-                    yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': conversation.convers_id, 'results': [], 'festivals': [], 'attractions': [], 'restaurants': [], 'has_festivals': False, 'has_attractions': False, 'has_restaurants': False}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'done', 'full_response': full_response, 'convers_id': convers_id, 'results': [], 'festivals': [], 'attractions': [], 'restaurants': [], 'has_festivals': False, 'has_attractions': False, 'has_restaurants': False}
                     return
                 
                 else:
                     # 레스토랑 검색
-                    yield f"data: {json.dumps({'type': 'searching', 'message': '🔍 맛집을 찾고 있어요...'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'searching', 'message': '🔍 맛집을 찾고 있어요...'}
                     
-                    restaurant = ChatService._search_best_restaurant(keyword)
+                    restaurant = await asyncio.to_thread(ChatService._search_best_restaurant, keyword)
                     
                     if not restaurant:
-                        yield f"data: {json.dumps({'type': 'error', 'message': 'Hey Hunters! 😅 그 맛집을 찾을 수 없네... 다른 곳을 찾아보자! 🔥'}, ensure_ascii=False)}\n\n"
+                        yield {'type': 'error', 'message': 'Hey Hunters! 😅 그 맛집을 찾을 수 없네... 다른 곳을 찾아보자! 🔥'}
                         return
                     
-                    yield f"data: {json.dumps({'type': 'found', 'title': restaurant['restaurant_name'], 'result': restaurant}, ensure_ascii=False)}\n\n"
-                    yield f"data: {json.dumps({'type': 'generating', 'message': '💫 레스토랑 정보 생성 중...'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'found', 'title': restaurant['restaurant_name'], 'result': restaurant}
+                    yield {'type': 'generating', 'message': '💫 레스토랑 정보 생성 중...'}
                     
                     prompt = RESTAURANT_QUICK_PROMPT.format(
                         restaurant_name=restaurant.get('restaurant_name', ''),
@@ -1077,23 +832,19 @@ ALWAYS structure your response this way for maximum readability!"""
                         {"role": "user", "content": prompt}
                     ]
                     
-                    full_response = ""
-                    for chunk in chat_with_gpt_stream(messages, max_tokens=250, temperature=0.6):
-                        full_response += chunk
-                        yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                        await asyncio.sleep(0.02)
+                    sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatService:{question_type}")
+                    async for event in sse_writer.events(achat_with_gpt_stream(messages, max_tokens=250, temperature=0.6)):
+                        yield event
+                    full_response = sse_writer.full_response
                     
-                    conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                    db.add(conversation)
-                    db.commit()
-                    db.refresh(conversation)
+                    convers_id = await save_conversation(user_id, message, full_response)
                     
                     map_markers = ChatService._create_markers([restaurant])
                     
                     completion_data = {
                         'type': 'done',
                         'full_response': full_response,
-                        'convers_id': conversation.convers_id,
+                        'convers_id': convers_id,
                         'result': restaurant,
                         'results': [restaurant],
                         'festivals': [],
@@ -1105,12 +856,12 @@ ALWAYS structure your response this way for maximum readability!"""
                         'map_markers': map_markers
                     }
                     
-                    yield f"data: {json.dumps(completion_data, ensure_ascii=False)}\n\n"
+                    yield completion_data
                     return
             
             # 비교 질문 처리
             elif question_type == "comparison":
-                yield f"data: {json.dumps({'type': 'generating', 'message': '🤔 비교 분석 중...'}, ensure_ascii=False)}\n\n"
+                yield {'type': 'generating', 'message': '🤔 비교 분석 중...'}
                 
                 prompt = COMPARISON_PROMPT.format(message=message)
                 
@@ -1120,23 +871,19 @@ ALWAYS structure your response this way for maximum readability!"""
                     {"role": "user", "content": prompt}
                 ]
                 
-                full_response = ""
-                for chunk in chat_with_gpt_stream(messages, max_tokens=300, temperature=0.7):
-                    full_response += chunk
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                    await asyncio.sleep(0.02)
+                sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatService:{question_type}")
+                async for event in sse_writer.events(achat_with_gpt_stream(messages, max_tokens=300, temperature=0.7)):
+                    yield event
+                full_response = sse_writer.full_response
                 
-                conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, full_response)
                 
-                yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': conversation.convers_id, 'results': [], 'festivals': [], 'attractions': [], 'restaurants': [], 'has_festivals': False, 'has_attractions': False, 'has_restaurants': False}, ensure_ascii=False)}\n\n"
+                yield {'type': 'done', 'full_response': full_response, 'convers_id': convers_id, 'results': [], 'festivals': [], 'attractions': [], 'restaurants': [], 'has_festivals': False, 'has_attractions': False, 'has_restaurants': False}
                 return
             
             # 일반 조언 질문 처리
             elif question_type == "general_advice":
-                yield f"data: {json.dumps({'type': 'generating', 'message': '💡 여행 팁 준비 중...'}, ensure_ascii=False)}\n\n"
+                yield {'type': 'generating', 'message': '💡 여행 팁 준비 중...'}
                 
                 prompt = ADVICE_PROMPT.format(message=message)
                 
@@ -1146,50 +893,40 @@ ALWAYS structure your response this way for maximum readability!"""
                     {"role": "user", "content": prompt}
                 ]
                 
-                full_response = ""
-                for chunk in chat_with_gpt_stream(messages, max_tokens=350, temperature=0.7):
-                    full_response += chunk
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                    await asyncio.sleep(0.02)
+                sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatService:{question_type}")
+                async for event in sse_writer.events(achat_with_gpt_stream(messages, max_tokens=350, temperature=0.7)):
+                    yield event
+                full_response = sse_writer.full_response
                 
-                conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, full_response)
                 
-                yield f"data: {json.dumps({'type': 'done', 'full_response': full_response, 'convers_id': conversation.convers_id, 'results': [], 'festivals': [], 'attractions': [], 'restaurants': [], 'has_festivals': False, 'has_attractions': False, 'has_restaurants': False}, ensure_ascii=False)}\n\n"
+                yield {'type': 'done', 'full_response': full_response, 'convers_id': convers_id, 'results': [], 'festivals': [], 'attractions': [], 'restaurants': [], 'has_festivals': False, 'has_attractions': False, 'has_restaurants': False}
                 return
             
             # 랜덤 추천 처리
             elif question_type == "recommendation":
-                yield f"data: {json.dumps({'type': 'random', 'message': '🎲 랜덤 추천 준비 중...'}, ensure_ascii=False)}\n\n"
+                yield {'type': 'random', 'message': '🎲 랜덤 추천 준비 중...'}
                 
                 count = analysis.get('count', 10)
-                random_attractions = ChatService._get_random_attractions(count)
+                random_attractions = await asyncio.to_thread(ChatService._get_random_attractions, count)
                 ai_response = ChatService._generate_random_response(random_attractions, False)
                 
-                conversation = Conversation(user_id=user_id, question=message, response=ai_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, ai_response)
                 
-                yield f"data: {json.dumps({'type': 'done', 'full_response': ai_response, 'results': random_attractions, 'attractions': random_attractions, 'convers_id': conversation.convers_id, 'has_festivals': False, 'has_attractions': True, 'has_restaurants': False, 'map_markers': ChatService._create_markers(random_attractions)}, ensure_ascii=False)}\n\n"
+                yield {'type': 'done', 'full_response': ai_response, 'results': random_attractions, 'attractions': random_attractions, 'convers_id': convers_id, 'has_festivals': False, 'has_attractions': True, 'has_restaurants': False, 'map_markers': ChatService._create_markers(random_attractions)}
                 return
             
             # ✅ 일반 장소 검색 (병렬 처리 - K-Content 추가!)
             else:
-                yield f"data: {json.dumps({'type': 'searching', 'message': '🔍 정보를 찾고 있어요...'}, ensure_ascii=False)}\n\n"
+                yield {'type': 'searching', 'message': '🔍 정보를 찾고 있어요...'}
                 
-                with ThreadPoolExecutor(max_workers=4) as executor:
-                    festival_future = executor.submit(ChatService._search_best_festival, keyword)
-                    attraction_future = executor.submit(ChatService._search_best_attraction, keyword)
-                    restaurant_future = executor.submit(ChatService._search_best_restaurant, keyword)
-                    kcontent_future = executor.submit(ChatService._search_best_kcontent, keyword)
-                    
-                    festival = festival_future.result()
-                    attraction = attraction_future.result()
-                    restaurant = restaurant_future.result()
-                    kcontent = kcontent_future.result()
+                # 스레드 풀에서 병렬 검색 (이벤트 루프 비차단)
+                festival, attraction, restaurant, kcontent = await asyncio.gather(
+                    asyncio.to_thread(ChatService._search_best_festival, keyword),
+                    asyncio.to_thread(ChatService._search_best_attraction, keyword),
+                    asyncio.to_thread(ChatService._search_best_restaurant, keyword),
+                    asyncio.to_thread(ChatService._search_best_kcontent, keyword),
+                )
                 
                 results = []
                 if festival:
@@ -1206,7 +943,7 @@ ALWAYS structure your response this way for maximum readability!"""
                     results.append(kcontent)
                 
                 if not results:
-                    yield f"data: {json.dumps({'type': 'error', 'message': 'Hey Hunters! 😅 그 장소를 찾을 수 없네... 🔥'}, ensure_ascii=False)}\n\n"
+                    yield {'type': 'error', 'message': 'Hey Hunters! 😅 그 장소를 찾을 수 없네... 🔥'}
                     return
                 
                 results.sort(key=lambda x: x['similarity_score'], reverse=True)
@@ -1220,8 +957,8 @@ ALWAYS structure your response this way for maximum readability!"""
                 else:
                     title = f"{result.get('drama_name', 'Unknown')} - {result.get('location_name', 'Unknown')}"
                 
-                yield f"data: {json.dumps({'type': 'found', 'title': title, 'result': result}, ensure_ascii=False)}\n\n"
-                yield f"data: {json.dumps({'type': 'generating', 'message': '💫 응답하는 중...'}, ensure_ascii=False)}\n\n"
+                yield {'type': 'found', 'title': title, 'result': result}
+                yield {'type': 'generating', 'message': '💫 응답하는 중...'}
                 
                 # 프롬프트 생성
                 result_type = result.get('type', 'attraction')
@@ -1265,23 +1002,19 @@ ALWAYS structure your response this way for maximum readability!"""
                     {"role": "user", "content": prompt}
                 ]
                 
-                full_response = ""
-                for chunk in chat_with_gpt_stream(messages, max_tokens=250, temperature=0.6):
-                    full_response += chunk
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': chunk}, ensure_ascii=False)}\n\n"
-                    await asyncio.sleep(0.02)
+                sse_writer = SSEChunkWriter(started_at=request_started, label=f"ChatService:{question_type}")
+                async for event in sse_writer.events(achat_with_gpt_stream(messages, max_tokens=250, temperature=0.6)):
+                    yield event
+                full_response = sse_writer.full_response
                 
-                conversation = Conversation(user_id=user_id, question=message, response=full_response)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
+                convers_id = await save_conversation(user_id, message, full_response)
                 
                 map_markers = ChatService._create_markers([result])
                 
                 completion_data = {
                     'type': 'done',
                     'full_response': full_response,
-                    'convers_id': conversation.convers_id,
+                    'convers_id': convers_id,
                     'result': result,
                     'results': [result],
                     'festivals': [result] if result_type == 'festival' else [],
@@ -1295,53 +1028,38 @@ ALWAYS structure your response this way for maximum readability!"""
                     'map_markers': map_markers
                 }
                 
-                yield f"data: {json.dumps(completion_data, ensure_ascii=False)}\n\n"
+                yield completion_data
             
         except Exception as e:
-            print(f"❌ Streaming 오류: {e}")
+            print(f"❌ 메시지 처리 오류: {e}")
             import traceback
             traceback.print_exc()
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)}, ensure_ascii=False)}\n\n"
+            yield {'type': 'error', 'message': str(e)}
     
-    # ===== 호환성 함수 =====
+    # ===== 메인 API 함수 =====
     
-    @staticmethod  
-    def send_message(db: Session, user_id: int, message: str, is_kcontent_mode: bool = False) -> Dict[str, Any]:
-        """기존 호환성을 위한 동기 wrapper"""
-        import asyncio
+    @staticmethod
+    async def send_message_streaming(db: Session, user_id: int, message: str, is_kcontent_mode: bool = False):
+        """스트리밍 메시지 처리 - 코어 이벤트를 SSE 프레임으로 변환"""
+        async for event in ChatService._message_events(db, user_id, message, is_kcontent_mode):
+            yield sse_event(event)
+    
+    @staticmethod
+    async def send_message(db: Session, user_id: int, message: str, is_kcontent_mode: bool = False) -> Dict[str, Any]:
+        """
+        일반(비스트리밍) 메시지 처리
         
-        async def _collect_streaming_result():
-            result_data = None
-            async for chunk in ChatService.send_message_streaming(db, user_id, message, is_kcontent_mode):
-                if '"type": "done"' in chunk or '"type": "multiple_locations"' in chunk:
-                    try:
-                        data = json.loads(chunk.split('data: ')[1])
-                        return data
-                    except:
-                        pass
-            return {"response": "처리 중 오류가 발생했습니다.", "convers_id": None, "results": []}
+        스트리밍과 같은 코어를 사용하되 SSE 인코딩 없이 최종 결과 dict를 그대로 반환합니다.
+        """
+        final_event = None
+        async for event in ChatService._message_events(db, user_id, message, is_kcontent_mode):
+            if event.get('type') in ('done', 'multiple_locations', 'error'):
+                final_event = event
         
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        if final_event is None:
+            return {"response": "처리 중 오류가 발생했습니다.", "convers_id": None, "results": []}
         
-        return loop.run_until_complete(_collect_streaming_result())
-    
-    @staticmethod
-    def get_conversation_history(db: Session, user_id: int, limit: int = 50) -> List[Dict]:
-        """대화 히스토리 조회"""
-        conversations = db.query(Conversation).filter(
-            Conversation.user_id == user_id
-        ).order_by(Conversation.datetime.desc()).limit(limit).all()
+        if final_event['type'] == 'error':
+            return {"response": final_event.get('message', "처리 중 오류가 발생했습니다."), "convers_id": None, "results": []}
         
-        return [
-            {
-                "conversation_id": conv.convers_id,
-                "message": conv.question,
-                "response": conv.response,
-                "created_at": conv.datetime.isoformat()
-            }
-            for conv in reversed(conversations)
-        ]
\ No newline at end of file
+        return final_event
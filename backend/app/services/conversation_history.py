@@ -0,0 +1,151 @@
+# app/services/conversation_history.py
+"""
+대화 히스토리 조회 (keyset 페이지네이션)
+
+OFFSET이나 "최근 N개 전부 읽기" 대신 (user_id, datetime, convers_id) 복합 인덱스를 따라
+마지막으로 본 위치(cursor) 다음부터 limit개만 읽습니다. 대화가 수천 개인 사용자도 페이지당 비용이 같습니다.
+
+- fields="full": 질문/응답 전체
+- fields="preview": 앞 CONVERSATION_PREVIEW_CHARS 글자만 (DB에서 잘라서 전송량 감소)
+- cursor: 이전 응답의 next_cursor (불투명 문자열, 더 오래된 대화 방향)
+
+datetime 컬럼은 NULL을 허용합니다. MySQL은 DESC 정렬에서 NULL을 맨 뒤에 두므로
+NULL인 대화는 가장 오래된 대화로 취급하고 (convers_id 내림차순), cursor에는 NULL_CURSOR로 표시합니다.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.conversation import Conversation
+
+HISTORY_FIELDS = ("full", "preview")
+NULL_CURSOR = "null"  # datetime이 NULL인 대화의 cursor 값
+
+
+def encode_cursor(created_at: Optional[datetime], convers_id: int) -> str:
+    raw = f"{created_at.isoformat() if created_at is not None else NULL_CURSOR}|{convers_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """cursor → (datetime 또는 None, convers_id), 형식이 잘못되면 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, convers_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return (None if created_at == NULL_CURSOR else datetime.fromisoformat(created_at)), int(convers_id)
+    except Exception:
+        raise ValueError("잘못된 cursor입니다")
+
+
+class ConversationHistoryService:
+
+    @staticmethod
+    def _page_query(user_id: int, limit: int, cursor: Optional[str], fields: str):
+        if fields not in HISTORY_FIELDS:
+            raise ValueError(f"fields는 {', '.join(HISTORY_FIELDS)} 중 하나여야 합니다")
+
+        columns = [Conversation.convers_id, Conversation.datetime]
+        if fields == "preview":
+            n = settings.CONVERSATION_PREVIEW_CHARS
+            columns += [
+                func.left(Conversation.question, n).label("question"),
+                func.left(Conversation.response, n).label("response"),
+                or_(
+                    func.char_length(Conversation.question) > n,
+                    func.char_length(Conversation.response) > n,
+                ).label("truncated"),
+            ]
+        else:
+            columns += [Conversation.question, Conversation.response]
+
+        query = select(*columns).where(Conversation.user_id == user_id)
+        if cursor:
+            created_at, convers_id = decode_cursor(cursor)
+            if created_at is None:
+                # NULL 구간 안에서 이어서 (convers_id 내림차순)
+                query = query.where(Conversation.datetime.is_(None), Conversation.convers_id < convers_id)
+            else:
+                query = query.where(or_(
+                    Conversation.datetime < created_at,
+                    and_(Conversation.datetime == created_at, Conversation.convers_id < convers_id),
+                    Conversation.datetime.is_(None),  # NULL은 가장 오래된 대화 (DESC에서 맨 뒤)
+                ))
+
+        # 최신순 (인덱스 역방향 스캔, NULL datetime은 맨 뒤)
+        return query.order_by(Conversation.datetime.desc(), Conversation.convers_id.desc()).limit(limit)
+
+    @staticmethod
+    def _to_item(row, fields: str) -> Dict[str, Any]:
+        item = {
+            "conversation_id": row.convers_id,
+            "message": row.question,
+            "response": row.response,
+            "created_at": row.datetime.isoformat() if row.datetime else None,
+        }
+        if fields == "preview":
+            item["truncated"] = bool(row.truncated)
+        return item
+
+    @staticmethod
+    async def _fetch_rows(db: AsyncSession, user_id: int, limit: int, cursor: Optional[str], fields: str):
+        """limit개 + 다음 페이지 cursor (더 없으면 None)"""
+        query = ConversationHistoryService._page_query(user_id, limit + 1, cursor, fields)
+        rows = (await db.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.datetime, last.convers_id)
+        return rows, next_cursor
+
+    @staticmethod
+    async def get_page(
+        db: AsyncSession,
+        user_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        fields: str = "full",
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        대화 히스토리 한 페이지
+
+        Returns:
+            (대화 목록 - 페이지 안에서는 오래된 순, 더 오래된 페이지의 cursor)
+        """
+        rows, next_cursor = await ConversationHistoryService._fetch_rows(db, user_id, limit, cursor, fields)
+        items = [ConversationHistoryService._to_item(row, fields) for row in reversed(rows)]
+        return items, next_cursor
+
+    @staticmethod
+    async def stream_ndjson(
+        db: AsyncSession,
+        user_id: int,
+        cursor: Optional[str] = None,
+        fields: str = "preview",
+    ) -> AsyncIterator[str]:
+        """
+        🌊 전체 히스토리를 NDJSON으로 (최신순, 한 줄에 대화 1개)
+
+        CONVERSATION_HISTORY_STREAM_BATCH개씩 keyset으로 읽어서 바로 내보내므로
+        전체를 메모리에 올리지 않습니다.
+        """
+        batch_size = settings.CONVERSATION_HISTORY_STREAM_BATCH
+        try:
+            while True:
+                rows, cursor = await ConversationHistoryService._fetch_rows(db, user_id, batch_size, cursor, fields)
+                if rows:
+                    yield "".join(
+                        json.dumps(ConversationHistoryService._to_item(row, fields), ensure_ascii=False) + "\n"
+                        for row in rows
+                    )
+                if cursor is None:
+                    return
+        except Exception as e:
+            print(f"❌ 히스토리 스트리밍 오류: {e}")
+            yield json.dumps({"error": str(e), "next_cursor": cursor}, ensure_ascii=False) + "\n"
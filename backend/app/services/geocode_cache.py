@@ -0,0 +1,250 @@
+# app/services/geocode_cache.py
+"""
+지오코딩 결과 캐시 (LRU + Redis 2단 구조)
+
+"강남역" 같은 같은 장소 이름으로 /search/location을 호출할 때마다 Google Geocoding을 다시 부르지 않도록
+좌표를 저장해 두고 재사용합니다.
+
+- 키: 언어 + 정규화된 검색어 (NFKC + 소문자 + 공백 정리)
+- 1단: 프로세스 내 LRU (항목별 만료 시각)
+- 2단: Redis (JSON, TTL)
+- 네거티브 캐시: ZERO_RESULTS는 "없음"으로 짧게 저장 (GEOCODE_NEGATIVE_TTL_SECONDS)
+- 요청 합치기(single-flight): 같은 키를 동시에 N번 조회해도 upstream 호출은 1번
+- 사전 적재: festival / celeb_restaurants / k_contents_trans에 이미 있는 좌표로 Redis 채우기
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.session import redis_client
+from app.models.festival import Festival
+from app.models.kcontent import KContent
+from app.models.restaurant import Restaurant
+from app.utils.geo_index import haversine_m
+from app.utils.single_flight import SingleFlight
+
+# 캐시 값: {"latitude": ..., "longitude": ...} 또는 None (ZERO_RESULTS)
+Coords = Optional[Dict[str, float]]
+
+# 사전 적재 시 같은 이름의 좌표가 이 거리 이상 다르면 모호한 이름으로 보고 제외
+SEED_AMBIGUOUS_DISTANCE_M = 100
+
+
+class GeocodeCache:
+    """언어 + 정규화 검색어 기준 좌표 캐시"""
+
+    KEY_PREFIX = "geo"
+
+    def __init__(self, max_size: int, ttl_seconds: int, negative_ttl_seconds: int, redis=None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.redis = redis if ttl_seconds > 0 else None
+
+        self._lru: "OrderedDict[str, Tuple[Coords, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+        # 📊 카운터
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """전각/반각 통일 + 소문자 + 공백 정리"""
+        return " ".join(unicodedata.normalize("NFKC", query).lower().split())
+
+    def _key(self, query: str, language: str) -> str:
+        digest = hashlib.sha1(self.normalize(query).encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{language}:{digest}"
+
+    def _remember(self, key: str, coords: Coords, ttl_seconds: int) -> None:
+        """LRU에 저장 (최대 크기 초과 시 가장 오래된 항목 제거)"""
+        with self._lock:
+            self._lru[key] = (coords, time.time() + ttl_seconds)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+    def get(self, query: str, language: str) -> Tuple[bool, Coords]:
+        """
+        Returns:
+            (캐시 히트 여부, 좌표 또는 None) - (True, None)은 네거티브 캐시 히트
+        """
+        key = self._key(query, language)
+
+        # 1단: LRU
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                coords, expires_at = entry
+                if expires_at > time.time():
+                    self._lru.move_to_end(key)
+                    self.memory_hits += 1
+                    if coords is None:
+                        self.negative_hits += 1
+                    return True, coords
+                del self._lru[key]
+
+        # 2단: Redis
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(key)
+            except Exception as e:
+                print(f"⚠️ 지오코딩 캐시 Redis 조회 실패: {e}")
+                raw = None
+
+            if raw:
+                data = json.loads(raw)
+                coords = None if data.get("miss") else {"latitude": data["lat"], "longitude": data["lng"]}
+                self._remember(key, coords, self.ttl_seconds if coords else self.negative_ttl_seconds)
+                self.redis_hits += 1
+                if coords is None:
+                    self.negative_hits += 1
+                return True, coords
+
+        self.misses += 1
+        return False, None
+
+    def set(self, query: str, language: str, coords: Coords) -> None:
+        """좌표 저장 (coords=None이면 ZERO_RESULTS 네거티브 캐시)"""
+        key = self._key(query, language)
+        ttl_seconds = self.ttl_seconds if coords else self.negative_ttl_seconds
+        self._remember(key, coords, ttl_seconds)
+
+        if self.redis is None:
+            return
+        value = {"miss": True} if coords is None else {"lat": coords["latitude"], "lng": coords["longitude"]}
+        try:
+            self.redis.setex(key, ttl_seconds, json.dumps(value))
+        except Exception as e:
+            print(f"⚠️ 지오코딩 캐시 Redis 저장 실패: {e}")
+
+    async def get_or_fetch(
+        self,
+        query: str,
+        language: str,
+        fetch: Callable[[], Awaitable[Tuple[str, Coords]]],
+    ) -> Coords:
+        """
+        캐시 조회 → 미스면 fetch() 1번 (같은 키의 동시 요청은 결과 공유)
+
+        Args:
+            fetch: upstream 호출 → (status, 좌표). "OK"/"ZERO_RESULTS"만 캐시 (나머지 오류는 저장하지 않음)
+        """
+        hit, coords = await asyncio.to_thread(self.get, query, language)
+        if hit:
+            return coords
+
+        async def fetch_and_store() -> Coords:
+            status, fetched = await fetch()
+            if status in ("OK", "ZERO_RESULTS"):
+                await asyncio.to_thread(self.set, query, language, fetched if status == "OK" else None)
+            return fetched
+
+        return await self._flight.run(self._key(query, language), fetch_and_store)
+
+    def seed(self, entries: Iterable[Tuple[str, float, float]], language: str) -> int:
+        """
+        (이름, 위도, 경도) 목록으로 Redis 사전 적재
+
+        - 이미 있는 키(Google 결과)는 덮어쓰지 않음 (SET NX)
+        - 같은 이름이 서로 다른 좌표(SEED_AMBIGUOUS_DISTANCE_M 이상 차이)로 여러 번 나오면 모호하므로 제외
+        """
+        if self.redis is None:
+            return 0
+
+        by_name: Dict[str, Optional[Tuple[float, float]]] = {}
+        for name, lat, lng in entries:
+            if not name or lat is None or lng is None:
+                continue
+            normalized = self.normalize(name)
+            if not normalized:
+                continue
+            point = (float(lat), float(lng))
+            if normalized not in by_name:
+                by_name[normalized] = point
+            elif by_name[normalized] is not None and haversine_m(*by_name[normalized], *point) > SEED_AMBIGUOUS_DISTANCE_M:
+                by_name[normalized] = None  # 모호한 이름
+
+        seeded = 0
+        pipe = self.redis.pipeline(transaction=False)
+        for normalized, point in by_name.items():
+            if point is None:
+                continue
+            pipe.set(
+                self._key(normalized, language),
+                json.dumps({"lat": point[0], "lng": point[1]}),
+                ex=self.ttl_seconds,
+                nx=True,
+            )
+            seeded += 1
+        pipe.execute()
+        return seeded
+
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스 통계"""
+        lookups = self.memory_hits + self.redis_hits + self.misses
+        hits = self.memory_hits + self.redis_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "coalesced": self._flight.coalesced,
+            "upstream_calls": self._flight.calls,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": len(self._lru),
+            "max_size": self.max_size,
+        }
+
+
+# 공유 캐시 인스턴스
+geocode_cache = GeocodeCache(
+    max_size=settings.GEOCODE_CACHE_SIZE,
+    ttl_seconds=settings.GEOCODE_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.GEOCODE_NEGATIVE_TTL_SECONDS,
+    redis=redis_client,
+)
+
+
+def seed_geocode_cache_from_db(db: Session, language: str = "ko") -> int:
+    """
+    DB에 이미 있는 장소 좌표로 지오코딩 캐시 사전 적재
+
+    - festival: title
+    - celeb_restaurants: restaurant_name / restaurant_name_en
+    - k_contents_trans: location_name / location_name_en
+    """
+    entries = []
+
+    for title, lat, lng in db.query(Festival.title, Festival.latitude, Festival.longitude).filter(
+        Festival.latitude.isnot(None), Festival.longitude.isnot(None)
+    ).all():
+        entries.append((title, lat, lng))
+
+    for name, name_en, lat, lng in db.query(
+        Restaurant.restaurant_name, Restaurant.restaurant_name_en, Restaurant.Latitude, Restaurant.Longitude
+    ).filter(Restaurant.Latitude.isnot(None), Restaurant.Longitude.isnot(None)).all():
+        entries.append((name, lat, lng))
+        entries.append((name_en, lat, lng))
+
+    for name, name_en, lat, lng in db.query(
+        KContent.location_name, KContent.location_name_en, KContent.latitude, KContent.longitude
+    ).filter(KContent.latitude.isnot(None), KContent.longitude.isnot(None)).all():
+        entries.append((name, lat, lng))
+        entries.append((name_en, lat, lng))
+
+    seeded = geocode_cache.seed(entries, language)
+    print(f"📍 지오코딩 캐시 사전 적재: {seeded}개 (후보 {len(entries)}개)")
+    return seeded
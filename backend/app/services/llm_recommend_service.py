@@ -8,9 +8,39 @@ recommend.py의 벡터 기반 추천 결과를 LLM에게 보내서
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, Optional, AsyncIterator
 from openai import OpenAI
 
+from app.core.config import settings
+from app.services.llm_rerank_cache import llm_rerank_cache
+from app.utils.json_stream import StreamingJSONArrayParser
+from app.utils.openai_client import achat_with_gpt_stream
+
+# 프롬프트 압축 설정
+CANDIDATE_LIMIT = 20  # LLM에 보내는 후보 수
+PROMPT_FIELD_MAX_CHARS = 60  # 표 셀 최대 길이 (토큰 예산 초과 시 줄어듦)
+PROMPT_FIELD_MIN_CHARS = 12
+PROMPT_VERSION = "table-v1"  # 프롬프트/응답 형식이 바뀌면 올림 (캐시 키에 포함)
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (영문 기준 약 4글자 = 1토큰)"""
+    return len(text) // 4 + 1
+
+
+def _clip(value: Any, max_chars: int) -> str:
+    """표 셀 정리: 구분자/줄바꿈 제거 + 길이 제한"""
+    text = " ".join(str(value or "").replace("|", "/").split())
+    return text if len(text) <= max_chars else text[:max_chars - 1] + "…"
+
+
+def _encode_table(header: List[str], rows: List[List[Any]], max_chars: int) -> str:
+    """"|" 구분 표 (헤더 + 행)"""
+    lines = ["|".join(header)]
+    lines.extend("|".join(_clip(cell, max_chars) for cell in row) for row in rows)
+    return "\n".join(lines)
+
 
 class LLMRecommendService:
     """
@@ -30,16 +60,20 @@ class LLMRecommendService:
         user_bookmarks: List[Dict[str, Any]],
         recommended_items: List[Dict[str, Any]],
         user_preferences: Optional[Dict[str, Any]] = None,
-        top_n: int = 10
+        top_n: int = 10,
+        user_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         벡터 기반 추천을 LLM으로 재정렬 및 설명 추가
         
+        같은 북마크/후보 조합이면 캐시된 LLM 결과를 재사용합니다. (llm_rerank_cache)
+        
         Args:
             user_bookmarks: 사용자가 북마크한 장소 목록
             recommended_items: Qdrant에서 추천한 장소 목록
             user_preferences: 사용자 선호도 정보 (선택)
             top_n: 최종 추천 개수
+            user_id: 캐시 폐기용 사용자 ID (선택)
             
         Returns:
             {
@@ -67,27 +101,20 @@ class LLMRecommendService:
             top_n
         )
         
-        # 2️⃣ LLM 호출
+        # 2️⃣ 캐시 확인 (stale이면 일단 반환하고 백그라운드 갱신)
+        cache_key = self._cache_key(user_bookmarks, recommended_items, user_preferences, top_n)
+        cached = llm_rerank_cache.get(cache_key)
+        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=2000,
-                response_format={"type": "json_object"}
-            )
-            
-            # 3️⃣ 응답 파싱
-            llm_result = json.loads(response.choices[0].message.content)
+            if cached is not None:
+                llm_result, is_stale = cached
+                if is_stale:
+                    llm_rerank_cache.refresh_in_background(cache_key, lambda: self._rerank(prompt), user_id)
+                print(f"⚡ LLM 재정렬 캐시 {'stale ' if is_stale else ''}히트: {cache_key}")
+            else:
+                # 3️⃣ LLM 호출
+                llm_result = self._rerank(prompt)
+                llm_rerank_cache.set(cache_key, llm_result, user_id)
             
             # 4️⃣ 원본 데이터와 병합
             enhanced = self._merge_with_original(
@@ -107,6 +134,120 @@ class LLMRecommendService:
             }
     
     
+    async def astream_recommendations(
+        self,
+        user_bookmarks: List[Dict[str, Any]],
+        recommended_items: List[Dict[str, Any]],
+        user_preferences: Optional[Dict[str, Any]] = None,
+        top_n: int = 10,
+        user_id: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        🌊 enhance_recommendations의 스트리밍 버전
+        
+        LLM 응답(JSON)을 토큰 단위로 받으면서 완성된 항목부터 바로 내보냅니다.
+        캐시 히트면 LLM 호출 없이 캐시된 결과를 같은 이벤트 형식으로 내보냅니다.
+        
+        Yields:
+            {"type": "summary", "user_taste_summary": "..."}
+            {"type": "rerank", "item": {...원본 + llm_rank/llm_reason/llm_match_score}}
+            {"type": "done", "total_count": 10, "cached": False}
+        """
+        prompt = self._build_prompt(user_bookmarks, recommended_items, user_preferences, top_n)
+        cache_key = self._cache_key(user_bookmarks, recommended_items, user_preferences, top_n)
+        alias_to_item = self._alias_map(recommended_items)
+        seen = set()
+        
+        # 1️⃣ 캐시 히트 → 한 번에 전송
+        cached = await asyncio.to_thread(llm_rerank_cache.get, cache_key)
+        if cached is not None:
+            llm_result, is_stale = cached
+            if is_stale:
+                llm_rerank_cache.refresh_in_background(cache_key, lambda: self._rerank(prompt), user_id)
+            print(f"⚡ LLM 재정렬 캐시 {'stale ' if is_stale else ''}히트 (stream): {cache_key}")
+            
+            yield {"type": "summary", "user_taste_summary": llm_result.get("user_taste_summary", "")}
+            count = 0
+            for llm_rec in llm_result.get("recommendations", []):
+                enhanced = self._merge_record(llm_rec, alias_to_item, seen)
+                if enhanced:
+                    count += 1
+                    yield {"type": "rerank", "item": enhanced}
+            yield {"type": "done", "total_count": count, "cached": True}
+            return
+        
+        # 2️⃣ LLM 스트리밍 + 점진 파싱
+        parser = StreamingJSONArrayParser(array_key="recommendations", string_keys=("user_taste_summary",))
+        count = 0
+        async for token in achat_with_gpt_stream(
+            messages=self._messages(prompt),
+            model=self.model,
+            temperature=0.7,
+            max_tokens=2000,
+            response_format={"type": "json_object"}
+        ):
+            for kind, value in parser.feed(token):
+                if kind == "string":
+                    yield {"type": "summary", "user_taste_summary": value[1]}
+                    continue
+                enhanced = self._merge_record(value, alias_to_item, seen)
+                if enhanced:
+                    count += 1
+                    yield {"type": "rerank", "item": enhanced}
+        
+        # 3️⃣ 전체 JSON 캐시 저장 (다음 요청은 캐시 히트)
+        try:
+            await asyncio.to_thread(llm_rerank_cache.set, cache_key, parser.result(), user_id)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ LLM 스트리밍 응답 JSON 파싱 실패 (캐시 저장 생략): {e}")
+        
+        yield {"type": "done", "total_count": count, "cached": False}
+    
+    
+    def _cache_key(
+        self,
+        user_bookmarks: List[Dict],
+        recommended_items: List[Dict],
+        user_preferences: Optional[Dict],
+        top_n: int
+    ) -> str:
+        """LLM 재정렬 캐시 키 (북마크 + 프롬프트에 들어간 후보 + 모델/프롬프트 버전)"""
+        return llm_rerank_cache.make_key(
+            [(bm.get("place_type"), bm.get("reference_id")) for bm in user_bookmarks[:10]],
+            [(item.get("place_type"), item.get("reference_id")) for item in recommended_items[:CANDIDATE_LIMIT]],
+            top_n,
+            f"{self.model}/{PROMPT_VERSION}",
+            user_preferences
+        )
+    
+    
+    def _messages(self, prompt: str) -> List[Dict[str, str]]:
+        """시스템 프롬프트 + 사용자 프롬프트"""
+        return [
+            {
+                "role": "system",
+                "content": self._get_system_prompt()
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    
+    def _rerank(self, prompt: str) -> Dict[str, Any]:
+        """LLM 호출 + JSON 파싱 (캐시 대상 원본 결과)"""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=0.7,
+            max_tokens=2000,
+            response_format={"type": "json_object"}
+        )
+        
+        return json.loads(response.choices[0].message.content)
+    
+    
     def _get_system_prompt(self) -> str:
         """시스템 프롬프트 정의"""
         return """You are a K-Culture travel expert AI assistant.
@@ -118,12 +259,16 @@ You should:
 3. Provide personalized reasons for each recommendation
 4. Write a summary of user's travel preferences
 
+Input Format:
+- Bookmarks and candidates are given as pipe-separated tables with a header row
+- Each candidate has a short integer "id" (use it to refer to the candidate)
+
 Output Format (JSON):
 {
     "user_taste_summary": "This user seems to enjoy...",
     "recommendations": [
         {
-            "reference_id": 123,
+            "id": 3,
             "rank": 1,
             "reason": "This place offers stunning night views, similar to Namsan Tower you bookmarked",
             "match_score": 0.95
@@ -145,42 +290,55 @@ Important:
         user_preferences: Optional[Dict],
         top_n: int
     ) -> str:
-        """사용자 데이터를 바탕으로 프롬프트 생성"""
+        """
+        사용자 데이터를 바탕으로 프롬프트 생성 (🚀 압축 표 형식)
         
-        # 북마크 요약
-        bookmarks_summary = []
-        for bm in user_bookmarks[:10]:  # 최근 10개만
-            bookmarks_summary.append({
-                "name": bm.get("name", "Unknown"),
-                "category": bm.get("extra", {}).get("category_en", ""),
-                "keyword": bm.get("extra", {}).get("keyword_en", ""),
-                "location": bm.get("extra", {}).get("location_name_en", "")
-            })
+        - json.dumps(indent=2) 대신 "|" 구분 표 (헤더 1줄 + 행)
+        - 후보 reference_id 대신 1부터 시작하는 짧은 id (병합 시 후보 순서로 복원)
+        - 필드 길이를 줄여가며 LLM_RERANK_PROMPT_TOKEN_BUDGET 안에 맞춤
+        """
         
-        # 추천 후보 요약
-        candidates_summary = []
-        for idx, item in enumerate(recommended_items[:20]):  # 상위 20개
-            candidates_summary.append({
-                "rank": idx + 1,
-                "reference_id": item.get("reference_id"),
-                "name": item.get("name", "Unknown"),
-                "category": item.get("category", ""),
-                "address": item.get("address", ""),
-                "score": item.get("score", 0),
-                "extra": {
-                    "category_en": item.get("extra", {}).get("category_en", ""),
-                    "keyword_en": item.get("extra", {}).get("keyword_en", ""),
-                    "location_name_en": item.get("extra", {}).get("location_name_en", "")
-                }
-            })
+        # 북마크 요약 (최근 10개만)
+        bookmark_rows = [
+            [
+                bm.get("name", "Unknown"),
+                bm.get("extra", {}).get("category_en", ""),
+                bm.get("extra", {}).get("keyword_en", ""),
+                bm.get("extra", {}).get("location_name_en", ""),
+            ]
+            for bm in user_bookmarks[:10]
+        ]
         
-        prompt = f"""Analyze the user's travel preferences and re-rank recommendations.
-
+        # 추천 후보 요약 (상위 20개, 순서 = 벡터 유사도 순위)
+        candidate_rows = [
+            [
+                str(idx + 1),
+                item.get("name", "Unknown"),
+                item.get("category", "") or item.get("extra", {}).get("category_en", ""),
+                item.get("extra", {}).get("keyword_en", ""),
+                item.get("address", ""),
+                f"{item.get('score', 0) or 0:.2f}",
+            ]
+            for idx, item in enumerate(recommended_items[:CANDIDATE_LIMIT])
+        ]
+        
+        preferences_line = ""
+        if user_preferences:
+            preferences_line = f"\nUser preferences: {json.dumps(user_preferences, ensure_ascii=False, separators=(',', ':'))}\n"
+        
+        # 토큰 예산을 넘으면 필드 최대 길이를 줄여서 다시 생성
+        max_field_chars = PROMPT_FIELD_MAX_CHARS
+        while True:
+            bookmarks_table = _encode_table(["name", "category", "keyword", "location"], bookmark_rows, max_field_chars)
+            candidates_table = _encode_table(["id", "name", "category", "keyword", "address", "score"], candidate_rows, max_field_chars)
+            
+            prompt = f"""Analyze the user's travel preferences and re-rank recommendations.
+{preferences_line}
 User's Bookmarked Places:
-{json.dumps(bookmarks_summary, indent=2, ensure_ascii=False)}
+{bookmarks_table}
 
-Recommended Candidates (from vector similarity):
-{json.dumps(candidates_summary, indent=2, ensure_ascii=False)}
+Recommended Candidates (id = vector similarity rank):
+{candidates_table}
 
 Task:
 1. Identify user's preferences (what kind of places they like)
@@ -190,10 +348,11 @@ Task:
 
 Return JSON with:
 - user_taste_summary: Brief analysis of user's preferences
-- recommendations: Array of top {top_n} places with reference_id, rank, reason, match_score
+- recommendations: Array of top {top_n} places with id, rank, reason, match_score
 """
-        
-        return prompt
+            if estimate_tokens(prompt) <= settings.LLM_RERANK_PROMPT_TOKEN_BUDGET or max_field_chars <= PROMPT_FIELD_MIN_CHARS:
+                return prompt
+            max_field_chars = max(PROMPT_FIELD_MIN_CHARS, max_field_chars * 2 // 3)
     
     
     def _merge_with_original(
@@ -201,28 +360,16 @@ Return JSON with:
         llm_result: Dict,
         original_items: List[Dict]
     ) -> Dict[str, Any]:
-        """LLM 결과와 원본 데이터 병합"""
+        """LLM 결과와 원본 데이터 병합 (프롬프트의 짧은 id → 후보 순서로 복원)"""
         
-        # reference_id로 매핑
-        id_to_item = {
-            item["reference_id"]: item 
-            for item in original_items
-        }
+        alias_to_item = self._alias_map(original_items)
         
         # LLM 추천 결과에 원본 데이터 병합
         enhanced_recs = []
+        seen = set()
         for llm_rec in llm_result.get("recommendations", []):
-            ref_id = llm_rec["reference_id"]
-            
-            if ref_id in id_to_item:
-                original = id_to_item[ref_id]
-                enhanced = {
-                    **original,  # 원본 데이터 (name, address, image_url 등)
-                    "llm_rank": llm_rec["rank"],
-                    "llm_reason": llm_rec["reason"],
-                    "llm_match_score": llm_rec.get("match_score", 0),
-                    "original_score": original.get("score", 0)
-                }
+            enhanced = self._merge_record(llm_rec, alias_to_item, seen)
+            if enhanced:
                 enhanced_recs.append(enhanced)
         
         return {
@@ -230,6 +377,37 @@ Return JSON with:
             "user_taste_summary": llm_result.get("user_taste_summary", ""),
             "total_count": len(enhanced_recs)
         }
+    
+    
+    @staticmethod
+    def _alias_map(original_items: List[Dict]) -> Dict[int, Dict]:
+        """프롬프트 id(1부터) → 후보"""
+        return {
+            idx + 1: item
+            for idx, item in enumerate(original_items[:CANDIDATE_LIMIT])
+        }
+    
+    
+    @staticmethod
+    def _merge_record(llm_rec: Dict, alias_to_item: Dict[int, Dict], seen: set) -> Optional[Dict[str, Any]]:
+        """LLM 추천 1건 + 원본 후보 병합 (알 수 없는 id/중복이면 None)"""
+        try:
+            alias = int(llm_rec.get("id"))
+        except (TypeError, ValueError):
+            return None
+        
+        if alias not in alias_to_item or alias in seen:
+            return None
+        
+        seen.add(alias)
+        original = alias_to_item[alias]
+        return {
+            **original,  # 원본 데이터 (name, address, image_url 등)
+            "llm_rank": llm_rec.get("rank"),
+            "llm_reason": llm_rec.get("reason"),
+            "llm_match_score": llm_rec.get("match_score", 0),
+            "original_score": original.get("score", 0)
+        }
 
 
 # ============================================================
@@ -0,0 +1,174 @@
+# app/services/llm_rerank_cache.py
+"""
+LLM 재정렬 결과 캐시 (Redis, stale-while-revalidate)
+
+북마크와 후보가 그대로인데 /recommend-llm 요청마다 gpt 호출(max_tokens=2000)을 다시 하지 않도록
+LLM이 돌려준 JSON(순위/이유/요약)을 저장해 두고 재사용합니다.
+
+- 키: (북마크 ID, 후보 ID, top_n, 모델, 선호도) 해시
+- fresh 구간(LLM_RERANK_FRESH_SECONDS): 캐시 그대로 반환
+- stale 구간(~ LLM_RERANK_CACHE_TTL_SECONDS): 캐시를 즉시 반환하고 백그라운드에서 갱신
+- 북마크 추가/삭제 시 사용자 키 전체 폐기 (invalidate_user)
+
+원본 장소 데이터는 저장하지 않고 요청마다 최신 후보와 병합합니다.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.session import redis_client
+
+
+class LLMRerankCache:
+
+    KEY_PREFIX = "llmrank"
+
+    def __init__(self, redis=None):
+        self.redis = redis
+        self._lock = threading.Lock()
+
+        # 📊 카운터
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def make_key(
+        self,
+        bookmark_ids: Iterable[Tuple[Any, Any]],
+        candidate_ids: Iterable[Tuple[Any, Any]],
+        top_n: int,
+        model: str,
+        preferences: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """북마크는 순서 무관(정렬), 후보는 순서 유지 (프롬프트의 rank가 달라지므로)"""
+        material = json.dumps({
+            "bookmarks": sorted([list(map(str, pair)) for pair in bookmark_ids]),
+            "candidates": [list(map(str, pair)) for pair in candidate_ids],
+            "top_n": top_n,
+            "model": model,
+            "preferences": preferences or {},
+        }, sort_keys=True, ensure_ascii=False)
+        return f"{self.KEY_PREFIX}:{hashlib.sha1(material.encode('utf-8')).hexdigest()}"
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}:user:{user_id}"
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """
+        Returns:
+            (LLM 결과, stale 여부) 또는 None
+        """
+        if self.redis is None:
+            return None
+        try:
+            raw = self.redis.get(key)
+        except Exception as e:
+            print(f"⚠️ LLM 재정렬 캐시 조회 실패: {e}")
+            self._count("errors")
+            return None
+
+        if raw is None:
+            self._count("misses")
+            return None
+
+        # 손상되었거나 예전 형식인 항목은 미스로 처리 (새 결과가 set()으로 덮어씀)
+        try:
+            entry = json.loads(raw)
+            is_stale = time.time() - entry["created_at"] > settings.LLM_RERANK_FRESH_SECONDS
+            result = entry["result"]
+        except (ValueError, TypeError, KeyError) as e:
+            print(f"⚠️ LLM 재정렬 캐시 항목 손상 ({key}): {e}")
+            self._count("errors")
+            return None
+
+        self._count("stale_hits" if is_stale else "hits")
+        return result, is_stale
+
+    def set(self, key: str, result: Dict[str, Any], user_id: Optional[int] = None) -> None:
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.setex(
+                key,
+                settings.LLM_RERANK_CACHE_TTL_SECONDS,
+                json.dumps({"result": result, "created_at": time.time()}, ensure_ascii=False)
+            )
+            if user_id is not None:
+                # 사용자별 키 목록 (북마크 변경 시 일괄 폐기용)
+                pipe.sadd(self._user_key(user_id), key)
+                pipe.expire(self._user_key(user_id), settings.LLM_RERANK_CACHE_TTL_SECONDS)
+            pipe.execute()
+        except Exception as e:
+            print(f"⚠️ LLM 재정렬 캐시 저장 실패: {e}")
+            self._count("errors")
+
+    def refresh_in_background(
+        self,
+        key: str,
+        compute: Callable[[], Dict[str, Any]],
+        user_id: Optional[int] = None,
+    ) -> None:
+        """stale 항목 갱신 (같은 키는 동시에 한 번만 - Redis NX 락)"""
+        if self.redis is None:
+            return
+        lock_key = f"{key}:refresh"
+        try:
+            if not self.redis.set(lock_key, "1", nx=True, ex=60):
+                return
+        except Exception:
+            return
+
+        def run():
+            try:
+                self.set(key, compute(), user_id)
+                self._count("refreshes")
+                print(f"🔄 LLM 재정렬 캐시 갱신 완료: {key}")
+            except Exception as e:
+                print(f"⚠️ LLM 재정렬 캐시 갱신 실패: {e}")
+                self._count("errors")
+            finally:
+                try:
+                    self.redis.delete(lock_key)
+                except Exception:
+                    pass
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def invalidate_user(self, user_id: int) -> None:
+        """사용자의 캐시된 재정렬 결과 전체 폐기 (북마크 변경 시)"""
+        if self.redis is None:
+            return
+        try:
+            user_key = self._user_key(user_id)
+            keys = list(self.redis.smembers(user_key))
+            self.redis.delete(user_key, *keys)
+            if keys:
+                print(f"🗑️ LLM 재정렬 캐시 폐기: user_id={user_id} ({len(keys)}개)")
+        except Exception as e:
+            print(f"⚠️ LLM 재정렬 캐시 폐기 실패 (user_id={user_id}): {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """히트/미스 통계 (stale 히트도 즉시 응답이므로 히트로 계산)"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
+
+
+# 🚀 공유 인스턴스 (TTL 0이면 캐시 미사용)
+llm_rerank_cache = LLMRerankCache(redis=redis_client if settings.LLM_RERANK_CACHE_TTL_SECONDS > 0 else None)
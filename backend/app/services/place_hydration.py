@@ -0,0 +1,96 @@
+# app/services/place_hydration.py
+"""
+🚀 추천 결과 원본 데이터 일괄 조회 (N+1 제거)
+
+추천 결과마다 db.query(...).first()를 호출하면
+북마크 10개 × top_k 만큼 단건 SELECT가 발생합니다.
+(place_type, reference_id) 목록을 place_type별로 묶어
+테이블당 IN (...) 쿼리 1번으로 조회하고 원래 키로 다시 매핑합니다.
+"""
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.festival import Festival
+from app.models.kcontent import KContent
+from app.models.restaurant import Restaurant
+from app.schemas.bookmarkschema import PlaceType
+
+PlaceKey = Tuple[int, Any]  # (place_type, reference_id)
+
+# place_type → (모델, PK 컬럼)
+PLACE_MODELS = {
+    PlaceType.KCONTENT: (KContent, KContent.content_id),
+    PlaceType.RESTAURANT: (Restaurant, Restaurant.restaurant_id),
+    PlaceType.FESTIVAL: (Festival, Festival.festival_id),
+}
+
+
+def _normalize_id(reference_id: Any) -> Optional[int]:
+    """Qdrant payload의 id는 문자열일 수 있으므로 정수 PK로 변환 (변환 불가면 None)"""
+    try:
+        return int(reference_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_places_bulk(db: Session, keys: Iterable[PlaceKey]) -> Dict[PlaceKey, Any]:
+    """
+    원본 ORM 객체 일괄 조회
+
+    Args:
+        keys: [(place_type, reference_id), ...] - 중복 가능
+
+    Returns:
+        {(place_type, reference_id): ORM 객체} - 원래 키 그대로 (없는 키는 제외)
+    """
+    keys_by_type: Dict[int, Dict[int, list]] = defaultdict(lambda: defaultdict(list))
+    for place_type, reference_id in keys:
+        normalized = _normalize_id(reference_id)
+        if normalized is None or place_type not in PLACE_MODELS:
+            continue
+        keys_by_type[place_type][normalized].append((place_type, reference_id))
+
+    loaded: Dict[PlaceKey, Any] = {}
+    for place_type, id_map in keys_by_type.items():
+        model, pk_column = PLACE_MODELS[place_type]
+        try:
+            items = db.query(model).filter(pk_column.in_(list(id_map))).all()
+        except Exception as e:
+            print(f"❌ 원본 데이터 일괄 조회 실패 (place_type={place_type}, {len(id_map)}개): {e}")
+            continue
+
+        for item in items:
+            for original_key in id_map.get(getattr(item, pk_column.key), ()):
+                loaded[original_key] = item
+
+    return loaded
+
+
+def hydrate_places(
+    db: Session,
+    keys: Iterable[PlaceKey],
+    formatter: Callable[[int, Any], Optional[dict]],
+) -> Dict[PlaceKey, dict]:
+    """
+    일괄 조회 + 응답용 dict 변환
+
+    Args:
+        keys: [(place_type, reference_id), ...]
+        formatter: (place_type, ORM 객체) → dict (None이면 결과에서 제외)
+
+    Returns:
+        {(place_type, reference_id): dict}
+    """
+    hydrated: Dict[PlaceKey, dict] = {}
+    for key, item in load_places_bulk(db, keys).items():
+        place_type, reference_id = key
+        try:
+            data = formatter(place_type, item)
+        except Exception as e:
+            print(f"❌ 원본 데이터 변환 실패 (place_type={place_type}, reference_id={reference_id}): {e}")
+            continue
+        if data:
+            hydrated[key] = data
+    return hydrated
@@ -0,0 +1,158 @@
+# app/services/recommend_engine.py
+"""
+🎯 북마크 기반 추천 엔진
+
+북마크마다 client.recommend()를 순차 호출하면 Qdrant 왕복이 북마크 수만큼 생깁니다.
+여기서는 북마크를 컬렉션별로 묶어 recommend_batch 1번으로 처리합니다. (왕복 O(컬렉션))
+
+- 최근성 가중치: 최신 북마크에서 나온 결과일수록 가중 점수가 높음 (RECOMMEND_RECENCY_DECAY ** 순위)
+- 서버 측 중복 제거: 이미 북마크한 포인트는 Qdrant 필터(must_not has_id)로 제외
+- 클라이언트 측 병합: 여러 북마크에서 같은 결과가 나오면 가중 점수가 가장 높은 것만 유지
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from qdrant_client.http import models
+
+from app.core.config import settings
+from app.schemas.bookmarkschema import PlaceType
+
+# place_type → Qdrant 컬렉션
+PLACE_TYPE_COLLECTION_MAP = {
+    PlaceType.RESTAURANT: "seoul-restaurant",
+    PlaceType.FESTIVAL: "seoul-festival",
+    # PlaceType.ATTRACTION: "seoul-attraction",
+    PlaceType.KCONTENT: "seoul-kcontents",
+}
+
+
+@dataclass
+class RecommendHit:
+    """추천 결과 1건"""
+    place_type: int
+    reference_id: Any
+    point: Any  # models.ScoredPoint
+    weighted_score: float
+    bookmark_id: Optional[int] = None
+
+    @property
+    def score(self) -> float:
+        """Qdrant 원본 유사도"""
+        return self.point.score
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        return self.point.payload or {}
+
+
+def point_reference_id(point) -> Any:
+    """Qdrant 포인트 → 원본 테이블 ID (payload content_id/id 우선)"""
+    payload = point.payload or {}
+    return payload.get("content_id") or payload.get("id") or point.id
+
+
+class BookmarkRecommender:
+
+    @staticmethod
+    def _recommend_collection(
+        client,
+        collection_name: str,
+        bookmarks: list,
+        limit: int,
+    ) -> List[List[Any]]:
+        """
+        컬렉션 하나에 대한 북마크별 추천 (recommend_batch 1회)
+
+        배치 중 하나라도 실패하면(없는 포인트 등) 북마크별 호출로 폴백해 실패를 격리합니다.
+        """
+        exclude = models.Filter(must_not=[
+            models.HasIdCondition(has_id=[b.reference_id for b in bookmarks])
+        ])
+
+        try:
+            return client.recommend_batch(
+                collection_name=collection_name,
+                requests=[
+                    models.RecommendRequest(
+                        positive=[b.reference_id],
+                        negative=[],
+                        filter=exclude,
+                        limit=limit,
+                        with_payload=True,
+                    )
+                    for b in bookmarks
+                ],
+            )
+        except Exception as e:
+            print(f"⚠️ Qdrant recommend_batch 실패 ({collection_name}, {len(bookmarks)}개) → 개별 호출: {e}")
+
+        results = []
+        for b in bookmarks:
+            try:
+                results.append(client.recommend(
+                    collection_name=collection_name,
+                    positive=[b.reference_id],
+                    query_filter=exclude,
+                    limit=limit,
+                ))
+            except Exception as e:
+                print(f"Qdrant recommend 실패 (bookmark_id={b.bookmark_id}): {e}")
+                results.append([])
+        return results
+
+    @staticmethod
+    def recommend(
+        client,
+        bookmarks: list,
+        collection_map: Dict[int, str],
+        top_k_per_bookmark: int,
+        recency_decay: Optional[float] = None,
+    ) -> List[RecommendHit]:
+        """
+        북마크 목록 → 추천 결과 (가중 점수 내림차순, 중복 제거)
+
+        Args:
+            client: QdrantClient
+            bookmarks: 최신순 Bookmark 리스트
+            collection_map: place_type → Qdrant 컬렉션 이름
+            top_k_per_bookmark: 북마크당 추천 수
+            recency_decay: 순위별 감쇠 (None이면 설정값, 1.0이면 가중치 없음)
+        """
+        decay = settings.RECOMMEND_RECENCY_DECAY if recency_decay is None else recency_decay
+
+        # 1. 컬렉션별로 묶기 (최신순 순위 유지)
+        grouped: Dict[str, list] = OrderedDict()  # 컬렉션 → [(최신순 순위, 북마크), ...]
+        for rank, b in enumerate(bookmarks):
+            collection_name = collection_map.get(b.place_type)
+            if not collection_name:
+                continue
+            grouped.setdefault(collection_name, []).append((rank, b))
+
+        # 2. 컬렉션당 Qdrant 왕복 1회 + 병합
+        merged: Dict[tuple, RecommendHit] = {}
+        for collection_name, ranked_bookmarks in grouped.items():
+            batch_results = BookmarkRecommender._recommend_collection(
+                client, collection_name, [b for _, b in ranked_bookmarks], top_k_per_bookmark
+            )
+
+            for (rank, b), results in zip(ranked_bookmarks, batch_results):
+                weight = decay ** rank
+                for point in results:
+                    reference_id = point_reference_id(point)
+                    key = (b.place_type, reference_id)
+                    weighted = point.score * weight
+
+                    current = merged.get(key)
+                    if current is None or weighted > current.weighted_score:
+                        merged[key] = RecommendHit(
+                            place_type=b.place_type,
+                            reference_id=reference_id,
+                            point=point,
+                            weighted_score=weighted,
+                            bookmark_id=b.bookmark_id,
+                        )
+
+        hits = sorted(merged.values(), key=lambda hit: hit.weighted_score, reverse=True)
+        print(f"🎯 북마크 {len(bookmarks)}개 → Qdrant 호출 {len(grouped)}회, 추천 {len(hits)}개")
+        return hits
@@ -0,0 +1,215 @@
+# app/services/retrieval.py
+"""
+🔎 통합 검색(Retrieval) 서비스
+- ChatService / ChatRestService / ChatKContentsService 공용
+- Qdrant 클라이언트 1개 + 임베딩 모델 1개 (임베딩 캐시 공유)
+- 컬렉션별 필드 매핑 (CollectionSpec) - 새 컬렉션은 COLLECTIONS에 추가
+- 통일된 결과 타입 (SearchHit)
+- 벡터 + lexical(BM25) 하이브리드 검색 (RRF)
+
+검색어 전처리/보정 규칙은 채팅 모드마다 다르므로 각 서비스에 남겨두고,
+여기서는 정제된 검색어와 변형 리스트를 받아 검색만 담당합니다.
+"""
+import os
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from qdrant_client import QdrantClient
+
+from app.core.config import settings
+from app.core.embedding_cache import get_cached_embeddings
+from app.utils.hybrid_search import get_lexical_index, hybrid_rank
+from app.utils.vector_search import search_variants_batch
+
+
+@dataclass(frozen=True)
+class CollectionSpec:
+    """검색 타입별 Qdrant 컬렉션 설정"""
+    search_type: str
+    collection_name: str
+    title_fields: Tuple[str, ...]  # 제목 / lexical 인덱스 필드 (payload.metadata)
+    threshold: float  # 최종 채택 임계값
+
+
+@dataclass
+class SearchHit:
+    """검색 결과 (모든 컬렉션 공통)"""
+    search_type: str
+    point_id: Any
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    page_content: str = ""
+
+    @property
+    def title(self) -> str:
+        spec = COLLECTIONS[self.search_type]
+        return " ".join(str(self.metadata.get(f, "") or "") for f in spec.title_fields).strip()
+
+
+COLLECTIONS: Dict[str, CollectionSpec] = {
+    "festival": CollectionSpec("festival", "seoul-festival", ("title",), 0.5),
+    "attraction": CollectionSpec("attraction", "seoul-attraction", ("title",), 0.5),
+    "restaurant": CollectionSpec("restaurant", "seoul-restaurant", ("name",), 0.5),
+    "kcontent": CollectionSpec("kcontent", "seoul-kcontents", ("drama_name_ko", "location_name_en"), 0.4),
+}
+
+
+def _to_hit(search_type: str, point) -> SearchHit:
+    payload = point.payload or {}
+    return SearchHit(
+        search_type=search_type,
+        point_id=point.id,
+        score=getattr(point, "score", 0.0),
+        metadata=payload.get("metadata", {}) or {},
+        page_content=payload.get("page_content", "") or "",
+    )
+
+
+class RetrievalService:
+
+    QDRANT_URL = os.getenv("QDRANT_URL", "http://172.17.0.1:6333")
+    QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
+
+    # 🚀 공유 인스턴스
+    _qdrant_client = None
+    _client_lock = threading.Lock()
+
+    @staticmethod
+    def get_qdrant_client() -> QdrantClient:
+        """Qdrant 클라이언트 싱글톤 - 클라우드/로컬 자동 선택"""
+        if RetrievalService._qdrant_client is None:
+            with RetrievalService._client_lock:
+                if RetrievalService._qdrant_client is None:
+                    if RetrievalService.QDRANT_API_KEY:
+                        RetrievalService._qdrant_client = QdrantClient(
+                            url=RetrievalService.QDRANT_URL,
+                            api_key=RetrievalService.QDRANT_API_KEY,
+                            timeout=60,
+                            prefer_grpc=False
+                        )
+                        print(f"✅ Qdrant Cloud 연결: {RetrievalService.QDRANT_URL}")
+                    else:
+                        RetrievalService._qdrant_client = QdrantClient(
+                            url=RetrievalService.QDRANT_URL,
+                            timeout=60,
+                            prefer_grpc=False
+                        )
+                        print(f"✅ Qdrant Local 연결: {RetrievalService.QDRANT_URL}")
+        return RetrievalService._qdrant_client
+
+    @staticmethod
+    def get_embedding_model():
+        """임베딩 모델 (LRU + Redis 캐시 적용, 모든 채팅 모드 공유)"""
+        return get_cached_embeddings(settings.EMBEDDING_MODEL)
+
+    @staticmethod
+    def get_spec(search_type: str) -> CollectionSpec:
+        return COLLECTIONS.get(search_type, COLLECTIONS["attraction"])
+
+    @staticmethod
+    def keyword_overlap(query: str, title: str) -> float:
+        """키워드 겹치는 정도 계산 (lexical 인덱스가 없을 때 사용)"""
+        query_words = set(query.lower().split())
+        title_words = set(title.lower().split())
+
+        overlap = len(query_words & title_words)
+        total = len(query_words | title_words)
+
+        return overlap / total if total > 0 else 0
+
+    @staticmethod
+    def search(
+        cleaned_query: str,
+        variants: List[str],
+        search_type: str,
+        limit: int = 5,
+        score_threshold: float = 0.3,
+        lexical_limit: int = 10,
+    ) -> List[SearchHit]:
+        """
+        하이브리드 검색 (벡터 + BM25, RRF 순서)
+
+        Args:
+            cleaned_query: 정제된 검색어 (lexical 검색/커버리지 계산용)
+            variants: 벡터 검색에 쓸 검색어 변형들
+            search_type: festival / attraction / restaurant / kcontent
+            limit: 변형당 벡터 결과 수
+            score_threshold: 벡터 최소 유사도
+            lexical_limit: BM25 후보 수
+
+        Returns:
+            SearchHit 리스트 (score = 벡터 0.8 + 커버리지 0.2 신뢰도)
+        """
+        spec = RetrievalService.get_spec(search_type)
+        qdrant_client = RetrievalService.get_qdrant_client()
+
+        # 🚀 모든 변형을 임베딩 1회 + search_batch 1회로 처리
+        batch_results = search_variants_batch(
+            qdrant_client,
+            RetrievalService.get_embedding_model(),
+            spec.collection_name,
+            variants,
+            limit=limit,
+            score_threshold=score_threshold
+        )
+
+        # 🔀 벡터 결과 + lexical(BM25) 결과를 RRF로 결합
+        lexical_index = get_lexical_index(qdrant_client, spec.collection_name, list(spec.title_fields))
+        candidates = hybrid_rank(
+            cleaned_query,
+            [result for _, search_results in batch_results for result in search_results],
+            lexical_index,
+            lexical_limit=lexical_limit,
+            fallback_coverage=lambda result: RetrievalService.keyword_overlap(
+                cleaned_query, _to_hit(search_type, result).title
+            )
+        )
+
+        return [_to_hit(search_type, candidate) for candidate in candidates]
+
+    @staticmethod
+    def search_best(cleaned_query: str, variants: List[str], search_type: str) -> Optional[SearchHit]:
+        """RRF 순서에서 타입별 임계값을 처음 넘는 결과 1개"""
+        spec = RetrievalService.get_spec(search_type)
+        hits = RetrievalService.search(cleaned_query, variants, search_type)
+
+        for hit in hits:
+            if hit.score > spec.threshold:
+                print(f"✅ 하이브리드 결과: '{hit.title}' → 점수: {hit.score:.3f}")
+                return hit
+
+        best_score = max((hit.score for hit in hits), default=0)
+        print(f"❌ 유효한 결과 없음 (최고 점수: {best_score:.3f})")
+        return None
+
+    @staticmethod
+    def random_hits(search_type: str, count: int = 10) -> List[SearchHit]:
+        """랜덤 추천용 포인트 (scroll 후 셔플)"""
+        spec = RetrievalService.get_spec(search_type)
+        fetch_count = min(count * 5, 100)
+
+        points, _ = RetrievalService.get_qdrant_client().scroll(
+            collection_name=spec.collection_name,
+            limit=fetch_count,
+            offset=random.randint(0, 50),
+            with_payload=True,
+            with_vectors=False
+        )
+
+        points = list(points)
+        random.shuffle(points)
+        return [_to_hit(search_type, point) for point in points[:count]]
+
+    @staticmethod
+    def warm_up() -> None:
+        """서버 시작 시 클라이언트 연결 + lexical 인덱스 미리 생성"""
+        try:
+            qdrant_client = RetrievalService.get_qdrant_client()
+            RetrievalService.get_embedding_model()
+            for spec in COLLECTIONS.values():
+                get_lexical_index(qdrant_client, spec.collection_name, list(spec.title_fields))
+            print("✅ 검색 서비스 warm-up 완료")
+        except Exception as e:
+            print(f"⚠️ 검색 서비스 warm-up 실패: {e}")
@@ -0,0 +1,121 @@
+# app/services/route_cache.py
+"""
+대중교통 경로 캐시 (ODsay 응답, Redis)
+
+/api/search/route는 요청마다 ODsay를 호출합니다.
+출발/도착 좌표를 약 ROUTE_CACHE_QUANTIZE_M(기본 50m) 격자로 양자화해서 키로 쓰고
+ODsay 원본 응답을 TTL 동안 재사용합니다. (같은 장소 간 경로를 반복 조회하는 일정 화면용)
+
+- 키: route:{출발 격자}:{도착 격자} (위도/경도 격자 인덱스)
+- 원본 응답을 저장하므로 일반/slim 응답 모두 같은 캐시 사용
+- 같은 키 동시 요청은 ODsay 호출 1번 (single-flight)
+- 오류 응답(경로 없음 등)은 저장하지 않음
+"""
+import asyncio
+import json
+import math
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.core.config import settings
+from app.core.session import redis_client
+from app.utils.geo_index import METERS_PER_DEGREE_LAT
+from app.utils.single_flight import SingleFlight
+
+
+def quantize_coord(lat: float, lng: float, cell_m: float) -> Tuple[int, int]:
+    """좌표 → 약 cell_m 크기 격자 인덱스 (경도 간격은 위도에 따라 보정)"""
+    lat_step = cell_m / METERS_PER_DEGREE_LAT
+    lat_idx = int(round(lat / lat_step))
+    lng_step = lat_step / max(math.cos(math.radians(lat_idx * lat_step)), 0.01)
+    return lat_idx, int(round(lng / lng_step))
+
+
+class RouteCache:
+
+    KEY_PREFIX = "route"
+
+    def __init__(self, ttl_seconds: int, cell_m: float, redis=None):
+        self.ttl_seconds = ttl_seconds
+        self.cell_m = cell_m
+        self.redis = redis if ttl_seconds > 0 else None
+        self._flight = SingleFlight()
+
+        # 📊 카운터
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def make_key(self, start_lat: float, start_lng: float, end_lat: float, end_lng: float) -> str:
+        s_lat, s_lng = quantize_coord(start_lat, start_lng, self.cell_m)
+        e_lat, e_lng = quantize_coord(end_lat, end_lng, self.cell_m)
+        return f"{self.KEY_PREFIX}:{int(self.cell_m)}:{s_lat}:{s_lng}:{e_lat}:{e_lng}"
+
+    def get(self, key: str) -> Any:
+        if self.redis is None:
+            return None
+        try:
+            raw = self.redis.get(key)
+        except Exception as e:
+            print(f"⚠️ 경로 캐시 조회 실패: {e}")
+            self.errors += 1
+            return None
+
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        if self.redis is None:
+            return
+        try:
+            self.redis.setex(key, self.ttl_seconds, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        except Exception as e:
+            print(f"⚠️ 경로 캐시 저장 실패: {e}")
+            self.errors += 1
+
+    async def get_or_fetch(
+        self,
+        start_lat: float,
+        start_lng: float,
+        end_lat: float,
+        end_lng: float,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        캐시 조회 → 미스면 fetch() 1번 (같은 격자 쌍의 동시 요청은 결과 공유)
+
+        fetch()가 예외(HTTPException 등)를 던지면 저장하지 않고 그대로 전파합니다.
+        """
+        key = self.make_key(start_lat, start_lng, end_lat, end_lng)
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            print(f"⚡ 경로 캐시 히트: {key}")
+            return cached
+
+        async def fetch_and_store() -> Dict[str, Any]:
+            data = await fetch()
+            await asyncio.to_thread(self.set, key, data)
+            return data
+
+        return await self._flight.run(key, fetch_and_store)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self._flight.coalesced,
+            "upstream_calls": self._flight.calls,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# 공유 캐시 인스턴스
+route_cache = RouteCache(
+    ttl_seconds=settings.ROUTE_CACHE_TTL_SECONDS,
+    cell_m=settings.ROUTE_CACHE_QUANTIZE_M,
+    redis=redis_client,
+)
@@ -0,0 +1,290 @@
+# app/services/taste_profile.py
+"""
+👤 사용자 취향 벡터 (Taste Profile)
+
+요청마다 최근 북마크 10개로 유사도를 새로 계산하는 대신,
+북마크한 아이템 임베딩(Qdrant에서 ID로 조회)의 가중 평균(centroid)을 사용자별로 저장해 두고
+추천은 centroid로 벡터 검색 1번만 합니다.
+
+- 가중치: 최신순 순위별 RECOMMEND_RECENCY_DECAY ** 순위 (recommend_engine과 같은 최근성 가중치)
+- 저장: Redis 해시 taste:{user_id}:{collection}
+    sum = 가중 합 벡터 (float32 bytes), weight = 가중치 합, count = 북마크 수, ids = 반영된 reference_id 목록
+- 추가: 기존 sum/weight에 decay를 곱해 순위를 한 칸 밀고 새 북마크를 가중치 1로 더함 (증분 갱신)
+    이미 ids에 있는 북마크는 건너뜀 → 재생성과 백그라운드 추가가 겹쳐도 두 번 더해지지 않음
+- 삭제: 뒤 순위 가중치가 모두 바뀌므로 프로필을 지우고 다음 추천 때 DB 기준으로 재생성
+- 프로필이 없으면 DB 북마크로 한 번 생성 (TASTE_PROFILE_TTL_SECONDS 동안 유지)
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import redis
+from qdrant_client.http import models
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.qdrant_client import get_qdrant_client
+from app.core.session import redis_binary_client
+from app.models.bookmark import Bookmark
+from app.services.recommend_engine import PLACE_TYPE_COLLECTION_MAP, RecommendHit, point_reference_id
+
+
+@dataclass
+class TasteProfile:
+    """가중 합 벡터 + 가중치 합 (centroid = vector_sum / weight)"""
+    vector_sum: np.ndarray
+    weight: float
+    count: int
+    reference_ids: List[int] = field(default_factory=list)  # 반영된 북마크 (최신순)
+
+    @property
+    def centroid(self) -> np.ndarray:
+        return self.vector_sum / self.weight
+
+    @classmethod
+    def build(cls, ranked: List[Tuple[int, np.ndarray]], decay: float) -> Optional["TasteProfile"]:
+        """최신순 (reference_id, 벡터) → 프로필 (순위 r의 가중치 = decay ** r)"""
+        if not ranked:
+            return None
+        weights = np.power(decay, np.arange(len(ranked)), dtype=np.float64)
+        stacked = np.stack([vector for _, vector in ranked]).astype(np.float64)
+        return cls(
+            vector_sum=(weights[:, None] * stacked).sum(axis=0).astype(np.float32),
+            weight=float(weights.sum()),
+            count=len(ranked),
+            reference_ids=[reference_id for reference_id, _ in ranked],
+        )
+
+    def push(self, reference_id: int, vector: np.ndarray, decay: float) -> bool:
+        """가장 최신 북마크로 추가 (기존 순위 한 칸씩 감쇠), 이미 반영된 북마크면 False"""
+        if reference_id in self.reference_ids:
+            return False
+        self.vector_sum = decay * self.vector_sum + vector
+        self.weight = decay * self.weight + 1.0
+        self.count += 1
+        self.reference_ids.insert(0, reference_id)
+        return True
+
+    def to_redis(self) -> Dict[str, Any]:
+        return {
+            "sum": self.vector_sum.astype("<f4").tobytes(),
+            "weight": repr(float(self.weight)),
+            "count": str(self.count),
+            "ids": ",".join(str(reference_id) for reference_id in self.reference_ids),
+        }
+
+    @classmethod
+    def from_redis(cls, data: Dict[bytes, bytes]) -> Optional["TasteProfile"]:
+        if not data or b"sum" not in data:
+            return None
+        return cls(
+            vector_sum=np.frombuffer(data[b"sum"], dtype="<f4").copy(),
+            weight=float(data[b"weight"]),
+            count=int(data[b"count"]),
+            reference_ids=[int(reference_id) for reference_id in data.get(b"ids", b"").decode().split(",") if reference_id],
+        )
+
+
+def _point_vector(point) -> Optional[np.ndarray]:
+    """Qdrant 포인트 벡터 (이름 있는 벡터면 첫 번째 사용)"""
+    vector = point.vector
+    if isinstance(vector, dict):
+        vector = next(iter(vector.values()), None)
+    if vector is None:
+        return None
+    return np.asarray(vector, dtype=np.float32)
+
+
+class TasteProfileService:
+
+    KEY_PREFIX = "taste"
+
+    @staticmethod
+    def _key(user_id: int, collection_name: str) -> str:
+        return f"{TasteProfileService.KEY_PREFIX}:{user_id}:{collection_name}"
+
+    @staticmethod
+    def _fetch_vectors(client, collection_name: str, reference_ids: Iterable[Any]) -> Dict[Any, np.ndarray]:
+        """북마크 아이템 임베딩을 ID로 일괄 조회"""
+        ids = list(dict.fromkeys(reference_ids))
+        if not ids:
+            return {}
+        points = client.retrieve(
+            collection_name=collection_name,
+            ids=ids,
+            with_payload=False,
+            with_vectors=True,
+        )
+        vectors = {}
+        for point in points:
+            vector = _point_vector(point)
+            if vector is not None:
+                vectors[point.id] = vector
+        return vectors
+
+    @staticmethod
+    def load(user_id: int, collection_name: str) -> Optional[TasteProfile]:
+        return TasteProfile.from_redis(redis_binary_client.hgetall(TasteProfileService._key(user_id, collection_name)))
+
+    @staticmethod
+    def save(user_id: int, collection_name: str, profile: TasteProfile) -> None:
+        key = TasteProfileService._key(user_id, collection_name)
+        pipe = redis_binary_client.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping=profile.to_redis())
+        pipe.expire(key, settings.TASTE_PROFILE_TTL_SECONDS)
+        pipe.execute()
+
+    @staticmethod
+    def bookmarked_ids(db: Session, user_id: int, place_type: int) -> List[int]:
+        """사용자가 북마크한 reference_id 전체 (최신순, 중복 제거)"""
+        rows = (
+            db.query(Bookmark.reference_id)
+            .filter(Bookmark.user_id == user_id, Bookmark.place_type == place_type)
+            .order_by(Bookmark.created_at.desc(), Bookmark.bookmark_id.desc())
+            .all()
+        )
+        return list(dict.fromkeys(row.reference_id for row in rows))
+
+    @staticmethod
+    def rebuild(
+        db: Session,
+        client,
+        user_id: int,
+        place_type: int,
+        collection_name: str,
+        reference_ids: Optional[List[int]] = None,
+    ) -> Optional[TasteProfile]:
+        """DB 북마크 전체로 프로필 생성 (프로필이 없을 때 1회, 최신순 감쇠 가중치)"""
+        if reference_ids is None:
+            reference_ids = TasteProfileService.bookmarked_ids(db, user_id, place_type)
+        vectors = TasteProfileService._fetch_vectors(client, collection_name, reference_ids)
+        profile = TasteProfile.build(
+            [(ref_id, vectors[ref_id]) for ref_id in reference_ids if ref_id in vectors],
+            settings.RECOMMEND_RECENCY_DECAY,
+        )
+        if profile is None:
+            return None
+
+        TasteProfileService.save(user_id, collection_name, profile)
+        print(f"👤 취향 벡터 생성: user_id={user_id}, {collection_name} (북마크 {profile.count}개)")
+        return profile
+
+    @staticmethod
+    def get_or_build(
+        db: Session,
+        client,
+        user_id: int,
+        place_type: int,
+        collection_name: str,
+        reference_ids: Optional[List[int]] = None,
+    ) -> Optional[TasteProfile]:
+        profile = TasteProfileService.load(user_id, collection_name)
+        if profile is not None:
+            return profile
+        return TasteProfileService.rebuild(db, client, user_id, place_type, collection_name, reference_ids)
+
+    @staticmethod
+    def apply_bookmark_change(
+        user_id: int,
+        place_type: int,
+        reference_id: Any,
+        added: bool,
+    ) -> None:
+        """
+        북마크 추가/삭제 시 갱신 (BackgroundTasks에서 호출)
+
+        - 추가: 최신 순위로 증분 반영 (이미 반영된 reference_id면 건너뜀)
+        - 삭제: 프로필 삭제 (다음 추천 때 DB 기준으로 재생성)
+        프로필이 아직 없으면 아무것도 하지 않습니다. (다음 추천 때 DB 기준으로 생성)
+        """
+        collection_name = PLACE_TYPE_COLLECTION_MAP.get(place_type)
+        if not collection_name:
+            return
+
+        key = TasteProfileService._key(user_id, collection_name)
+        try:
+            if not added:
+                redis_binary_client.delete(key)
+                print(f"👤 취향 벡터 제거: user_id={user_id}, {collection_name} (다음 추천 때 재생성)")
+                return
+
+            if not redis_binary_client.exists(key):
+                return
+
+            vector = TasteProfileService._fetch_vectors(get_qdrant_client(), collection_name, [reference_id]).get(reference_id)
+            if vector is None:
+                return
+
+            # 동시 갱신 대비 WATCH 트랜잭션 (충돌 시 재시도)
+            for _ in range(3):
+                with redis_binary_client.pipeline() as pipe:
+                    try:
+                        pipe.watch(key)
+                        profile = TasteProfile.from_redis(pipe.hgetall(key))
+                        if profile is None or not profile.push(reference_id, vector, settings.RECOMMEND_RECENCY_DECAY):
+                            return
+
+                        pipe.multi()
+                        pipe.hset(key, mapping=profile.to_redis())
+                        pipe.expire(key, settings.TASTE_PROFILE_TTL_SECONDS)
+                        pipe.execute()
+                        print(f"👤 취향 벡터 추가: user_id={user_id}, {collection_name} (북마크 {profile.count}개)")
+                        return
+                    except redis.WatchError:
+                        continue
+
+            # 재시도 실패 시 프로필 폐기 → 다음 추천 때 재생성
+            redis_binary_client.delete(key)
+        except Exception as e:
+            print(f"⚠️ 취향 벡터 갱신 실패 (user_id={user_id}, reference_id={reference_id}): {e}")
+
+    @staticmethod
+    def recommend(
+        db: Session,
+        client,
+        user_id: int,
+        bookmarks: list,
+        limit: int,
+        collection_map: Optional[Dict[int, str]] = None,
+    ) -> Optional[List[RecommendHit]]:
+        """
+        취향 벡터 기반 추천 (컬렉션당 벡터 검색 1번)
+
+        Returns:
+            점수 내림차순 RecommendHit 리스트, 프로필을 만들 수 없으면 None (기존 방식으로 폴백)
+        """
+        collection_map = collection_map or PLACE_TYPE_COLLECTION_MAP
+        place_types = list(dict.fromkeys(b.place_type for b in bookmarks if b.place_type in collection_map))
+        if not place_types:
+            return None
+
+        hits: List[RecommendHit] = []
+        for place_type in place_types:
+            collection_name = collection_map[place_type]
+            # 최근 북마크만이 아니라 사용자가 북마크한 아이템 전체를 결과에서 제외
+            bookmarked_ids = TasteProfileService.bookmarked_ids(db, user_id, place_type)
+            profile = TasteProfileService.get_or_build(db, client, user_id, place_type, collection_name, bookmarked_ids)
+            if profile is None:
+                return None
+
+            results = client.search(
+                collection_name=collection_name,
+                query_vector=profile.centroid.tolist(),
+                query_filter=models.Filter(must_not=[models.HasIdCondition(has_id=bookmarked_ids)]),
+                limit=limit,
+                with_payload=True,
+            )
+            hits.extend(
+                RecommendHit(
+                    place_type=place_type,
+                    reference_id=point_reference_id(point),
+                    point=point,
+                    weighted_score=point.score,
+                )
+                for point in results
+            )
+
+        hits.sort(key=lambda hit: hit.weighted_score, reverse=True)
+        print(f"👤 취향 벡터 추천: user_id={user_id}, 컬렉션 {len(place_types)}개 → {len(hits)}개")
+        return hits
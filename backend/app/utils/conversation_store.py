@@ -0,0 +1,346 @@
+"""
+대화 저장 - 🚀 write-behind 로거
+
+채팅 응답마다 INSERT + commit + refresh(SELECT)를 기다리면
+최종 'done' 프레임이 DB 왕복만큼 늦게 나갑니다.
+저장할 대화를 큐에 넣고 바로 반환하며, 백그라운드 스레드가 모아서 한 번에 INSERT합니다.
+
+- convers_id: id_sequences 테이블에서 CONVERSATION_ID_BLOCK_SIZE개씩 블록 예약 → 응답에 바로 포함
+  (모든 INSERT가 같은 시퀀스를 쓰므로 워커 간 충돌 없음, 재시작 시 남은 블록만큼 ID가 건너뜀)
+  id_sequences 테이블이 없으면(마이그레이션 전) 모든 워커가 AUTO_INCREMENT로 바로 INSERT
+- 한 번 반환한 ID는 바꾸지 않음: INSERT가 실패하면 다른 ID로 다시 저장하지 않고 dropped로 기록
+- 큐: 최대 CONVERSATION_LOG_QUEUE_SIZE개, 가득 차면 호출한 쪽에서 바로 INSERT
+- 워커: 최대 CONVERSATION_LOG_BATCH_SIZE개를 CONVERSATION_LOG_FLUSH_INTERVAL_MS 동안 모아 executemany
+- 종료 시 큐에 남은 대화를 모두 저장
+
+⚠️ 반환한 ID의 행은 최대 CONVERSATION_LOG_FLUSH_INTERVAL_MS + INSERT 시간 동안 아직 DB에 없습니다.
+   현재 그 ID를 FK로 참조해 저장하는 API는 없습니다. (destinations.extracted_from_convers_id는 항상 NULL)
+   참조가 추가되면 엔드포인트에서 await asyncio.to_thread(conversation_logger.wait_written, convers_id)로
+   기다린 뒤 저장합니다. (wait_written은 블로킹 호출이므로 모델/이벤트 루프에서 직접 호출하지 않음)
+"""
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.database.connection import engine
+from app.models.conversation import Conversation
+from app.models.id_sequence import IdSequence
+
+_STOP = object()
+
+
+class ConversationLogger:
+
+    SEQUENCE_NAME = "conversations"
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval_ms: int, id_block_size: int = 100):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.id_block_size = id_block_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+
+        # convers_id 블록: [_next_id, _block_end) / 모드: None(미확인), "sequence", "auto"(테이블 없음)
+        self._id_lock = threading.Lock()
+        self._id_mode: Optional[str] = None
+        self._next_id = 0
+        self._block_end = 0
+
+        # 큐에 있는(아직 저장 전) convers_id → 저장/실패 시 set
+        self._pending: Dict[int, threading.Event] = {}
+        self._pending_lock = threading.Lock()
+
+        # 📊 카운터
+        self.queued = 0
+        self.written = 0
+        self.batches = 0
+        self.direct_writes = 0
+        self.id_blocks = 0
+        self.id_conflicts = 0
+        self.dropped = 0
+
+    # ===== 수명 주기 =====
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="conversation-logger", daemon=True)
+        self._thread.start()
+        print("📝 대화 저장 워커 시작")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """남은 대화를 모두 저장하고 워커 종료 (앱 shutdown 시)"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"⚠️ 대화 저장 워커 종료 시간 초과 (남은 항목: {self._queue.qsize()}개)")
+        else:
+            print(f"📝 대화 저장 워커 종료 (저장 {self.written}개)")
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ===== convers_id 발급 =====
+
+    def seed_ids(self) -> None:
+        """시퀀스 준비 (시작 시): 행이 없으면 MAX(convers_id) + 1로 만들고, 있으면 그 이상으로만 올림"""
+        with self._id_lock:
+            self._seed_locked()
+
+    def _seed_locked(self) -> None:
+        table = IdSequence.__table__
+        try:
+            with engine.begin() as conn:
+                if not sa.inspect(conn).has_table(table.name):
+                    self._id_mode = "auto"
+                    print("⚠️ id_sequences 테이블 없음 → convers_id는 AUTO_INCREMENT로 발급 (alembic upgrade head 필요)")
+                    return
+
+                max_id = conn.execute(select(func.max(Conversation.convers_id))).scalar() or 0
+                current = conn.execute(
+                    select(table.c.next_id).where(table.c.name == self.SEQUENCE_NAME).with_for_update()
+                ).scalar()
+                if current is None:
+                    conn.execute(table.insert(), {"name": self.SEQUENCE_NAME, "next_id": max_id + 1})
+                    current = max_id + 1
+                elif current <= max_id:
+                    conn.execute(
+                        table.update().where(table.c.name == self.SEQUENCE_NAME).values(next_id=max_id + 1)
+                    )
+                    current = max_id + 1
+            self._id_mode = "sequence"
+            print(f"🔢 convers_id 시퀀스 준비: 다음 블록 {current}부터")
+        except Exception as e:
+            print(f"⚠️ convers_id 시퀀스 초기화 실패 (다음 발급 때 재시도): {e}")
+
+    def _reserve_block(self) -> None:
+        """id_sequences에서 id_block_size개 예약 (행 잠금 → 워커끼리 같은 블록을 받지 않음)"""
+        table = IdSequence.__table__
+        with engine.begin() as conn:
+            start = conn.execute(
+                select(table.c.next_id).where(table.c.name == self.SEQUENCE_NAME).with_for_update()
+            ).scalar_one()
+            conn.execute(
+                table.update().where(table.c.name == self.SEQUENCE_NAME).values(next_id=start + self.id_block_size)
+            )
+        self._next_id, self._block_end = start, start + self.id_block_size
+        self.id_blocks += 1
+
+    def _take_id(self) -> Optional[int]:
+        """예약한 블록에서 1개 (블록이 비었으면 None)"""
+        with self._id_lock:
+            if self._id_mode != "sequence" or self._next_id >= self._block_end:
+                return None
+            convers_id = self._next_id
+            self._next_id += 1
+            return convers_id
+
+    def allocate_id(self) -> Optional[int]:
+        """
+        convers_id 발급 (블록이 비면 DB에서 새 블록 예약)
+
+        Returns:
+            ID, AUTO_INCREMENT 모드이거나 발급 실패 시 None
+        """
+        convers_id = self._take_id()
+        if convers_id is not None:
+            return convers_id
+
+        with self._id_lock:
+            if self._id_mode is None:
+                self._seed_locked()
+            if self._id_mode != "sequence":
+                return None
+            try:
+                if self._next_id >= self._block_end:
+                    self._reserve_block()
+            except Exception as e:
+                print(f"⚠️ convers_id 블록 예약 실패: {e}")
+                return None
+            convers_id = self._next_id
+            self._next_id += 1
+            return convers_id
+
+    async def aallocate_id(self) -> Optional[int]:
+        """블록에 남은 ID가 있으면 바로, 없으면 스레드 풀에서 블록 예약"""
+        convers_id = self._take_id()
+        if convers_id is not None:
+            return convers_id
+        return await asyncio.to_thread(self.allocate_id)
+
+    # ===== 저장 =====
+
+    def _enqueue(self, row: Dict[str, Any]) -> bool:
+        if not self.running or row["convers_id"] is None or not settings.CONVERSATION_WRITE_BEHIND:
+            return False
+        with self._pending_lock:
+            self._pending[row["convers_id"]] = threading.Event()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._mark_done([row])
+            return False
+        self.queued += 1
+        return True
+
+    def _mark_done(self, rows: List[Dict[str, Any]]) -> None:
+        """저장(또는 실패)이 끝난 행의 대기 해제"""
+        with self._pending_lock:
+            for row in rows:
+                event = self._pending.pop(row["convers_id"], None)
+                if event is not None:
+                    event.set()
+
+    def wait_written(self, convers_id: int, timeout: Optional[float] = None) -> bool:
+        """
+        이 프로세스의 큐에 있는 대화가 저장될 때까지 대기 (FK로 참조하기 전에 호출)
+
+        블로킹 호출입니다. async 엔드포인트에서는 asyncio.to_thread로 실행합니다.
+
+        Returns:
+            False면 timeout 안에 저장되지 않음 (큐에 없는 ID는 바로 True)
+        """
+        with self._pending_lock:
+            event = self._pending.get(convers_id)
+        if event is None:
+            return True
+        return event.wait(settings.CONVERSATION_WAIT_WRITTEN_SECONDS if timeout is None else timeout)
+
+    def log(self, user_id: int, question: str, response: str) -> Optional[int]:
+        """
+        대화 저장 (동기 호출용)
+
+        Returns:
+            convers_id (미리 발급한 ID 또는 AUTO_INCREMENT 모드에서 DB가 부여한 ID), 저장 실패 시 None
+        """
+        row = {"convers_id": self.allocate_id(), "user_id": user_id, "question": question, "response": response}
+        if self._enqueue(row):
+            return row["convers_id"]
+        return self._write_one(row)
+
+    async def alog(self, user_id: int, question: str, response: str) -> Optional[int]:
+        """대화 저장 (async 핸들러용) - 큐에 넣지 못하면 스레드 풀에서 바로 INSERT"""
+        row = {"convers_id": await self.aallocate_id(), "user_id": user_id, "question": question, "response": response}
+        if self._enqueue(row):
+            return row["convers_id"]
+        return await asyncio.to_thread(self._write_one, row)
+
+    def _write_one(self, row: Dict[str, Any]) -> Optional[int]:
+        self.direct_writes += 1
+        try:
+            return self._insert_row(row)
+        except IntegrityError as e:
+            # 이미 반환한 ID이므로 다른 ID로 다시 저장하지 않음
+            self.id_conflicts += 1
+            self.dropped += 1
+            print(f"❌ 대화 저장 실패 (convers_id={row['convers_id']}, 무결성 오류): {e}")
+            return None
+        except Exception as e:
+            self.dropped += 1
+            print(f"❌ 대화 저장 실패: {e}")
+            return None
+
+    def _insert_row(self, row: Dict[str, Any]) -> int:
+        """1건 INSERT (ID가 없으면 AUTO_INCREMENT 모드에서만 저장 - 시퀀스 ID와 섞지 않음)"""
+        if row["convers_id"] is None and self._id_mode != "auto":
+            raise RuntimeError("convers_id 발급 실패 (시퀀스 사용 중이므로 AUTO_INCREMENT로 저장하지 않음)")
+
+        values = {key: value for key, value in row.items() if value is not None}
+        with engine.begin() as conn:
+            result = conn.execute(Conversation.__table__.insert(), values)
+        self.written += 1
+        return result.inserted_primary_key[0]
+
+    def _insert_batch(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            with engine.begin() as conn:
+                conn.execute(Conversation.__table__.insert(), rows)  # executemany
+            self.written += len(rows)
+            self.batches += 1
+        except Exception as e:
+            # 배치 실패 시 1건씩 다시 시도 (실패한 행만 dropped)
+            print(f"⚠️ 대화 배치 저장 실패 ({len(rows)}개), 1건씩 재시도: {e}")
+            for row in rows:
+                self._write_one(row)
+        finally:
+            self._mark_done(rows)
+
+    # ===== 워커 =====
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._insert_batch(batch)
+
+        # 종료 요청 이후 남은 항목 저장
+        remaining_rows = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                remaining_rows.append(item)
+        for start in range(0, len(remaining_rows), self.batch_size):
+            self._insert_batch(remaining_rows[start:start + self.batch_size])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "pending": self._queue.qsize(),
+            "queued": self.queued,
+            "written": self.written,
+            "batches": self.batches,
+            "direct_writes": self.direct_writes,
+            "id_mode": self._id_mode,
+            "id_blocks": self.id_blocks,
+            "id_conflicts": self.id_conflicts,
+            "dropped": self.dropped,
+        }
+
+
+# 공유 로거 인스턴스
+conversation_logger = ConversationLogger(
+    max_queue=settings.CONVERSATION_LOG_QUEUE_SIZE,
+    batch_size=settings.CONVERSATION_LOG_BATCH_SIZE,
+    flush_interval_ms=settings.CONVERSATION_LOG_FLUSH_INTERVAL_MS,
+    id_block_size=settings.CONVERSATION_ID_BLOCK_SIZE,
+)
+
+
+async def save_conversation(user_id: int, question: str, response: str) -> Optional[int]:
+    """
+    대화 저장 (write-behind)
+
+    Returns:
+        convers_id
+    """
+    return await conversation_logger.alog(user_id, question, response)
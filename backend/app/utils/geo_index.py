@@ -0,0 +1,210 @@
+"""
+위치 검색 유틸 - 🚀 바운딩 박스 + 그리드 인덱스
+
+반경 검색을 모든 행에 Haversine(acos/sin/cos)으로 돌리면 전체 스캔이 됩니다.
+1. bounding_box(): 반경을 감싸는 위도/경도 범위 → 인덱스가 걸린 컬럼으로 BETWEEN 사전 필터
+2. GridIndex: 프로세스 내 격자(셀) 인덱스 → 주변 셀에 있는 점만 정확한 거리 계산
+3. ArrayGeoIndex: NumPy 좌표 배열 (위도 정렬 + searchsorted 사전 필터, 벡터화 Haversine)
+
+모든 방식이 사전 필터 후 살아남은 후보만 정확히 거리를 계산합니다.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE_LAT = EARTH_RADIUS_M * math.pi / 180  # haversine_m과 같은 구 반지름 기준
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 지점 간 거리 (미터)"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lng: float, radius_m: float) -> Tuple[float, float, float, float]:
+    """
+    반경 radius_m 원을 감싸는 사각형
+
+    Returns:
+        (min_lat, max_lat, min_lng, max_lng)
+    """
+    d_lat = radius_m / METERS_PER_DEGREE_LAT
+    # 원의 가장자리는 중심보다 극에 가까우므로 더 높은 위도의 cos로 여유를 둠
+    # (극지방에서 cos → 0 이 되지 않도록 보호 - 서울은 해당 없음)
+    edge_lat = min(abs(lat) + d_lat, 90.0)
+    d_lng = radius_m / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(edge_lat)), 1e-6))
+    return lat - d_lat, lat + d_lat, lng - d_lng, lng + d_lng
+
+
+class GridIndex:
+    """
+    격자 인덱스 (위도/경도를 cell_deg 단위로 나눈 버킷)
+
+    사용법:
+        index = GridIndex(cell_deg=0.01)
+        index.add(37.56, 126.97, row)
+        index.query(37.5665, 126.9780, 500)  # → [(거리m, row), ...] 거리순
+    """
+
+    def __init__(self, cell_deg: float = 0.01):
+        self.cell_deg = cell_deg
+        self.built_at = 0.0
+        self._cells: Dict[Tuple[int, int], List[Tuple[float, float, Any]]] = defaultdict(list)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+    def add(self, lat: float, lng: float, item: Any) -> None:
+        self._cells[self._cell(lat, lng)].append((lat, lng, item))
+        self._size += 1
+
+    def query(self, lat: float, lng: float, radius_m: float) -> List[Tuple[float, Any]]:
+        """반경 내 항목 (거리 오름차순)"""
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_m)
+        min_row, min_col = self._cell(min_lat, min_lng)
+        max_row, max_col = self._cell(max_lat, max_lng)
+
+        found = []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                for item_lat, item_lng, item in self._cells.get((row, col), ()):
+                    if not (min_lat <= item_lat <= max_lat and min_lng <= item_lng <= max_lng):
+                        continue
+                    distance = haversine_m(lat, lng, item_lat, item_lng)
+                    if distance <= radius_m:
+                        found.append((distance, item))
+
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Any],
+        coords: Callable[[Any], Tuple[Optional[float], Optional[float]]],
+        cell_deg: float = 0.01,
+    ) -> "GridIndex":
+        """행 목록으로 인덱스 생성 (좌표가 없는 행은 제외)"""
+        index = cls(cell_deg=cell_deg)
+        for row in rows:
+            lat, lng = coords(row)
+            if lat is None or lng is None:
+                continue
+            index.add(float(lat), float(lng), row)
+        index.built_at = time.time()
+        return index
+
+
+class ArrayGeoIndex:
+    """
+    NumPy 좌표 배열 인덱스 (ORM 객체 없이 id/좌표/정렬키만 보관)
+
+    - 위도 기준으로 정렬해 두고 searchsorted로 위도 범위만 잘라낸 뒤
+      경도 범위 마스크 → 벡터화 Haversine 순서로 후보를 줄임
+    - 결과는 id 배열이므로 반경 안에 든 행만 DB에서 조회하면 됨
+    """
+
+    def __init__(self, ids, lats, lngs, sort_keys=None):
+        order = np.argsort(lats, kind="stable")
+        self.ids = np.asarray(ids)[order]
+        self.lats = np.asarray(lats, dtype=np.float64)[order]
+        self.lngs = np.asarray(lngs, dtype=np.float64)[order]
+        self.sort_keys = np.asarray(sort_keys if sort_keys is not None else ids)[order]
+        self._lat_rad = np.radians(self.lats)
+        self._lng_rad = np.radians(self.lngs)
+        self._cos_lat = np.cos(self._lat_rad)
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Tuple[Any, Optional[float], Optional[float], Any]],
+    ) -> "ArrayGeoIndex":
+        """(id, 위도, 경도, 정렬키) 행 목록으로 생성 (좌표가 없는 행은 제외)"""
+        rows = [row for row in rows if row[1] is not None and row[2] is not None]
+        return cls(
+            ids=[row[0] for row in rows],
+            lats=[float(row[1]) for row in rows],
+            lngs=[float(row[2]) for row in rows],
+            sort_keys=[row[3] for row in rows],
+        )
+
+    def query(self, lat: float, lng: float, radius_m: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        반경 내 항목
+
+        Returns:
+            (ids, distances_m) - 정렬키 오름차순 (같으면 id 순)
+        """
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_m)
+        start = np.searchsorted(self.lats, min_lat, side="left")
+        end = np.searchsorted(self.lats, max_lat, side="right")
+
+        lngs = self.lngs[start:end]
+        candidates = np.nonzero((lngs >= min_lng) & (lngs <= max_lng))[0] + start
+        if candidates.size == 0:
+            return self.ids[:0], np.empty(0)
+
+        phi = math.radians(lat)
+        d_phi = self._lat_rad[candidates] - phi
+        d_lambda = self._lng_rad[candidates] - math.radians(lng)
+        a = np.sin(d_phi / 2) ** 2 + math.cos(phi) * self._cos_lat[candidates] * np.sin(d_lambda / 2) ** 2
+        distances = 2 * EARTH_RADIUS_M * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+        inside = distances <= radius_m
+        candidates = candidates[inside]
+        distances = distances[inside]
+
+        order = np.lexsort((self.ids[candidates], self.sort_keys[candidates]))
+        return self.ids[candidates][order], distances[order]
+
+
+# ===== 인덱스 캐시 (이름별) =====
+# 콘서트/음식점 좌표는 DB 적재(db/init.sql, 배치)로만 바뀌고 앱에는 쓰기 API가 없으므로
+# 갱신은 TTL(GEO_INDEX_TTL_SECONDS)로만 합니다. 데이터 변경은 최대 TTL만큼 늦게 반영됩니다.
+
+_geo_indexes: Dict[str, Any] = {}
+_geo_lock = threading.Lock()
+
+
+def get_geo_index(name: str, loader: Callable[[], Any], ttl_seconds: int):
+    """
+    이름별 위치 인덱스 (GridIndex / ArrayGeoIndex)
+
+    없거나 TTL 지나면 loader로 재생성, 실패 시 이전 인덱스 또는 None
+    """
+    index = _geo_indexes.get(name)
+    if index is not None and time.time() - index.built_at < ttl_seconds:
+        return index
+
+    with _geo_lock:
+        index = _geo_indexes.get(name)
+        if index is not None and time.time() - index.built_at < ttl_seconds:
+            return index
+        try:
+            started = time.perf_counter()
+            _geo_indexes[name] = loader()
+            print(f"🗺️ 위치 인덱스 생성: {name} ({len(_geo_indexes[name])}개, "
+                  f"{(time.perf_counter() - started) * 1000:.0f}ms)")
+        except Exception as e:
+            print(f"⚠️ 위치 인덱스 생성 실패 ({name}): {e}")
+            return index
+        return _geo_indexes[name]
+
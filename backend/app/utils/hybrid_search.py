@@ -0,0 +1,339 @@
+"""
+하이브리드 검색 (BM25 문자 n-gram + 벡터) - 🚀 정확한 이름 검색 보강
+
+벡터 검색만 쓰면 "사랑의 불시착"처럼 정확한 한글 제목을 입력해도
+임베딩이 살짝 빗나가면 결과를 놓칩니다.
+Qdrant payload의 이름 필드(title, name, drama_name_ko, location_name_en)로
+메모리 내 BM25 인덱스(문자 2-3gram)를 만들고, 벡터 순위와 RRF로 합칩니다.
+
+- 인덱스는 컬렉션별로 처음 검색할 때 scroll로 한 번 만들고 LEXICAL_INDEX_TTL_SECONDS마다 백그라운드에서 갱신
+- 점수(신뢰도) = 벡터 0.8 + 문자 n-gram 커버리지 0.2
+  (커버리지가 LEXICAL_EXACT_COVERAGE 이상이면 벡터가 빗나가도 커버리지로 인정)
+"""
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from qdrant_client.http import models
+
+from app.core.config import settings
+
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """NFKC + 소문자 + 공백/기호 제거 ("사랑의 불시착" == "사랑의불시착")"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return _NON_WORD.sub("", text)
+
+
+def char_ngrams(text: str, sizes: Tuple[int, ...] = (2, 3)) -> List[str]:
+    """문자 n-gram 추출 (너무 짧으면 원문 그대로)"""
+    normalized = normalize_text(text)
+    if len(normalized) < min(sizes):
+        return [normalized] if normalized else []
+
+    grams = []
+    for n in sizes:
+        grams.extend(normalized[i:i + n] for i in range(len(normalized) - n + 1))
+    return grams
+
+
+def payload_text(payload: Dict[str, Any], fields: Iterable[str]) -> str:
+    """payload(metadata)에서 인덱싱할 이름 필드 추출"""
+    metadata = (payload or {}).get("metadata", {}) or {}
+    return " ".join(str(metadata.get(field, "") or "") for field in fields).strip()
+
+
+class LexicalIndex:
+    """문자 n-gram BM25 인덱스 (컬렉션 1개)"""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, collection_name: str, fields: List[str]):
+        self.collection_name = collection_name
+        self.fields = fields
+        self.built_at = 0.0
+
+        self._ids: List[Any] = []
+        self._payloads: List[Dict[str, Any]] = []
+        self._lengths: List[int] = []
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._position: Dict[Any, int] = {}
+        self._avg_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, point_id: Any, payload: Dict[str, Any]) -> None:
+        text = payload_text(payload, self.fields)
+        grams = Counter(char_ngrams(text))
+        if not grams:
+            return
+
+        doc_idx = len(self._ids)
+        self._ids.append(point_id)
+        self._payloads.append(payload)
+        self._lengths.append(sum(grams.values()))
+        self._position[point_id] = doc_idx
+        for gram, tf in grams.items():
+            self._postings[gram][doc_idx] = tf
+
+    def finalize(self) -> None:
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        self.built_at = time.time()
+
+    @classmethod
+    def build(cls, qdrant_client, collection_name: str, fields: List[str], batch_size: int = 256) -> "LexicalIndex":
+        """Qdrant scroll로 전체 payload를 읽어 인덱스 생성"""
+        started = time.perf_counter()
+        index = cls(collection_name, fields)
+
+        offset = None
+        while True:
+            points, offset = qdrant_client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            for point in points:
+                index.add(point.id, point.payload)
+            if offset is None:
+                break
+
+        index.finalize()
+        print(f"📚 lexical 인덱스 생성: {collection_name} ({len(index)}개, "
+              f"{(time.perf_counter() - started) * 1000:.0f}ms)")
+        return index
+
+    def _idf(self, gram: str) -> float:
+        df = len(self._postings.get(gram, ()))
+        n = len(self._ids)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Any, float, float]]:
+        """
+        BM25 검색
+
+        Returns:
+            [(point_id, bm25_score, coverage), ...] - BM25 내림차순
+            coverage: 쿼리 n-gram 중 문서에 있는 비율 (0~1)
+        """
+        query_grams = set(char_ngrams(query))
+        if not query_grams or not self._ids:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            postings = self._postings.get(gram)
+            if not postings:
+                continue
+            idf = self._idf(gram)
+            for doc_idx, tf in postings.items():
+                norm = self.K1 * (1 - self.B + self.B * self._lengths[doc_idx] / self._avg_length)
+                scores[doc_idx] += idf * tf * (self.K1 + 1) / (tf + norm)
+                matched[doc_idx] += 1
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(self._ids[idx], score, matched[idx] / len(query_grams)) for idx, score in top]
+
+    def coverage(self, query: str, point_id: Any) -> Optional[float]:
+        """특정 문서의 쿼리 n-gram 커버리지 (인덱스에 없으면 None)"""
+        doc_idx = self._position.get(point_id)
+        query_grams = set(char_ngrams(query))
+        if doc_idx is None or not query_grams:
+            return None
+        hits = sum(1 for gram in query_grams if doc_idx in self._postings.get(gram, {}))
+        return hits / len(query_grams)
+
+    def payload(self, point_id: Any) -> Optional[Dict[str, Any]]:
+        doc_idx = self._position.get(point_id)
+        return self._payloads[doc_idx] if doc_idx is not None else None
+
+
+# ===== 인덱스 캐시 (컬렉션별) =====
+
+_indexes: Dict[str, LexicalIndex] = {}
+_index_locks: Dict[str, threading.Lock] = {}
+_index_locks_guard = threading.Lock()
+
+
+def _collection_lock(collection_name: str) -> threading.Lock:
+    """컬렉션별 lock (한 컬렉션 재생성이 다른 컬렉션 검색을 막지 않도록)"""
+    with _index_locks_guard:
+        return _index_locks.setdefault(collection_name, threading.Lock())
+
+
+def _build_index(qdrant_client, collection_name: str, fields: List[str]) -> Optional[LexicalIndex]:
+    try:
+        _indexes[collection_name] = LexicalIndex.build(qdrant_client, collection_name, fields)
+    except Exception as e:
+        print(f"⚠️ lexical 인덱스 생성 실패 ({collection_name}): {e}")
+        stale = _indexes.get(collection_name)
+        if stale is not None:
+            stale.built_at = time.time()  # 이전 인덱스 계속 사용, TTL 후 다시 시도
+    return _indexes.get(collection_name)
+
+
+def _refresh_in_background(qdrant_client, collection_name: str, fields: List[str]) -> None:
+    lock = _collection_lock(collection_name)
+    if not lock.acquire(blocking=False):
+        return  # 이미 재생성 중
+
+    def run():
+        try:
+            _build_index(qdrant_client, collection_name, fields)
+        finally:
+            lock.release()
+
+    threading.Thread(target=run, name=f"lexical-index-{collection_name}", daemon=True).start()
+
+
+def get_lexical_index(qdrant_client, collection_name: str, fields: List[str]) -> Optional[LexicalIndex]:
+    """
+    컬렉션별 인덱스 (실패 시 None → 벡터 검색만 사용)
+
+    - 처음: 생성될 때까지 대기 (같은 컬렉션 요청만)
+    - TTL 지남: 기존 인덱스를 바로 반환하고 백그라운드 스레드에서 재생성
+    """
+    index = _indexes.get(collection_name)
+    if index is not None:
+        if time.time() - index.built_at >= settings.LEXICAL_INDEX_TTL_SECONDS:
+            _refresh_in_background(qdrant_client, collection_name, fields)
+        return index
+
+    with _collection_lock(collection_name):
+        index = _indexes.get(collection_name)
+        if index is not None:
+            return index
+        return _build_index(qdrant_client, collection_name, fields)
+
+
+# ===== 점수 결합 =====
+
+def reciprocal_rank_fusion(rankings: List[List[Any]], k: int = 60) -> Dict[Any, float]:
+    """RRF: score(d) = Σ 1 / (k + rank)"""
+    fused: Dict[Any, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            fused[item_id] += 1.0 / (k + rank)
+    return fused
+
+
+def hybrid_confidence(vector_score: float, coverage: float) -> float:
+    """벡터 0.8 + 커버리지 0.2, 정확한 이름 매칭은 커버리지 자체로 인정"""
+    blended = vector_score * 0.8 + coverage * 0.2
+    if coverage >= settings.LEXICAL_EXACT_COVERAGE:
+        return max(blended, coverage)
+    return blended
+
+
+def hybrid_rank(
+    query: str,
+    vector_hits: Iterable[models.ScoredPoint],
+    index: Optional[LexicalIndex],
+    lexical_limit: int = 10,
+    fallback_coverage: Optional[Callable[[models.ScoredPoint], float]] = None,
+) -> List[models.ScoredPoint]:
+    """
+    벡터 결과 + BM25 결과를 RRF 순서로 합치기
+
+    Args:
+        query: 정제된 검색어
+        vector_hits: 모든 검색 변형의 Qdrant 결과 (중복 가능)
+        index: lexical 인덱스 (None이면 벡터 결과만 사용)
+        lexical_limit: BM25 상위 후보 수
+        fallback_coverage: 인덱스가 없을 때 커버리지 계산 함수
+
+    Returns:
+        RRF 순서의 ScoredPoint 리스트 (score = hybrid_confidence)
+    """
+    # 1. 벡터 후보 (같은 포인트는 최고 점수만)
+    vector_best: Dict[Any, models.ScoredPoint] = {}
+    for hit in vector_hits:
+        current = vector_best.get(hit.id)
+        if current is None or hit.score > current.score:
+            vector_best[hit.id] = hit
+    vector_ranking = sorted(vector_best, key=lambda pid: vector_best[pid].score, reverse=True)
+
+    # 2. lexical 후보
+    lexical_hits = index.search(query, limit=lexical_limit) if index is not None else []
+    lexical_ranking = [pid for pid, _, _ in lexical_hits]
+    coverages = {pid: coverage for pid, _, coverage in lexical_hits}
+
+    # 3. RRF
+    fused = reciprocal_rank_fusion([vector_ranking, lexical_ranking])
+
+    ranked = []
+    for pid in sorted(fused, key=fused.get, reverse=True):
+        vector_hit = vector_best.get(pid)
+        vector_score = vector_hit.score if vector_hit is not None else 0.0
+
+        coverage = coverages.get(pid)
+        if coverage is None and index is not None:
+            coverage = index.coverage(query, pid)
+        if coverage is None:
+            coverage = fallback_coverage(vector_hit) if (fallback_coverage and vector_hit) else 0.0
+
+        payload = vector_hit.payload if vector_hit is not None else index.payload(pid)
+        ranked.append(models.ScoredPoint(
+            id=pid,
+            version=vector_hit.version if vector_hit is not None else 0,
+            score=hybrid_confidence(vector_score, coverage),
+            payload=payload,
+            vector=None,
+        ))
+
+    return ranked
+
+
+# ===== 오프라인 평가 =====
+
+def evaluate_retrieval(
+    search_fn: Callable[[str], List[Any]],
+    labeled_queries: List[Tuple[str, Set[Any]]],
+    k: int = 5,
+) -> Dict[str, float]:
+    """
+    검색 품질/지연 측정 (recall@k, MRR@k, 지연 p50/p95)
+
+    Args:
+        search_fn: 쿼리 → 결과 id 리스트 (순위순)
+        labeled_queries: [(쿼리, 정답 id 집합), ...]
+        k: recall 컷오프
+    """
+    recalls = []
+    reciprocal_ranks = []
+    latencies = []
+    for query, relevant in labeled_queries:
+        started = time.perf_counter()
+        result_ids = search_fn(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if relevant:
+            recalls.append(len(set(result_ids[:k]) & set(relevant)) / len(relevant))
+            first_hit = next((rank for rank, rid in enumerate(result_ids[:k], start=1) if rid in relevant), None)
+            reciprocal_ranks.append(1.0 / first_hit if first_hit else 0.0)
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+    return {
+        f"recall@{k}": round(sum(recalls) / len(recalls), 4) if recalls else 0.0,
+        f"mrr@{k}": round(sum(reciprocal_ranks) / len(reciprocal_ranks), 4) if reciprocal_ranks else 0.0,
+        "latency_p50_ms": percentile(0.50),
+        "latency_p95_ms": percentile(0.95),
+        "queries": len(labeled_queries),
+    }
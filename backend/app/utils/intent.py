@@ -0,0 +1,181 @@
+"""
+질문 의도 분류기 - 🚀 사전 컴파일 버전
+
+기존 _analyze_message_fast는 호출마다 패턴 리스트를 새로 만들고
+any(p in message_lower for p in ...)를 수십 번, re.search를 6번 돌렸습니다.
+여기서는 의도 그룹별 키워드를 import 시점에 하나의 정규식(alternation)으로 컴파일하고,
+수량 패턴도 이름 있는 그룹 하나로 합쳐 메시지를 그룹당 한 번만 스캔합니다.
+
+판정 순서(우선순위)는 기존과 동일합니다:
+    1. 다중 촬영지 검색 (multiple_kcontent_search) - 규칙에 있을 때만
+    2. 비교 (comparison)
+    3. 조언/팁 (general_advice) - 차단 키워드가 없을 때
+    4. 추천 (recommendation) - 추천 키워드 또는 수량이 있을 때
+    5. 기본 검색 (place_search / kcontent_search)
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+class KeywordMatcher:
+    """키워드 포함 여부 (부분 문자열 매칭 - any(k in text)와 동일)"""
+
+    def __init__(self, keywords: Iterable[str]):
+        keywords = sorted(set(keywords), key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(k) for k in keywords)) if keywords else None
+
+    def search(self, text: str) -> bool:
+        return self._pattern is not None and self._pattern.search(text) is not None
+
+
+class CountExtractor:
+    """
+    수량 추출 ("5곳", "3 places" 등)
+
+    여러 패턴이 동시에 있으면 패턴 목록의 앞쪽이 우선 (기존 for 루프와 동일)
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._patterns = list(patterns)
+        self._pattern = re.compile("|".join(
+            f"(?P<p{i}>{pattern})" for i, pattern in enumerate(self._patterns)
+        ))
+
+    def extract(self, text: str) -> Optional[int]:
+        best_index = None
+        best_value = None
+        for match in self._pattern.finditer(text):
+            index = int(match.lastgroup[1:])
+            if best_index is None or index < best_index:
+                best_index = index
+                best_value = int(re.match(r"\d+", match.group(match.lastgroup)).group())
+                if index == 0:
+                    break
+        return best_value
+
+
+@dataclass(frozen=True)
+class IntentRules:
+    """채팅 모드별 분류 규칙"""
+    count_patterns: Tuple[str, ...]
+    comparison: Tuple[str, ...]
+    advice: Tuple[str, ...]
+    advice_blockers: Tuple[str, ...]  # 이 키워드가 있으면 조언 질문이 아님
+    recommendation: Tuple[str, ...]
+    default_type: str
+    multiple: Tuple[str, ...] = ()  # 다중 촬영지 검색 키워드
+    multiple_requires: Tuple[str, ...] = ()  # 다중 검색에 함께 필요한 키워드
+    multiple_always: bool = False  # True면 multiple_requires 없이도 다중 검색 허용
+
+
+class IntentEngine:
+    """IntentRules를 컴파일한 분류기 (모듈 로드 시 1회 생성)"""
+
+    def __init__(self, rules: IntentRules):
+        self.rules = rules
+        self._count = CountExtractor(rules.count_patterns)
+        self._comparison = KeywordMatcher(rules.comparison)
+        self._advice = KeywordMatcher(rules.advice)
+        self._advice_blockers = KeywordMatcher(rules.advice_blockers)
+        self._recommendation = KeywordMatcher(rules.recommendation)
+        self._multiple = KeywordMatcher(rules.multiple)
+        self._multiple_requires = KeywordMatcher(rules.multiple_requires)
+
+    def classify(self, message: str, extract_keyword: Callable[[str], str]) -> Dict[str, Any]:
+        """
+        Returns:
+            {"type": ..., "keyword": ..., "count": ...}
+        """
+        message_lower = message.lower().strip()
+        count = self._count.extract(message_lower)
+
+        if self.rules.multiple and self._multiple.search(message_lower) and (
+            self.rules.multiple_always or self._multiple_requires.search(message_lower)
+        ):
+            return {"type": "multiple_kcontent_search", "keyword": extract_keyword(message), "count": count or 20}
+
+        if self._comparison.search(message_lower):
+            return {"type": "comparison", "keyword": message, "count": count}
+
+        if self._advice.search(message_lower) and not self._advice_blockers.search(message_lower):
+            return {"type": "general_advice", "keyword": message, "count": count}
+
+        if self._recommendation.search(message_lower) or count:
+            return {"type": "recommendation", "keyword": message, "count": count or 10}
+
+        return {"type": self.rules.default_type, "keyword": extract_keyword(message), "count": count}
+
+
+# ===== 공통 패턴 =====
+
+COUNT_PATTERNS = (r'(\d+)곳', r'(\d+)개', r'(\d+)가지', r'(\d+)\s*places?', r'(\d+)\s*spots?', r'(\d+)\s*locations?')
+COMPARISON_PATTERNS = (' vs ', 'vs.', ' versus ', 'which one', 'which is better', 'compare')
+ADVICE_PATTERNS = ('tip', 'tips', 'advice', '팁', '조언', 'how to', '어떻게', '방법', 'what should i know', '알아야', '준비', 'etiquette', '에티켓')
+DRAMA_KEYWORDS = ('drama', 'filming', 'location', 'scene', '드라마', '촬영지', '장면', '장소')
+
+# ===== ChatService (K-pop Lumi) =====
+
+_LUMI_MULTIPLE_PATTERNS = (
+    'places that appeared', 'locations that appeared', 'places from',
+    'all places', 'all locations', 'filming locations',
+    'places in', 'locations in', 'where', 'appeared',
+    'show me', 'tell me where', 'what are the places',
+    'places of', 'locations of', 'spots from', 'spots in',
+    '모든 장소', '전체 촬영지', '나온 장소', '등장한 장소', '촬영 장소들',
+    'drama', 'divorce insurance', 'places'
+)
+_LUMI_MULTIPLE_REQUIRES = ('drama', 'divorce insurance', "mom's friend's son", 'appeared', 'filming', 'locations', 'places')
+_LUMI_RECOMMENDATION = ('recommend', 'suggestion', 'suggest', '추천', 'places to visit', 'where to go', '가볼', 'best places', 'top places', '명소', 'best', 'top', 'popular', '인기')
+
+LUMI_RULES = IntentRules(
+    count_patterns=COUNT_PATTERNS,
+    comparison=COMPARISON_PATTERNS,
+    advice=ADVICE_PATTERNS,
+    advice_blockers=('palace', 'temple', 'tower', 'museum', 'park', '궁', '사찰', '타워', '박물관', '공원', 'gangnam', 'hongdae', 'myeongdong', 'itaewon', 'culture', '문화', 'transportation', '교통', 'weather', '날씨'),
+    recommendation=_LUMI_RECOMMENDATION,
+    default_type="place_search",
+    multiple=_LUMI_MULTIPLE_PATTERNS,
+    multiple_requires=_LUMI_MULTIPLE_REQUIRES,
+)
+
+LUMI_KCONTENT_RULES = IntentRules(
+    count_patterns=COUNT_PATTERNS,
+    comparison=COMPARISON_PATTERNS,
+    advice=ADVICE_PATTERNS,
+    advice_blockers=DRAMA_KEYWORDS,
+    recommendation=_LUMI_RECOMMENDATION,
+    default_type="kcontent_search",
+    multiple=_LUMI_MULTIPLE_PATTERNS,
+    multiple_always=True,
+)
+
+# ===== ChatRestService =====
+
+REST_RULES = IntentRules(
+    count_patterns=COUNT_PATTERNS[:5],
+    comparison=COMPARISON_PATTERNS,
+    advice=('tip', 'tips', 'advice', '팁', '조언', 'how to', '어떻게', '방법', 'what should i know', '알아야', '준비', 'culture', '문화', 'etiquette', '에티켓'),
+    advice_blockers=('palace', 'temple', 'tower', 'museum', 'park', '궁', '사찰', '타워', '박물관', '공원', 'restaurant', 'food', '레스토랑', '음식', '맛집'),
+    recommendation=('recommend', 'suggestion', 'suggest', '추천', 'places to visit', 'where to go', '가볼', 'best places', 'top places', '명소'),
+    default_type="place_search",
+)
+
+# ===== ChatKContentsService =====
+
+KCONTENT_RULES = IntentRules(
+    count_patterns=COUNT_PATTERNS,
+    comparison=COMPARISON_PATTERNS,
+    advice=ADVICE_PATTERNS + ('visit', '방문'),
+    advice_blockers=DRAMA_KEYWORDS,
+    recommendation=('recommend', 'suggestion', 'suggest', '추천', 'best', 'top', 'popular', '인기'),
+    default_type="kcontent_search",
+)
+
+# 🚀 import 시점에 1회 컴파일
+LUMI_INTENTS = IntentEngine(LUMI_RULES)
+LUMI_KCONTENT_INTENTS = IntentEngine(LUMI_KCONTENT_RULES)
+REST_INTENTS = IntentEngine(REST_RULES)
+KCONTENT_INTENTS = IntentEngine(KCONTENT_RULES)
+
+RESTAURANT_KEYWORDS = KeywordMatcher(('restaurant', 'food', 'eat', 'dining', 'meal', 'cuisine', 'dish', '레스토랑', '음식', '먹', '식당', '맛집', '요리', '음식점'))
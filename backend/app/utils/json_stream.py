@@ -0,0 +1,100 @@
+"""
+스트리밍 JSON 점진 파서 - LLM 재정렬 응답용
+
+LLM이 JSON을 토큰 단위로 보내는 동안
+    {"user_taste_summary": "...", "recommendations": [{...}, {...}, ...]}
+에서 완성된 항목부터 바로 꺼냅니다. (전체 응답을 기다리지 않음)
+
+- 배열 안의 객체는 닫는 중괄호가 도착하는 순간 json.loads로 파싱
+- 문자열 필드는 닫는 따옴표가 도착하면 파싱
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StreamingJSONArrayParser:
+    """
+    사용법:
+        parser = StreamingJSONArrayParser(array_key="recommendations", string_keys=("user_taste_summary",))
+        for token in stream:
+            for kind, value in parser.feed(token):
+                ...  # ("item", dict) 또는 ("string", (key, value))
+        result = parser.result()  # 전체 JSON (끝난 뒤)
+    """
+
+    def __init__(self, array_key: str, string_keys: Tuple[str, ...] = ()):
+        self.array_key = array_key
+        self.buffer = ""
+
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._item_start: Optional[int] = None
+        self._array_depth: Optional[int] = None
+
+        self._string_patterns = {
+            key: re.compile(rf'"{re.escape(key)}"\s*:\s*"((?:[^"\\]|\\.)*)"')
+            for key in string_keys
+        }
+        self._array_pattern = re.compile(rf'"{re.escape(array_key)}"\s*:\s*$')
+        self._emitted_strings = set()
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """새 텍스트 추가 → 이번에 완성된 (종류, 값) 목록"""
+        self.buffer += text
+        events: List[Tuple[str, Any]] = []
+
+        # 1. 완성된 문자열 필드
+        for key, pattern in self._string_patterns.items():
+            if key in self._emitted_strings:
+                continue
+            match = pattern.search(self.buffer)
+            if match:
+                self._emitted_strings.add(key)
+                events.append(("string", (key, json.loads(f'"{match.group(1)}"'))))
+
+        # 2. 배열 안의 완성된 객체
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if (
+                    char == "[" and self._array_depth is None
+                    and self._array_pattern.search(buffer, 0, i)
+                ):
+                    self._array_depth = len(self._stack) + 1
+                if char == "{" and self._array_depth is not None and len(self._stack) == self._array_depth:
+                    self._item_start = i
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if char == "}" and self._item_start is not None and len(self._stack) == self._array_depth:
+                    try:
+                        events.append(("item", json.loads(buffer[self._item_start:i + 1])))
+                    except json.JSONDecodeError:
+                        pass
+                    self._item_start = None
+                if char == "]" and self._array_depth is not None and len(self._stack) < self._array_depth:
+                    self._array_depth = -1  # 배열 종료 (다시 찾지 않음)
+
+        self._pos = len(buffer)
+        return events
+
+    def result(self) -> Dict[str, Any]:
+        """스트림이 끝난 뒤 전체 JSON 파싱"""
+        return json.loads(self.buffer)
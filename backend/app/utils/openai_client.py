@@ -1,13 +1,16 @@
 """
 OpenAI API 클라이언트 - 🚀 최적화 버전 (Streaming 지원)
 """
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from app.core.config import settings
-from typing import Generator
+from typing import Generator, AsyncGenerator
 
 # OpenAI 클라이언트 초기화
 client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
+# 비동기 클라이언트 (스트리밍 응답용 - 이벤트 루프를 막지 않음)
+async_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+
 def chat_with_gpt(messages: list, model: str = None, temperature: float = 0.7, max_tokens: int = 350, stream: bool = False) -> str:
     """
     🚀 최적화된 GPT 채팅
@@ -96,6 +99,43 @@ def chat_with_gpt_stream(messages: list, model: str = None, temperature: float =
         raise Exception(f"OpenAI API 오류: {str(e)}")
 
 
+async def achat_with_gpt_stream(messages: list, model: str = None, temperature: float = 0.7, max_tokens: int = 350, response_format: dict = None) -> AsyncGenerator[str, None]:
+    """
+    🌊 비동기 스트리밍 GPT 채팅 (async def 핸들러용)
+    
+    chat_with_gpt_stream과 동일하지만 AsyncOpenAI를 사용하므로
+    토큰을 기다리는 동안 다른 요청이 이벤트 루프를 사용할 수 있습니다.
+    
+    Args:
+        response_format: 응답 형식 (예: {"type": "json_object"}, 기본값: 일반 텍스트)
+    
+    Yields:
+        응답 청크 (한 글자 또는 단어씩)
+    """
+    if model is None:
+        model = settings.OPENAI_MODEL
+    
+    extra = {"response_format": response_format} if response_format else {}
+    
+    try:
+        response = await async_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            timeout=10,
+            **extra
+        )
+        
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+                
+    except Exception as e:
+        raise Exception(f"OpenAI API 오류: {str(e)}")
+
+
 def extract_destinations_from_text(text: str) -> list:
     """
     텍스트에서 여행지 추출
@@ -0,0 +1,56 @@
+"""
+Google Encoded Polyline 인코딩
+
+좌표 리스트 [{"lat": .., "lng": ..}, ...]를 JSON으로 보내는 대신
+Google Maps 형식의 문자열 하나로 압축합니다. (프론트: google.maps.geometry.encoding.decodePath)
+
+https://developers.google.com/maps/documentation/utilities/polylinealgorithm
+"""
+from typing import Iterable, List, Tuple
+
+
+def _encode_value(value: int) -> str:
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks = []
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+    return "".join(chunks)
+
+
+def encode_polyline(points: Iterable[Tuple[float, float]], precision: int = 5) -> str:
+    """(위도, 경도) 목록 → encoded polyline 문자열"""
+    factor = 10 ** precision
+    encoded = []
+    prev_lat = prev_lng = 0
+    for lat, lng in points:
+        lat_i = int(round(lat * factor))
+        lng_i = int(round(lng * factor))
+        encoded.append(_encode_value(lat_i - prev_lat))
+        encoded.append(_encode_value(lng_i - prev_lng))
+        prev_lat, prev_lng = lat_i, lng_i
+    return "".join(encoded)
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> List[Tuple[float, float]]:
+    """encoded polyline 문자열 → (위도, 경도) 목록"""
+    factor = 10 ** precision
+    points = []
+    index = lat = lng = 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lng += deltas[1]
+        points.append((lat / factor, lng / factor))
+    return points
@@ -0,0 +1,45 @@
+"""
+요청 합치기 (single-flight)
+
+같은 키로 동시에 들어온 비동기 호출은 첫 호출 1번만 실행하고
+나머지는 그 결과(또는 예외)를 함께 받습니다. (캐시 미스가 몰릴 때 upstream 보호)
+
+사용법:
+    flight = SingleFlight()
+    result = await flight.run(key, lambda: fetch_from_upstream(...))
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # 📊 카운터
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            self.calls += 1
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 "never retrieved" 경고 방지
+            raise
+        finally:
+            self._inflight.pop(key, None)
@@ -0,0 +1,145 @@
+"""
+SSE 청크 작성기 - 🚀 토큰 묶음 전송 버전
+
+토큰 하나마다 json.dumps + 프레임 전송을 하면 짧은 쓰기가 수백 번 발생합니다.
+여기서는 토큰을 버퍼에 모았다가 시간 창(SSE_FLUSH_INTERVAL_MS) 또는
+바이트 크기(SSE_FLUSH_MAX_BYTES)에 도달하면 하나의 chunk 프레임으로 보냅니다.
+첫 토큰은 바로 보내서 체감 응답 속도(TTFT)를 유지합니다.
+"""
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.core.config import settings
+
+
+def sse_event(data: Dict[str, Any]) -> str:
+    """SSE 프레임 생성 (data: {...}\\n\\n)"""
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class SSEChunkWriter:
+    """
+    LLM 토큰 스트림 → 묶음 chunk 프레임
+
+    사용법:
+        writer = SSEChunkWriter(started_at=request_started)
+        async for frame in writer.stream(achat_with_gpt_stream(...)):
+            yield frame
+        full_response = writer.full_response
+
+    이벤트 dict가 필요하면 stream() 대신 events()를 사용합니다.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        pacing_ms: Optional[int] = None,
+        started_at: Optional[float] = None,
+        label: str = "stream",
+    ):
+        self.flush_interval = (settings.SSE_FLUSH_INTERVAL_MS if flush_interval_ms is None else flush_interval_ms) / 1000
+        self.max_bytes = settings.SSE_FLUSH_MAX_BYTES if max_bytes is None else max_bytes
+        self.pacing = (settings.SSE_PACING_MS if pacing_ms is None else pacing_ms) / 1000
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.label = label
+
+        self.full_response = ""
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.token_count = 0
+        self.frame_count = 0
+
+    def _frame(self, text: str) -> Dict[str, Any]:
+        self.frame_count += 1
+        return {'type': 'chunk', 'content': text}
+
+    async def stream(self, tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+        """묶음 chunk 프레임을 SSE 문자열로 yield"""
+        async for event in self.events(tokens):
+            yield sse_event(event)
+
+    async def events(self, tokens: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+        """묶음 chunk 이벤트를 dict로 yield ({'type': 'chunk', 'content': ...})"""
+        buffer = []
+        buffer_bytes = 0
+        last_flush = time.perf_counter()
+
+        # 다음 토큰을 기다리는 동안에도 시간 창이 지나면 버퍼를 보냄 (모델이 멈춰도 글자가 묶여 있지 않도록)
+        # wait_for는 타임아웃 시 __anext__를 취소해서 LLM 스트림이 끊기므로 asyncio.wait 사용
+        iterator = tokens.__aiter__()
+        pending = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+
+                timeout = None
+                if buffer:
+                    timeout = max(self.flush_interval - (time.perf_counter() - last_flush), 0)
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+                if not done:
+                    yield self._frame("".join(buffer))
+                    buffer = []
+                    buffer_bytes = 0
+                    last_flush = time.perf_counter()
+                    continue
+
+                try:
+                    token = pending.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    pending = None
+
+                now = time.perf_counter()
+                self.full_response += token
+                self.token_count += 1
+
+                # 첫 토큰은 즉시 전송
+                if self.first_token_at is None:
+                    self.first_token_at = now
+                    last_flush = now
+                    yield self._frame(token)
+                    continue
+
+                buffer.append(token)
+                buffer_bytes += len(token.encode("utf-8"))
+
+                if buffer_bytes >= self.max_bytes or now - last_flush >= self.flush_interval:
+                    yield self._frame("".join(buffer))
+                    buffer = []
+                    buffer_bytes = 0
+                    last_flush = now
+
+                    # 타이핑 효과가 필요할 때만 (기본값 0 = 사용 안 함)
+                    if self.pacing > 0:
+                        await asyncio.sleep(self.pacing)
+        finally:
+            # 클라이언트 연결 종료 등으로 중단된 경우 대기 중인 토큰 요청 정리
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+        if buffer:
+            yield self._frame("".join(buffer))
+
+        self.finished_at = time.perf_counter()
+        metrics = self.metrics()
+        print(f"⏱️ [{self.label}] TTFT={metrics['ttft_ms']}ms, total={metrics['total_ms']}ms, "
+              f"tokens={self.token_count}, frames={self.frame_count}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """TTFT / 전체 스트림 시간 (ms)"""
+        ttft = None
+        if self.first_token_at is not None:
+            ttft = round((self.first_token_at - self.started_at) * 1000, 1)
+        end = self.finished_at or time.perf_counter()
+        return {
+            "ttft_ms": ttft,
+            "total_ms": round((end - self.started_at) * 1000, 1),
+            "tokens": self.token_count,
+            "frames": self.frame_count,
+        }
@@ -0,0 +1,79 @@
+"""
+벡터 검색 헬퍼 - 🚀 검색 변형 일괄 처리 버전
+
+검색어 변형(variant)마다 embed_query + search를 따로 호출하면
+변형 개수만큼 OpenAI / Qdrant 왕복이 순차적으로 발생합니다.
+여기서는 모든 변형을 embed_documents 한 번으로 임베딩하고,
+search_batch 한 번으로 Qdrant에 보냅니다. (왕복 2회 고정)
+
+일괄 호출이 실패하면 변형별 개별 호출로 되돌아가며,
+실패한 변형만 빈 결과가 됩니다. (예전 변형별 try/except와 같은 동작)
+"""
+from typing import List, Tuple, Any
+from qdrant_client.http import models
+
+
+def search_variants_batch(
+    qdrant_client,
+    embedding_model,
+    collection_name: str,
+    variants: List[str],
+    limit: int = 5,
+    score_threshold: float = 0.3,
+) -> List[Tuple[str, List[Any]]]:
+    """
+    검색 변형들을 한 번에 임베딩하고 한 번에 검색
+
+    Args:
+        qdrant_client: QdrantClient 인스턴스
+        embedding_model: embed_documents를 지원하는 임베딩 모델
+        collection_name: 검색할 Qdrant 컬렉션
+        variants: 검색어 변형 리스트
+        limit: 변형당 최대 결과 수
+        score_threshold: 최소 유사도
+
+    Returns:
+        [(variant, [ScoredPoint, ...]), ...] - variants와 같은 순서
+    """
+    if not variants:
+        return []
+
+    try:
+        # 1. 임베딩 1회 호출 (OpenAI 왕복 1번)
+        embeddings = embedding_model.embed_documents(list(variants))
+
+        # 2. Qdrant 검색 1회 호출 (search_batch)
+        requests = [
+            models.SearchRequest(
+                vector=embedding,
+                limit=limit,
+                score_threshold=score_threshold,
+                with_payload=True,
+                with_vector=False,
+            )
+            for embedding in embeddings
+        ]
+        batch_results = qdrant_client.search_batch(
+            collection_name=collection_name,
+            requests=requests,
+        )
+        return list(zip(variants, batch_results))
+    except Exception as e:
+        print(f"⚠️ 변형 일괄 검색 실패 ({collection_name}, {len(variants)}개) → 개별 호출: {e}")
+
+    results = []
+    for variant in variants:
+        try:
+            query_embedding = embedding_model.embed_query(variant)
+            results.append((variant, qdrant_client.search(
+                collection_name=collection_name,
+                query_vector=query_embedding,
+                limit=limit,
+                score_threshold=score_threshold,
+                with_payload=True,
+                with_vectors=False,
+            )))
+        except Exception as e:
+            print(f"⚠️ 변형 '{variant}' 검색 실패: {e}")
+            results.append((variant, []))
+    return results
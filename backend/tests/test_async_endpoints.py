@@ -0,0 +1,89 @@
+"""비동기 세션(get_async_db) 엔드포인트 - 가짜 AsyncSession으로 실제 라우트/응답 모델 실행"""
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.api.endpoints import festival, kcontent, restaurant
+from app.database.connection import Base, get_async_db
+from app.models.festival import Festival
+from app.models.kcontent import KContent
+from app.models.restaurant import Restaurant
+
+
+class FakeAsyncSession:
+    """AsyncSession.execute만 흉내 (sqlite 동기 세션)"""
+
+    def __init__(self, session):
+        self.session = session
+        self.executed = 0
+
+    async def execute(self, statement):
+        self.executed += 1
+        return self.session.execute(statement)
+
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[Festival.__table__, KContent.__table__, Restaurant.__table__])
+
+    with Session(engine) as session:
+        session.add_all([
+            Festival(festival_id=1, title="Seoul Lantern Festival", description="청계천 등불",
+                     start_date=date(2025, 11, 1), end_date=date(2025, 11, 16)),
+            Festival(festival_id=2, title="Hi Seoul Festival", description="봄 축제",
+                     start_date=date(2025, 5, 1), end_date=date(2025, 5, 5)),
+            KContent(content_id=10, drama_name="도깨비", drama_name_en="Goblin", location_name="덕수궁",
+                     trip_tip="돌담길 산책", latitude=37.5658, longitude=126.9751),
+            Restaurant(restaurant_id=100, restaurant_name="광장시장 빈대떡", place="종로", near_subway="종로5가"),
+        ])
+        session.commit()
+
+        fake = FakeAsyncSession(session)
+        app = FastAPI()
+        for module in (festival, kcontent, restaurant):
+            app.include_router(module.router)
+
+        async def override_get_async_db():
+            yield fake
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        with TestClient(app) as test_client:
+            test_client.fake_session = fake
+            yield test_client
+
+
+def test_festival_detail_and_search(client):
+    detail = client.get("/api/festivals/1")
+    assert detail.status_code == 200
+    assert detail.json()["title"] == "Seoul Lantern Festival"
+
+    assert client.get("/api/festivals/999").status_code == 404
+
+    found = client.get("/api/festivals/search/query", params={"q": "Seoul"})
+    assert [item["festival_id"] for item in found.json()] == [1, 2]  # start_date 내림차순
+
+    assert client.get("/api/festivals/search/query", params={"q": " a "}).status_code == 400
+    assert client.fake_session.executed == 3  # 400은 DB 조회 전에 반환
+
+
+def test_kcontent_reads(client):
+    assert len(client.get("/kcontents/").json()) == 1
+    assert client.get("/kcontents/10").status_code == 200
+    assert client.get("/kcontents/11").status_code == 404
+    assert len(client.get("/kcontents/search/query", params={"q": "Goblin"}).json()) == 1
+
+
+def test_restaurant_search_and_detail(client):
+    found = client.get("/restaurants/search", params={"keyword": "빈대떡"}).json()
+    assert found["count"] == 1
+    assert found["restaurants"][0]["restaurant_id"] == 100
+
+    assert client.get("/restaurants/search", params={"keyword": "없음"}).json()["count"] == 0
+    assert client.get("/restaurants/100").json()["restaurant"]["place"] == "종로"
+    assert client.get("/restaurants/101").status_code == 404
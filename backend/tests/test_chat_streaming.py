@@ -0,0 +1,115 @@
+"""채팅 스트리밍 - 검색은 스레드 풀에서, 대화 저장은 done 이벤트 전에"""
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.services import chat_kcontents, chat_rest, chat_service
+from app.services.chat_kcontents import ChatKContentsService
+from app.services.chat_rest import ChatRestService
+from app.services.chat_service import ChatService
+
+CONVERS_ID = 42
+
+ATTRACTION = {
+    "attr_id": 7, "title": "Gyeongbokgung", "address": "Jongno-gu", "description": "palace",
+    "latitude": 37.5796, "longitude": 126.9770, "similarity_score": 0.9,
+}
+KCONTENT = {
+    "content_id": 3, "drama_name": "Goblin", "location_name": "Deoksugung", "address": "Jung-gu",
+    "trip_tip": "stone wall road", "keyword": "goblin", "latitude": 37.5658, "longitude": 126.9751,
+    "similarity_score": 0.8,
+}
+
+
+class Recorder:
+    """검색 스레드와 이벤트/저장 순서를 기록"""
+
+    def __init__(self):
+        self.loop_thread = None
+        self.search_threads = []
+        self.order = []
+
+    def search(self, result):
+        def fake_search(keyword):
+            self.search_threads.append(threading.get_ident())
+            return dict(result) if result else None
+        return staticmethod(fake_search)
+
+    async def llm_stream(self, messages, **kwargs):
+        for token in ["Hey ", "Hunters!"]:
+            yield token
+
+    async def save_conversation(self, user_id, question, response):
+        await asyncio.sleep(0)  # write-behind 큐 대기 흉내
+        self.order.append(("saved", response))
+        return CONVERS_ID
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = Recorder()
+    for module in (chat_service, chat_rest, chat_kcontents):
+        monkeypatch.setattr(module, "achat_with_gpt_stream", recorder.llm_stream)
+        monkeypatch.setattr(module, "save_conversation", recorder.save_conversation)
+    return recorder
+
+
+def collect(recorder, events):
+    async def run():
+        recorder.loop_thread = threading.get_ident()
+        async for event in events:
+            if isinstance(event, str):  # SSE 프레임
+                event = json.loads(event[len("data: "):])
+            recorder.order.append((event["type"], event))
+    asyncio.run(run())
+    return recorder.order
+
+
+def assert_saved_before_done(order):
+    kinds = [kind for kind, _ in order]
+    assert kinds[-1] == "done"
+    assert kinds.index("saved") < kinds.index("done")
+
+    _, saved_response = order[kinds.index("saved")]
+    _, done = order[-1]
+    assert done["convers_id"] == CONVERS_ID
+    assert done["full_response"] == saved_response == "Hey Hunters!"
+
+
+def test_chat_service_searches_off_loop_and_saves_before_done(recorder, monkeypatch):
+    monkeypatch.setattr(ChatService, "_search_best_festival", recorder.search(None))
+    monkeypatch.setattr(ChatService, "_search_best_attraction", recorder.search(ATTRACTION))
+    monkeypatch.setattr(ChatService, "_search_best_restaurant", recorder.search(None))
+    monkeypatch.setattr(ChatService, "_search_best_kcontent", recorder.search(None))
+
+    order = collect(recorder, ChatService._message_events(None, 1, "Gyeongbokgung palace"))
+
+    assert len(recorder.search_threads) == 4
+    assert recorder.loop_thread not in recorder.search_threads
+    assert_saved_before_done(order)
+    assert order[-1][1]["has_attractions"] and order[-1][1]["map_markers"]
+
+
+def test_chat_rest_streaming_searches_off_loop_and_saves_before_done(recorder, monkeypatch):
+    monkeypatch.setattr(ChatRestService, "_search_best_festival", recorder.search(None))
+    monkeypatch.setattr(ChatRestService, "_search_best_attraction", recorder.search(ATTRACTION))
+    monkeypatch.setattr(ChatRestService, "_search_best_restaurant", recorder.search(None))
+
+    order = collect(recorder, ChatRestService.send_message_streaming(None, 1, "Gyeongbokgung palace"))
+
+    assert len(recorder.search_threads) == 3
+    assert recorder.loop_thread not in recorder.search_threads
+    assert_saved_before_done(order)
+
+
+def test_chat_kcontents_streaming_searches_off_loop_and_saves_before_done(recorder, monkeypatch):
+    monkeypatch.setattr(ChatKContentsService, "_search_best_kcontent", recorder.search(KCONTENT))
+
+    order = collect(recorder, ChatKContentsService.send_message_streaming(None, 1, "Goblin filming location"))
+
+    assert len(recorder.search_threads) == 1
+    assert recorder.loop_thread not in recorder.search_threads
+    assert_saved_before_done(order)
+    assert order[-1][1]["has_kcontents"]
@@ -0,0 +1,85 @@
+"""대화 히스토리 keyset 페이지네이션 - cursor + NULL datetime"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.database.connection import Base
+from app.models.conversation import Conversation
+from app.models.users import User  # noqa: F401 (conversations.user_id FK 대상)
+from app.services.conversation_history import ConversationHistoryService, decode_cursor, encode_cursor
+
+
+class SyncAsAsyncSession:
+    """AsyncSession.execute만 흉내 (sqlite 동기 연결)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def execute(self, query):
+        return self.conn.execute(query)
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2025, 10, 21, 8, 18, 42),
+    datetime(2025, 10, 21, 8, 18, 42, 123456),
+    None,
+])
+def test_cursor_round_trip(created_at):
+    cursor = encode_cursor(created_at, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor(datetime(2025, 1, 1), 1)[:-3], "bm9waXBl"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__, Conversation.__table__])
+    base = datetime(2025, 10, 21, 8, 0, 0)
+    rows = [
+        # 같은 시각 대화 2개, datetime NULL 3개, 다른 사용자 1개
+        {"convers_id": 1, "user_id": 1, "datetime": base},
+        {"convers_id": 2, "user_id": 1, "datetime": base + timedelta(minutes=1)},
+        {"convers_id": 3, "user_id": 1, "datetime": base + timedelta(minutes=1)},
+        {"convers_id": 4, "user_id": 1, "datetime": None},
+        {"convers_id": 5, "user_id": 1, "datetime": base + timedelta(minutes=2)},
+        {"convers_id": 6, "user_id": 1, "datetime": None},
+        {"convers_id": 7, "user_id": 2, "datetime": base},
+        {"convers_id": 8, "user_id": 1, "datetime": None},
+    ]
+    with engine.begin() as conn:
+        conn.execute(Conversation.__table__.insert(), [
+            {**row, "question": f"q{row['convers_id']}", "response": f"r{row['convers_id']}"} for row in rows
+        ])
+    with engine.connect() as conn:
+        yield SyncAsAsyncSession(conn)
+
+
+def read_all(db, limit):
+    ids, cursor = [], None
+    while True:
+        items, cursor = asyncio.run(ConversationHistoryService.get_page(db, 1, limit=limit, cursor=cursor))
+        ids.extend(item["conversation_id"] for item in reversed(items))  # 페이지 안은 오래된 순
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 10])
+def test_pages_cover_every_row_once_including_null_datetime(db, limit):
+    # 최신순, NULL datetime은 가장 오래된 대화로 맨 뒤 (cursor가 NULL 구간을 넘나들어도 누락/중복 없음)
+    assert read_all(db, limit) == [5, 3, 2, 1, 8, 6, 4]
+
+
+def test_page_items_are_oldest_first(db):
+    items, cursor = asyncio.run(ConversationHistoryService.get_page(db, 1, limit=3))
+
+    assert [item["conversation_id"] for item in items] == [2, 3, 5]
+    assert items[0]["created_at"] == "2025-10-21T08:01:00"
+    assert decode_cursor(cursor) == (datetime(2025, 10, 21, 8, 1), 2)
@@ -0,0 +1,91 @@
+"""대화 write-behind 로거 - convers_id 시퀀스 + 저장 실패 처리"""
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from app.database.connection import Base
+from app.models.conversation import Conversation
+from app.models.id_sequence import IdSequence
+from app.models.users import User  # noqa: F401 (conversations.user_id FK 대상)
+from app.utils import conversation_store
+from app.utils.conversation_store import ConversationLogger
+
+
+@pytest.fixture
+def db_engine(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[User.__table__, Conversation.__table__, IdSequence.__table__])
+    monkeypatch.setattr(conversation_store, "engine", engine)
+    return engine
+
+
+def make_logger(block_size=3):
+    return ConversationLogger(max_queue=100, batch_size=10, flush_interval_ms=10, id_block_size=block_size)
+
+
+def count_rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(Conversation.__table__)).scalar()
+
+
+def test_workers_reserve_disjoint_blocks_after_existing_rows(db_engine):
+    with db_engine.begin() as conn:
+        conn.execute(Conversation.__table__.insert(), {"convers_id": 10, "user_id": 1, "question": "q", "response": "r"})
+
+    worker_a, worker_b = make_logger(), make_logger()
+    ids_a, ids_b = [], []
+    for _ in range(4):
+        ids_a.append(worker_a.allocate_id())
+        ids_b.append(worker_b.allocate_id())
+
+    assert ids_a == [11, 12, 13, 17]
+    assert ids_b == [14, 15, 16, 20]
+    assert worker_a.stats()["id_mode"] == "sequence"
+
+
+def test_conflicting_row_is_dropped_not_reinserted(db_engine):
+    logger = make_logger()
+    convers_id = logger.allocate_id()
+    with db_engine.begin() as conn:
+        conn.execute(Conversation.__table__.insert(), {"convers_id": convers_id, "user_id": 1, "question": "q", "response": "r"})
+
+    row = {"convers_id": convers_id, "user_id": 1, "question": "q2", "response": "r2"}
+    assert logger._write_one(row) is None
+    assert (logger.id_conflicts, logger.dropped) == (1, 1)
+    assert count_rows(db_engine) == 1
+
+
+def test_missing_id_is_not_written_with_auto_increment_in_sequence_mode(db_engine):
+    logger = make_logger()
+    logger.seed_ids()
+
+    assert logger._write_one({"convers_id": None, "user_id": 1, "question": "q", "response": "r"}) is None
+    assert logger.dropped == 1
+    assert count_rows(db_engine) == 0
+
+
+def test_auto_increment_mode_without_sequence_table(db_engine):
+    IdSequence.__table__.drop(db_engine)
+    logger = make_logger()
+
+    first = logger.log(1, "q", "r")
+    second = logger.log(1, "q", "r")
+
+    assert logger.stats()["id_mode"] == "auto"
+    assert (first, second) == (1, 2)
+
+
+def test_wait_written_until_batch_commits(db_engine):
+    logger = make_logger()
+    logger.start()
+    try:
+        convers_id = logger.log(1, "q", "r")
+        assert logger.wait_written(convers_id, timeout=5)
+        with db_engine.connect() as conn:
+            stored = conn.execute(
+                select(Conversation.question).where(Conversation.convers_id == convers_id)
+            ).scalar()
+        assert stored == "q"
+        assert logger.wait_written(999_999, timeout=0)  # 큐에 없는 ID는 바로 반환
+    finally:
+        logger.stop()
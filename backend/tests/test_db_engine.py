@@ -0,0 +1,44 @@
+"""DB 엔진 프로필 - development / production + DB_* 개별 덮어쓰기"""
+import pytest
+
+from app.core.config import settings
+from app.database.connection import ENGINE_PROFILES, engine_options, get_engine_profile
+
+OVERRIDES = ("DB_ECHO", "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_RECYCLE", "DB_POOL_TIMEOUT", "DB_STATEMENT_TIMEOUT_MS")
+
+
+@pytest.fixture(autouse=True)
+def no_overrides(monkeypatch):
+    for name in OVERRIDES:
+        monkeypatch.setattr(settings, name, None)
+
+
+@pytest.mark.parametrize("name", list(ENGINE_PROFILES))
+def test_profiles_without_overrides(name):
+    assert get_engine_profile(name) == ENGINE_PROFILES[name]
+
+
+def test_overrides_apply_only_when_set(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+    monkeypatch.setattr(settings, "DB_ECHO", False)
+
+    profile = get_engine_profile("development")
+
+    assert profile["pool_size"] == 5
+    assert profile["echo"] is False
+    assert profile["max_overflow"] == ENGINE_PROFILES["development"]["max_overflow"]
+    assert ENGINE_PROFILES["development"]["pool_size"] == 10  # 원본 프로필은 그대로
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        get_engine_profile("staging")
+
+
+def test_engine_options_statement_timeout():
+    production = engine_options(get_engine_profile("production"))
+    assert production["pool_pre_ping"] is True
+    assert production["echo"] is False
+    assert production["connect_args"] == {"init_command": "SET SESSION max_execution_time=10000"}
+
+    assert "connect_args" not in engine_options(get_engine_profile("development"))
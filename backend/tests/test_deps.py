@@ -0,0 +1,95 @@
+"""get_current_user - 세션 캐시 + 사용자 존재 확인"""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import deps
+from app.core.session import LocalSessionCache
+
+PROFILE = {
+    "username": "lumi", "email": "lumi@example.com", "name": "루미", "address": None,
+    "phone": None, "gender": None, "permit": 0, "created_at": "2025-01-01T00:00:00",
+}
+
+
+class FakeSessions:
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.reads = 0
+
+    async def resolve_session(self, session_id, use_local_cache=True):
+        self.reads += 1
+        return self.sessions.get(session_id)
+
+    async def delete_session(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    async def update_user_data(self, session_id, user_data):
+        self.sessions[session_id] = {**self.sessions[session_id], "user_data": user_data}
+
+
+class FakeAsyncDB:
+
+    def __init__(self, users):
+        self.users = users
+        self.queries = 0
+
+    async def execute(self, query):
+        self.queries += 1
+        user_id = query.whereclause.right.value
+        return SimpleNamespace(scalar_one_or_none=lambda: self.users.get(user_id))
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    fake = FakeSessions({"s1": {"user_id": 1, "user_data": PROFILE}})
+    monkeypatch.setattr(deps, "async_session_manager", fake)
+    monkeypatch.setattr(deps, "local_session_cache", LocalSessionCache(ttl_seconds=60, max_size=10))
+    return fake
+
+
+def make_user(user_id):
+    return SimpleNamespace(user_id=user_id, **{**PROFILE, "created_at": datetime(2025, 1, 1)})
+
+
+def test_cache_hit_skips_redis_and_db(sessions):
+    db = FakeAsyncDB({1: make_user(1)})
+
+    first = asyncio.run(deps.get_current_user("Bearer s1", db))
+    second = asyncio.run(deps.get_current_user("Bearer s1", db))
+
+    assert first == second
+    assert first["username"] == "lumi"
+    assert first["created_at"] == datetime(2025, 1, 1)
+    assert (sessions.reads, db.queries) == (1, 1)
+
+
+def test_deleted_user_session_is_rejected(sessions):
+    db = FakeAsyncDB({})
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(deps.get_current_user("Bearer s1", db))
+    assert exc.value.status_code == 404
+    assert "s1" not in sessions.sessions
+    assert deps.local_session_cache.get("s1") is None
+
+
+def test_legacy_session_is_filled_from_users(sessions):
+    sessions.sessions["old"] = {"user_id": 1}
+    db = FakeAsyncDB({1: make_user(1)})
+
+    user = asyncio.run(deps.get_current_user("Bearer old", db))
+
+    assert user["email"] == "lumi@example.com"
+    assert sessions.sessions["old"]["user_data"]["username"] == "lumi"
+
+
+@pytest.mark.parametrize("authorization", [None, "s1", "Basic s1", "Bearer missing"])
+def test_invalid_authorization(sessions, authorization):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(deps.get_current_user(authorization, FakeAsyncDB({})))
+    assert exc.value.status_code == 401
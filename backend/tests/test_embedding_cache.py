@@ -0,0 +1,109 @@
+"""임베딩 캐시 - LRU + Redis 2단, float32 압축, 미스만 일괄 임베딩"""
+import threading
+
+import pytest
+
+from app.core.embedding_cache import CachedEmbeddings, EmbeddingCache, _pack_vector, _unpack_vector
+
+MODEL = "text-embedding-3-small"
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.data = {}
+        self.mget_calls = []
+        self.setex_calls = []
+
+    def mget(self, keys):
+        self.mget_calls.append(list(keys))
+        return [self.data.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.setex_calls.append((key, ttl))
+        self.data[key] = value
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def execute(self):
+        return []
+
+
+class FakeEmbeddings:
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+
+def test_pack_round_trip_is_float32():
+    vector = [0.1, -2.5, 3.0]
+    data = _pack_vector(vector)
+
+    assert len(data) == 4 * len(vector)
+    assert _unpack_vector(data) == pytest.approx(vector, rel=1e-6)
+
+
+def test_lru_eviction_and_hit_counters():
+    cache = EmbeddingCache(max_size=2, ttl_seconds=0)
+    cache.set_many(MODEL, ["a", "b"], [[1.0], [2.0]])
+    cache.get_many(MODEL, ["a"])  # a를 최근 사용으로
+    cache.set_many(MODEL, ["c"], [[3.0]])  # b가 밀려남
+
+    assert cache.get_many(MODEL, ["a", "b", "c"]) == [[1.0], None, [3.0]]
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["redis_hits"], stats["misses"]) == (3, 0, 1)
+    assert stats["size"] == 2
+
+
+def test_redis_uses_one_mget_and_setex_with_ttl():
+    redis = FakeRedis()
+    writer = EmbeddingCache(max_size=10, ttl_seconds=60, redis=redis)
+    writer.set_many(MODEL, ["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+
+    assert [ttl for _, ttl in redis.setex_calls] == [60, 60]
+    assert all(key.startswith(f"emb:{MODEL}:") for key, _ in redis.setex_calls)
+
+    reader = EmbeddingCache(max_size=10, ttl_seconds=60, redis=redis)  # 다른 프로세스 (LRU 비어 있음)
+    assert reader.get_many(MODEL, ["a", "x", "b"]) == [[1.0, 2.0], None, [3.0, 4.0]]
+    assert len(redis.mget_calls) == 1 and len(redis.mget_calls[0]) == 3
+    assert reader.stats()["redis_hits"] == 2
+
+    reader.get_many(MODEL, ["a"])  # Redis에서 읽은 값은 LRU에 올라감
+    assert len(redis.mget_calls) == 1
+    assert reader.stats()["memory_hits"] == 1
+
+
+def test_cached_embeddings_only_embeds_unique_misses():
+    embeddings = FakeEmbeddings()
+    model = CachedEmbeddings(embeddings, MODEL, EmbeddingCache(max_size=10, ttl_seconds=0))
+
+    first = model.embed_documents(["Namsan Tower", "namsan  tower", "Gyeongbokgung"])
+    assert embeddings.calls == [["namsan tower", "gyeongbokgung"]]
+    assert first[0] == first[1]
+
+    assert model.embed_query("NAMSAN TOWER") == first[0]
+    assert len(embeddings.calls) == 1
+
+
+def test_counters_are_consistent_across_threads():
+    cache = EmbeddingCache(max_size=10, ttl_seconds=0)
+    cache.set_many(MODEL, ["a"], [[1.0]])
+
+    def lookup():
+        for _ in range(500):
+            cache.get_many(MODEL, ["a", "missing"])
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 2000
+    assert stats["misses"] == 2000
@@ -0,0 +1,92 @@
+"""위치 인덱스 - 바운딩 박스 / 격자 / NumPy 배열 인덱스가 전체 Haversine 스캔과 같은 결과인지"""
+import random
+
+import numpy as np
+import pytest
+
+from app.utils import geo_index
+from app.utils.geo_index import ArrayGeoIndex, GridIndex, bounding_box, get_geo_index, haversine_m
+
+SEOUL = (37.5665, 126.9780)
+
+random.seed(7)
+POINTS = [
+    (i, SEOUL[0] + random.uniform(-0.1, 0.1), SEOUL[1] + random.uniform(-0.1, 0.1), random.randint(0, 5))
+    for i in range(2000)
+] + [(2000, None, 126.97, 0), (2001, 37.56, None, 0)]  # 좌표 없는 행은 제외
+
+
+def brute_force(lat, lng, radius_m):
+    return {
+        point_id: haversine_m(lat, lng, p_lat, p_lng)
+        for point_id, p_lat, p_lng, _ in POINTS
+        if p_lat is not None and p_lng is not None and haversine_m(lat, lng, p_lat, p_lng) <= radius_m
+    }
+
+
+def test_haversine_known_distance():
+    # 위도 1도 ≈ 111.2km
+    assert haversine_m(37.0, 127.0, 38.0, 127.0) == pytest.approx(111_195, rel=1e-4)
+    assert haversine_m(*SEOUL, *SEOUL) == 0
+
+
+@pytest.mark.parametrize("radius_m", [100, 1000, 5000])
+def test_bounding_box_contains_circle(radius_m):
+    min_lat, max_lat, min_lng, max_lng = bounding_box(*SEOUL, radius_m)
+    for point_id in brute_force(*SEOUL, radius_m):
+        _, p_lat, p_lng, _ = POINTS[point_id]
+        assert min_lat <= p_lat <= max_lat and min_lng <= p_lng <= max_lng
+
+
+@pytest.mark.parametrize("radius_m", [100, 1000, 5000, 20000])
+def test_grid_index_matches_brute_force(radius_m):
+    index = GridIndex.from_rows(POINTS, coords=lambda row: (row[1], row[2]))
+    found = index.query(*SEOUL, radius_m)
+
+    expected = brute_force(*SEOUL, radius_m)
+    assert {row[0] for _, row in found} == set(expected)
+    assert [distance for distance, _ in found] == sorted(distance for distance, _ in found)
+    assert len(index) == 2000
+
+
+@pytest.mark.parametrize("radius_m", [100, 1000, 5000, 20000])
+def test_array_index_matches_brute_force(radius_m):
+    index = ArrayGeoIndex.from_rows(POINTS)
+    ids, distances = index.query(*SEOUL, radius_m)
+
+    expected = brute_force(*SEOUL, radius_m)
+    assert set(ids.tolist()) == set(expected)
+    np.testing.assert_allclose(distances, [expected[point_id] for point_id in ids.tolist()], rtol=1e-9)
+
+    # 정렬키 오름차순, 같으면 id 순
+    keys = {point_id: sort_key for point_id, _, _, sort_key in POINTS}
+    assert [(keys[i], i) for i in ids.tolist()] == sorted((keys[i], i) for i in ids.tolist())
+
+
+def test_array_index_empty_result():
+    ids, distances = ArrayGeoIndex.from_rows(POINTS).query(35.1796, 129.0756, 1000)  # 부산
+    assert ids.size == 0 and distances.size == 0
+
+
+def test_get_geo_index_caches_until_ttl(monkeypatch):
+    monkeypatch.setattr(geo_index, "_geo_indexes", {})
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return ArrayGeoIndex.from_rows(POINTS[:10])
+
+    first = get_geo_index("test", loader, ttl_seconds=60)
+    assert get_geo_index("test", loader, ttl_seconds=60) is first
+    assert get_geo_index("test", loader, ttl_seconds=0) is not first  # TTL 만료 → 재생성
+    assert len(calls) == 2
+
+
+def test_get_geo_index_keeps_previous_index_when_rebuild_fails(monkeypatch):
+    monkeypatch.setattr(geo_index, "_geo_indexes", {})
+    first = get_geo_index("test-fail", lambda: ArrayGeoIndex.from_rows(POINTS[:10]), ttl_seconds=60)
+
+    def broken():
+        raise RuntimeError("DB down")
+
+    assert get_geo_index("test-fail", broken, ttl_seconds=0) is first
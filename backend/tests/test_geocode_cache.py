@@ -0,0 +1,110 @@
+"""지오코딩 캐시 - LRU + Redis 2단, 네거티브 캐시, 요청 합치기, 사전 적재"""
+import asyncio
+
+from app.services.geocode_cache import GeocodeCache
+
+GANGNAM = {"latitude": 37.4979, "longitude": 127.0276}
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def execute(self):
+        return []
+
+
+def make_cache(redis=None, max_size=100):
+    return GeocodeCache(max_size=max_size, ttl_seconds=60, negative_ttl_seconds=10, redis=redis)
+
+
+def test_normalized_queries_share_a_key():
+    cache = make_cache()
+    cache.set("강남역", "ko", GANGNAM)
+
+    assert cache.get("  강남역 ", "ko") == (True, GANGNAM)
+    assert cache.get("ＧＡＮＧＮＡＭ", "en") == (False, None)
+    assert GeocodeCache.normalize("  Gangnam   STATION ") == "gangnam station"
+    assert GeocodeCache.normalize("ＧＡＮＧＮＡＭ") == "gangnam"
+
+
+def test_negative_cache():
+    cache = make_cache()
+    cache.set("없는장소", "ko", None)
+
+    assert cache.get("없는장소", "ko") == (True, None)
+    assert cache.stats()["negative_hits"] == 1
+
+
+def test_lru_eviction_then_redis_hit():
+    redis = FakeRedis()
+    cache = make_cache(redis, max_size=2)
+    cache.set("a", "ko", GANGNAM)
+    cache.set("b", "ko", None)
+    cache.set("c", "ko", GANGNAM)  # a는 LRU에서 밀려남
+
+    assert cache.get("c", "ko") == (True, GANGNAM)
+    assert cache.get("a", "ko") == (True, GANGNAM)  # Redis에서 읽어 LRU에 다시 저장
+    stats = cache.stats()
+    assert stats["redis_hits"] == 1 and stats["memory_hits"] == 1 and stats["size"] == 2
+
+
+def test_concurrent_misses_call_upstream_once_and_skip_errors():
+    cache = make_cache(FakeRedis())
+    calls = []
+
+    def fetcher(status, coords):
+        async def fetch():
+            calls.append(status)
+            await asyncio.sleep(0.01)
+            return status, coords
+        return fetch
+
+    async def main():
+        results = await asyncio.gather(*(cache.get_or_fetch("강남역", "ko", fetcher("OK", GANGNAM)) for _ in range(5)))
+        cached = await cache.get_or_fetch("강남역", "ko", fetcher("OK", None))
+        await cache.get_or_fetch("시청", "ko", fetcher("OVER_QUERY_LIMIT", None))
+        await cache.get_or_fetch("시청", "ko", fetcher("OVER_QUERY_LIMIT", None))
+        return results, cached
+
+    results, cached = asyncio.run(main())
+    assert results == [GANGNAM] * 5
+    assert cached == GANGNAM
+    assert calls == ["OK", "OVER_QUERY_LIMIT", "OVER_QUERY_LIMIT"]  # 오류 응답은 저장하지 않음
+
+
+def test_seed_skips_ambiguous_names_and_existing_keys():
+    redis = FakeRedis()
+    cache = make_cache(redis)
+    cache.set("경복궁", "ko", {"latitude": 0.0, "longitude": 0.0})  # Google 결과가 이미 있음
+
+    seeded = cache.seed([
+        ("경복궁", 37.5796, 126.9770),
+        ("스타벅스", 37.5, 127.0),
+        ("스타벅스", 37.6, 127.1),  # 같은 이름, 다른 장소
+        ("남산타워", 37.5512, 126.9882),
+        ("남산타워", 37.55121, 126.98821),  # 같은 장소 (100m 이내)
+        (None, 37.0, 127.0),
+    ], "ko")
+
+    fresh = make_cache(redis)
+    assert seeded == 2
+    assert fresh.get("경복궁", "ko") == (True, {"latitude": 0.0, "longitude": 0.0})
+    assert fresh.get("스타벅스", "ko") == (False, None)
+    assert fresh.get("남산타워", "ko") == (True, {"latitude": 37.5512, "longitude": 126.9882})
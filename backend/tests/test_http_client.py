@@ -0,0 +1,58 @@
+"""외부 API 공유 HTTP 클라이언트"""
+import asyncio
+
+import httpx
+
+from app.core import http_client
+from app.core.http_client import UpstreamHTTPClient, close_http_clients
+
+
+def test_client_is_reused_until_closed():
+    upstream = UpstreamHTTPClient("test", max_connections=3, timeout=2.5, connect_timeout=1.0, pool_timeout=0.5)
+
+    async def main():
+        first = upstream.client
+        assert upstream.client is first
+        assert first.timeout == httpx.Timeout(2.5, connect=1.0, pool=0.5)
+
+        await upstream.aclose()
+        assert first.is_closed
+        second = upstream.client
+        assert second is not first and not second.is_closed
+        await upstream.aclose()
+
+    asyncio.run(main())
+
+
+def test_get_goes_through_the_shared_client(monkeypatch):
+    upstream = UpstreamHTTPClient("test", max_connections=2, timeout=1.0)
+    seen = []
+
+    def handler(request):
+        seen.append(str(request.url))
+        return httpx.Response(200, json={"status": "OK"})
+
+    async def main():
+        upstream._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        shared = upstream.client
+        responses = await asyncio.gather(*(upstream.get("https://example.com/geo", params={"q": i}) for i in range(3)))
+        assert upstream.client is shared
+        await upstream.aclose()
+        return responses
+
+    responses = asyncio.run(main())
+    assert [response.json() for response in responses] == [{"status": "OK"}] * 3
+    assert sorted(seen) == [f"https://example.com/geo?q={i}" for i in range(3)]
+
+
+def test_close_http_clients_closes_every_upstream(monkeypatch):
+    clients = {name: UpstreamHTTPClient(name, max_connections=1, timeout=1.0) for name in ("a", "b")}
+    monkeypatch.setattr(http_client, "HTTP_CLIENTS", clients)
+
+    async def main():
+        opened = [client.client for client in clients.values()]
+        await close_http_clients()
+        return opened
+
+    assert all(client.is_closed for client in asyncio.run(main()))
+    assert all(client._client is None for client in clients.values())
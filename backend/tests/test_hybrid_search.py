@@ -0,0 +1,84 @@
+"""하이브리드 검색 - lexical 인덱스 회귀 테스트 + 인덱스 갱신"""
+import json
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.utils import hybrid_search
+from app.utils.hybrid_search import LexicalIndex, evaluate_retrieval, get_lexical_index, hybrid_rank
+
+FIXTURE = json.loads((Path(__file__).parent / "fixtures" / "retrieval_queries.json").read_text(encoding="utf-8"))
+
+
+class FakeQdrant:
+    """scroll만 지원하는 테스트용 클라이언트"""
+
+    def __init__(self, collections, delay: float = 0.0):
+        self.collections = collections
+        self.delay = delay
+        self.scroll_calls = 0
+
+    def scroll(self, collection_name, limit, offset, with_payload, with_vectors):
+        self.scroll_calls += 1
+        time.sleep(self.delay)
+        documents = self.collections[collection_name]["documents"]
+        start = offset or 0
+        points = [
+            SimpleNamespace(id=doc["id"], payload={"metadata": doc["metadata"]})
+            for doc in documents[start:start + limit]
+        ]
+        next_offset = start + limit if start + limit < len(documents) else None
+        return points, next_offset
+
+
+def _evaluate_fixture():
+    client = FakeQdrant(FIXTURE["collections"])
+    k = FIXTURE["k"]
+    totals = {f"recall@{k}": 0.0, f"mrr@{k}": 0.0}
+    query_count = 0
+
+    for name, collection in FIXTURE["collections"].items():
+        index = LexicalIndex.build(client, name, collection["fields"], batch_size=5)
+
+        def search_fn(query):
+            return [point.id for point in hybrid_rank(query, [], index)]
+
+        labeled = [(item["query"], set(item["relevant"])) for item in collection["queries"]]
+        metrics = evaluate_retrieval(search_fn, labeled, k=k)
+        for key in totals:
+            totals[key] += metrics[key] * len(labeled)
+        query_count += len(labeled)
+
+    return {key: round(value / query_count, 4) for key, value in totals.items()}
+
+
+def test_lexical_retrieval_does_not_regress():
+    metrics = _evaluate_fixture()
+    for key, baseline in FIXTURE["baseline"].items():
+        assert metrics[key] >= baseline, f"{key}: {metrics[key]} < baseline {baseline}"
+
+
+def test_stale_index_is_served_while_rebuilding(monkeypatch):
+    collection = {"stale-test": FIXTURE["collections"]["seoul-festival"]}
+    client = FakeQdrant(collection)
+    monkeypatch.setattr(hybrid_search, "_indexes", {})
+    monkeypatch.setattr(settings, "LEXICAL_INDEX_TTL_SECONDS", 60)
+
+    first = get_lexical_index(client, "stale-test", ["title"])
+    assert first is not None and client.scroll_calls > 0
+
+    # TTL 지남 + 느린 재생성 → 기존 인덱스가 바로 반환되어야 함
+    first.built_at -= 120
+    client.delay = 0.2
+    started = time.perf_counter()
+    served = get_lexical_index(client, "stale-test", ["title"])
+    assert served is first
+    assert time.perf_counter() - started < 0.1
+
+    # 백그라운드 재생성 완료 후 새 인덱스로 교체
+    for thread in threading.enumerate():
+        if thread.name == "lexical-index-stale-test":
+            thread.join(timeout=5)
+    assert hybrid_search._indexes["stale-test"] is not first
@@ -0,0 +1,194 @@
+"""
+의도 분류기 골든 테스트
+
+사전 컴파일한 IntentEngine이 기존 서비스별 키워드 루프(_analyze_message_fast)와
+같은 결과를 내는지 대표 메시지로 비교합니다. 아래 legacy_* 함수는 기존 구현을 그대로 옮긴 기준값입니다.
+"""
+import re
+
+import pytest
+
+from app.utils.intent import (
+    KCONTENT_INTENTS,
+    LUMI_INTENTS,
+    LUMI_KCONTENT_INTENTS,
+    RESTAURANT_KEYWORDS,
+    REST_INTENTS,
+)
+
+
+def extract_keyword(message: str) -> str:
+    return f"<kw:{message}>"
+
+
+def _legacy_count(message_lower, patterns):
+    for pattern in patterns:
+        match = re.search(pattern, message_lower)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def legacy_lumi(message: str, is_kcontent_mode: bool) -> dict:
+    """ChatService._analyze_message_fast (기존)"""
+    message_lower = message.lower().strip()
+    extracted_count = _legacy_count(message_lower, [r'(\d+)곳', r'(\d+)개', r'(\d+)가지', r'(\d+)\s*places?', r'(\d+)\s*spots?', r'(\d+)\s*locations?'])
+    multiple_patterns = [
+        'places that appeared', 'locations that appeared', 'places from',
+        'all places', 'all locations', 'filming locations',
+        'places in', 'locations in', 'where', 'appeared',
+        'show me', 'tell me where', 'what are the places',
+        'places of', 'locations of', 'spots from', 'spots in',
+        '모든 장소', '전체 촬영지', '나온 장소', '등장한 장소', '촬영 장소들',
+        'drama', 'divorce insurance', 'places'
+    ]
+    has_multiple_intent = any(pattern in message_lower for pattern in multiple_patterns)
+    drama_keywords = ['drama', 'divorce insurance', "mom's friend's son", 'appeared', 'filming', 'locations', 'places']
+    has_drama = any(kw in message_lower for kw in drama_keywords)
+    if has_multiple_intent and (is_kcontent_mode or has_drama):
+        return {"type": "multiple_kcontent_search", "keyword": extract_keyword(message), "count": extracted_count or 20}
+
+    comparison_patterns = [' vs ', 'vs.', ' versus ', 'which one', 'which is better', 'compare']
+    if any(p in message_lower for p in comparison_patterns):
+        return {"type": "comparison", "keyword": message, "count": extracted_count}
+
+    advice_patterns = ['tip', 'tips', 'advice', '팁', '조언', 'how to', '어떻게', '방법', 'what should i know', '알아야', '준비', 'etiquette', '에티켓']
+    has_advice = any(kw in message_lower for kw in advice_patterns)
+    if is_kcontent_mode:
+        drama_keywords = ['drama', 'filming', 'location', 'scene', '드라마', '촬영지', '장면', '장소']
+        if has_advice and not any(kw in message_lower for kw in drama_keywords):
+            return {"type": "general_advice", "keyword": message, "count": extracted_count}
+    else:
+        place_keywords = ['palace', 'temple', 'tower', 'museum', 'park', '궁', '사찰', '타워', '박물관', '공원', 'gangnam', 'hongdae', 'myeongdong', 'itaewon', 'culture', '문화', 'transportation', '교통', 'weather', '날씨']
+        if has_advice and not any(place in message_lower for place in place_keywords):
+            return {"type": "general_advice", "keyword": message, "count": extracted_count}
+
+    recommendation_patterns = ['recommend', 'suggestion', 'suggest', '추천', 'places to visit', 'where to go', '가볼', 'best places', 'top places', '명소', 'best', 'top', 'popular', '인기']
+    if any(kw in message_lower for kw in recommendation_patterns) or extracted_count:
+        return {"type": "recommendation", "keyword": message, "count": extracted_count or 10}
+
+    search_type = "kcontent_search" if is_kcontent_mode else "place_search"
+    return {"type": search_type, "keyword": extract_keyword(message), "count": extracted_count}
+
+
+def legacy_rest(message: str) -> dict:
+    """ChatRestService._analyze_message_fast (기존)"""
+    message_lower = message.lower().strip()
+    extracted_count = _legacy_count(message_lower, [r'(\d+)곳', r'(\d+)개', r'(\d+)가지', r'(\d+)\s*places?', r'(\d+)\s*spots?'])
+    for pattern in [' vs ', 'vs.', ' versus ', 'which one', 'which is better', 'compare']:
+        if pattern in message_lower:
+            return {"type": "comparison", "keyword": message, "count": extracted_count}
+
+    advice_patterns = [
+        'tip', 'tips', 'advice', '팁', '조언',
+        'how to', '어떻게', '방법',
+        'what should i know', '알아야', '준비',
+        'culture', '문화', 'etiquette', '에티켓'
+    ]
+    place_keywords = [
+        'palace', 'temple', 'tower', 'museum', 'park',
+        '궁', '사찰', '타워', '박물관', '공원',
+        'restaurant', 'food', '레스토랑', '음식', '맛집'
+    ]
+    if any(kw in message_lower for kw in advice_patterns) and not any(p in message_lower for p in place_keywords):
+        return {"type": "general_advice", "keyword": message, "count": extracted_count}
+
+    recommendation_patterns = [
+        'recommend', 'suggestion', 'suggest', '추천',
+        'places to visit', 'where to go', '가볼',
+        'best places', 'top places', '명소'
+    ]
+    if any(kw in message_lower for kw in recommendation_patterns) or extracted_count:
+        return {"type": "recommendation", "keyword": message, "count": extracted_count or 10}
+
+    return {"type": "place_search", "keyword": extract_keyword(message), "count": extracted_count}
+
+
+def legacy_kcontent(message: str) -> dict:
+    """ChatKContentsService._analyze_message_fast (기존)"""
+    message_lower = message.lower().strip()
+    extracted_count = _legacy_count(message_lower, [r'(\d+)곳', r'(\d+)개', r'(\d+)가지', r'(\d+)\s*places?', r'(\d+)\s*spots?', r'(\d+)\s*locations?'])
+    for pattern in [' vs ', 'vs.', ' versus ', 'which one', 'which is better', 'compare']:
+        if pattern in message_lower:
+            return {"type": "comparison", "keyword": message, "count": extracted_count}
+
+    advice_patterns = [
+        'tip', 'tips', 'advice', '팁', '조언',
+        'how to', '어떻게', '방법',
+        'what should i know', '알아야', '준비',
+        'etiquette', '에티켓', 'visit', '방문'
+    ]
+    drama_keywords = ['drama', 'filming', 'location', 'scene', '드라마', '촬영지', '장면', '장소']
+    if any(kw in message_lower for kw in advice_patterns) and not any(kw in message_lower for kw in drama_keywords):
+        return {"type": "general_advice", "keyword": message, "count": extracted_count}
+
+    recommendation_patterns = ['recommend', 'suggestion', 'suggest', '추천', 'best', 'top', 'popular', '인기']
+    if any(kw in message_lower for kw in recommendation_patterns) or extracted_count:
+        return {"type": "recommendation", "keyword": message, "count": extracted_count or 10}
+
+    return {"type": "kcontent_search", "keyword": extract_keyword(message), "count": extracted_count}
+
+
+def legacy_is_restaurant(message: str) -> bool:
+    restaurant_keywords = ['restaurant', 'food', 'eat', 'dining', 'meal', 'cuisine', 'dish', '레스토랑', '음식', '먹', '식당', '맛집', '요리', '음식점']
+    return any(keyword in message.lower() for keyword in restaurant_keywords)
+
+
+MESSAGES = [
+    "경복궁",
+    "Gyeongbokgung Palace",
+    "Namsan Tower vs Lotte Tower",
+    "which is better, Hongdae or Gangnam?",
+    "compare Bukchon and Ikseon-dong",
+    "tips for visiting a temple",
+    "any advice for first-time visitors to Seoul?",
+    "서울 여행 팁 알려줘",
+    "지하철 타는 방법",
+    "what should i know about Korean etiquette",
+    "how to get to Myeongdong",
+    "weather tips for November",
+    "recommend 5 places to visit",
+    "서울 명소 3곳 추천해줘",
+    "맛집 10개 알려줘",
+    "top 3 spots in Itaewon",
+    "2가지 코스 추천",
+    "best places for night view",
+    "popular cafes",
+    "where to go this weekend",
+    "show me all filming locations of Crash Landing on You",
+    "Goblin drama filming locations",
+    "places that appeared in Divorce Insurance",
+    "where was Itaewon Class filmed?",
+    "사랑의 불시착 촬영지 모든 장소",
+    "도깨비 나온 장소",
+    "drama scene tips",
+    "tips to visit the drama set",
+    "방문 팁",
+    "Hotel del Luna location",
+    "Korean food tips",
+    "best restaurant near Hongdae",
+    "I want to eat bibimbap",
+    "1 location please",
+    "4 spots from Vincenzo",
+    "Seoul Lantern Festival",
+    "  VS. Code  ",
+    "",
+]
+
+ENGINES = [
+    pytest.param(lambda m: LUMI_INTENTS.classify(m, extract_keyword), lambda m: legacy_lumi(m, False), id="lumi"),
+    pytest.param(lambda m: LUMI_KCONTENT_INTENTS.classify(m, extract_keyword), lambda m: legacy_lumi(m, True), id="lumi-kcontent"),
+    pytest.param(lambda m: REST_INTENTS.classify(m, extract_keyword), legacy_rest, id="restaurant"),
+    pytest.param(lambda m: KCONTENT_INTENTS.classify(m, extract_keyword), legacy_kcontent, id="kcontent"),
+]
+
+
+@pytest.mark.parametrize("classify, legacy", ENGINES)
+@pytest.mark.parametrize("message", MESSAGES)
+def test_engine_matches_legacy_keyword_loops(classify, legacy, message):
+    assert classify(message) == legacy(message)
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_restaurant_matcher_matches_legacy(message):
+    assert bool(RESTAURANT_KEYWORDS.search(message.lower())) == legacy_is_restaurant(message)
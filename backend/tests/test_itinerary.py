@@ -0,0 +1,117 @@
+"""일정 전체 경로 - 구간 순서, 전체 폴리라인 중복 제거, 합계/실패 구간"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.endpoints import odsay
+from app.models.destination import Destination
+from app.utils.polyline import decode_polyline
+
+STOPS = [
+    SimpleNamespace(destination_id=1, name="Gyeongbokgung", latitude=37.57960, longitude=126.97700),
+    SimpleNamespace(destination_id=2, name="Insadong", latitude=37.57400, longitude=126.98500),
+    SimpleNamespace(destination_id=3, name="No coords", latitude=None, longitude=None),
+    SimpleNamespace(destination_id=4, name="Myeongdong", latitude=37.56360, longitude=126.98260),
+    SimpleNamespace(destination_id=5, name="N Seoul Tower", latitude=37.55120, longitude=126.98820),
+    SimpleNamespace(destination_id=6, name="Itaewon", latitude=37.53450, longitude=126.99460),
+]
+
+
+class FakeQuery:
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *criteria):
+        return self
+
+    def order_by(self, *columns):
+        return self
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def all(self):
+        return list(self.rows)
+
+
+class FakeDB:
+
+    def query(self, model):
+        return FakeQuery(STOPS if model is Destination else [SimpleNamespace(schedule_id=9)])
+
+
+def route(end_lat, end_lng, total_time, fare):
+    return {"result": {"path": [{
+        "info": {"totalTime": total_time, "payment": fare},
+        "subPath": [{"trafficType": 3, "sectionTime": total_time, "endX": end_lng, "endY": end_lat}],
+    }]}}
+
+
+@pytest.fixture
+def itinerary(monkeypatch):
+    monkeypatch.setattr(odsay, "ODSAY_API_KEY", "test-key")
+
+    def install(failures):
+        async def fake_get_route_data(start_lat, start_lng, end_lat, end_lng):
+            # 앞 구간일수록 늦게 끝나도록 → gather 결과 순서가 완료 순서가 아님을 확인
+            await asyncio.sleep(0.01 * (60 - end_lat))
+            failure = failures.get((end_lat, end_lng))
+            if isinstance(failure, Exception):
+                raise failure
+            if failure is not None:
+                return failure
+            return route(end_lat, end_lng, total_time=10, fare=1400)
+
+        monkeypatch.setattr(odsay, "get_route_data", fake_get_route_data)
+        return asyncio.run(odsay.search_itinerary(9, {"user_id": 1}, FakeDB()))
+    return install
+
+
+def test_legs_keep_visit_order_and_polyline_dedups_boundaries(itinerary):
+    response = itinerary({})
+
+    assert [(leg.fromDestinationId, leg.toDestinationId) for leg in response.legs] == [(1, 2), (2, 4), (4, 5), (5, 6)]
+    assert response.skippedDestinations == [3]
+
+    # 구간 경계 좌표(다음 구간 시작점)는 한 번만
+    expected = [(stop.latitude, stop.longitude) for stop in STOPS if stop.latitude is not None]
+    assert decode_polyline(response.polyline) == pytest.approx(expected)
+
+    assert response.totalTime == 40
+    assert response.totalFare == 4 * 1400
+    assert response.failedLegs == 0
+
+
+def test_failed_legs_are_reported_without_failing_the_itinerary(itinerary):
+    myeongdong, tower = STOPS[3], STOPS[4]
+    response = itinerary({
+        (myeongdong.latitude, myeongdong.longitude): HTTPException(status_code=502, detail="ODsay 경로 검색 실패"),
+        (tower.latitude, tower.longitude): {"result": {}},  # 손상된 캐시 항목 (path 없음)
+    })
+
+    errors = [leg.error for leg in response.legs]
+    assert errors[0] is None and errors[3] is None
+    assert errors[1] == "ODsay 경로 검색 실패"
+    assert errors[2] is not None
+    assert response.failedLegs == 2
+    assert response.totalTime == 20
+    assert response.totalFare == 2 * 1400
+    assert decode_polyline(response.polyline) == pytest.approx([
+        (STOPS[0].latitude, STOPS[0].longitude), (STOPS[1].latitude, STOPS[1].longitude),
+        (tower.latitude, tower.longitude), (STOPS[5].latitude, STOPS[5].longitude),
+    ])
+
+
+def test_missing_schedule_is_404(monkeypatch):
+    monkeypatch.setattr(odsay, "ODSAY_API_KEY", "test-key")
+
+    class EmptyDB:
+        def query(self, model):
+            return FakeQuery([])
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(odsay.search_itinerary(9, {"user_id": 1}, EmptyDB()))
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,51 @@
+"""스트리밍 JSON 점진 파서"""
+import json
+
+import pytest
+
+from app.utils.json_stream import StreamingJSONArrayParser
+
+RESPONSE = {
+    "user_taste_summary": "조용한 \"한옥\" 카페를 좋아함\n{괄호}도 포함",
+    "recommendations": [
+        {"reference_id": 1, "reason": "전통 {분위기} [한옥]", "tags": ["cafe", "hanok"]},
+        {"reference_id": 2, "reason": "escaped \\\" quote", "meta": {"score": 0.9, "nested": [1, 2]}},
+        {"reference_id": 3, "reason": ""},
+    ],
+    "other": [{"reference_id": 99}],
+}
+TEXT = json.dumps(RESPONSE, ensure_ascii=False)
+
+
+def run(chunks):
+    parser = StreamingJSONArrayParser(array_key="recommendations", string_keys=("user_taste_summary",))
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return parser, events
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, len(TEXT)])
+def test_items_and_strings_are_emitted_once_in_order(chunk_size):
+    parser, events = run(TEXT[i:i + chunk_size] for i in range(0, len(TEXT), chunk_size))
+
+    assert events[0] == ("string", ("user_taste_summary", RESPONSE["user_taste_summary"]))
+    assert [value for kind, value in events if kind == "item"] == RESPONSE["recommendations"]
+    assert len(events) == 1 + len(RESPONSE["recommendations"])
+    assert parser.result() == RESPONSE
+
+
+def test_item_is_emitted_as_soon_as_it_closes():
+    first_item = json.dumps(RESPONSE["recommendations"][0], ensure_ascii=False)
+    first_item_end = TEXT.index(first_item) + len(first_item)
+    parser = StreamingJSONArrayParser(array_key="recommendations")
+
+    events = parser.feed(TEXT[:first_item_end])
+    assert events == [("item", RESPONSE["recommendations"][0])]
+    assert parser.feed(TEXT[first_item_end:first_item_end + 5]) == []
+
+
+def test_objects_outside_the_array_are_ignored():
+    text = '{"before": {"reference_id": 0}, "recommendations": [], "after": [{"reference_id": 1}]}'
+    _, events = run([text])
+    assert events == []
@@ -0,0 +1,110 @@
+"""LLM 재정렬 캐시 - fresh / stale / 손상 항목 / 사용자별 폐기"""
+import json
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.llm_rerank_cache import LLMRerankCache
+
+RESULT = {"user_taste_summary": "한옥 카페", "recommendations": [{"reference_id": 1, "rank": 1}]}
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+
+    def expire(self, key, ttl):
+        pass
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.sets.pop(key, None)
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+
+@pytest.fixture
+def cache():
+    return LLMRerankCache(redis=FakeRedis())
+
+
+def test_fresh_hit(cache):
+    key = cache.make_key([(1, "attraction")], [(10, "restaurant")], 5, "gpt-4o-mini")
+    assert cache.get(key) is None
+    cache.set(key, RESULT, user_id=7)
+
+    assert cache.get(key) == (RESULT, False)
+    assert (cache.hits, cache.stale_hits, cache.misses) == (1, 0, 1)
+
+
+def test_stale_hit(cache):
+    key = cache.make_key([(1, "attraction")], [(10, "restaurant")], 5, "gpt-4o-mini")
+    created_at = time.time() - settings.LLM_RERANK_FRESH_SECONDS - 1
+    cache.redis.data[key] = json.dumps({"result": RESULT, "created_at": created_at})
+
+    assert cache.get(key) == (RESULT, True)
+    assert cache.stale_hits == 1
+
+
+@pytest.mark.parametrize("raw", [
+    "{not json",
+    json.dumps(RESULT),  # created_at 없는 예전 형식
+    json.dumps({"created_at": time.time()}),
+    json.dumps(["result"]),
+])
+def test_corrupt_entry_is_a_miss(cache, raw):
+    cache.redis.data["llmrank:broken"] = raw
+
+    assert cache.get("llmrank:broken") is None
+    assert cache.errors == 1
+    assert cache.hits == cache.stale_hits == 0
+
+
+def test_invalidate_user_drops_only_that_users_keys(cache):
+    mine = cache.make_key([(1, "attraction")], [(10, "restaurant")], 5, "gpt-4o-mini")
+    theirs = cache.make_key([(2, "attraction")], [(10, "restaurant")], 5, "gpt-4o-mini")
+    cache.set(mine, RESULT, user_id=7)
+    cache.set(theirs, RESULT, user_id=8)
+
+    cache.invalidate_user(7)
+
+    assert cache.get(mine) is None
+    assert cache.get(theirs) == (RESULT, False)
+    cache.invalidate_user(7)  # 키가 없어도 오류 없음
+
+
+def test_key_ignores_bookmark_order_but_not_candidate_order(cache):
+    bookmarks = [(1, "attraction"), (2, "festival")]
+    candidates = [(10, "restaurant"), (11, "attraction")]
+    key = cache.make_key(bookmarks, candidates, 5, "gpt-4o-mini")
+
+    assert cache.make_key(bookmarks[::-1], candidates, 5, "gpt-4o-mini") == key
+    assert cache.make_key(bookmarks, candidates[::-1], 5, "gpt-4o-mini") != key
+    assert cache.make_key(bookmarks, candidates, 5, "gpt-4o-mini", {"budget": "low"}) != key
+
+
+def test_disabled_cache_is_a_no_op():
+    cache = LLMRerankCache(redis=None)
+    cache.set("llmrank:x", RESULT, user_id=1)
+    cache.invalidate_user(1)
+    assert cache.get("llmrank:x") is None
@@ -0,0 +1,87 @@
+"""LLM 재정렬 프롬프트 - 압축 표 + 짧은 id + 토큰 예산"""
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services.llm_recommend_service import (
+    CANDIDATE_LIMIT,
+    PROMPT_FIELD_MIN_CHARS,
+    LLMRecommendService,
+    _clip,
+    estimate_tokens,
+)
+
+BOOKMARKS = [
+    {"name": "N Seoul Tower", "extra": {"category_en": "Landmark", "keyword_en": "night view", "location_name_en": "Namsan"}},
+]
+CANDIDATES = [
+    {
+        "reference_id": 1000 + i,
+        "name": f"Place {i} | with pipe",
+        "category": "Cafe",
+        "extra": {"keyword_en": "hanok " * 30},
+        "address": f"{i} Bukchon-ro\nJongno-gu, Seoul",
+        "score": 0.9 - i * 0.01,
+    }
+    for i in range(CANDIDATE_LIMIT + 5)
+]
+
+
+def max_cell(prompt):
+    return max(len(cell) for line in prompt.splitlines() if "|" in line for cell in line.split("|"))
+
+
+@pytest.fixture
+def service():
+    return LLMRecommendService.__new__(LLMRecommendService)  # OpenAI 클라이언트 없이
+
+
+def test_clip_removes_separators_and_truncates():
+    assert _clip("a | b\nc", 20) == "a / b c"
+    assert _clip("x" * 30, 10) == "x" * 9 + "…"
+    assert _clip(None, 10) == ""
+
+
+def test_prompt_is_compact_table_with_short_ids(service):
+    prompt = service._build_prompt(BOOKMARKS, CANDIDATES, None, top_n=5)
+
+    candidate_lines = [line for line in prompt.splitlines() if line[:1].isdigit() and "|" in line]
+    assert len(candidate_lines) == CANDIDATE_LIMIT
+    assert candidate_lines[0].startswith("1|Place 0 / with pipe|Cafe|")
+    assert all(line.count("|") == 5 for line in candidate_lines)
+    assert "1000" not in prompt  # reference_id 대신 짧은 id
+
+    verbose = json.dumps(CANDIDATES[:CANDIDATE_LIMIT], indent=2)
+    assert estimate_tokens(prompt) < estimate_tokens(verbose) / 2
+
+
+def test_prompt_shrinks_fields_to_fit_budget(service, monkeypatch):
+    loose = service._build_prompt(BOOKMARKS, CANDIDATES, None, top_n=5)
+    monkeypatch.setattr(settings, "LLM_RERANK_PROMPT_TOKEN_BUDGET", estimate_tokens(loose) // 2)
+
+    tight = service._build_prompt(BOOKMARKS, CANDIDATES, None, top_n=5)
+
+    assert estimate_tokens(tight) < estimate_tokens(loose)
+    assert PROMPT_FIELD_MIN_CHARS <= max_cell(tight) < max_cell(loose)
+
+
+def test_merge_maps_short_ids_back_and_drops_unknown_or_duplicate(service):
+    llm_result = {
+        "user_taste_summary": "likes hanok cafes",
+        "recommendations": [
+            {"id": 3, "rank": 1, "reason": "quiet", "match_score": 0.9},
+            {"id": "1", "rank": 2, "reason": "view"},
+            {"id": 3, "rank": 3, "reason": "duplicate"},
+            {"id": CANDIDATE_LIMIT + 1, "rank": 4},  # 프롬프트에 없던 후보
+            {"id": "abc", "rank": 5},
+        ],
+    }
+
+    merged = service._merge_with_original(llm_result, CANDIDATES)
+
+    assert [rec["reference_id"] for rec in merged["recommendations"]] == [1002, 1000]
+    assert merged["recommendations"][0]["llm_reason"] == "quiet"
+    assert merged["recommendations"][0]["original_score"] == CANDIDATES[2]["score"]
+    assert merged["total_count"] == 2
+    assert merged["user_taste_summary"] == "likes hanok cafes"
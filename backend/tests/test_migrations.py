@@ -0,0 +1,53 @@
+"""마이그레이션 0001 - 새 DB(테이블 없음)에서도 upgrade가 멈추지 않아야 함"""
+import importlib.util
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+VERSIONS = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+
+
+def load_revision(prefix: str):
+    path = next(VERSIONS.glob(f"{prefix}_*.py"))
+    spec = importlib.util.spec_from_file_location(f"revision_{prefix}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(engine, fn):
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            fn()
+
+
+def index_names(engine, table_name):
+    return {index["name"] for index in sa.inspect(engine).get_indexes(table_name)}
+
+
+def test_0001_skips_missing_table():
+    revision = load_revision("0001")
+    engine = sa.create_engine("sqlite://")
+
+    run(engine, revision.upgrade)
+    run(engine, revision.downgrade)
+
+    assert not sa.inspect(engine).has_table(revision.TABLE_NAME)
+
+
+def test_0001_creates_index_once_when_table_exists():
+    revision = load_revision("0001")
+    engine = sa.create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(sa.text(
+            "CREATE TABLE celeb_restaurants (restaurant_id INTEGER PRIMARY KEY, Latitude NUMERIC, Longitude NUMERIC)"
+        ))
+
+    run(engine, revision.upgrade)
+    run(engine, revision.upgrade)  # 이미 있으면 건너뜀
+    assert revision.INDEX_NAME in index_names(engine, revision.TABLE_NAME)
+
+    run(engine, revision.downgrade)
+    assert revision.INDEX_NAME not in index_names(engine, revision.TABLE_NAME)
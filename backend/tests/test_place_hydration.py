@@ -0,0 +1,66 @@
+"""추천 결과 원본 데이터 일괄 조회 - place_type별 IN 쿼리 1번"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database.connection import Base
+from app.models.festival import Festival
+from app.models.kcontent import KContent
+from app.models.restaurant import Restaurant
+from app.schemas.bookmarkschema import PlaceType
+from app.services.place_hydration import hydrate_places, load_places_bulk
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[KContent.__table__, Restaurant.__table__, Festival.__table__])
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        KContent(content_id=1, location_name="남산타워"),
+        KContent(content_id=2, location_name="경복궁"),
+        Restaurant(restaurant_id=10, restaurant_name="진옥화할매원조닭한마리"),
+        Festival(festival_id=20, title="서울바비큐페스타"),
+    ])
+    session.commit()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session.statements = statements
+    yield session
+    session.close()
+
+
+def test_one_query_per_place_type_and_original_keys(db):
+    keys = [
+        (PlaceType.KCONTENT, 1),
+        (PlaceType.KCONTENT, "2"),  # Qdrant payload의 문자열 id
+        (PlaceType.KCONTENT, 2),
+        (PlaceType.KCONTENT, 999),  # 없는 id
+        (PlaceType.RESTAURANT, 10),
+        (PlaceType.FESTIVAL, 20),
+        (PlaceType.FESTIVAL, "not-an-id"),
+        (99, 1),  # 알 수 없는 place_type
+    ]
+
+    loaded = load_places_bulk(db, keys)
+
+    assert len(db.statements) == 3
+    assert set(loaded) == {
+        (PlaceType.KCONTENT, 1), (PlaceType.KCONTENT, "2"), (PlaceType.KCONTENT, 2),
+        (PlaceType.RESTAURANT, 10), (PlaceType.FESTIVAL, 20),
+    }
+    assert loaded[(PlaceType.KCONTENT, "2")] is loaded[(PlaceType.KCONTENT, 2)]
+
+
+def test_hydrate_skips_formatter_failures_and_empty_results(db):
+    def formatter(place_type, item):
+        if place_type == PlaceType.FESTIVAL:
+            raise ValueError("bad row")
+        if place_type == PlaceType.RESTAURANT:
+            return None
+        return {"name": item.location_name}
+
+    hydrated = hydrate_places(db, [(PlaceType.KCONTENT, 1), (PlaceType.RESTAURANT, 10), (PlaceType.FESTIVAL, 20)], formatter)
+
+    assert hydrated == {(PlaceType.KCONTENT, 1): {"name": "남산타워"}}
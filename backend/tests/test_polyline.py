@@ -0,0 +1,29 @@
+"""Google Encoded Polyline"""
+import pytest
+
+from app.utils.polyline import decode_polyline, encode_polyline
+
+# https://developers.google.com/maps/documentation/utilities/polylinealgorithm 예시
+GOOGLE_POINTS = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+GOOGLE_ENCODED = "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+def test_matches_google_reference():
+    assert encode_polyline(GOOGLE_POINTS) == GOOGLE_ENCODED
+    assert decode_polyline(GOOGLE_ENCODED) == GOOGLE_POINTS
+
+
+@pytest.mark.parametrize("points", [
+    [],
+    [(0.0, 0.0)],
+    [(37.5796, 126.977), (37.5512, 126.9882), (37.5665, 126.978)],  # 서울
+    [(-33.8568, 151.2153), (51.5007, -0.1246)],
+])
+def test_round_trip(points):
+    assert decode_polyline(encode_polyline(points)) == points
+
+
+def test_precision():
+    points = [(37.579617, 126.977041)]
+    assert decode_polyline(encode_polyline(points, precision=6), precision=6) == points
+    assert decode_polyline(encode_polyline(points)) == [(37.57962, 126.97704)]
@@ -0,0 +1,91 @@
+"""북마크 기반 추천 엔진 - 컬렉션당 recommend_batch 1번 + 최근성 가중치 + 중복 제거"""
+from types import SimpleNamespace
+
+from app.schemas.bookmarkschema import PlaceType
+from app.services.recommend_engine import PLACE_TYPE_COLLECTION_MAP, BookmarkRecommender
+
+
+def point(point_id, score):
+    return SimpleNamespace(id=point_id, score=score, payload={"id": point_id})
+
+
+def bookmark(bookmark_id, place_type, reference_id):
+    return SimpleNamespace(bookmark_id=bookmark_id, place_type=place_type, reference_id=reference_id)
+
+
+class FakeQdrant:
+
+    def __init__(self, results, fail_batch=False):
+        self.results = results  # reference_id → [point, ...]
+        self.fail_batch = fail_batch
+        self.batch_calls = []
+        self.single_calls = 0
+
+    def recommend_batch(self, collection_name, requests):
+        self.batch_calls.append((collection_name, len(requests)))
+        if self.fail_batch:
+            raise RuntimeError("point not found")
+        return [self.results[request.positive[0]] for request in requests]
+
+    def recommend(self, collection_name, positive, query_filter, limit):
+        self.single_calls += 1
+        if positive[0] not in self.results:
+            raise RuntimeError("point not found")
+        return self.results[positive[0]]
+
+
+BOOKMARKS = [  # 최신순
+    bookmark(1, PlaceType.KCONTENT, 100),
+    bookmark(2, PlaceType.RESTAURANT, 200),
+    bookmark(3, PlaceType.KCONTENT, 101),
+]
+RESULTS = {
+    100: [point(500, 0.80), point(501, 0.70)],
+    200: [point(600, 0.90)],
+    101: [point(500, 0.95), point(502, 0.60)],
+}
+
+
+def test_one_batch_per_collection():
+    client = FakeQdrant(RESULTS)
+    BookmarkRecommender.recommend(client, BOOKMARKS, PLACE_TYPE_COLLECTION_MAP, top_k_per_bookmark=5)
+
+    assert sorted(client.batch_calls) == [("seoul-kcontents", 2), ("seoul-restaurant", 1)]
+    assert client.single_calls == 0
+
+
+def test_recency_weighting_and_dedup():
+    hits = BookmarkRecommender.recommend(
+        FakeQdrant(RESULTS), BOOKMARKS, PLACE_TYPE_COLLECTION_MAP, top_k_per_bookmark=5, recency_decay=0.5
+    )
+
+    by_key = {(hit.place_type, hit.reference_id): hit for hit in hits}
+    assert len(hits) == 4
+    # 500은 두 북마크에서 나옴 → 가중 점수가 높은 쪽 (순위 0: 0.80 > 순위 2: 0.95 * 0.25)
+    assert by_key[(PlaceType.KCONTENT, 500)].weighted_score == 0.80
+    assert by_key[(PlaceType.KCONTENT, 500)].bookmark_id == 1
+    assert by_key[(PlaceType.RESTAURANT, 600)].weighted_score == 0.90 * 0.5
+    assert [hit.weighted_score for hit in hits] == sorted((hit.weighted_score for hit in hits), reverse=True)
+
+
+def test_no_decay_keeps_raw_scores():
+    hits = BookmarkRecommender.recommend(
+        FakeQdrant(RESULTS), BOOKMARKS, PLACE_TYPE_COLLECTION_MAP, top_k_per_bookmark=5, recency_decay=1.0
+    )
+    assert hits[0].reference_id == 500 and hits[0].weighted_score == 0.95
+
+
+def test_batch_failure_falls_back_per_bookmark():
+    results = {100: RESULTS[100], 200: RESULTS[200]}  # 101은 컬렉션에 없음
+    client = FakeQdrant(results, fail_batch=True)
+
+    hits = BookmarkRecommender.recommend(client, BOOKMARKS, PLACE_TYPE_COLLECTION_MAP, top_k_per_bookmark=5)
+
+    assert client.single_calls == 3
+    assert {hit.reference_id for hit in hits} == {500, 501, 600}
+
+
+def test_unknown_place_type_is_skipped():
+    client = FakeQdrant(RESULTS)
+    assert BookmarkRecommender.recommend(client, [bookmark(9, 99, 1)], PLACE_TYPE_COLLECTION_MAP, 5) == []
+    assert client.batch_calls == []
@@ -0,0 +1,116 @@
+"""통합 검색 서비스 - 컬렉션 매핑, 하이브리드 결합, 임계값, 랜덤 추천"""
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client.http import models
+
+from app.services import retrieval
+from app.services.retrieval import COLLECTIONS, RetrievalService, SearchHit
+from app.utils.hybrid_search import LexicalIndex, hybrid_confidence
+
+
+def point(point_id, score, **metadata):
+    return models.ScoredPoint(
+        id=point_id, version=0, score=score,
+        payload={"metadata": metadata, "page_content": f"doc {point_id}"}, vector=None,
+    )
+
+
+class FakeEmbeddings:
+
+    def embed_documents(self, texts):
+        return [[float(i)] for i, _ in enumerate(texts)]
+
+
+class FakeQdrant:
+
+    def __init__(self, results=None, documents=None):
+        self.results = results or {}  # 변형 순서 → 결과
+        self.documents = documents or []
+        self.batch_collections = []
+        self.scroll_calls = []
+
+    def search_batch(self, collection_name, requests):
+        self.batch_collections.append(collection_name)
+        return [self.results.get(i, []) for i in range(len(requests))]
+
+    def scroll(self, collection_name, limit, offset, with_payload, with_vectors):
+        self.scroll_calls.append((collection_name, limit, offset))
+        points = [SimpleNamespace(id=doc_id, payload={"metadata": metadata}) for doc_id, metadata in self.documents]
+        return points[:limit], None
+
+
+@pytest.fixture
+def service(monkeypatch):
+    def install(qdrant, lexical_index=None):
+        monkeypatch.setattr(RetrievalService, "_qdrant_client", qdrant)
+        monkeypatch.setattr(RetrievalService, "get_embedding_model", staticmethod(FakeEmbeddings))
+        monkeypatch.setattr(retrieval, "get_lexical_index", lambda client, name, fields: lexical_index)
+        return qdrant
+    return install
+
+
+def test_search_maps_collection_and_merges_variants(service):
+    qdrant = service(FakeQdrant(results={
+        0: [point(1, 0.7, title="Seoul Lantern Festival"), point(2, 0.6, title="Hi Seoul")],
+        1: [point(1, 0.9, title="Seoul Lantern Festival")],  # 같은 포인트는 최고 점수만
+    }))
+
+    hits = RetrievalService.search("seoul lantern festival", ["seoul lantern festival", "lantern"], "festival")
+
+    assert qdrant.batch_collections == ["seoul-festival"]
+    assert [hit.point_id for hit in hits] == [1, 2]
+    assert all(isinstance(hit, SearchHit) and hit.search_type == "festival" for hit in hits)
+    assert hits[0].title == "Seoul Lantern Festival"
+    assert hits[0].page_content == "doc 1"
+    # lexical 인덱스가 없으면 keyword_overlap으로 커버리지 계산 (3단어 모두 일치)
+    assert hits[0].score == pytest.approx(hybrid_confidence(0.9, 1.0))
+
+
+def test_search_adds_lexical_only_hits(service):
+    index = LexicalIndex("seoul-restaurant", ["name"])
+    index.add(10, {"metadata": {"name": "광장시장 빈대떡"}})
+    index.add(11, {"metadata": {"name": "명동 칼국수"}})
+    index.finalize()
+    service(FakeQdrant(results={0: [point(11, 0.55, name="명동 칼국수")]}), lexical_index=index)
+
+    hits = RetrievalService.search("광장시장 빈대떡", ["광장시장 빈대떡"], "restaurant")
+
+    by_id = {hit.point_id: hit for hit in hits}
+    assert 10 in by_id  # 벡터 결과에 없어도 BM25로 후보에 포함
+    assert by_id[10].title == "광장시장 빈대떡"
+    assert by_id[10].metadata == {"name": "광장시장 빈대떡"}
+
+
+def test_search_best_uses_per_type_threshold(service):
+    service(FakeQdrant(results={0: [point(5, 0.56, drama_name_ko="도깨비", location_name_en="Deoksugung")]}))
+
+    kcontent = RetrievalService.search_best("unrelated words", ["unrelated words"], "kcontent")
+    attraction = RetrievalService.search_best("unrelated words", ["unrelated words"], "attraction")
+
+    # 0.56 * 0.8 = 0.448 → kcontent(0.4)는 통과, attraction(0.5)은 탈락
+    assert kcontent is not None and kcontent.title == "도깨비 Deoksugung"
+    assert attraction is None
+
+
+def test_unknown_type_falls_back_to_attraction():
+    assert RetrievalService.get_spec("museum") is COLLECTIONS["attraction"]
+
+
+def test_keyword_overlap():
+    assert RetrievalService.keyword_overlap("N Seoul Tower", "n seoul tower") == 1.0
+    assert RetrievalService.keyword_overlap("seoul tower", "seoul forest") == pytest.approx(1 / 3)
+    assert RetrievalService.keyword_overlap("", "") == 0
+
+
+def test_random_hits_scrolls_once_and_limits_count(service):
+    qdrant = service(FakeQdrant(documents=[(i, {"title": f"place {i}"}) for i in range(30)]))
+
+    hits = RetrievalService.random_hits("attraction", count=4)
+
+    assert len(qdrant.scroll_calls) == 1
+    collection_name, limit, _ = qdrant.scroll_calls[0]
+    assert (collection_name, limit) == ("seoul-attraction", 20)
+    assert len(hits) == 4
+    assert len({hit.point_id for hit in hits}) == 4
+    assert all(hit.search_type == "attraction" for hit in hits)
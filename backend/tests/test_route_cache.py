@@ -0,0 +1,107 @@
+"""경로 캐시 - 좌표 양자화 + single-flight"""
+import asyncio
+
+import pytest
+
+from app.services.route_cache import RouteCache, quantize_coord
+from app.utils.single_flight import SingleFlight
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+
+def test_quantize_coord_groups_nearby_points():
+    # 약 10m 차이 → 같은 50m 격자
+    assert quantize_coord(37.57960, 126.97700, 50) == quantize_coord(37.57965, 126.97705, 50)
+    # 약 200m 차이 → 다른 격자
+    assert quantize_coord(37.57960, 126.97700, 50) != quantize_coord(37.58140, 126.97700, 50)
+    assert quantize_coord(37.57960, 126.97700, 50) != quantize_coord(37.57960, 126.97930, 50)
+
+
+def test_quantize_coord_cell_size_in_meters():
+    lat_idx, lng_idx = quantize_coord(37.5, 127.0, 50)
+    next_lat, _ = quantize_coord(37.5 + 50 / 111_320, 127.0, 50)
+    assert next_lat == lat_idx + 1
+    # 경도 격자는 위도에 따라 넓어짐 (약 50m 유지)
+    _, next_lng = quantize_coord(37.5, 127.0 + 0.000567, 50)
+    assert next_lng == lng_idx + 1
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    async def main():
+        return await asyncio.gather(*(flight.run("k", fetch) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert results == [{"ok": True}] * 5
+    assert len(calls) == 1
+    assert (flight.calls, flight.coalesced) == (1, 4)
+
+
+def test_single_flight_propagates_exception_and_forgets_key():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def ok():
+        return "ok"
+
+    async def main():
+        results = await asyncio.gather(*(flight.run("k", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        # 실패한 키는 남지 않음 → 다음 호출은 새로 실행
+        assert await flight.run("k", ok) == "ok"
+
+    asyncio.run(main())
+    assert flight.calls == 2
+
+
+def test_route_cache_fetches_once_then_hits():
+    cache = RouteCache(ttl_seconds=60, cell_m=50, redis=FakeRedis())
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"result": {"path": []}}
+
+    async def main():
+        first = await asyncio.gather(*(cache.get_or_fetch(37.5796, 126.977, 37.5512, 126.9882, fetch) for _ in range(3)))
+        again = await cache.get_or_fetch(37.57961, 126.97701, 37.5512, 126.9882, fetch)
+        return first, again
+
+    first, again = asyncio.run(main())
+    assert first == [{"result": {"path": []}}] * 3
+    assert again == {"result": {"path": []}}
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_route_cache_does_not_store_errors():
+    redis = FakeRedis()
+    cache = RouteCache(ttl_seconds=60, cell_m=50, redis=redis)
+
+    async def fetch():
+        raise ValueError("경로 없음")
+
+    with pytest.raises(ValueError):
+        asyncio.run(cache.get_or_fetch(37.5, 127.0, 37.6, 127.1, fetch))
+    assert redis.data == {}
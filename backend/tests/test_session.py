@@ -0,0 +1,106 @@
+"""세션 조회 - 프로세스 내 캐시 + Redis GET/TTL 파이프라인 + 갱신 throttle"""
+import json
+import time
+
+import pytest
+
+from app.core import session
+from app.core.config import settings
+from app.core.session import LocalSessionCache, SessionManager
+
+EXPIRE_SECONDS = settings.SESSION_EXPIRE_HOURS * 3600
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.round_trips = 0
+        self.expire_calls = 0
+        self._ops = []
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def get(self, key):
+        self._ops.append(lambda: self.data.get(key))
+        return self
+
+    def ttl(self, key):
+        self._ops.append(lambda: self.ttls.get(key, -2))
+        return self
+
+    def execute(self):
+        self.round_trips += 1
+        ops, self._ops = self._ops, []
+        return [op() for op in ops]
+
+    def expire(self, key, seconds):
+        self.round_trips += 1
+        self.expire_calls += 1
+        self.ttls[key] = seconds
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(session, "redis_client", fake)
+    monkeypatch.setattr(session, "local_session_cache", LocalSessionCache(ttl_seconds=60, max_size=10))
+    return fake
+
+
+def store(redis, session_id, ttl):
+    redis.data[f"session:{session_id}"] = json.dumps({"user_id": 1, "user_data": {"username": "lumi"}})
+    redis.ttls[f"session:{session_id}"] = ttl
+
+
+def test_local_cache_expiry_and_lru():
+    cache = LocalSessionCache(ttl_seconds=0.05, max_size=2)
+    cache.set("a", {"user_id": 1})
+    cache.set("b", {"user_id": 2})
+    assert cache.get("a") == {"user_id": 1}  # a가 최근 사용
+    cache.set("c", {"user_id": 3})  # b 제거
+
+    assert cache.get("b") is None
+    assert cache.get("c") == {"user_id": 3}
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+
+def test_local_cache_disabled():
+    cache = LocalSessionCache(ttl_seconds=0, max_size=10)
+    cache.set("a", {"user_id": 1})
+    assert cache.get("a") is None
+
+
+def test_resolve_uses_one_round_trip_then_local_cache(redis):
+    store(redis, "s1", EXPIRE_SECONDS - 10)
+
+    first = SessionManager.resolve_session("s1")
+    second = SessionManager.resolve_session("s1")
+
+    assert first == second == {"user_id": 1, "user_data": {"username": "lumi"}}
+    assert redis.round_trips == 1
+    assert redis.expire_calls == 0  # 남은 시간이 충분하면 갱신하지 않음
+
+
+def test_resolve_refreshes_only_after_threshold(redis):
+    store(redis, "s1", EXPIRE_SECONDS - settings.SESSION_REFRESH_THRESHOLD_SECONDS - 1)
+
+    SessionManager.resolve_session("s1")
+
+    assert redis.expire_calls == 1
+    assert redis.ttls["session:s1"] == EXPIRE_SECONDS
+
+
+def test_missing_session_and_logout(redis):
+    assert SessionManager.resolve_session("nope") is None
+
+    store(redis, "s1", EXPIRE_SECONDS)
+    SessionManager.resolve_session("s1")
+    SessionManager.delete_session("s1")
+    assert SessionManager.resolve_session("s1") is None
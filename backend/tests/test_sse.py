@@ -0,0 +1,55 @@
+"""SSEChunkWriter 묶음 전송 테스트"""
+import asyncio
+
+from app.utils.sse import SSEChunkWriter
+
+
+async def _collect(writer, tokens):
+    return [event["content"] async for event in writer.events(tokens)]
+
+
+def test_first_token_is_sent_immediately_and_rest_is_coalesced():
+    async def tokens():
+        for token in ["Hello", " ", "world", "!"]:
+            yield token
+
+    writer = SSEChunkWriter(flush_interval_ms=1000, max_bytes=1024, pacing_ms=0)
+    frames = asyncio.run(_collect(writer, tokens()))
+
+    assert frames == ["Hello", " world!"]
+    assert writer.full_response == "Hello world!"
+    assert writer.token_count == 4
+
+
+def test_max_bytes_forces_flush():
+    async def tokens():
+        for token in ["a", "bb", "cc", "dd"]:
+            yield token
+
+    writer = SSEChunkWriter(flush_interval_ms=1000, max_bytes=4, pacing_ms=0)
+    frames = asyncio.run(_collect(writer, tokens()))
+
+    assert frames == ["a", "bbcc", "dd"]
+
+
+def test_buffer_is_flushed_when_model_stalls():
+    """다음 토큰이 늦게 와도 시간 창이 지나면 버퍼를 먼저 보냄"""
+    async def tokens():
+        for token in ["a", "b", "c"]:
+            yield token
+        await asyncio.sleep(0.3)
+        yield "d"
+
+    async def run():
+        writer = SSEChunkWriter(flush_interval_ms=20, max_bytes=1024, pacing_ms=0)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        timeline = []
+        async for event in writer.events(tokens()):
+            timeline.append((event["content"], loop.time() - started))
+        return timeline
+
+    timeline = asyncio.run(run())
+
+    assert [content for content, _ in timeline] == ["a", "bc", "d"]
+    assert timeline[1][1] < 0.2  # "bc"는 "d"를 기다리지 않음
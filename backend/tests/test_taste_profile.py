@@ -0,0 +1,56 @@
+"""취향 벡터 - 최근성 가중치 + 증분 추가"""
+import numpy as np
+
+from app.services.taste_profile import TasteProfile
+
+DECAY = 0.9
+
+VECTORS = {
+    1: np.array([1.0, 0.0, 0.0], dtype=np.float32),
+    2: np.array([0.0, 1.0, 0.0], dtype=np.float32),
+    3: np.array([0.0, 0.0, 1.0], dtype=np.float32),
+}
+
+
+def ranked(*reference_ids):
+    return [(reference_id, VECTORS[reference_id]) for reference_id in reference_ids]
+
+
+def test_centroid_is_recency_weighted():
+    profile = TasteProfile.build(ranked(3, 2, 1), DECAY)  # 최신순
+
+    weights = np.array([DECAY ** 2, DECAY, 1.0])  # id 1, 2, 3
+    np.testing.assert_allclose(profile.centroid, weights / weights.sum(), rtol=1e-6)
+    assert profile.count == 3
+    assert profile.reference_ids == [3, 2, 1]
+
+
+def test_push_matches_rebuild():
+    profile = TasteProfile.build(ranked(2, 1), DECAY)
+    assert profile.push(3, VECTORS[3], DECAY)
+
+    rebuilt = TasteProfile.build(ranked(3, 2, 1), DECAY)
+    np.testing.assert_allclose(profile.vector_sum, rebuilt.vector_sum, rtol=1e-6)
+    assert abs(profile.weight - rebuilt.weight) < 1e-9
+    assert profile.reference_ids == rebuilt.reference_ids
+
+
+def test_push_is_idempotent_per_bookmark():
+    # 재생성에 이미 포함된 북마크를 백그라운드 추가가 다시 더하지 않음
+    profile = TasteProfile.build(ranked(3, 2, 1), DECAY)
+    before = profile.vector_sum.copy()
+
+    assert not profile.push(3, VECTORS[3], DECAY)
+    np.testing.assert_array_equal(profile.vector_sum, before)
+    assert profile.count == 3
+
+
+def test_redis_round_trip():
+    profile = TasteProfile.build(ranked(2, 1), DECAY)
+    data = {key.encode(): value if isinstance(value, bytes) else value.encode() for key, value in profile.to_redis().items()}
+
+    restored = TasteProfile.from_redis(data)
+    np.testing.assert_array_equal(restored.vector_sum, profile.vector_sum)
+    assert restored.weight == profile.weight
+    assert restored.reference_ids == [2, 1]
+    assert TasteProfile.build([], DECAY) is None
@@ -0,0 +1,77 @@
+"""검색 변형 일괄 임베딩 + search_batch"""
+from app.utils.vector_search import search_variants_batch
+
+
+class FakeEmbeddings:
+    def __init__(self, bad=()):
+        self.bad = set(bad)
+        self.document_calls = []
+        self.query_calls = []
+
+    def embed_documents(self, texts):
+        self.document_calls.append(list(texts))
+        if self.bad & set(texts):
+            raise RuntimeError("embedding failed")
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text):
+        self.query_calls.append(text)
+        if text in self.bad:
+            raise RuntimeError("embedding failed")
+        return [float(len(text))]
+
+
+class FakeQdrant:
+    def __init__(self, fail_batch=False):
+        self.fail_batch = fail_batch
+        self.batch_calls = []
+        self.search_calls = []
+
+    def search_batch(self, collection_name, requests):
+        self.batch_calls.append((collection_name, requests))
+        if self.fail_batch:
+            raise RuntimeError("batch failed")
+        return [[("hit", request.vector[0])] for request in requests]
+
+    def search(self, collection_name, query_vector, **kwargs):
+        self.search_calls.append(query_vector)
+        return [("hit", query_vector[0])]
+
+
+def test_all_variants_use_one_embedding_and_one_search_call():
+    embeddings, qdrant = FakeEmbeddings(), FakeQdrant()
+
+    results = search_variants_batch(qdrant, embeddings, "seoul-festival", ["a", "bb", "ccc"], limit=3, score_threshold=0.4)
+
+    assert embeddings.document_calls == [["a", "bb", "ccc"]]
+    assert embeddings.query_calls == []
+    assert len(qdrant.batch_calls) == 1
+    collection_name, requests = qdrant.batch_calls[0]
+    assert collection_name == "seoul-festival"
+    assert [(r.limit, r.score_threshold, r.with_payload, r.with_vector) for r in requests] == [(3, 0.4, True, False)] * 3
+    assert results == [("a", [("hit", 1.0)]), ("bb", [("hit", 2.0)]), ("ccc", [("hit", 3.0)])]
+
+
+def test_bad_variant_only_empties_its_own_results():
+    embeddings, qdrant = FakeEmbeddings(bad=["bb"]), FakeQdrant()
+
+    results = search_variants_batch(qdrant, embeddings, "seoul-festival", ["a", "bb", "ccc"])
+
+    assert embeddings.query_calls == ["a", "bb", "ccc"]
+    assert results == [("a", [("hit", 1.0)]), ("bb", []), ("ccc", [("hit", 3.0)])]
+
+
+def test_batch_search_failure_falls_back_to_single_searches():
+    embeddings, qdrant = FakeEmbeddings(), FakeQdrant(fail_batch=True)
+
+    results = search_variants_batch(qdrant, embeddings, "seoul-festival", ["a", "bb"])
+
+    assert qdrant.search_calls == [[1.0], [2.0]]
+    assert [variant for variant, _ in results] == ["a", "bb"]
+
+
+def test_no_variants_makes_no_calls():
+    embeddings, qdrant = FakeEmbeddings(), FakeQdrant()
+
+    assert search_variants_batch(qdrant, embeddings, "seoul-festival", []) == []
+    assert embeddings.document_calls == [] and qdrant.batch_calls == []
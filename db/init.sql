@@ -314,6 +314,44 @@ INSERT INTO `attraction` VALUES
 /*!40000 ALTER TABLE `attraction` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `celeb_restaurants`
+--
+
+DROP TABLE IF EXISTS `celeb_restaurants`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8mb4 */;
+CREATE TABLE `celeb_restaurants` (
+  `restaurant_id` int(11) NOT NULL AUTO_INCREMENT,
+  `restaurant_name` varchar(255) NOT NULL,
+  `place` varchar(255) DEFAULT NULL,
+  `image_path` varchar(500) DEFAULT NULL,
+  `Latitude` decimal(10,8) DEFAULT NULL,
+  `Longitude` decimal(11,8) DEFAULT NULL,
+  `near_subway` varchar(255) DEFAULT NULL,
+  `type` varchar(255) DEFAULT NULL,
+  `description_clean` text DEFAULT NULL,
+  `restaurant_name_en` varchar(255) DEFAULT NULL,
+  `place_en` varchar(255) DEFAULT NULL,
+  `near_subway_en` varchar(255) DEFAULT NULL,
+  `type_en` varchar(255) DEFAULT NULL,
+  `description_clean_en` text DEFAULT NULL,
+  PRIMARY KEY (`restaurant_id`),
+  KEY `ix_celeb_restaurants_restaurant_id` (`restaurant_id`),
+  KEY `ix_celeb_restaurants_restaurant_name` (`restaurant_name`),
+  KEY `idx_celeb_restaurants_lat_lng` (`Latitude`,`Longitude`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `celeb_restaurants`
+--
+
+LOCK TABLES `celeb_restaurants` WRITE;
+/*!40000 ALTER TABLE `celeb_restaurants` DISABLE KEYS */;
+/*!40000 ALTER TABLE `celeb_restaurants` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `conversations`
 --
@@ -331,6 +369,7 @@ CREATE TABLE `conversations` (
   PRIMARY KEY (`convers_id`),
   KEY `idx_user_id` (`user_id`),
   KEY `idx_datetime` (`datetime`),
+  KEY `idx_conversations_user_datetime_id` (`user_id`,`datetime`,`convers_id`),
   CONSTRAINT `conversations_ibfk_1` FOREIGN KEY (`user_id`) REFERENCES `users` (`user_id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=15 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -445,6 +484,31 @@ INSERT INTO `fastival` VALUES
 /*!40000 ALTER TABLE `fastival` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `id_sequences`
+--
+
+DROP TABLE IF EXISTS `id_sequences`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8mb4 */;
+CREATE TABLE `id_sequences` (
+  `name` varchar(64) NOT NULL COMMENT '시퀀스 이름 (테이블)',
+  `next_id` bigint(20) NOT NULL COMMENT '아직 예약되지 않은 다음 ID',
+  PRIMARY KEY (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `id_sequences`
+--
+
+LOCK TABLES `id_sequences` WRITE;
+/*!40000 ALTER TABLE `id_sequences` DISABLE KEYS */;
+INSERT INTO `id_sequences` VALUES
+('conversations',15);
+/*!40000 ALTER TABLE `id_sequences` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `musical`
 --